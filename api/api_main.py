@@ -1,12 +1,14 @@
-from fastapi import FastAPI, Query, Request, HTTPException
+from fastapi import FastAPI, Query, Request, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from typing import Optional, Union
 from sqlalchemy.orm import Session
 
-from database.connection import SessionLocal
+from database.connection import ReadSessionLocal, getPoolMetrics
 from database.models import Player as PlayerRow
 
-from api.models import PlayerResponse, GoalieResponse, seasonLevelResponse
-from api.db_communicators import getAllPlayers, getOnePlayer, getFilteredSeasonLevels
+from api.models import PlayerResponse, GoalieResponse, seasonLevelResponse, playersPageResponse
+from api.db_communicators import getPlayersPage, getOnePlayer, getFilteredSeasonLevels, exportSeasonLevels
+from api.cache import getCacheMetrics
 
 # Init the FastAPI app
 app = FastAPI()
@@ -14,29 +16,104 @@ app = FastAPI()
 # Dependecy that creates a Session for each request.
 # Currently this is not used anywhere, but lets keep it here just in case.
 def getSession():
-    dbSession = SessionLocal()  # Create a new one time use session
+    dbSession = ReadSessionLocal()  # Create a new one time use session. The API only reads, so it can use a read replica
     try:
         yield dbSession         # Return the session to be used in endpoint
     finally:    
         dbSession.close()       # Ensure session is closed after use
 
+# The query keys of the season level filters, shared by /season-levels and /season-levels/export
+SEASON_LEVEL_FILTER_KEYS = {"position", "clubName", "levelName", "ageGroupName", "sjlName", "year", "clubId", "levelId", "ageGroupId", "seasonId", "playerId"}
 
+def seasonLevelFilters(
+    position: Optional[str] = Query(None),
+    clubName: Optional[str] = Query(None),
+    levelName: Optional[str] = Query(None),
+    ageGroupName: Optional[str] = Query(None),
+    sjlName: Optional[str] = Query(None),
+    year: Optional[int] = Query(None),
+    clubId: Optional[int] = Query(None),
+    levelId: Optional[int] = Query(None),
+    ageGroupId: Optional[int] = Query(None),
+    seasonId: Optional[int] = Query(None),
+    playerId: Optional[int] = Query(None),
+    ) -> dict:
+    """
+    Dependency that builds the filters dict of the season level endpoints from the query. The keys are SEASON_LEVEL_FILTER_KEYS.
+
+    Query Parameters:
+        position (Optional[str]): The position of the player (e.g., "Maalivahti").
+        clubName (Optional[str]): The name of the club.
+        levelName (Optional[str]): The name of the level.
+        ageGroupName (Optional[str]): The name of the age group.
+        sjlName (Optional[str]): The SJL name of the player.
+        year (Optional[int]): The year of the season. Validated here, so a non-numeric year is a 422 before the cache key is built.
+        clubId (Optional[int]): The ID of the club.
+        levelId (Optional[int]): The ID of the level.
+        ageGroupId (Optional[int]): The ID of the age group.
+        seasonId (Optional[int]): The ID of the season.
+        playerId (Optional[int]): The ID of the player.
 
-@app.get("/players/", response_model=dict[str, PlayerResponse])
-def list_players():
+    Returns:
+        dict: The filters, None for the ones not in the query.
+    """
+    return {"position": position, "levelName": levelName, "clubName": clubName, "ageGroupName": ageGroupName, "sjlName": sjlName, "year": year, "clubId": clubId, "levelId": levelId, "ageGroupId": ageGroupId, "seasonId": seasonId, "playerId": playerId}
+
+def checkQueryKeys(request: Request, AcceptedKeys: set) -> None:
+    """
+    Raises HTTPException 400 listing the query keys of the request that are not in AcceptedKeys.
+    Done before even trying to get the data, so a typo in a filter doesn't silently return unfiltered rows.
+    """
+    InvalidKeys = set(request.query_params.keys()) - AcceptedKeys   # If any keys remain after subtracting the accepted keys, these are invalid
+    if len(InvalidKeys) > 0:
+        raise HTTPException(status_code=400, detail=f"Invalid query parameters: {', '.join(InvalidKeys)}")
+
+
+
+@app.get("/metrics/db-pool")
+def get_db_pool_metrics():
+    """
+    Returns the state of the database connection pools: size, connections in use and how long the checkouts have waited.
+    See getPoolMetrics in database/connection.py.
+    """
+    return getPoolMetrics()
+
+@app.get("/metrics/cache")
+def get_cache_metrics():
+    """
+    Returns the hit, miss and eviction counters of the response cache. See getCacheMetrics in api/cache.py.
     """
-    Returns all players in the database.
+    return getCacheMetrics()
 
-    Returns a dictionary with the following structure:
-    {
-        "Player1 sjlName": Player1 (PlayerResponse),
-        "Player2 sjlName": Player2 (PlayerResponse),
-        ...
-    }
-    Each PlayerResponse object has the attributes documented in api/models.py
+@app.get("/players/", response_model=playersPageResponse)
+def list_players(
+    request: Request,
+    sort: str = Query("id"),
+    after: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+    ):
     """
-    players = getAllPlayers()
-    return players
+    Returns one page of the players in the database, without their seasons.
+
+    Query Parameters:
+        sort (str): "id", "sjlName" or "birthYear". A "-" in front sorts in descending order, ex. "-birthYear".
+        after (Optional[str]): The "nextCursor" of the previous page. Leave out for the first page.
+        limit (Optional[int]): The page size, 100 by default and 1000 at most.
+
+    Returns:
+        playersPageResponse: {"players": [PlayerResponse...], "nextCursor": .., "next": url of the next page}
+        Each PlayerResponse object has the attributes documented in api/models.py
+
+    Raises:
+        HTTPException: 400 if the sort, cursor or limit is invalid.
+    """
+    try:
+        Players, NextCursor = getPlayersPage(sort, after, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    NextUrl = str(request.url.include_query_params(after=NextCursor)) if NextCursor else None     # Same query, only the cursor changes
+    return playersPageResponse(players=[PlayerResponse.model_validate(Player) for Player in Players], nextCursor=NextCursor, next=NextUrl)
 
 @app.get("/players/{player_id}", response_model=Union[GoalieResponse, PlayerResponse])
 def get_player(player_id: int):
@@ -50,24 +127,22 @@ def get_player(player_id: int):
         Union[GoalieResponse, PlayerResponse]: The player object read from the database.
         Each player object has custom made "seasons" attribute, which is a list containing the seasons for the player.
         Each season object has custom made "seasonLevels" attribute, which is a list containing the seasonLevel objects for the season.
+
+    Raises:
+        HTTPException: 404 if there is no player with the id.
     """
     Player = getOnePlayer(player_id)
+    if Player is None:
+        raise HTTPException(status_code=404, detail=f"No player with id {player_id}")
     return Player
 
 @app.get("/season-levels", response_model=seasonLevelResponse)
 def getFilteredSeasons(
     request: Request,
-    position: Optional[str] = Query(None),
-    clubName: Optional[str] = Query(None),
-    levelName: Optional[str] = Query(None),
-    ageGroupName: Optional[str] = Query(None),
-    sjlName: Optional[str] = Query(None),
-    year: Optional[str] = Query(None),
-    clubID: Optional[int] = Query(None),
-    levelId: Optional[int] = Query(None),
-    ageGroupId: Optional[int] = Query(None),
-    seasonId: Optional[int] = Query(None),
-    playerId: Optional[int] = Query(None),
+    Filters: dict = Depends(seasonLevelFilters),
+    sort: str = Query("id"),
+    after: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
     ):
 
     """
@@ -79,33 +154,62 @@ def getFilteredSeasons(
 
     Query Parameters:
         request (Request): The HTTP request object.
-        position (Optional[str]): The position of the player (e.g., "Maalivahti").
-        clubName (Optional[str]): The name of the club.
-        levelName (Optional[str]): The name of the level.
-        ageGroupName (Optional[str]): The name of the age group.
-        sjlName (Optional[str]): The SJL name of the player.
-        year (Optional[str]): The year of the season.
-        clubID (Optional[int]): The ID of the club.
-        levelId (Optional[int]): The ID of the level.
-        ageGroupId (Optional[int]): The ID of the age group.
-        seasonId (Optional[int]): The ID of the season.
-        playerId (Optional[int]): The ID of the player.
+        The filters: "position", "clubName", "levelName", "ageGroupName", "sjlName", "year", "clubId", "levelId", "ageGroupId", "seasonId"
+        and "playerId". See seasonLevelFilters.
+        sort (str): "id", "games", and "points" (players) or "savePercentage" (goalies). A "-" in front sorts in descending order, ex. "-points".
+                    Without a position filter, the sort must work for both goalies and players.
+        after (Optional[str]): The "nextCursor" of the previous page. Leave out for the first page.
+        limit (Optional[int]): The page size of both lists, 100 by default and 1000 at most.
 
     Returns:
-        seasonLevelResponse: A response model containing lists of goalie and player season levels.
+        seasonLevelResponse: A response model containing lists of goalie and player season levels, and the cursor and url of the next page.
 
     Raises:
-        HTTPException: If any invalid query parameters are provided.
+        HTTPException: If any invalid query parameters are provided, or the sort, cursor or limit is invalid.
     """
 
     # If there are invalid keys in the query we inform the user before even trying to get the data
-    AcceptedKeys = {"position", "clubName", "levelName", "ageGroupName", "sjlName", "year", "clubId", "levelId", "ageGroupId", "seasonId", "playerId"} # Set of accepted query keys
-    QueryKeys = set(request.query_params.keys())    # Gets a set of all the query keys used in a request
-    InvalidKeys = QueryKeys - AcceptedKeys          # Finds the invalid keys by subtracting the accepted keys from the query keys, if any remain, these are invalid
-    if len(InvalidKeys) > 0:                        # If there are any invalid keys we raise the exception informing the user about incorrect keys used
-        Message = f"Invalid query parameters: {', '.join(InvalidKeys)}"
-        raise HTTPException(status_code=400, detail=Message)
+    checkQueryKeys(request, SEASON_LEVEL_FILTER_KEYS | {"sort", "after", "limit"})
 
     # If there are no invalid keys we get the filtered season level objects and return them inside the seasonLevelResponse model defined in api/models.py
-    Filters = {"position": position, "levelName": levelName, "clubName": clubName, "ageGroupName": ageGroupName, "sjlName": sjlName, "year": year, "clubId": clubID, "levelId": levelId, "ageGroupId": ageGroupId, "seasonId": seasonId, "playerId": playerId}
-    return getFilteredSeasonLevels(Filters)
+    try:
+        Response = getFilteredSeasonLevels(Filters, sort, after, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if Response.nextCursor:
+        Response.next = str(request.url.include_query_params(after=Response.nextCursor))   # Same filters, only the cursor changes
+    return Response
+
+@app.get("/season-levels/export")
+def exportFilteredSeasons(
+    request: Request,
+    format: str = Query("ndjson"),
+    Filters: dict = Depends(seasonLevelFilters),
+    ):
+
+    """
+    Streams all the season levels matching the filters as ndjson or csv, for exporting whole seasons.
+    The filters are the same as in /season-levels, but there are no pages: the rows are streamed from a server-side cursor
+    as they are read, so the memory use stays the same for any number of rows.
+
+    Query Parameters:
+        format (str): "ndjson" (default) or "csv". The csv needs a position filter.
+        The rest are the filters of /season-levels, see seasonLevelFilters.
+
+    Returns:
+        StreamingResponse: The rows. Each has the columns of the season level table and "clubName", "levelName" and "ageGroupName".
+        Without a position filter the ndjson rows also have "position", "goalie" or "player".
+
+    Raises:
+        HTTPException: 400 if there are invalid query parameters, or the format or position is not supported.
+    """
+    checkQueryKeys(request, SEASON_LEVEL_FILTER_KEYS | {"format"})
+
+    try:
+        Chunks, MediaType = exportSeasonLevels(Filters, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    FileName = f"season-levels.{format}"
+    return StreamingResponse(Chunks, media_type=MediaType, headers={"Content-Disposition": f'attachment; filename="{FileName}"'})
@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from database.data_versions import readDataVersions
+
+try:
+    import redis    # Optional. Only needed for a shared cache in redis, API_CACHE_SHARED_URL=redis://...
+except ImportError:
+    redis = None
+
+# Response cache of the API. The stats only change when the scrapers commit, so the responses of /players/{id} and /season-levels
+# are kept in memory and served without querying the database again.
+#
+# The key of an entry is the endpoint, the normalized query (the parameters that were given, sorted) and the data versions of the scopes
+# the response depends on (database/data_versions.py). The writers bump the versions in the same transaction as the rows, so after a commit
+# the next request has a new key and reads the new data. Only the entries of the scopes that were written change their keys, the rest
+# are still hits. The old entries are never read again and are dropped by the LRU or when their TTL runs out.
+#
+# Two levels:
+# - In-process LRU: API_CACHE_MAX_ENTRIES entries, each kept at most API_CACHE_TTL_SECONDS.
+# - Shared backend, optional: API_CACHE_SHARED_URL. "redis://..." shares the entries between the API processes, "local" uses LocalSharedBackend,
+#   an in-process stand-in with the same get/setex interface, for running without redis. Empty (default) turns it off.
+
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "2000"))
+API_CACHE_TTL_SECONDS = float(os.getenv("API_CACHE_TTL_SECONDS", "300"))
+API_CACHE_SHARED_URL = os.getenv("API_CACHE_SHARED_URL", "")
+
+class LruTtlCache:
+    """
+    Thread safe LRU with a TTL. Counts the hits, misses, evictions (dropped because the cache was full) and expirations.
+    """
+    def __init__(self, PMaxEntries: int, PTtlSeconds: float):
+        self.maxEntries = PMaxEntries
+        self.ttlSeconds = PTtlSeconds
+        self.entries = OrderedDict()        # Key: (value, expires at). The last one is the most recently used
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, PKey: str) -> object:
+        """
+        Returns the value of the key, or None if it isn't cached or has expired.
+        """
+        with self.lock:
+            Entry = self.entries.get(PKey)
+            if Entry is not None and Entry[1] <= time.monotonic():
+                del self.entries[PKey]
+                self.expirations += 1
+                Entry = None
+            if Entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(PKey)
+            self.hits += 1
+            return Entry[0]
+
+    def set(self, PKey: str, PValue: object) -> None:
+        with self.lock:
+            self.entries[PKey] = (PValue, time.monotonic() + self.ttlSeconds)
+            self.entries.move_to_end(PKey)
+            while len(self.entries) > self.maxEntries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return None
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+        return None
+
+class LocalSharedBackend:
+    """
+    Stand-in for redis when there is none: the same get/setex of bytes with a TTL, kept in this process.
+    """
+    def __init__(self):
+        self.values = {}                    # Key: (bytes, expires at)
+        self.lock = threading.Lock()
+
+    def get(self, PKey: str) -> bytes:
+        with self.lock:
+            Entry = self.values.get(PKey)
+            if Entry is None or Entry[1] <= time.monotonic():
+                self.values.pop(PKey, None)
+                return None
+            return Entry[0]
+
+    def setex(self, PKey: str, PTtlSeconds: int, PValue: bytes) -> None:
+        with self.lock:
+            self.values[PKey] = (PValue, time.monotonic() + PTtlSeconds)
+        return None
+
+def buildSharedBackend(PUrl: str) -> object:
+    """
+    Returns the shared backend for the url: a redis client, a LocalSharedBackend for "local", or None for "".
+    A redis url without the redis package falls back to LocalSharedBackend.
+    """
+    if not PUrl:
+        return None
+    if PUrl == "local":
+        return LocalSharedBackend()
+    if redis is None:
+        print(f"The redis package is not installed, using LocalSharedBackend instead of {PUrl}")
+        return LocalSharedBackend()
+    return redis.Redis.from_url(PUrl)
+
+LocalCache = LruTtlCache(API_CACHE_MAX_ENTRIES, API_CACHE_TTL_SECONDS)
+SharedBackend = buildSharedBackend(API_CACHE_SHARED_URL)
+SharedCounts = {"Hits": 0, "Misses": 0, "Errors": 0}
+SharedLock = threading.Lock()
+
+def countShared(PName: str) -> None:
+    with SharedLock:
+        SharedCounts[PName] += 1
+    return None
+
+def buildCacheKey(PEndpoint: str, PParams: dict, PVersions: dict) -> str:
+    """
+    Returns the cache key of a request, ex. ("season-levels", {"year": "2024", "clubId": None}, {"levels:2024": 7})
+    -> 'season-levels?{"year": "2024"}@{"levels:2024": 7}'. The parameters that were not given are left out, and the order doesn't matter.
+    """
+    Params = {Key: Value for Key, Value in PParams.items() if Value is not None}
+    return f"{PEndpoint}?{json.dumps(Params, sort_keys=True, default=str)}@{json.dumps(PVersions, sort_keys=True)}"
+
+def cachedResponse(PEndpoint: str, PParams: dict, PScopes: list[str], PBuild: object) -> object:
+    """
+    Returns the cached response of the request, or builds it with PBuild and caches it. None is not cached.
+
+    Args:
+        PEndpoint (str): The name of the endpoint, ex. "player".
+        PParams (dict): The query parameters that change the response.
+        PScopes (list[str]): The data version scopes the response depends on, ex. ["player:3405"].
+        PBuild (object): Function without arguments that reads the response from the database. It must return json serializable data (dicts and lists).
+
+    Returns:
+        object: The response.
+    """
+    Key = buildCacheKey(PEndpoint, PParams, readDataVersions(PScopes))
+    Value = LocalCache.get(Key)
+    if Value is not None:
+        return Value
+
+    if SharedBackend is not None:
+        try:
+            Stored = SharedBackend.get(Key)
+        except Exception as e:                  # A broken shared cache only costs the database query
+            print(f"Shared cache get failed: {e}")
+            countShared("Errors")
+            Stored = None
+        if Stored is not None:
+            countShared("Hits")
+            Value = json.loads(Stored)
+            LocalCache.set(Key, Value)
+            return Value
+        countShared("Misses")
+
+    Value = PBuild()
+    if Value is None:
+        return None
+    LocalCache.set(Key, Value)
+    if SharedBackend is not None:
+        try:
+            SharedBackend.setex(Key, int(API_CACHE_TTL_SECONDS), json.dumps(Value).encode())
+        except Exception as e:
+            print(f"Shared cache set failed: {e}")
+            countShared("Errors")
+    return Value
+
+def getCacheMetrics() -> dict:
+    """
+    Returns the counters of the response cache.
+
+    Returns:
+        dict: "Entries", "MaxEntries", "TtlSeconds", "Hits", "Misses", "HitRate", "Evictions" and "Expirations" of the in-process LRU,
+        and "SharedHits", "SharedMisses" and "SharedErrors" of the shared backend (all 0 if there is none).
+    """
+    with LocalCache.lock:
+        Lookups = LocalCache.hits + LocalCache.misses
+        Metrics = {
+            "Entries": len(LocalCache.entries),
+            "MaxEntries": LocalCache.maxEntries,
+            "TtlSeconds": LocalCache.ttlSeconds,
+            "Hits": LocalCache.hits,
+            "Misses": LocalCache.misses,
+            "HitRate": round(LocalCache.hits / Lookups, 3) if Lookups else 0.0,
+            "Evictions": LocalCache.evictions,
+            "Expirations": LocalCache.expirations,
+        }
+    with SharedLock:
+        Metrics["SharedHits"] = SharedCounts["Hits"]
+        Metrics["SharedMisses"] = SharedCounts["Misses"]
+        Metrics["SharedErrors"] = SharedCounts["Errors"]
+    return Metrics
+
+def printCacheMetrics() -> None:
+    """
+    Prints the metrics from getCacheMetrics() on one line.
+    """
+    Metrics = getCacheMetrics()
+    print(f"Cache: {Metrics['Entries']}/{Metrics['MaxEntries']} entries, {Metrics['Hits']} hits, {Metrics['Misses']} misses (hit rate {Metrics['HitRate']}), "
+          f"{Metrics['Evictions']} evictions, {Metrics['Expirations']} expired, shared {Metrics['SharedHits']} hits / {Metrics['SharedMisses']} misses / {Metrics['SharedErrors']} errors")
+    return None
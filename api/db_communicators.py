@@ -1,61 +1,97 @@
-from database.reader import readAllPlayers, parsePlayersToDict, readOnePlayerById, readPlayersSeasons, readLevelsForSeason, convertNamesToIds, filterGoalieSeasonLevels, filterPlayerSeasonLevels
-from database.connection import SessionLocal
-from api.models import seasonLevelResponse
+import io
+import csv
+import json
+from database.reader import readPlayersPage, readPlayerDocument, convertNamesToIds, filterGoalieSeasonLevels, filterPlayerSeasonLevels, streamSeasonLevelRows, seasonLevelColumns
+from database.connection import ReadSessionLocal
+from database.pagination import checkPageSize, encodeCursor, decodeCursor
+from database.models import Player as PlayerRow, GoalieSeasonLevel as GoalieSeasonLevelRow, PlayerSeasonLevel as PlayerSeasonLevelRow
+from database.data_versions import playerScope, yearScope
+from api.models import seasonLevelResponse, GoalieResponse, PlayerResponse
+from api.cache import cachedResponse
 
-def getAllPlayers():
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_CHUNK_ROWS = 500         # Rows written to the response at a time. Small enough that the first bytes go out right away
+
+def getPlayersPage(PSort: str = "id", PAfter: str = None, PLimit: int = None):
     """
-    Queries the database and returns a dictionary of all players in the database.
+    Queries the database and returns one page of players, without their seasons.
     
-    Returns a dictionary with the following structure:
-    {
-        "Player1 sjlName": Player1 (Player object (Base)),
-        "Player2 sjlName": Player2 (Player object (Base)),
-        ...
-    }
-    Each Player object has the following attributes:
-    - sjlName (str): The player's name in the format "LASTNAME Firstname".
-    - epName (str): The player's name in the format "Firstname Lastname".
-    - sjlLink (str): A link to the player's page on the SJL website.
-    - birthYear (int): The player's birth year.
-    - position (str): The player's position, either "Maalivahti", "Kenttäpelaaja", "Hyökkääjä" or "Puolustaja".
+    Args:
+        PSort (str): The sort, "id", "sjlName" or "birthYear". A "-" in front sorts in descending order.
+        PAfter (str): The cursor from the previous page. None for the first page.
+        PLimit (int): The page size. Defaults to DEFAULT_PAGE_SIZE in database/pagination.py.
+
+    Returns:
+        tuple: (list of Player objects (Base), the cursor of the next page or None)
+
+    Raises:
+        ValueError: If the sort, the cursor or the limit is invalid.
     """
+    Limit = checkPageSize(PLimit)
+    After = decodeCursor(PAfter, {"players": PlayerRow}).get("players")
     
-    Session = SessionLocal()                    # Create Session object to communicate with SQL Alchemy
-    players = readAllPlayers(Session)           # Read all players from the database using the database.readers function
-    parsedPlayers = parsePlayersToDict(players) # Parse the list of all Player objects into a dictionary
-    return parsedPlayers
+    Session = ReadSessionLocal()                                        # Create Session object to communicate with SQL Alchemy
+    try:
+        Players, NextPosition = readPlayersPage(Session, PSort, After, Limit)   # Read one page of players, from after the cursor
+    finally:
+        Session.close()
+
+    NextCursor = encodeCursor({"players": NextPosition}) if NextPosition else None
+    return Players, NextCursor
 
 def getOnePlayer(id: int):
 
     """
-    Queries the database and returns one player by id.
+    Queries the database and returns one player by id, with all the seasons and their season levels.
+    The whole document is read with readPlayerDocument, in three queries no matter how long the career is, and cached (api/cache.py).
     
     Args:
         id (int): The id of the player to read.
     
     Returns:
-        Player: The player object read from the database.
-        Each player object has custom made "seasons" attribute, which is a list containing the seasons for the player.
-        Each season object has custom made "seasonLevels" attribute, which is a list containing the seasonLevel objects for the season.
+        GoalieResponse | PlayerResponse: The response model of the player, or None if there is no player with the id.
+        The "seasons" field contains the seasons of the player, and each season has its "seasonLevels".
 
     """
     
-    Session = SessionLocal()                                            # Create Session object to communicate with SQL Alchemy
-    Player = readOnePlayerById(Session, id)                             # Read the player from the database using the database.readers function
-    Player.seasons = readPlayersSeasons(Session, id)                    # Read the seasons for the player from the database. Write this list to the player object .seasons attribute
+    Document = cachedResponse("player", {"id": id}, [playerScope(id)], lambda: readOnePlayerDocument(id))  # Cached until the player is written again, see api/cache.py
+    if Document is None:
+        return None
+    if Document["position"] == "Maalivahti":
+        return GoalieResponse(**Document)                               # The dicts already have the shape of the response models
+    return PlayerResponse(**Document)
 
-    for season in Player.seasons:                           
-        season.seasonLevels = readLevelsForSeason(Session, season.id, Player.position)   # Read the seasonLevels for the season from the database. Write this list to the season object .seasonLevels attribute
-    
-        for seasonLevel in season.seasonLevels:
-            print(type(seasonLevel))
-            print(seasonLevel)
-            print("")    
-    
-    return Player                                                       # Return player object, that has custom .seasons attribute.
-                                                                        # List contains season objects, that has custom .seasonLevels attribute containing seasonLevel objects
+def readOnePlayerDocument(id: int) -> dict:
+    """
+    Reads the document of getOnePlayer from the database, in a session of its own.
+    """
+    Session = ReadSessionLocal()                                        # Create Session object to communicate with SQL Alchemy
+    try:
+        return readPlayerDocument(Session, id)                          # The player, seasons and season levels as plain dicts
+    finally:
+        Session.close()
 
-def getFilteredSeasonLevels(Filters: dict):
+def seasonLevelScopes(Filters: dict) -> list[str]:
+    """
+    Returns the data version scope the /season-levels response of the filters depends on. Filtered by playerId only that player,
+    by year only the season levels of the year, otherwise any season level. The year is already an int, see seasonLevelFilters in api/api_main.py.
+    """
+    if Filters.get("playerId") is not None:
+        return [playerScope(Filters["playerId"])]
+    if Filters.get("year") is not None:
+        return [yearScope(Filters["year"])]
+    return ["levels"]
+
+def getFilteredSeasonLevels(Filters: dict, PSort: str = "id", PAfter: str = None, PLimit: int = None):
+    """
+    Returns the season levels of readFilteredSeasonLevels from the response cache (api/cache.py), reading them only when
+    the data has been written after the response was cached. Same arguments, return value and errors as readFilteredSeasonLevels.
+    """
+    Params = dict(Filters, sort=PSort, after=PAfter, limit=PLimit)
+    Data = cachedResponse("season-levels", Params, seasonLevelScopes(Filters), lambda: readFilteredSeasonLevels(Filters, PSort, PAfter, PLimit).model_dump())
+    return seasonLevelResponse(**Data)
+
+def readFilteredSeasonLevels(Filters: dict, PSort: str = "id", PAfter: str = None, PLimit: int = None):
     """
     Filters and retrieves season level data based on the provided criteria.
 
@@ -69,12 +105,15 @@ def getFilteredSeasonLevels(Filters: dict):
         Filters (dict): A dictionary containing the filter criteria for querying season levels.
                         Acceptable keys include "position", "clubName", "levelName", "ageGroupName", 
                         "sjlName", "year", "clubId", "levelId", "ageGroupId", "seasonId", "playerId".
+        PSort (str): The sort, ex. "-points". See SORT_COLUMNS in database/pagination.py. Both tables must have the column, if there is no position filter.
+        PAfter (str): The cursor from the previous page. None for the first page.
+        PLimit (int): The page size, per table. Defaults to DEFAULT_PAGE_SIZE in database/pagination.py.
 
     Returns:
-        seasonLevelResponse: An object containing lists of filtered goalie and player season levels.
+        seasonLevelResponse: An object containing lists of filtered goalie and player season levels, and the cursor of the next page.
 
     Raises:
-        ValueError: If an unsupported position filter is provided.
+        ValueError: If an unsupported position filter, sort, cursor or limit is provided.
     """
 
     # The original filters contains all query options, so we remove all key-values that are None. This is done because we don't want to add None values to the query.
@@ -83,7 +122,11 @@ def getFilteredSeasonLevels(Filters: dict):
         if value is not None:                   # Check if the value is not None, aka contains an actualy query
             FiltersToUse[key] = value           # Add the key-value pair to the FiltersToUse dict
     
-    Session = SessionLocal()                    # Create Session object to communicate with SQL Alchemy
+    Limit = checkPageSize(PLimit)
+    After = decodeCursor(PAfter, {"goalies": GoalieSeasonLevelRow, "players": PlayerSeasonLevelRow})   # The positions of the previous page in both tables. {} for the first page
+    NextPositions = {}
+
+    Session = ReadSessionLocal()                # Create Session object to communicate with SQL Alchemy
     convertNamesToIds(FiltersToUse, Session)    # If there are "clubName", "levelName", "ageGroupName" or "sjlName" in the filters, convert them to "clubId", "levelId", "ageGroupId" or "playerId"
                                                 # This is done because the seasonLevel tables dont have the string name values. Therefore we have to use the ids instead.
 
@@ -94,23 +137,115 @@ def getFilteredSeasonLevels(Filters: dict):
     # Filter the SeasonLevel objects based on the position. This needs to be done separately for the goalie and player season levels, because they have different models both in database and api.
     if FiltersToUse.get("position") == "Maalivahti":                                    # If position in maalivahti.
         del FiltersToUse["position"]                                                    # Remove from filters because its not a key in the "goalie_season_levels" table. Would cause error otherwise.
-        filterGoalieSeasonLevels(Session, GoalieSeasonLevels, FiltersToUse)             # Filter goalie season levels. This appends the filtered goalie season level objects to the GoalieSeasonLevels list in place.
+        NextPositions["goalies"] = filterGoalieSeasonLevels(Session, GoalieSeasonLevels, FiltersToUse, PSort, After.get("goalies"), Limit)   # Filter goalie season levels. This appends the filtered goalie season level objects to the GoalieSeasonLevels list in place.
     
     elif FiltersToUse.get("position") in ["Kenttäpelaaja", "Puolustaja", "Hyökkääjä"]:  # If position in kenttäpelaaja, puolustaja or hyökkääjä
         del FiltersToUse["position"]                                                    # Remove from filters because its not a key in the "player_season_levels" table. Would cause error otherwise.
-        filterPlayerSeasonLevels(Session, PlayerSeasonLevels, FiltersToUse)             # Filter player season levels. This appends the filtered player season level objects to the PlayerSeasonLevels list in place.
+        NextPositions["players"] = filterPlayerSeasonLevels(Session, PlayerSeasonLevels, FiltersToUse, PSort, After.get("players"), Limit)   # Filter player season levels. This appends the filtered player season level objects to the PlayerSeasonLevels list in place.
     
     elif FiltersToUse.get("position") is None:                                          # If there is no position filter, we need to separately filter goalie and player season level tables.
-        filterGoalieSeasonLevels(Session, GoalieSeasonLevels, FiltersToUse)             
-        filterPlayerSeasonLevels(Session, PlayerSeasonLevels, FiltersToUse)
+        if After.get("goalies") or not After:                                           # A table that ran out on an earlier page is not in the cursor anymore
+            NextPositions["goalies"] = filterGoalieSeasonLevels(Session, GoalieSeasonLevels, FiltersToUse, PSort, After.get("goalies"), Limit)
+        if After.get("players") or not After:
+            NextPositions["players"] = filterPlayerSeasonLevels(Session, PlayerSeasonLevels, FiltersToUse, PSort, After.get("players"), Limit)
     else:                                                                               # If there is a position query filter, but its invalid raise ValueError.
         raise ValueError(f"Unsupported position: {FiltersToUse.get('position')} in getFilteredSeasonLevels")
         
 
+    Session.close()
+
     # We create and return a seaonLevelResponse object, this contains "goalies" and "players" attributes. Both are a list of corresponding seasonLevel objects. 
+
     Response = seasonLevelResponse()
     Response.goalies = GoalieSeasonLevels
     Response.players = PlayerSeasonLevels
+    NextPositions = {Table: Position for Table, Position in NextPositions.items() if Position}     # Only the tables that have more rows
+    Response.nextCursor = encodeCursor(NextPositions) if NextPositions else None
 
     return Response
-    
\ No newline at end of file
+
+def exportSeasonLevels(Filters: dict, PFormat: str = "ndjson"):
+    """
+    Prepares a streamed export of the season levels matching the filters. Takes the same filters as getFilteredSeasonLevels,
+    but the rows are streamed from a server-side cursor and written straight to text, without ORM objects or pydantic models.
+    The filters are checked and the names converted to ids here, so an invalid request fails before the response starts.
+
+    Args:
+        Filters (dict): Same as in getFilteredSeasonLevels.
+        PFormat (str): "ndjson" (one json object per line) or "csv". Without a position filter the ndjson has the goalies first and then the players,
+                       each row with "position" "goalie" or "player". The csv needs a position filter, the tables have different columns.
+
+    Returns:
+        tuple: (generator of the text chunks of the response, media type)
+
+    Raises:
+        ValueError: If the format or the position filter is not supported.
+    """
+    if PFormat not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported format: {PFormat}, the options are {list(EXPORT_MEDIA_TYPES)}")
+
+    FiltersToUse = {key: value for key, value in Filters.items() if value is not None}     # Only the filters given in the request
+    Position = FiltersToUse.pop("position", None)
+    if Position == "Maalivahti":
+        Positions = ["Maalivahti"]
+    elif Position in ["Kenttäpelaaja", "Puolustaja", "Hyökkääjä"]:
+        Positions = [Position]
+    elif Position is None:
+        if PFormat == "csv":
+            raise ValueError("The csv export needs a position filter, goalies and players have different columns")
+        Positions = ["Maalivahti", "Kenttäpelaaja"]
+    else:
+        raise ValueError(f"Unsupported position: {Position} in exportSeasonLevels")
+
+    Session = ReadSessionLocal()
+    try:
+        convertNamesToIds(FiltersToUse, Session)
+    except Exception:
+        Session.close()
+        raise
+
+    if PFormat == "csv":
+        return streamCsv(Session, Positions[0], FiltersToUse), EXPORT_MEDIA_TYPES[PFormat]
+    return streamNdjson(Session, Positions, FiltersToUse, Tagged=Position is None), EXPORT_MEDIA_TYPES[PFormat]
+
+def streamNdjson(Session: object, Positions: list, Filters: dict, Tagged: bool):
+    """
+    Yields the rows of each position as ndjson, EXPORT_CHUNK_ROWS lines at a time. Closes the session at the end.
+    """
+    try:
+        for Position in Positions:
+            Lines = []
+            for Row in streamSeasonLevelRows(Session, Position, Filters):
+                if Tagged:
+                    Row["position"] = "goalie" if Position == "Maalivahti" else "player"
+                Lines.append(json.dumps(Row, ensure_ascii=False))
+                if len(Lines) >= EXPORT_CHUNK_ROWS:
+                    yield "\n".join(Lines) + "\n"
+                    Lines = []
+            if Lines:
+                yield "\n".join(Lines) + "\n"
+    finally:
+        Session.close()
+
+def streamCsv(Session: object, Position: str, Filters: dict):
+    """
+    Yields the header and the rows as csv, EXPORT_CHUNK_ROWS rows at a time. Closes the session at the end.
+    """
+    try:
+        Buffer = io.StringIO()
+        Writer = csv.DictWriter(Buffer, fieldnames=seasonLevelColumns(Position))
+        Writer.writeheader()
+        yield Buffer.getvalue()                 # The header goes out before the first row is read
+        Buffer.seek(0)
+        Buffer.truncate()
+        Rows = 0
+        for Row in streamSeasonLevelRows(Session, Position, Filters):
+            Writer.writerow(Row)
+            Rows += 1
+            if Rows % EXPORT_CHUNK_ROWS == 0:
+                yield Buffer.getvalue()
+                Buffer.seek(0)
+                Buffer.truncate()
+        yield Buffer.getvalue()
+    finally:
+        Session.close()
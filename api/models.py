@@ -56,6 +56,10 @@ class seasonLevelResponse(BaseModel):
     goalies: Optional[List[goalieSeasonLevelResponse]] = None
     players: Optional[List[playerSeasonLevelResponse]] = None        
 
+    # The cursor of the next page, and the url of the next page with it. None on the last page
+    nextCursor: Optional[str] = None
+    next: Optional[str] = None
+
 class goalieSeasonResponse(BaseModel):
     """
     Represents a response model for a season in the API. This does not directly
@@ -153,3 +157,12 @@ class PlayerResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class playersPageResponse(BaseModel):
+    """
+    One page of GET /players/. The players have no seasons, read those from /players/{id}.
+    "nextCursor" is given back as the "after" query parameter to get the next page, "next" is the url of the next page.
+    Both are None on the last page.
+    """
+    players: List[PlayerResponse]
+    nextCursor: Optional[str] = None
+    next: Optional[str] = None
@@ -0,0 +1,140 @@
+import os
+from sqlalchemy import select
+from database.connection import SessionLocal
+from database.writer import writePlayerBatchToDb
+from database.registry import getDimensionId, registerSeasonLevels
+from database.upsert import upsertRows, mergeLevelRows, rowToValues
+from database.data_versions import bumpDataVersions, scopesForWrite
+from database.models import Player as PlayerRow, GoalieSeason as GoalieSeasonRow, PlayerSeason as PlayerSeasonRow, PlayerSeasonLevel as PlayerSeasonLevelRow, GoalieSeasonLevel as GoalieSeasonLevelRow
+from database.converters import playerConverter, goalieSeasonConverter, playerSeasonConverter, playerSeasonLevelConverter, goalieSeasonLevelConverter
+
+# Bulk writer for the historical loads. writeEntirePlayerToDb flushes every row on its own to get its id, which is hundreds of round trips per player.
+# This writes a whole batch of players with one multi-row upsert per table (database/upsert.py), so writing a player again updates its rows
+# instead of duplicating them. The ids are read back with one SELECT per table by the natural keys (sjlLink for the players, (playerId, year)
+# for the seasons), and the foreign keys of the next table are filled in from those in memory.
+# The club, level and age group ids come from the registry (database/registry.py).
+
+BULK_WRITE_BATCH = int(os.getenv("DB_BULK_WRITE_BATCH", "500"))     # Players per commit
+
+SKATER_POSITIONS = ["Kenttäpelaaja", "Puolustaja", "Hyökkääjä"]
+
+def insertPlayers(PPlayerObjects: list, Session: object) -> None:
+    """
+    Upserts the player rows of the batch and sets the .id of each player object. The ids are read back by sjlLink.
+    """
+    upsertRows(PlayerRow, [rowToValues(playerConverter(Player)) for Player in PPlayerObjects], Session)
+
+    Links = [Player.sjlLink for Player in PPlayerObjects]
+    IdsByLink = dict(Session.execute(select(PlayerRow.sjlLink, PlayerRow.id).where(PlayerRow.sjlLink.in_(Links))).all())
+    for Player in PPlayerObjects:
+        Player.id = IdsByLink[Player.sjlLink]
+    return None
+
+def insertSeasons(PPlayerObjects: list, PTable: object, PConverter, Session: object) -> dict:
+    """
+    Upserts the season rows of the given players into one season table.
+
+    Args:
+        PPlayerObjects (list): The players whose seasons go to PTable. Their .id must be set.
+        PTable (object): GoalieSeasonRow or PlayerSeasonRow.
+        PConverter (callable): goalieSeasonConverter or playerSeasonConverter.
+        Session (object): The SQLAlchemy session of the batch.
+
+    Returns:
+        dict: {(player id, year): season row id}
+    """
+    Values = [rowToValues(PConverter(Season, Player.id)) for Player in PPlayerObjects for Season in Player.seasons]
+    if not Values:
+        return {}
+    upsertRows(PTable, Values, Session)
+
+    PlayerIds = [Player.id for Player in PPlayerObjects]
+    Rows = Session.execute(select(PTable.playerId, PTable.year, PTable.id).where(PTable.playerId.in_(PlayerIds))).all()
+    return {(PlayerId, int(Year)): SeasonId for PlayerId, Year, SeasonId in Rows}
+
+def insertSeasonLevels(PPlayerObjects: list, PSeasonIds: dict, PTable: object, PConverter, Session: object) -> int:
+    """
+    Upserts the season level rows of the given players into one level table. The foreign keys come from PSeasonIds and the registry.
+
+    Returns:
+        int: How many rows were written.
+    """
+    Values = []
+    for Player in PPlayerObjects:
+        for Season in Player.seasons:
+            SeasonId = PSeasonIds[(Player.id, int(Season.year))]
+            for Level in Season.seasonLevelStats:
+                Values.append(rowToValues(PConverter(Level, SeasonId, getDimensionId("club", Level.club), getDimensionId("level", Level.level), getDimensionId("ageGroup", Level.ageGroup), Player.id)))
+    return upsertRows(PTable, mergeLevelRows(PTable, Values), Session)
+
+def writeBulkBatch(PPlayerObjects: list) -> int:
+    """
+    Writes one batch of players, their seasons and levels with a few multi-row statements, and commits once.
+
+    Args:
+        PPlayerObjects (list): The scraped player objects. The club, level and ageGroup of the levels must be parsed. Their .id is set.
+
+    Returns:
+        int: How many rows were written in total.
+
+    Raises:
+        ValueError: If a player has an unsupported position. Nothing of the batch is committed on any error.
+    """
+    Goalies = [Player for Player in PPlayerObjects if Player.position == "Maalivahti"]
+    Skaters = [Player for Player in PPlayerObjects if Player.position in SKATER_POSITIONS]
+    if len(Goalies) + len(Skaters) != len(PPlayerObjects):
+        Unsupported = [Player.sjlName for Player in PPlayerObjects if Player not in Goalies and Player not in Skaters]
+        raise ValueError(f"Unsupported position for {Unsupported} in writeBulkBatch")
+
+    registerSeasonLevels([Season for Player in PPlayerObjects for Season in Player.seasons])    # Committed before the batch, so every name below is a dict lookup
+
+    Session = SessionLocal()
+    try:
+        insertPlayers(PPlayerObjects, Session)
+        GoalieSeasonIds = insertSeasons(Goalies, GoalieSeasonRow, goalieSeasonConverter, Session)
+        SkaterSeasonIds = insertSeasons(Skaters, PlayerSeasonRow, playerSeasonConverter, Session)
+        LevelCount = insertSeasonLevels(Goalies, GoalieSeasonIds, GoalieSeasonLevelRow, goalieSeasonLevelConverter, Session)
+        LevelCount += insertSeasonLevels(Skaters, SkaterSeasonIds, PlayerSeasonLevelRow, playerSeasonLevelConverter, Session)
+        bumpDataVersions(Session, scopesForWrite([Player.id for Player in PPlayerObjects], [Season.year for Player in PPlayerObjects for Season in Player.seasons]))
+
+        Session.commit()
+    except Exception:
+        Session.rollback()
+        raise
+    finally:
+        Session.close()
+
+    return len(PPlayerObjects) + len(GoalieSeasonIds) + len(SkaterSeasonIds) + LevelCount
+
+def writePlayersInBulk(PPlayerObjects: list, PBatchSize: int = BULK_WRITE_BATCH) -> list:
+    """
+    Writes many players to the database in batches of PBatchSize with writeBulkBatch.
+    A batch that fails is written again player by player with writePlayerBatchToDb, so only the broken players are left out.
+
+    Args:
+        PPlayerObjects (list): The scraped player objects. The club, level and ageGroup of the levels must be parsed.
+        PBatchSize (int): How many players are committed at once.
+
+    Returns:
+        list: (PlayerObject, Exception) for each player that couldn't be written. Same as writePlayerBatchToDb.
+    """
+    Failed = []
+    SeenLinks = set()
+    UniquePlayers = []
+    for Player in PPlayerObjects:        # A link can only be once in an upsert statement
+        if Player.sjlLink in SeenLinks:
+            print(f"{Player.sjlName} is twice in the players to write, skipping the second one")
+            continue
+        SeenLinks.add(Player.sjlLink)
+        UniquePlayers.append(Player)
+
+    for Start in range(0, len(UniquePlayers), PBatchSize):
+        Batch = UniquePlayers[Start:Start + PBatchSize]
+        try:
+            RowCount = writeBulkBatch(Batch)
+            print(f"Wrote {len(Batch)} players ({RowCount} rows) to the database")
+        except Exception as e:
+            print(f"Bulk write of {len(Batch)} players failed ({e}), writing them one by one")
+            Failed.extend(writePlayerBatchToDb(Batch))
+
+    return Failed
@@ -1,9 +1,23 @@
 import os
+import time
+import itertools
+import threading
 from dotenv import load_dotenv, find_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
 from database.models import Base, Player
 
+# The engines are created on the first use, not when this module is imported, so the database package can be imported without
+# a database (ex. the scraper without the env vars, or a script that points DATABASE_URL to SQLite first).
+#
+# Configuration, from the environment (or the .env file):
+# - DATABASE_URL: Any SQLAlchemy url, ex. "sqlite:///hockey.db" for local runs and benchmarks. If not set, the MySQL url is built from
+#   MYSQL_USER, MYSQL_PW, MYSQL_HOST and MYSQL_DB like before.
+# - DB_READ_REPLICA_URLS: Comma separated urls of read replicas. ReadSessionLocal() takes them in turns, the primary is used if there are none.
+# - DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING: The connection pool of each engine.
+# SQLite files are opened in WAL mode, so the readers don't block the writer.
+
 # Fetch the enviroment variables stored on the system
 load_dotenv(find_dotenv())
 DB_USER = os.getenv("MYSQL_USER")
@@ -12,15 +26,155 @@ DB_HOST = os.getenv("MYSQL_HOST")
 DB_NAME = os.getenv("MYSQL_DB")
 
 # Build the connection string for the database
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PW}@{DB_HOST}/{DB_NAME}"
+DATABASE_URL = os.getenv("DATABASE_URL") or f"mysql+pymysql://{DB_USER}:{DB_PW}@{DB_HOST}/{DB_NAME}"
+READ_REPLICA_URLS = [Url.strip() for Url in os.getenv("DB_READ_REPLICA_URLS", "").split(",") if Url.strip()]
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))                 # Connections kept open per engine
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))          # Extra connections opened when all of the pool are in use
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))          # Seconds to wait for a free connection before raising
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))        # Seconds before a connection is replaced. Below the wait_timeout of MySQL
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"      # Test each connection on checkout, so a dropped one is replaced instead of failing the query
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that measures how long each checkout waits for a free connection. Read with getPoolMetrics().
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.totalWaitSeconds = 0.0
+        self.maxWaitSeconds = 0.0
+        self.metricsLock = threading.Lock()
+
+    def _do_get(self):
+        Start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            Waited = time.perf_counter() - Start
+            with self.metricsLock:
+                self.checkouts += 1
+                self.totalWaitSeconds += Waited
+                self.maxWaitSeconds = max(self.maxWaitSeconds, Waited)
+
+Engines = {"primary": None, "replicas": []}     # Created by getEngine() on the first use
+EngineLock = threading.Lock()
+ReplicaTurns = itertools.count()
+
+def setSqliteWal(DbapiConnection, ConnectionRecord) -> None:
+    """
+    Connect event of the SQLite engines. WAL lets the readers work while a writer commits, busy_timeout makes a writer wait for the lock instead of failing.
+    """
+    Cursor = DbapiConnection.cursor()
+    Cursor.execute("PRAGMA journal_mode=WAL")
+    Cursor.execute("PRAGMA synchronous=NORMAL")      # Safe with WAL, and much faster than FULL
+    Cursor.execute("PRAGMA busy_timeout=30000")
+    Cursor.close()
+    return None
+
+def buildEngine(PUrl: str) -> object:
+    """
+    Creates an engine for the url with the pool settings above. SQLite files get WAL mode, an in-memory SQLite database keeps the default pool.
+    """
+    if PUrl.startswith("sqlite"):
+        if PUrl in ["sqlite://", "sqlite:///:memory:"]:
+            return create_engine(PUrl)
+        Engine = create_engine(PUrl, poolclass=MeteredQueuePool, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT,
+                               connect_args={"check_same_thread": False})      # The pipeline and the API use the sessions from several threads
+        event.listen(Engine, "connect", setSqliteWal)
+        return Engine
+
+    return create_engine(PUrl, poolclass=MeteredQueuePool, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT,
+                         pool_recycle=DB_POOL_RECYCLE, pool_pre_ping=DB_POOL_PRE_PING)
+
+def getEngine() -> object:
+    """
+    Returns the engine of the primary database, creating it (and the replica engines) on the first call.
+    """
+    if Engines["primary"] is None:
+        with EngineLock:
+            if Engines["primary"] is None:
+                Engines["replicas"] = [buildEngine(Url) for Url in READ_REPLICA_URLS]
+                Engines["primary"] = buildEngine(DATABASE_URL)      # Set last, the check above reads it without the lock
+    return Engines["primary"]
+
+def getReadEngine() -> object:
+    """
+    Returns the engine of the next read replica in turn, or the primary engine if there are no replicas.
+    """
+    getEngine()
+    if not Engines["replicas"]:
+        return Engines["primary"]
+    return Engines["replicas"][next(ReplicaTurns) % len(Engines["replicas"])]
+
+def SessionLocal() -> object:
+    """
+    Returns a new Session of the primary database. Imported in other parts, and used to communicate with the database.
+    """
+    return Session(bind=getEngine())
+
+def ReadSessionLocal() -> object:
+    """
+    Returns a new Session of a read replica, or of the primary database if there are no replicas. Only for reading,
+    the replicas can be a moment behind the primary, so don't use it to read back what was just written.
+    """
+    return Session(bind=getReadEngine())
+
+def configureEngine(PUrl: str, PReplicaUrls: list[str] = None) -> object:
+    """
+    Replaces the engines with ones for the given urls, ex. configureEngine("sqlite:///bench.db") in a benchmark. The old engines are disposed.
+
+    Returns:
+        object: The new primary engine.
+    """
+    global DATABASE_URL, READ_REPLICA_URLS
+    with EngineLock:
+        for Engine in [Engines["primary"]] + Engines["replicas"]:
+            if Engine is not None:
+                Engine.dispose()
+        DATABASE_URL = PUrl
+        READ_REPLICA_URLS = PReplicaUrls or []
+        Engines["primary"] = None
+    return getEngine()
+
+def getPoolMetrics() -> dict:
+    """
+    Returns the state of the connection pool of each engine that has been created.
 
-Engine = create_engine(DATABASE_URL)        # Create the engine used in the sessionmaker
-SessionLocal = sessionmaker(bind=Engine)    # The SessionLocal is imported in other parts, and used to create a Session object to communicate with the database
+    Returns:
+        dict: Key is "primary" or "replica-N", value is a dict with "PoolSize", "CheckedOut", "Overflow", "Checkouts",
+        "AvgWaitMs" and "MaxWaitMs" (how long the checkouts waited for a free connection).
+    """
+    Metrics = {}
+    Named = [("primary", Engines["primary"])] + [(f"replica-{Index}", Engine) for Index, Engine in enumerate(Engines["replicas"])]
+    for Name, Engine in Named:
+        if Engine is None or not isinstance(Engine.pool, MeteredQueuePool):
+            continue
+        Pool = Engine.pool
+        with Pool.metricsLock:
+            Metrics[Name] = {
+                "PoolSize": Pool.size(),
+                "CheckedOut": Pool.checkedout(),
+                "Overflow": max(Pool.overflow(), 0),
+                "Checkouts": Pool.checkouts,
+                "AvgWaitMs": round(1000 * Pool.totalWaitSeconds / Pool.checkouts, 2) if Pool.checkouts else 0.0,
+                "MaxWaitMs": round(1000 * Pool.maxWaitSeconds, 2),
+            }
+    return Metrics
+
+def printPoolMetrics() -> None:
+    """
+    Prints the metrics from getPoolMetrics(), one line per engine.
+    """
+    for Name, Metrics in getPoolMetrics().items():
+        print(f"Pool {Name}: size {Metrics['PoolSize']}, {Metrics['CheckedOut']} checked out, overflow {Metrics['Overflow']}, "
+              f"{Metrics['Checkouts']} checkouts, avg wait {Metrics['AvgWaitMs']}ms, max wait {Metrics['MaxWaitMs']}ms")
+    return None
 
 def createEmptyTables():
     """
     This is a development funciton.
     It's used to just reset the database and create the empty tables.
     """
-    Base.metadata.drop_all(Engine)
-    Base.metadata.create_all(Engine)
\ No newline at end of file
+    Base.metadata.drop_all(getEngine())
+    Base.metadata.create_all(getEngine())
@@ -0,0 +1,92 @@
+import os
+import time
+import threading
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite, postgresql
+from database.connection import ReadSessionLocal
+from database.models import DataVersion
+
+# Data versions of the API response cache (api/cache.py). Each scope has a counter in the "data_versions" table, and every writer bumps
+# the scopes of the rows it writes in the same transaction, so the new versions are visible exactly when the rows are committed.
+# The cache keys have the versions in them, so after a commit the old entries of the scope are never read again, and the LRU drops them.
+#
+# Scopes:
+# - "player:<id>": Anything of the player, its seasons or season levels. /players/{id}, and /season-levels filtered by playerId.
+# - "levels:<year>": The season levels of the seasons of that year. /season-levels filtered by year.
+# - "levels": Any season level. The rest of /season-levels.
+#
+# The API reads the versions at most every DATA_VERSION_CHECK_SECONDS per scope, so a commit shows up in the responses within that time.
+
+DATA_VERSION_CHECK_SECONDS = float(os.getenv("DB_DATA_VERSION_CHECK_SECONDS", "1"))
+
+VersionLock = threading.Lock()      # The API serves the requests from several threads
+KnownVersions = {}                  # Scope: (version, time it was read)
+
+def playerScope(PPlayerId: int) -> str:
+    return f"player:{PPlayerId}"
+
+def yearScope(PYear: int) -> str:
+    return f"levels:{int(PYear)}"
+
+def scopesForWrite(PPlayerIds: list, PYears: list) -> list[str]:
+    """
+    Returns the scopes to bump after writing rows of the players for the season years, ex. ([3405], [2024]) -> ["levels", "levels:2024", "player:3405"].
+    """
+    Scopes = {"levels"} | {yearScope(Year) for Year in PYears} | {playerScope(PlayerId) for PlayerId in PPlayerIds}
+    return sorted(Scopes)     # Always locked in the same order, so two writers can't deadlock on the rows
+
+def buildBumpStatement(PDialect: str) -> object:
+    """
+    Returns the insert of data_versions rows that adds one to the version when the scope already exists.
+
+    Raises:
+        ValueError: If the dialect has no upsert here.
+    """
+    Table = DataVersion.__table__
+    if PDialect in ["mysql", "mariadb"]:
+        return mysql.insert(Table).on_duplicate_key_update(version=Table.c.version + 1)
+    if PDialect in ["sqlite", "postgresql"]:
+        Statement = (sqlite if PDialect == "sqlite" else postgresql).insert(Table)
+        return Statement.on_conflict_do_update(index_elements=["scope"], set_={"version": Table.c.version + 1})
+    raise ValueError(f"No upsert for the {PDialect} dialect")
+
+def bumpDataVersions(Session: object, PScopes: list[str]) -> None:
+    """
+    Adds one to the version of each scope. Call it in the transaction that writes the rows, before the commit. Not committed here.
+
+    Args:
+        Session (object): The SQLAlchemy session of the write.
+        PScopes (list[str]): The scopes from scopesForWrite.
+    """
+    if not PScopes:
+        return None
+    Statement = buildBumpStatement(Session.get_bind().dialect.name)
+    Session.execute(Statement, [{"scope": Scope, "version": 1} for Scope in PScopes])
+    return None
+
+def readDataVersions(PScopes: list[str]) -> dict[str, int]:
+    """
+    Returns the version of each scope, 0 for a scope that has never been bumped. The scopes read less than DATA_VERSION_CHECK_SECONDS ago
+    come from memory, the rest are read with one query.
+    """
+    Now = time.monotonic()
+    with VersionLock:
+        Versions = {Scope: KnownVersions[Scope][0] for Scope in PScopes if Scope in KnownVersions and Now - KnownVersions[Scope][1] < DATA_VERSION_CHECK_SECONDS}
+    Stale = [Scope for Scope in PScopes if Scope not in Versions]
+    if not Stale:
+        return Versions
+
+    Session = ReadSessionLocal()        # Read like the data, from a replica if there are any
+    try:
+        Read = dict(Session.execute(select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(Stale))).all())
+    finally:
+        Session.close()
+
+    with VersionLock:
+        if len(KnownVersions) > 10000:     # One entry per player that has been asked for, drop the old ones
+            for Scope in [Scope for Scope, (Version, ReadAt) in KnownVersions.items() if Now - ReadAt >= DATA_VERSION_CHECK_SECONDS]:
+                del KnownVersions[Scope]
+        for Scope in Stale:
+            Versions[Scope] = Read.get(Scope, 0)
+            KnownVersions[Scope] = (Versions[Scope], Now)
+    return Versions
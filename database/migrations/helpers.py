@@ -0,0 +1,129 @@
+from sqlalchemy import Index, MetaData, Table, select, delete, update, func, inspect, and_
+from database.upsert import mergeLevelRows, SUMMED_LEVEL_COLUMNS
+from database.models import GoalieSeasonLevel
+
+# Building blocks of the migrations. Every step checks the current schema first, so running a migration on a database that already
+# has the change (ex. one made with createEmptyTables()) does nothing. MySQL commits DDL right away, so a migration that fails halfway
+# is simply run again.
+
+DELETE_CHUNK = 1000     # Values per DELETE statement
+
+def reflectTable(Connection: object, PTableName: str) -> Table:
+    """
+    Returns the table as it is in the database right now, not as it is in database/models.py.
+    """
+    return Table(PTableName, MetaData(), autoload_with=Connection)
+
+def hasIndexOn(Connection: object, PTableName: str, PColumns: list[str], PUnique: bool = False) -> bool:
+    """
+    Returns True if the table has an index (or a unique constraint) on exactly these columns, in this order.
+    With PUnique, only unique ones count. The names don't matter, so the indexes create_all made are found too.
+    """
+    Inspector = inspect(Connection)
+    for IndexInfo in Inspector.get_indexes(PTableName):
+        if IndexInfo["column_names"] == PColumns and (IndexInfo["unique"] or not PUnique):
+            return True
+    for Constraint in Inspector.get_unique_constraints(PTableName):
+        if Constraint["column_names"] == PColumns:
+            return True
+    return False
+
+def createIndexIfMissing(Connection: object, PTableName: str, PIndexName: str, PColumns: list[str], PUnique: bool = False) -> bool:
+    """
+    Creates the index, unless the table already has one on the same columns.
+
+    Returns:
+        bool: True if the index was created.
+    """
+    if hasIndexOn(Connection, PTableName, PColumns, PUnique):
+        return False
+    TableObject = reflectTable(Connection, PTableName)
+    Index(PIndexName, *[TableObject.c[Column] for Column in PColumns], unique=PUnique).create(Connection)
+    print(f"Created index {PIndexName} on {PTableName} {PColumns}")
+    return True
+
+def deleteWhereIn(Connection: object, PTable: Table, PColumn: str, PValues: list) -> None:
+    """
+    Deletes the rows whose PColumn is one of PValues, DELETE_CHUNK values per statement.
+    """
+    for Start in range(0, len(PValues), DELETE_CHUNK):
+        Connection.execute(delete(PTable).where(PTable.c[PColumn].in_(PValues[Start:Start + DELETE_CHUNK])))
+    return None
+
+def findDuplicateIds(Connection: object, PTable: Table, PKeyColumns: list[str]) -> list[int]:
+    """
+    Returns the ids of the rows that would break a unique key on PKeyColumns. The newest row (biggest id) of each key is kept,
+    it is the one the old writers read back with max(id). Rows with a NULL in the key don't break a unique key, so they are kept.
+
+    Returns:
+        list[int]: The ids to delete.
+    """
+    KeyColumns = [PTable.c[Column] for Column in PKeyColumns]
+    NotNull = and_(*[Column.is_not(None) for Column in KeyColumns])
+    Kept = select(func.max(PTable.c.id)).where(NotNull).group_by(*KeyColumns)
+    return list(Connection.execute(select(PTable.c.id).where(NotNull, PTable.c.id.not_in(Kept))).scalars())
+
+def mergeDuplicateLevels(Connection: object, PTable: Table, PModel: object) -> int:
+    """
+    Merges the level rows that have the same (seasonId, clubId, levelId, ageGroupId) into the newest one. These are not stray re-scrapes,
+    but the rows of two teams of one club in one level (ex. "Pelicans Turkoosi" and "Pelicans Valkoinen"), and more of them appear when
+    mergeDuplicateNames folds the club ids together. The counts are added up like database/upsert.mergeLevelRows does, the newest row is
+    updated with the sums and the others are deleted.
+
+    Args:
+        Connection (object): The connection of the migration.
+        PTable (Table): The reflected level table.
+        PModel (object): GoalieSeasonLevel or PlayerSeasonLevel, for the columns to add up.
+
+    Returns:
+        int: How many rows were deleted.
+    """
+    KeyColumns = [PTable.c[Column] for Column in ["seasonId", "clubId", "levelId", "ageGroupId"]]
+    NotNull = and_(*[Column.is_not(None) for Column in KeyColumns])
+    DuplicateKeys = select(*KeyColumns).where(NotNull).group_by(*KeyColumns).having(func.count() > 1).subquery()
+    Joined = PTable.join(DuplicateKeys, and_(*[Column == DuplicateKeys.c[Column.name] for Column in KeyColumns]))
+    Rows = Connection.execute(select(PTable).select_from(Joined).order_by(PTable.c.id)).mappings().all()
+
+    Groups = {}
+    for Row in Rows:
+        Groups.setdefault(tuple(Row[Column.name] for Column in KeyColumns), []).append(dict(Row))
+
+    DeletedIds = []
+    for GroupRows in Groups.values():
+        KeptId = GroupRows[-1]["id"]        # The newest row, the one the old writers read back
+        Merged = mergeLevelRows(PModel, GroupRows)[0]
+        Values = {Column: Merged[Column] for Column in SUMMED_LEVEL_COLUMNS[PModel]}
+        if PModel is GoalieSeasonLevel:
+            Values["savePercentage"] = Merged["savePercentage"]
+        Connection.execute(update(PTable).where(PTable.c.id == KeptId).values(Values))
+        DeletedIds += [Row["id"] for Row in GroupRows[:-1]]
+
+    deleteWhereIn(Connection, PTable, "id", DeletedIds)
+    return len(DeletedIds)
+
+def mergeDuplicateNames(Connection: object, PTableName: str, PNameColumn: str, PReferences: list[tuple[str, str]]) -> int:
+    """
+    Merges the rows of a dimension table (clubs, levels, age_groups) that have the same name into the oldest one.
+    The rows in PReferences that point to a duplicate are pointed to the oldest row first, then the duplicates are deleted.
+    The oldest row is the one database/registry.py already uses for the name.
+
+    Args:
+        Connection (object): The connection of the migration.
+        PTableName (str): Ex. "clubs".
+        PNameColumn (str): Ex. "clubName".
+        PReferences (list[tuple[str, str]]): (table name, column) of the foreign keys to the table, ex. ("player_season_level", "clubId").
+
+    Returns:
+        int: How many rows were deleted.
+    """
+    TableObject = reflectTable(Connection, PTableName)
+    NameColumn = TableObject.c[PNameColumn]
+    OldestIds = dict(Connection.execute(select(NameColumn, func.min(TableObject.c.id)).group_by(NameColumn)).all())
+    Duplicates = [(Id, OldestIds[Name]) for Id, Name in Connection.execute(select(TableObject.c.id, NameColumn)) if Id != OldestIds[Name]]
+
+    References = [(reflectTable(Connection, TableName), Column) for TableName, Column in PReferences]
+    for DuplicateId, OldestId in Duplicates:
+        for Referencing, Column in References:
+            Connection.execute(update(Referencing).where(Referencing.c[Column] == DuplicateId).values({Column: OldestId}))
+    deleteWhereIn(Connection, TableObject, "id", [DuplicateId for DuplicateId, OldestId in Duplicates])
+    return len(Duplicates)
@@ -0,0 +1,10 @@
+from database.models import Base
+
+# The tables as createEmptyTables() made them. Only the missing tables are created, the existing ones are left as they are.
+
+VERSION = 1
+DESCRIPTION = "Create the missing tables"
+
+def upgrade(Connection: object) -> None:
+    Base.metadata.create_all(Connection, checkfirst=True)
+    return None
@@ -0,0 +1,44 @@
+from database.migrations.helpers import reflectTable, createIndexIfMissing, deleteWhereIn, findDuplicateIds, mergeDuplicateNames, mergeDuplicateLevels
+from database.models import GoalieSeasonLevel, PlayerSeasonLevel
+
+# The unique keys the registry (database/registry.py) and the upserts (database/upsert.py) rely on.
+# The rows that would break them are cleaned up first:
+# - Clubs, levels and age groups with the same name are merged into the oldest row.
+# - Of players with the same sjlLink and seasons with the same (playerId, year), the newest row is kept and the older ones are deleted
+#   together with the rows that point to them.
+# - Levels with the same (seasonId, clubId, levelId, ageGroupId) are two teams of one club in one level. Their counts are added up into the newest row.
+
+VERSION = 2
+DESCRIPTION = "Unique natural keys, duplicates removed"
+
+LEVEL_TABLES = {"goalie_seasons": "goalie_season_level", "player_seasons": "player_season_level"}     # Season table: its level table
+LEVEL_MODELS = {"goalie_season_level": GoalieSeasonLevel, "player_season_level": PlayerSeasonLevel}
+
+def upgrade(Connection: object) -> None:
+    for TableName, NameColumn, ForeignKey in [("clubs", "clubName", "clubId"), ("levels", "levelName", "levelId"), ("age_groups", "ageGroupName", "ageGroupId")]:
+        Merged = mergeDuplicateNames(Connection, TableName, NameColumn, [(LevelTable, ForeignKey) for LevelTable in LEVEL_TABLES.values()])
+        print(f"Merged {Merged} duplicate {TableName} rows")
+        createIndexIfMissing(Connection, TableName, f"uq_{TableName}_name", [NameColumn], PUnique=True)
+
+    Players = reflectTable(Connection, "players")
+    PlayerIds = findDuplicateIds(Connection, Players, ["sjlLink"])
+    for SeasonTable, LevelTable in LEVEL_TABLES.items():
+        deleteWhereIn(Connection, reflectTable(Connection, LevelTable), "playerId", PlayerIds)
+        deleteWhereIn(Connection, reflectTable(Connection, SeasonTable), "playerId", PlayerIds)
+    deleteWhereIn(Connection, Players, "id", PlayerIds)
+    print(f"Deleted {len(PlayerIds)} duplicate players")
+    createIndexIfMissing(Connection, "players", "uq_players_sjl_link", ["sjlLink"], PUnique=True)
+
+    for SeasonTable, LevelTable in LEVEL_TABLES.items():
+        Seasons = reflectTable(Connection, SeasonTable)
+        Levels = reflectTable(Connection, LevelTable)
+
+        SeasonIds = findDuplicateIds(Connection, Seasons, ["playerId", "year"])
+        deleteWhereIn(Connection, Levels, "seasonId", SeasonIds)
+        deleteWhereIn(Connection, Seasons, "id", SeasonIds)
+        createIndexIfMissing(Connection, SeasonTable, f"uq_{SeasonTable}_player_year", ["playerId", "year"], PUnique=True)
+
+        MergedLevels = mergeDuplicateLevels(Connection, Levels, LEVEL_MODELS[LevelTable])
+        createIndexIfMissing(Connection, LevelTable, f"uq_{LevelTable}_natural_key", ["seasonId", "clubId", "levelId", "ageGroupId"], PUnique=True)
+        print(f"Deleted {len(SeasonIds)} duplicate {SeasonTable} rows, merged {MergedLevels} {LevelTable} rows into the other team of the same club")
+    return None
@@ -0,0 +1,35 @@
+from database.migrations.helpers import createIndexIfMissing
+
+# Indexes for the reader queries. The (playerId, year) and (seasonId, ...) unique keys of m002 already serve the lookups by playerId
+# of the seasons and by seasonId of the levels, as they are the first column of the key.
+# - getSeasonObjectsByYear: year of the season tables
+# - readOnePlayerByName (the sjlName filter of /season-levels): sjlName of players
+# - /season-levels: playerId, clubId, (levelId, ageGroupId) and ageGroupId of the level tables
+
+VERSION = 3
+DESCRIPTION = "Indexes for the reader queries"
+
+# Table: [(index name, columns)]
+INDEXES = {
+    "players": [("ix_players_sjl_name", ["sjlName"])],
+    "goalie_seasons": [("ix_goalie_seasons_year", ["year"])],
+    "player_seasons": [("ix_player_seasons_year", ["year"])],
+    "goalie_season_level": [
+        ("ix_goalie_season_level_player", ["playerId"]),
+        ("ix_goalie_season_level_club", ["clubId"]),
+        ("ix_goalie_season_level_level_age_group", ["levelId", "ageGroupId"]),
+        ("ix_goalie_season_level_age_group", ["ageGroupId"]),
+    ],
+    "player_season_level": [
+        ("ix_player_season_level_player", ["playerId"]),
+        ("ix_player_season_level_club", ["clubId"]),
+        ("ix_player_season_level_level_age_group", ["levelId", "ageGroupId"]),
+        ("ix_player_season_level_age_group", ["ageGroupId"]),
+    ],
+}
+
+def upgrade(Connection: object) -> None:
+    for TableName, Indexes in INDEXES.items():
+        for IndexName, Columns in Indexes:
+            createIndexIfMissing(Connection, TableName, IndexName, Columns)
+    return None
@@ -0,0 +1,26 @@
+from database.migrations.helpers import createIndexIfMissing
+
+# Indexes for the sorts of the paginated endpoints (database/pagination.py). The id is the tie breaker of every sort, and both
+# InnoDB and SQLite keep the primary key in each index, so an index on the sort column alone serves "ORDER BY column, id".
+
+VERSION = 4
+DESCRIPTION = "Indexes for the sorted pages"
+
+# Table: [(index name, columns)]
+INDEXES = {
+    "players": [("ix_players_birth_year", ["birthYear"])],
+    "goalie_season_level": [
+        ("ix_goalie_season_level_games", ["games"]),
+        ("ix_goalie_season_level_save_percentage", ["savePercentage"]),
+    ],
+    "player_season_level": [
+        ("ix_player_season_level_games", ["games"]),
+        ("ix_player_season_level_points", ["points"]),
+    ],
+}
+
+def upgrade(Connection: object) -> None:
+    for TableName, Indexes in INDEXES.items():
+        for IndexName, Columns in Indexes:
+            createIndexIfMissing(Connection, TableName, IndexName, Columns)
+    return None
@@ -0,0 +1,10 @@
+from database.models import DataVersion
+
+# The "data_versions" table of the API response cache. Empty at first, a missing scope is version 0.
+
+VERSION = 5
+DESCRIPTION = "Data versions of the response cache"
+
+def upgrade(Connection: object) -> None:
+    DataVersion.__table__.create(Connection, checkfirst=True)
+    return None
@@ -0,0 +1,54 @@
+import time
+from sqlalchemy import MetaData, Table, Column, Integer, String, Float, select, insert
+from database import connection
+from database.migrations import m001_initial_tables, m002_natural_keys, m003_access_path_indexes, m004_sort_indexes, m005_data_versions
+
+# Versioned schema migrations. Each migration is a module with VERSION, DESCRIPTION and upgrade(Connection). The versions that are
+# applied to a database are stored in its "schema_version" table, and upgradeDatabase() runs the missing ones in order.
+# A new schema change gets a new module and a line in MIGRATIONS, the old modules are never changed.
+# createEmptyTables() is still fine for a fresh development database, upgradeDatabase() after it only records the versions.
+
+MIGRATIONS = [m001_initial_tables, m002_natural_keys, m003_access_path_indexes, m004_sort_indexes, m005_data_versions]
+
+SchemaVersionTable = Table(
+    "schema_version", MetaData(),       # Not in Base.metadata, so createEmptyTables() doesn't drop it
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255)),
+    Column("appliedAt", Float),
+)
+
+def readAppliedVersions(PEngine: object = None) -> set[int]:
+    """
+    Returns the migration versions already applied to the database. Empty for a database that has never been migrated.
+    """
+    Engine = PEngine or connection.getEngine()
+    with Engine.begin() as Connection:
+        SchemaVersionTable.create(Connection, checkfirst=True)
+        return set(Connection.execute(select(SchemaVersionTable.c.version)).scalars())
+
+def upgradeDatabase(PEngine: object = None) -> list[int]:
+    """
+    Applies the migrations that the database doesn't have yet, in order. Each one runs in its own transaction together with its
+    schema_version row. On MySQL the DDL commits on its own, but every migration step checks the schema first, so a failed one can just be run again.
+
+    Args:
+        PEngine (object): The engine of the database to migrate. Defaults to the primary engine of database/connection.py.
+
+    Returns:
+        list[int]: The versions that were applied now.
+    """
+    Engine = PEngine or connection.getEngine()
+    Applied = readAppliedVersions(Engine)
+
+    NewVersions = []
+    for Migration in sorted(MIGRATIONS, key=lambda Migration: Migration.VERSION):
+        if Migration.VERSION in Applied:
+            continue
+        print(f"Applying migration {Migration.VERSION}: {Migration.DESCRIPTION}")
+        with Engine.begin() as Connection:
+            Migration.upgrade(Connection)
+            Connection.execute(insert(SchemaVersionTable).values(version=Migration.VERSION, description=Migration.DESCRIPTION, appliedAt=time.time()))
+        NewVersions.append(Migration.VERSION)
+
+    print(f"Database is at schema version {max([Migration.VERSION for Migration in MIGRATIONS])}, applied now: {NewVersions}")
+    return NewVersions
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -13,20 +13,22 @@ class Player(Base):
     - id = Column(Integer, primary_key=True, autoincrement=True)
     - sjlName = Column(String(255))
     - epName = Column(String(255))
-    - sjlLink = Column(String(255))
+    - sjlLink = Column(String(255), unique=True)
     - position = Column(String(255))
     - birthYear = Column(Integer)
 
     - goalie_seasons = relationship("GoalieSeason", back_populates="player")
     - player_seasons = relationship("PlayerSeason", back_populates="player")
-        
+
+    INDEX: (sjlName), (birthYear)
     """
     __tablename__ = 'players'
+    __table_args__ = (Index("ix_players_sjl_name", "sjlName"), Index("ix_players_birth_year", "birthYear"))
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     sjlName = Column(String(255))
     epName = Column(String(255))
-    sjlLink = Column(String(255))
+    sjlLink = Column(String(255), unique=True)     # The natural key of a player, database/upsert.py updates the row by it
     position = Column(String(255))
     birthYear = Column(Integer)
 
@@ -54,8 +56,12 @@ class GoalieSeason(Base):
 
     - player = relationship("Player", back_populates="goalie_seasons")
     - seasonLevelStats = relationship("GoalieSeasonLevel", back_populates="season")
+
+    UNIQUE: (playerId, year), also the index for the playerId lookups
+    INDEX: (year)
     """
     __tablename__ = 'goalie_seasons'
+    __table_args__ = (UniqueConstraint("playerId", "year", name="uq_goalie_seasons_player_year"), Index("ix_goalie_seasons_year", "year"))
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     year = Column(Integer)
@@ -86,8 +92,12 @@ class PlayerSeason(Base):
 
     - player = relationship("Player", back_populates="player_seasons")
     - seasonLevelStats = relationship("PlayerSeasonLevel", back_populates="season")
+
+    UNIQUE: (playerId, year), also the index for the playerId lookups
+    INDEX: (year)
     """
     __tablename__ = "player_seasons"
+    __table_args__ = (UniqueConstraint("playerId", "year", name="uq_player_seasons_player_year"), Index("ix_player_seasons_year", "year"))
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     year = Column(Integer)
@@ -130,8 +140,20 @@ class GoalieSeasonLevel(Base):
     - club = relationship("Club", back_populates="goalieSeasonLevels")
     - level = relationship("Level", back_populates="goalieSeasonLevels")
     - ageGroup = relationship("AgeGroup", back_populates="goalieSeasonLevels")
+
+    UNIQUE: (seasonId, clubId, levelId, ageGroupId), also the index for the seasonId lookups
+    INDEX: (playerId), (clubId), (levelId, ageGroupId), (ageGroupId), (games), (savePercentage)
     """
     __tablename__ = "goalie_season_level"
+    __table_args__ = (
+        UniqueConstraint("seasonId", "clubId", "levelId", "ageGroupId", name="uq_goalie_season_level_natural_key"),
+        Index("ix_goalie_season_level_player", "playerId"),
+        Index("ix_goalie_season_level_club", "clubId"),
+        Index("ix_goalie_season_level_level_age_group", "levelId", "ageGroupId"),     # The /season-levels filters, ex. levelName=U16 and ageGroupName=AAA
+        Index("ix_goalie_season_level_age_group", "ageGroupId"),
+        Index("ix_goalie_season_level_games", "games"),
+        Index("ix_goalie_season_level_save_percentage", "savePercentage"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     clubId = Column(Integer, ForeignKey("clubs.id"))
@@ -176,8 +198,20 @@ class PlayerSeasonLevel(Base):
     - club = relationship("Club", back_populates="playerSeasonLevels")
     - level = relationship("Level", back_populates="playerSeasonLevels")
     - ageGroup = relationship("AgeGroup", back_populates="playerSeasonLevels")
+
+    UNIQUE: (seasonId, clubId, levelId, ageGroupId), also the index for the seasonId lookups
+    INDEX: (playerId), (clubId), (levelId, ageGroupId), (ageGroupId), (games), (points)
     """
     __tablename__ = "player_season_level"
+    __table_args__ = (
+        UniqueConstraint("seasonId", "clubId", "levelId", "ageGroupId", name="uq_player_season_level_natural_key"),
+        Index("ix_player_season_level_player", "playerId"),
+        Index("ix_player_season_level_club", "clubId"),
+        Index("ix_player_season_level_level_age_group", "levelId", "ageGroupId"),     # The /season-levels filters, ex. levelName=U16 and ageGroupName=AAA
+        Index("ix_player_season_level_age_group", "ageGroupId"),
+        Index("ix_player_season_level_games", "games"),
+        Index("ix_player_season_level_points", "points"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     clubId = Column(Integer, ForeignKey("clubs.id"))
@@ -208,7 +242,7 @@ class Club(Base):
     These rows are only created when encountering value, that is not already present in the table.
     VALUES:
     - id = Column(Integer, primary_key=True, autoincrement=True)
-    - clubName = Column(String(255))
+    - clubName = Column(String(255), unique=True)
 
     - goalieSeasonLevel = relationship("GoalieSeasonLevel", back_populates="club")
     - playerSeasonLevel = relationship("PlayerSeasonLevel", back_populates="club")
@@ -216,7 +250,7 @@ class Club(Base):
     __tablename__ = "clubs"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    clubName = Column(String(255))
+    clubName = Column(String(255), unique=True)    # Unique, so database/registry.py can insert a new club from several processes at once
 
     goalieSeasonLevel = relationship("GoalieSeasonLevel", back_populates="club")
     playerSeasonLevel = relationship("PlayerSeasonLevel", back_populates="club")
@@ -228,12 +262,12 @@ class Level(Base):
     These rows are only created when encountering value, that is not already present in the table.
     VALUES:
     - id = Column(Integer, primary_key=True, autoincrement=True)
-    - levelName = Column(String(255))
+    - levelName = Column(String(255), unique=True)
     """
     __tablename__ = "levels"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    levelName = Column(String(255))
+    levelName = Column(String(255), unique=True)
 
     goalieSeasonLevel = relationship("GoalieSeasonLevel", back_populates="level")
     playerSeasonLevel = relationship("PlayerSeasonLevel", back_populates="level")
@@ -248,15 +282,32 @@ class AgeGroup(Base):
     These rows are only created when encountering value, that is not already present in the table.
     VALUES:
     - id = Column(Integer, primary_key=True, autoincrement=True)
-    - ageGroupName = Column(String(255))
+    - ageGroupName = Column(String(255), unique=True)
     """
     __tablename__ = "age_groups"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    ageGroupName = Column(String(255))
+    ageGroupName = Column(String(255), unique=True)
 
     goalieSeasonLevel = relationship("GoalieSeasonLevel", back_populates="ageGroup")
     playerSeasonLevel = relationship("PlayerSeasonLevel", back_populates="ageGroup")
 
     def __str__(self):
-        return f"{self.ageGroupName} AgeGroup Row str representation"
\ No newline at end of file
+        return f"{self.ageGroupName} AgeGroup Row str representation"
+
+class DataVersion(Base):
+    """
+    "data_versions" table
+    A counter per scope, bumped by the writers in the same transaction as the rows they write (see database/data_versions.py).
+    The API response cache has the versions in its keys, so a commit makes the cached responses of the scope unreachable.
+    VALUES:
+    - scope = Column(String(100), primary_key=True)  ex. "levels", "levels:2024" or "player:3405"
+    - version = Column(Integer)
+    """
+    __tablename__ = "data_versions"
+
+    scope = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __str__(self):
+        return f"{self.scope} DataVersion Row str representation"
@@ -0,0 +1,141 @@
+import json
+import base64
+from sqlalchemy import tuple_
+from database.models import Player, GoalieSeasonLevel, PlayerSeasonLevel
+
+# Keyset pagination. A page is read with "WHERE (sort column, id) > (last value, last id) ORDER BY sort column, id LIMIT n",
+# so every page costs one index range read, no matter how deep the client is. OFFSET would read and throw away all the rows before the page.
+# The position of the last row is given to the client as an opaque cursor (base64 of json), and the next page starts after it.
+# A sort is "column" (ascending) or "-column" (descending). Only the columns in SORT_COLUMNS can be sorted by, each of them has an index
+# (see database/migrations/m004_sort_indexes.py). Rows with NULL in the sort column are left out of a sort by that column.
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Table: the columns it can be sorted by
+SORT_COLUMNS = {
+    Player: ["id", "sjlName", "birthYear"],
+    GoalieSeasonLevel: ["id", "games", "savePercentage"],
+    PlayerSeasonLevel: ["id", "games", "points"],
+}
+
+def parseSort(PTable: object, PSort: str) -> tuple[str, bool]:
+    """
+    Returns (column name, descending) of a sort like "-points".
+
+    Raises:
+        ValueError: If the table can't be sorted by the column.
+    """
+    Descending = PSort.startswith("-")
+    ColumnName = PSort.lstrip("-")
+    if ColumnName not in SORT_COLUMNS[PTable]:
+        raise ValueError(f"Can't sort {PTable.__tablename__} by {ColumnName}, the options are {SORT_COLUMNS[PTable]}")
+    return ColumnName, Descending
+
+def encodeCursor(PPositions: dict) -> str:
+    """
+    Returns the opaque cursor of the positions, ex. {"players": ["points", 12, 3405]} -> "eyJwbGF5ZXJzIjog..."
+    """
+    return base64.urlsafe_b64encode(json.dumps(PPositions).encode()).decode()
+
+def decodeCursor(PCursor: str, PTables: dict) -> dict:
+    """
+    Returns the positions of a cursor from encodeCursor. An empty dict for None.
+    Each position is checked against the sort columns of its table, so a tampered cursor is refused here and not by the database.
+
+    Args:
+        PCursor (str): The cursor from the client.
+        PTables (dict): The key of each position in the cursor: the table it's a position in, ex. {"players": Player}.
+
+    Raises:
+        ValueError: If the cursor is not one of ours.
+    """
+    if PCursor is None:
+        return {}
+    try:
+        Positions = json.loads(base64.urlsafe_b64decode(PCursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(Positions, dict):
+        raise ValueError("Invalid cursor")
+    for Key, Position in Positions.items():
+        if Key not in PTables or not isValidPosition(PTables[Key], Position):
+            raise ValueError("Invalid cursor")
+    return Positions
+
+def isValidPosition(PTable: object, PPosition: object) -> bool:
+    """
+    Returns True if PPosition is [sort, sort column value, id] of a sort of PTable, with the value and the id of the types of their columns.
+    """
+    if not isinstance(PPosition, list) or len(PPosition) != 3 or not isinstance(PPosition[0], str):
+        return False
+    Sort, Value, Id = PPosition
+    try:
+        ColumnName, Descending = parseSort(PTable, Sort)
+    except ValueError:
+        return False
+    ColumnType = getattr(PTable, ColumnName).type.python_type
+    AcceptedTypes = (int, float) if ColumnType is float else (ColumnType,)   # json gives 90.0 back as a float but a whole number may still come as an int
+    if isinstance(Value, bool) or not isinstance(Value, AcceptedTypes):     # bool is an int in python, but never a value of these columns
+        return False
+    return isinstance(Id, int) and not isinstance(Id, bool)
+
+def applyKeyset(PQuery: object, PTable: object, PSort: str, PAfter: list, PLimit: int) -> object:
+    """
+    Adds the sort, the "after the cursor" condition and the limit to a select of PTable.
+
+    Args:
+        PQuery (object): The select, with the filters already in it.
+        PTable (object): The model class the select reads, ex. PlayerSeasonLevel.
+        PSort (str): Ex. "-points".
+        PAfter (list): The position of the last row of the previous page, [sort, sort column value, id]. None for the first page.
+        PLimit (int): The page size. One more row is read, to know whether there is a next page.
+
+    Returns:
+        object: The select.
+
+    Raises:
+        ValueError: If the sort is not allowed, or the cursor was made for another sort.
+    """
+    ColumnName, Descending = parseSort(PTable, PSort)
+    SortColumn = getattr(PTable, ColumnName)
+    if ColumnName != "id":
+        PQuery = PQuery.where(SortColumn.is_not(None))
+
+    if PAfter is not None:
+        if len(PAfter) != 3 or PAfter[0] != PSort:
+            raise ValueError(f"The cursor is not for the sort {PSort}")
+        Position = tuple_(SortColumn, PTable.id)
+        PQuery = PQuery.where(Position < tuple_(PAfter[1], PAfter[2]) if Descending else Position > tuple_(PAfter[1], PAfter[2]))
+
+    if Descending:
+        PQuery = PQuery.order_by(SortColumn.desc(), PTable.id.desc())
+    else:
+        PQuery = PQuery.order_by(SortColumn, PTable.id)
+    return PQuery.limit(PLimit + 1)
+
+def splitPage(PRows: list, PTable: object, PSort: str, PLimit: int) -> tuple[list, list]:
+    """
+    Splits the rows read with applyKeyset into the page and the position of its last row.
+
+    Returns:
+        tuple: (the rows of the page, [sort, value, id] of the last row or None if this is the last page)
+    """
+    if len(PRows) <= PLimit:
+        return PRows, None
+    Page = PRows[:PLimit]
+    ColumnName, Descending = parseSort(PTable, PSort)
+    return Page, [PSort, getattr(Page[-1], ColumnName), Page[-1].id]
+
+def checkPageSize(PLimit: int) -> int:
+    """
+    Returns the page size, DEFAULT_PAGE_SIZE for None.
+
+    Raises:
+        ValueError: If it's not between 1 and MAX_PAGE_SIZE.
+    """
+    if PLimit is None:
+        return DEFAULT_PAGE_SIZE
+    if PLimit < 1 or PLimit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return PLimit
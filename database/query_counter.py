@@ -0,0 +1,123 @@
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+from database.models import Base, Player, GoalieSeason, PlayerSeason, GoalieSeasonLevel, PlayerSeasonLevel, Club, Level, AgeGroup
+from database.reader import filterGoalieSeasonLevels, filterPlayerSeasonLevels, readLevelsForSeason, readPlayerDocument
+
+# Query count check of the season level readers. Each reader runs against an in-memory SQLite database filled with a small and a big
+# number of rows, and the SQL statements are counted. The count has to be the same for both sizes. If it grows with the rows,
+# a reader is querying per row again (N+1), ex. reading the club name of each row on its own.
+
+class QueryCounter:
+    """
+    Counts the SQL statements an engine runs inside a with block.
+
+    Usage:
+        with QueryCounter(Engine) as Counter:
+            ...
+        print(Counter.count, Counter.statements)
+    """
+    def __init__(self, PEngine: object):
+        self.engine = PEngine
+        self.count = 0
+        self.statements = []
+
+    def onExecute(self, Conn, Cursor, Statement, Parameters, Context, Executemany):
+        self.count += 1
+        self.statements.append(Statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.onExecute)
+        return self
+
+    def __exit__(self, *Exc):
+        event.remove(self.engine, "before_cursor_execute", self.onExecute)
+        return False
+
+def seedLevelRows(PEngine: object, PRowCount: int) -> None:
+    """
+    Fills an empty database with one goalie and one skater, each with one season that has PRowCount season levels in PRowCount different clubs,
+    and a third player with a career of PRowCount seasons with one level each.
+    """
+    with PEngine.begin() as Connection:
+        Connection.execute(insert(Club), [{"id": Index + 1, "clubName": f"Club {Index}"} for Index in range(PRowCount)])
+        Connection.execute(insert(Level), [{"id": 1, "levelName": "U16"}])
+        Connection.execute(insert(AgeGroup), [{"id": 1, "ageGroupName": "AAA"}])
+        Connection.execute(insert(Player), [{"id": 1, "sjlName": "GOALIE Test", "sjlLink": "goalie", "position": "Maalivahti"},
+                                            {"id": 2, "sjlName": "SKATER Test", "sjlLink": "skater", "position": "Puolustaja"},
+                                            {"id": 3, "sjlName": "CAREER Test", "sjlLink": "career", "position": "Hyökkääjä"}])
+        Connection.execute(insert(GoalieSeason), [{"id": 1, "year": 2024, "playerId": 1}])
+        Connection.execute(insert(PlayerSeason), [{"id": 1, "year": 2024, "playerId": 2}] + [{"id": Index + 2, "year": 1900 + Index, "playerId": 3} for Index in range(PRowCount)])
+        Connection.execute(insert(GoalieSeasonLevel), [{"seasonId": 1, "playerId": 1, "clubId": Index + 1, "levelId": 1, "ageGroupId": 1, "games": 1} for Index in range(PRowCount)])
+        Connection.execute(insert(PlayerSeasonLevel), [{"seasonId": 1, "playerId": 2, "clubId": Index + 1, "levelId": 1, "ageGroupId": 1, "games": 1} for Index in range(PRowCount)])
+        Connection.execute(insert(PlayerSeasonLevel), [{"seasonId": Index + 2, "playerId": 3, "clubId": 1, "levelId": 1, "ageGroupId": 1, "games": 1} for Index in range(PRowCount)])
+    return None
+
+def readFilteredGoalieLevels(PSession: Session) -> list:
+    """
+    filterGoalieSeasonLevels appends to a list, this returns it.
+    """
+    Rows = []
+    filterGoalieSeasonLevels(PSession, Rows, {"levelId": 1})
+    return Rows
+
+def readFilteredPlayerLevels(PSession: Session) -> list:
+    """
+    filterPlayerSeasonLevels appends to a list, this returns it.
+    """
+    Rows = []
+    filterPlayerSeasonLevels(PSession, Rows, {"levelId": 1, "playerId": 2})
+    return Rows
+
+# Name: the reader call, with the session as the only argument. Each returns the rows it read.
+READER_CALLS = {
+    "filterGoalieSeasonLevels": readFilteredGoalieLevels,
+    "filterPlayerSeasonLevels": readFilteredPlayerLevels,
+    "readLevelsForSeason goalie": lambda PSession: readLevelsForSeason(PSession, 1, "Maalivahti"),
+    "readLevelsForSeason player": lambda PSession: readLevelsForSeason(PSession, 1, "Puolustaja"),
+    "readPlayerDocument": lambda PSession: readPlayerDocument(PSession, 3)["seasons"],      # Returns dicts, the names are already in them
+}
+
+def countReaderQueries(PRowCount: int) -> dict:
+    """
+    Runs every reader in READER_CALLS against a fresh database with PRowCount season levels, and reads the names of each row like the API does.
+
+    Returns:
+        dict: {reader name: how many statements it ran}
+    """
+    Engine = create_engine("sqlite://")
+    Base.metadata.create_all(Engine)
+    seedLevelRows(Engine, PRowCount)
+
+    Counts = {}
+    for Name, Call in READER_CALLS.items():
+        with Session(Engine) as ReadSession, QueryCounter(Engine) as Counter:
+            Rows = Call(ReadSession)
+            [(Row.clubName, Row.levelName, Row.ageGroupName) for Row in Rows if not isinstance(Row, dict)]     # Would query, if the names were loaded lazily
+            if len(Rows) != PRowCount:
+                raise AssertionError(f"{Name} read {len(Rows)} rows, expected {PRowCount}")
+        Counts[Name] = Counter.count
+    Engine.dispose()
+    return Counts
+
+def checkReaderQueryCounts(PSmall: int = 10, PBig: int = 500) -> dict:
+    """
+    Counts the statements of each reader with PSmall and with PBig rows.
+
+    Returns:
+        dict: {reader name: (statements with PSmall rows, statements with PBig rows)}
+
+    Raises:
+        AssertionError: If the count of any reader grows with the rows.
+    """
+    SmallCounts = countReaderQueries(PSmall)
+    BigCounts = countReaderQueries(PBig)
+
+    Growing = []
+    for Name in READER_CALLS:
+        print(f"{Name}: {SmallCounts[Name]} queries with {PSmall} rows, {BigCounts[Name]} with {PBig} rows")
+        if BigCounts[Name] > SmallCounts[Name]:
+            Growing.append(Name)
+
+    if Growing:
+        raise AssertionError(f"The query count grows with the number of rows in {Growing}")
+    return {Name: (SmallCounts[Name], BigCounts[Name]) for Name in READER_CALLS}
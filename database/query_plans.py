@@ -0,0 +1,77 @@
+from sqlalchemy import select
+from database import connection
+from database.models import Player, GoalieSeason, PlayerSeason, GoalieSeasonLevel, PlayerSeasonLevel
+from database.pagination import applyKeyset
+from database.reader import whereLevelFilters
+
+# EXPLAIN check of the reader queries (database/reader.py). Each query below has the same WHERE as the reader function it is named after,
+# with a sample value. The plans are read with EXPLAIN (MySQL) or EXPLAIN QUERY PLAN (SQLite), and every full table scan is reported.
+# Run it after database/migrations/ has been applied, on a database with real data: on a nearly empty table MySQL may scan anyway,
+# because reading a few rows is cheaper than the index.
+# The queries that read a whole table on purpose (readAllPlayers, getAllGoalieObjects...) are not here.
+
+# Name: the query
+READER_QUERIES = {
+    "getSeasonObjectsByYear goalies": select(GoalieSeason).where(GoalieSeason.year == 2024),
+    "getSeasonObjectsByYear players": select(PlayerSeason).where(PlayerSeason.year == 2024),
+    "readPlayersSeasons goalie": select(GoalieSeason).where(GoalieSeason.playerId == 1),
+    "readPlayersSeasons player": select(PlayerSeason).where(PlayerSeason.playerId == 1),
+    "readOnePlayerByName": select(Player).where(Player.sjlName == "KOIVU Saku"),
+    "readLevelsForSeason goalie": select(GoalieSeasonLevel).where(GoalieSeasonLevel.seasonId == 1),
+    "readLevelsForSeason player": select(PlayerSeasonLevel).where(PlayerSeasonLevel.seasonId == 1),
+    "filterPlayerSeasonLevels playerId": select(PlayerSeasonLevel).where(PlayerSeasonLevel.playerId == 1),
+    "filterPlayerSeasonLevels clubId": select(PlayerSeasonLevel).where(PlayerSeasonLevel.clubId == 1),
+    "filterPlayerSeasonLevels levelId": select(PlayerSeasonLevel).where(PlayerSeasonLevel.levelId == 1),
+    "filterPlayerSeasonLevels levelId ageGroupId": select(PlayerSeasonLevel).where(PlayerSeasonLevel.levelId == 1, PlayerSeasonLevel.ageGroupId == 1),
+    "filterPlayerSeasonLevels ageGroupId": select(PlayerSeasonLevel).where(PlayerSeasonLevel.ageGroupId == 1),
+    "filterGoalieSeasonLevels clubId": select(GoalieSeasonLevel).where(GoalieSeasonLevel.clubId == 1),
+    "filterGoalieSeasonLevels levelId ageGroupId": select(GoalieSeasonLevel).where(GoalieSeasonLevel.levelId == 1, GoalieSeasonLevel.ageGroupId == 1),
+    "readPlayersPage -birthYear": applyKeyset(select(Player), Player, "-birthYear", ["-birthYear", 2008, 500], 100),
+    "filterPlayerSeasonLevels page -points": applyKeyset(select(PlayerSeasonLevel), PlayerSeasonLevel, "-points", ["-points", 20, 500], 100),
+    "filterGoalieSeasonLevels page -savePercentage": applyKeyset(select(GoalieSeasonLevel), GoalieSeasonLevel, "-savePercentage", ["-savePercentage", 91.5, 500], 100),
+    "streamSeasonLevelRows year": whereLevelFilters(select(PlayerSeasonLevel), PlayerSeasonLevel, {"year": 2024}),
+}
+
+def explainQuery(Connection: object, PQuery: object) -> list[tuple[str, str]]:
+    """
+    Runs EXPLAIN on the query and returns its full table scans.
+
+    Returns:
+        list[tuple[str, str]]: (table, plan detail) of each full scan. Empty if every table is read through an index.
+
+    Raises:
+        ValueError: If the dialect has no EXPLAIN support here.
+    """
+    Dialect = Connection.dialect
+    Sql = str(PQuery.compile(dialect=Dialect, compile_kwargs={"literal_binds": True}))
+
+    if Dialect.name in ["mysql", "mariadb"]:
+        Rows = Connection.exec_driver_sql(f"EXPLAIN {Sql}").mappings().all()
+        return [(Row["table"], f"type=ALL rows={Row['rows']}") for Row in Rows if Row["type"] == "ALL"]     # "ALL" is the full scan, "ref" / "range" use an index
+    if Dialect.name == "sqlite":
+        Rows = Connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {Sql}").all()
+        Details = [Row[3] for Row in Rows]
+        return [(Detail.split(" ")[1], Detail) for Detail in Details if Detail.startswith("SCAN") and "INDEX" not in Detail]   # "SEARCH ... USING INDEX" uses an index
+    raise ValueError(f"No EXPLAIN check for the {Dialect.name} dialect")
+
+def checkQueryPlans(PEngine: object = None) -> dict:
+    """
+    Explains every query in READER_QUERIES and prints the ones that scan a whole table.
+
+    Args:
+        PEngine (object): The engine of the database to check. Defaults to the primary engine of database/connection.py.
+
+    Returns:
+        dict: {query name: [(table, plan detail)...]} of the queries with full scans. Empty if there are none.
+    """
+    Engine = PEngine or connection.getEngine()
+    FullScans = {}
+    with Engine.connect() as Connection:
+        for Name, Query in READER_QUERIES.items():
+            Scans = explainQuery(Connection, Query)
+            if Scans:
+                FullScans[Name] = Scans
+                print(f"Full table scan in {Name}: {Scans}")
+
+    print(f"Checked {len(READER_QUERIES)} reader queries, {len(FullScans)} with a full table scan")
+    return FullScans
@@ -1,6 +1,12 @@
+import os
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from database.connection import SessionLocal
 from database.models import Player, PlayerSeason, GoalieSeason, PlayerSeasonLevel, GoalieSeasonLevel, Club, Level, AgeGroup
+from database.registry import findDimensionId
+from database.pagination import applyKeyset, splitPage
+
+EXPORT_BATCH = int(os.getenv("DB_EXPORT_BATCH", "1000"))      # Rows fetched at a time from the server-side cursor of streamSeasonLevelRows
 
 def getSeasonLevelsForGoalieSeason(PSession: Session, GoalieSeasonId: int) -> list[GoalieSeasonLevel]:
     """
@@ -14,6 +20,48 @@ def getSeasonLevelsForPlayerSeason(PSession: Session, PlayerSeasonId: int) -> li
     """
     return PSession.query(PlayerSeasonLevel).filter_by(seasonId=PlayerSeasonId).all()
 
+def selectLevelsWithNames(PLevelTable: object) -> object:
+    """
+    Returns a select of the season level rows of PLevelTable (GoalieSeasonLevel or PlayerSeasonLevel) joined to the clubs, levels and age_groups tables,
+    so the names come in the same statement as the rows. Outer joins, so a row with a missing club, level or age group is still returned.
+    Add the filters with .where(). Not .filter_by(), it would filter the age_groups table, the last one joined.
+    """
+    return joinLevelNames(select(PLevelTable, Club.clubName, Level.levelName, AgeGroup.ageGroupName), PLevelTable)
+
+def joinLevelNames(PQuery: object, PLevelTable: object) -> object:
+    """
+    Adds the outer joins from PLevelTable to the clubs, levels and age_groups tables to a select that has their name columns.
+    """
+    return (PQuery.outerjoin(Club, PLevelTable.clubId == Club.id)
+            .outerjoin(Level, PLevelTable.levelId == Level.id)
+            .outerjoin(AgeGroup, PLevelTable.ageGroupId == AgeGroup.id))
+
+def whereLevelFilters(PQuery: object, PLevelTable: object, Filters: dict) -> object:
+    """
+    Adds the /season-levels filters to a select of PLevelTable. The keys are the names of its columns, and "year",
+    which is a column of the season table, so it's matched with the ids of the seasons of that year.
+    """
+    SeasonTable = GoalieSeason if PLevelTable is GoalieSeasonLevel else PlayerSeason
+    for key, value in (Filters or {}).items():      # Loop over keys and values in the filters dict
+        if key == "year":
+            PQuery = PQuery.where(PLevelTable.seasonId.in_(select(SeasonTable.id).where(SeasonTable.year == value)))
+        else:
+            PQuery = PQuery.where(getattr(PLevelTable, key) == value)
+    return PQuery
+
+def readLevelsWithNames(PSession: Session, PQuery: object) -> list:
+    """
+    Runs a query from selectLevelsWithNames and returns the season level rows with the custom .clubName, .levelName and .ageGroupName attributes
+    the pydantic models need. One query, no matter how many rows.
+    """
+    SeasonLevels = []
+    for SeasonLevel, ClubName, LevelName, AgeGroupName in PSession.execute(PQuery).all():
+        SeasonLevel.clubName = ClubName
+        SeasonLevel.levelName = LevelName
+        SeasonLevel.ageGroupName = AgeGroupName
+        SeasonLevels.append(SeasonLevel)
+    return SeasonLevels
+
 def getAllGoalieObjects(PSession: Session) -> list:
     """
     Queries the database and returns all Goalie objects as a list.
@@ -119,22 +167,22 @@ def convertNamesToIds(Filters: dict, PSession: Session) -> None:
         None
     """
     if "clubName" in Filters:                                                               # If clubName is given as filter
-        Filters["clubId"] = readOneClubByName(PSession, Filters["clubName"]).id             # Get the id of the club
+        Filters["clubId"] = findDimensionId("club", Filters["clubName"])                    # Get the id of the club from the registry. None (no matches) for an unknown name
         del Filters["clubName"]                                                             # Delete the name from the filters dict
 
     if "levelName" in Filters:                                                              # If levelName is given as filter
-        Filters["levelId"] = readOneLevelByName(PSession, Filters["levelName"]).id          # Get the id of the level
+        Filters["levelId"] = findDimensionId("level", Filters["levelName"])                 # Get the id of the level
         del Filters["levelName"]                                                            # Delete the name from the filters dict
 
     if "ageGroupName" in Filters:                                                           # If ageGroupName is given as filter
-        Filters["ageGroupId"] = readOneAgeGroupByName(PSession, Filters["ageGroupName"]).id # Get the id of the age group
+        Filters["ageGroupId"] = findDimensionId("ageGroup", Filters["ageGroupName"])        # Get the id of the age group
         del Filters["ageGroupName"]                                                         # Delete the name from the filters dict 
 
     if "sjlName" in Filters:                                                                # If sjlName is given as filter  
         Filters["playerId"] = readOnePlayerByName(PSession, Filters["sjlName"]).id          # Get the id of the player
         del Filters["sjlName"]                                                              # Delete the name from the filters dict
 
-def filterGoalieSeasonLevels(PSession: Session, GoalieSeasonLevels: list, Filters: dict) -> None:
+def filterGoalieSeasonLevels(PSession: Session, GoalieSeasonLevels: list, Filters: dict, PSort: str = "id", PAfter: list = None, PLimit: int = None) -> list:
     """
     Queries the database and appends all matching GoalieSeasonLevel rows to the GoalieSeasonLevels list.
     
@@ -143,30 +191,32 @@ def filterGoalieSeasonLevels(PSession: Session, GoalieSeasonLevels: list, Filter
         GoalieSeasonLevels (list): The list to append the matching rows to.
         Filters (dict): The dictionary of filters to apply to the query.
                          The keys are the names of columns in the goalie_season_levels table, and the values are the values to filter by.
+        PSort (str): The sort, ex. "-games". See database/pagination.py.
+        PAfter (list): The position from the cursor of the previous page. None for the first page.
+        PLimit (int): The page size. None reads all the matching rows, without paging.
+
+    Returns:
+        list: The position of the last row for the next cursor, or None if there are no more rows.
     """
     
-    Query = PSession.query(GoalieSeasonLevel)   # Create the empty query object
+    Query = selectLevelsWithNames(GoalieSeasonLevel)     # The rows and their club, level and age group names in one query
 
-    if Filters:
-        for key, value in Filters.items():      # Loop over keys and values in the filters dict
-            Query = Query.filter(getattr(GoalieSeasonLevel, key) == value) # Add a filter to the query                     
-    
-    # Execute the query and append the results to PlayerSeasonLevels
-    Result = Query.all()
+    Query = whereLevelFilters(Query, GoalieSeasonLevel, Filters)     # Add the filters to the query
     
-    for SeasonLevel in Result:
-    # Write the custom names to each SeasonLevel object. This is needed for the pydantic model
-    # The functions used are from the same module, and return the whole row.
-    # Thats why we use ".clubName" for example, to just acces the desired name, not the object itself.
-        SeasonLevel.clubName = readOneClubById(PSession, SeasonLevel.clubId).clubName 
-        SeasonLevel.levelName = readOneLevelById(PSession, SeasonLevel.levelId).levelName
-        SeasonLevel.ageGroupName = readOneAgeGroupById(PSession, SeasonLevel.ageGroupId).ageGroupName
+    NextPosition = None
+    if PLimit is not None:
+        Query = applyKeyset(Query, GoalieSeasonLevel, PSort, PAfter, PLimit)   # Only the rows after the cursor, in the sort order
+
+    # Execute the query. The custom names needed for the pydantic model are written to each SeasonLevel object
+    Result = readLevelsWithNames(PSession, Query)
+    if PLimit is not None:
+        Result, NextPosition = splitPage(Result, GoalieSeasonLevel, PSort, PLimit)
 
     GoalieSeasonLevels.extend(Result)
 
-    return None
+    return NextPosition
 
-def filterPlayerSeasonLevels(PSession: Session, PlayerSeasonLevels: list, Filters: dict) -> None:
+def filterPlayerSeasonLevels(PSession: Session, PlayerSeasonLevels: list, Filters: dict, PSort: str = "id", PAfter: list = None, PLimit: int = None) -> list:
     """
     Queries the database and appends all matching PlayerSeasonLevel rows to the PlayerSeasonLevels list.
     
@@ -175,28 +225,63 @@ def filterPlayerSeasonLevels(PSession: Session, PlayerSeasonLevels: list, Filter
         PlayerSeasonLevels (list): The list to append the matching rows to.
         Filters (dict): The dictionary of filters to apply to the query.
                          The keys are the names of columns in the player_season_levels table, and the values are the values to filter by.
+        PSort (str): The sort, ex. "-games". See database/pagination.py.
+        PAfter (list): The position from the cursor of the previous page. None for the first page.
+        PLimit (int): The page size. None reads all the matching rows, without paging.
+
+    Returns:
+        list: The position of the last row for the next cursor, or None if there are no more rows.
     """
     
-    Query = PSession.query(PlayerSeasonLevel)   # Create the empty query object
+    Query = selectLevelsWithNames(PlayerSeasonLevel)     # The rows and their club, level and age group names in one query
 
-    if Filters:
-        for key, value in Filters.items():      # Loop over keys and values in the filters dict
-            Query = Query.filter(getattr(PlayerSeasonLevel, key) == value) # Add a filter to the query                     
-    
-    # Execute the query and append the results to PlayerSeasonLevels
-    Result = Query.all()
+    Query = whereLevelFilters(Query, PlayerSeasonLevel, Filters)     # Add the filters to the query
     
-    for SeasonLevel in Result:
-    # Write the custom names to each SeasonLevel object. This is needed for the pydantic model
-    # The functions used are from the same module, and return the whole row.
-    # Thats why we use ".clubName" for example, to just acces the desired name, not the object itself.
-        SeasonLevel.clubName = readOneClubById(PSession, SeasonLevel.clubId).clubName 
-        SeasonLevel.levelName = readOneLevelById(PSession, SeasonLevel.levelId).levelName
-        SeasonLevel.ageGroupName = readOneAgeGroupById(PSession, SeasonLevel.ageGroupId).ageGroupName
+    NextPosition = None
+    if PLimit is not None:
+        Query = applyKeyset(Query, PlayerSeasonLevel, PSort, PAfter, PLimit)   # Only the rows after the cursor, in the sort order
+
+    # Execute the query. The custom names needed for the pydantic model are written to each SeasonLevel object
+    Result = readLevelsWithNames(PSession, Query)
+    if PLimit is not None:
+        Result, NextPosition = splitPage(Result, PlayerSeasonLevel, PSort, PLimit)
         
     PlayerSeasonLevels.extend(Result)
 
-    return None
+    return NextPosition
+
+def seasonLevelColumns(Position: str) -> list[str]:
+    """
+    Returns the names of the values in each row of streamSeasonLevelRows, in order. The CSV header of the export.
+    """
+    LevelTable = GoalieSeasonLevel if Position == "Maalivahti" else PlayerSeasonLevel
+    return [Column.name for Column in LevelTable.__table__.columns] + ["clubName", "levelName", "ageGroupName"]
+
+def streamSeasonLevelRows(PSession: Session, Position: str, Filters: dict):
+    """
+    Yields the matching season level rows one at a time, in no particular order, as dicts of the columns and the club, level and age group names.
+    The rows are fetched EXPORT_BATCH at a time from a server-side cursor (stream_results), and no ORM objects are made,
+    so the memory use doesn't grow with the number of rows. Used by the export endpoint.
+    Keep the session for this only until the generator is done, the open cursor holds its connection.
+
+    Args:
+        PSession (Session): The SQLAlchemy session to use for the query.
+        Position (str): "Maalivahti" reads the goalie_season_level table, anything else the player_season_level table.
+        Filters (dict): The filters, like in filterGoalieSeasonLevels. The names must already be converted to ids.
+
+    Yields:
+        dict: One row, with the keys from seasonLevelColumns.
+    """
+    LevelTable = GoalieSeasonLevel if Position == "Maalivahti" else PlayerSeasonLevel
+    Query = joinLevelNames(select(*LevelTable.__table__.columns, Club.clubName, Level.levelName, AgeGroup.ageGroupName), LevelTable)
+    Query = whereLevelFilters(Query, LevelTable, Filters)     # No ORDER BY, a sort would read every row before sending the first one
+
+    Result = PSession.execute(Query, execution_options={"stream_results": True, "yield_per": EXPORT_BATCH})
+    try:
+        for Row in Result.mappings():
+            yield dict(Row)
+    finally:
+        Result.close()          # Also when the client disconnects in the middle, so the cursor is not left open
 
 def readPlayersSeasons(PSession: Session, playerId: int, Position: str = None) -> list:
     """
@@ -238,26 +323,96 @@ def readLevelsForSeason(PSession: Session, PseasonId: int, Position: str = None)
         raise Exception("Position is None!")
 
     if Position == "Maalivahti": 
-        SeasonLevels = PSession.query(GoalieSeasonLevel).filter_by(seasonId=PseasonId).all()     # Finds all the goalieSeasonLevel rows that match the Season rows id
+        Query = selectLevelsWithNames(GoalieSeasonLevel).where(GoalieSeasonLevel.seasonId == PseasonId)   # Finds all the goalieSeasonLevel rows that match the Season rows id
     else:
-        SeasonLevels = PSession.query(PlayerSeasonLevel).filter_by(seasonId=PseasonId).all()     # Finds all the playerSeasonLevel rows that match the Season rows id
-
-    for SeasonLevel in SeasonLevels:
-        # Write the custom names to each SeasonLevel object. This is needed for the pydantic model
-        # The functions used are from the same module, and return the whole row.
-        # Thats why we use ".clubName" for example, to just acces the desired name, not the object itself.
-        SeasonLevel.clubName = readOneClubById(PSession, SeasonLevel.clubId).clubName 
-        SeasonLevel.levelName = readOneLevelById(PSession, SeasonLevel.levelId).levelName
-        SeasonLevel.ageGroupName = readOneAgeGroupById(PSession, SeasonLevel.ageGroupId).ageGroupName
+        Query = selectLevelsWithNames(PlayerSeasonLevel).where(PlayerSeasonLevel.seasonId == PseasonId)   # Finds all the playerSeasonLevel rows that match the Season rows id
+
+    SeasonLevels = readLevelsWithNames(PSession, Query)   # The names come in the same query, written to each SeasonLevel object for the pydantic model
     
     return SeasonLevels # Return the list of seasonsLevel rows with new custom attributes.
 
+def readPlayerDocument(PSession: Session, playerId: int) -> dict:
+    """
+    Reads one player with all the seasons and their season levels (with the club, level and age group names) as plain dicts,
+    in the shape of the GoalieResponse / PlayerResponse models of the API. Three queries, no matter how many seasons the player has.
+
+    Args:
+        PSession (Session): The SQLAlchemy session to use for the queries.
+        playerId (int): The id of the player to read.
+
+    Returns:
+        dict: The player columns and "seasons", a list of the season columns ordered by year. Each season has "seasonLevels",
+        a list of the level columns with "clubName", "levelName" and "ageGroupName". None if there is no such player.
+    """
+    PlayerRow = PSession.execute(select(*Player.__table__.columns).where(Player.id == playerId)).mappings().first()
+    if PlayerRow is None:
+        return None
+
+    if PlayerRow["position"] == "Maalivahti":
+        SeasonTable, LevelTable = GoalieSeason, GoalieSeasonLevel
+    else:
+        SeasonTable, LevelTable = PlayerSeason, PlayerSeasonLevel
+
+    SeasonQuery = select(*SeasonTable.__table__.columns).where(SeasonTable.playerId == playerId).order_by(SeasonTable.year)
+    Seasons = [dict(Row) for Row in PSession.execute(SeasonQuery).mappings()]
+
+    LevelsBySeason = {}
+    if Seasons:
+        LevelQuery = joinLevelNames(select(*LevelTable.__table__.columns, Club.clubName, Level.levelName, AgeGroup.ageGroupName), LevelTable)
+        LevelQuery = LevelQuery.where(LevelTable.seasonId.in_([Season["id"] for Season in Seasons])).order_by(LevelTable.id)
+        for Row in PSession.execute(LevelQuery).mappings():
+            LevelsBySeason.setdefault(Row["seasonId"], []).append(dict(Row))
+
+    for Season in Seasons:
+        Season["seasonLevels"] = LevelsBySeason.get(Season["id"], [])
+
+    Document = dict(PlayerRow)
+    Document["seasons"] = Seasons
+    return Document
+
 def readAllPlayers(PSession: Session) -> list:
     """
     Queries the database and returns all contents of the "players" table. Return just the basic info, no seasons.
     """
     return PSession.query(Player).all()
 
+def readPlayersPage(PSession: Session, PSort: str = "id", PAfter: list = None, PLimit: int = 100) -> tuple[list, list]:
+    """
+    Queries the database and returns one page of the "players" table. No seasons.
+
+    Args:
+        PSession (Session): The SQLAlchemy session to use for the query.
+        PSort (str): The sort, ex. "sjlName" or "-birthYear". See database/pagination.py.
+        PAfter (list): The position from the cursor of the previous page. None for the first page.
+        PLimit (int): The page size.
+
+    Returns:
+        tuple: (the Player rows of the page, the position of the last row for the next cursor or None if this is the last page)
+    """
+    Rows = PSession.execute(applyKeyset(select(Player), Player, PSort, PAfter, PLimit)).scalars().all()
+    return splitPage(Rows, Player, PSort, PLimit)
+
+def readPlayerYears(PSession: Session, playerId: int, Position: str) -> set[int]:
+    """
+    Queries the database and returns the years of the seasons already stored for the player.
+    """
+    SeasonTable = GoalieSeason if Position == "Maalivahti" else PlayerSeason
+    return {Row.year for Row in PSession.query(SeasonTable.year).filter_by(playerId=playerId).all()}
+
+def readStoredSeasonYears(PSession: Session) -> dict[int, set[int]]:
+    """
+    Queries the database and returns the years stored for every player, from both player_seasons and goalie_seasons.
+    Two queries in total, no matter how many players there are.
+
+    Returns:
+        dict[int, set[int]]: Key is the player id, value is the set of years that have a season row. Players without seasons are not in the dict.
+    """
+    StoredYears = {}
+    for SeasonTable in [PlayerSeason, GoalieSeason]:
+        for PlayerId, Year in PSession.query(SeasonTable.playerId, SeasonTable.year).all():
+            StoredYears.setdefault(PlayerId, set()).add(Year)
+    return StoredYears
+
 def parsePlayersToDict(Players: list) -> dict:
     """
     Parses the list of Player objects into a dictionary with the sjlName as the key and the Player object as the value. No seasons.
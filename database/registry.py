@@ -0,0 +1,179 @@
+import os
+import time
+import threading
+from sqlalchemy import insert, select, func
+from database.connection import SessionLocal
+from database.models import Club, Level, AgeGroup
+
+# Process wide registry of the dimension tables "clubs", "levels" and "age_groups". The tables are small and almost never change,
+# so they are loaded once and every name -> id and id -> name lookup after that is a dict lookup instead of a query.
+# A name that isn't in the registry is inserted with an INSERT IGNORE (the names are unique), so two processes adding the same club
+# at the same time end up with the same row. The registry reloads itself when a lookup misses, and when the tables have grown since the
+# last load (checked at most every REGISTRY_CHECK_SECONDS), so rows added by other processes are picked up.
+
+REGISTRY_CHECK_SECONDS = int(os.getenv("DB_REGISTRY_CHECK_SECONDS", "60"))
+
+# Kind: (table, name column). The kinds are the attribute names the scraped season level objects use.
+DIMENSIONS = {"club": (Club, Club.clubName), "level": (Level, Level.levelName), "ageGroup": (AgeGroup, AgeGroup.ageGroupName)}
+
+RegistryLock = threading.Lock()     # The pipeline and the async scraper write from several threads
+NamesToIds = {"club": {}, "level": {}, "ageGroup": {}}
+IdsToNames = {"club": {}, "level": {}, "ageGroup": {}}
+RegistryState = {"Loaded": False, "CheckedAt": 0.0, "Snapshot": None, "Loads": 0}
+
+def readSnapshot(PSession: object) -> tuple:
+    """
+    Returns (row count, max id) of each dimension table with one query. If it differs from RegistryState["Snapshot"], the tables have changed.
+    """
+    Columns = []
+    for Table, NameColumn in DIMENSIONS.values():
+        Columns.append(select(func.count(Table.id)).scalar_subquery())
+        Columns.append(select(func.max(Table.id)).scalar_subquery())
+    return tuple(PSession.execute(select(*Columns)).one())
+
+def loadRegistry(PSession: object = None) -> None:
+    """
+    (Re)loads all three dimension tables into the registry. Three small queries. If a name has several rows (written before the names were unique),
+    the oldest id is used for the name, and every id still resolves back to the name.
+
+    Args:
+        PSession (object): The session to read with. A new one is opened if None.
+
+    Returns:
+        None
+    """
+    Session = PSession or SessionLocal()
+    try:
+        Snapshot = readSnapshot(Session)
+        Loaded = {Kind: Session.execute(select(Table.id, NameColumn).order_by(Table.id)).all() for Kind, (Table, NameColumn) in DIMENSIONS.items()}
+    finally:
+        if PSession is None:
+            Session.close()
+
+    with RegistryLock:
+        for Kind, Rows in Loaded.items():
+            IdsToNames[Kind] = {Id: Name for Id, Name in Rows}
+            NamesToIds[Kind] = {}
+            for Id, Name in Rows:
+                NamesToIds[Kind].setdefault(Name, Id)   # Ordered by id, so the oldest row wins
+        RegistryState["Loaded"] = True
+        RegistryState["CheckedAt"] = time.monotonic()
+        RegistryState["Snapshot"] = Snapshot
+        RegistryState["Loads"] += 1
+    return None
+
+def refreshIfChanged() -> None:
+    """
+    Loads the registry on the first use, and reloads it if the tables have changed since the last load. The change check runs at most every REGISTRY_CHECK_SECONDS.
+    """
+    if not RegistryState["Loaded"]:
+        loadRegistry()
+        return None
+    if time.monotonic() - RegistryState["CheckedAt"] < REGISTRY_CHECK_SECONDS:
+        return None
+
+    Session = SessionLocal()
+    try:
+        Changed = readSnapshot(Session) != RegistryState["Snapshot"]
+    finally:
+        Session.close()
+    RegistryState["CheckedAt"] = time.monotonic()
+    if Changed:
+        loadRegistry()
+    return None
+
+def insertMissingNames(PKind: str, PNames: list) -> None:
+    """
+    Inserts the names into the dimension table of PKind and commits right away, in a session of its own.
+    Names another process inserted in the meantime are skipped by the database (INSERT IGNORE / INSERT OR IGNORE).
+    Committed on its own, so a writer that rolls back later never leaves a cached id without a row.
+    """
+    Table, NameColumn = DIMENSIONS[PKind]
+    Session = SessionLocal()
+    try:
+        Statement = insert(Table.__table__)
+        Dialect = Session.get_bind().dialect.name
+        if Dialect in ["mysql", "mariadb"]:
+            Statement = Statement.prefix_with("IGNORE")
+        elif Dialect == "sqlite":
+            Statement = Statement.prefix_with("OR IGNORE")
+        Session.execute(Statement, [{NameColumn.key: Name} for Name in PNames])
+        Session.commit()
+    except Exception:
+        Session.rollback()
+        raise
+    finally:
+        Session.close()
+
+    print(f"Created {len(PNames)} new {Table.__tablename__} rows: {PNames}")
+    return None
+
+def getDimensionIds(PKind: str, PNames: set) -> dict:
+    """
+    Returns the ids of the names, creating the rows that don't exist yet.
+
+    Args:
+        PKind (str): "club", "level" or "ageGroup".
+        PNames (set): The names. None is a valid name, ex. the age group of "Harjoitusottelut".
+
+    Returns:
+        dict: {name: id}
+    """
+    refreshIfChanged()
+    Missing = [Name for Name in PNames if Name not in NamesToIds[PKind]]
+    if Missing:
+        loadRegistry()      # Another process may have added them
+        Missing = [Name for Name in Missing if Name not in NamesToIds[PKind]]
+    if Missing:
+        insertMissingNames(PKind, Missing)
+        loadRegistry()
+    return {Name: NamesToIds[PKind][Name] for Name in PNames}
+
+def getDimensionId(PKind: str, PName: str) -> int:
+    """
+    Returns the id of one name, creating the row if it doesn't exist yet. See getDimensionIds.
+    """
+    return getDimensionIds(PKind, {PName})[PName]
+
+def findDimensionId(PKind: str, PName: str) -> int:
+    """
+    Returns the id of the name, or None if there is no such row. Never creates rows. For the readers and the API filters.
+    """
+    refreshIfChanged()
+    if PName not in NamesToIds[PKind]:
+        loadRegistry()
+    return NamesToIds[PKind].get(PName)
+
+def getDimensionName(PKind: str, PId: int) -> str:
+    """
+    Returns the name of the row with the id, or None if there is no such row.
+
+    Args:
+        PKind (str): "club", "level" or "ageGroup".
+        PId (int): The id of the row, ex. PlayerSeasonLevel.clubId.
+
+    Returns:
+        str: The name, ex. "Pelicans".
+    """
+    if PId is None:
+        return None
+    refreshIfChanged()
+    if PId not in IdsToNames[PKind]:
+        loadRegistry()
+    return IdsToNames[PKind].get(PId)
+
+def registerSeasonLevels(PSeasons: list) -> None:
+    """
+    Makes sure the clubs, levels and age groups of all the season levels have a row, with one lookup per kind.
+    The writers call this before they start their own transaction, so the new names are committed before any player row is written.
+
+    Args:
+        PSeasons (list): Scraped GoalieSeason or PlayerSeason objects. The club, level and ageGroup of their levels must be parsed.
+
+    Returns:
+        None
+    """
+    Levels = [Level for Season in PSeasons for Level in Season.seasonLevelStats]
+    for Kind in DIMENSIONS:
+        getDimensionIds(Kind, {getattr(Level, Kind) for Level in Levels})
+    return None
@@ -0,0 +1,107 @@
+import os
+from sqlalchemy.dialects import mysql, sqlite, postgresql
+from database.models import Player, GoalieSeason, PlayerSeason, GoalieSeasonLevel, PlayerSeasonLevel
+
+# Idempotent writes. Every table has a natural key with a unique constraint (see database/models.py), and the rows are written with
+# INSERT ... ON DUPLICATE KEY UPDATE on MySQL, or INSERT ... ON CONFLICT DO UPDATE on SQLite and PostgreSQL. Writing the same rows
+# twice updates them in place instead of adding duplicates, and many rows go in one statement.
+
+UPSERT_BATCH = int(os.getenv("DB_UPSERT_BATCH", "1000"))     # Rows per statement
+
+# Table: the columns of its natural key
+NATURAL_KEYS = {
+    Player: ["sjlLink"],
+    GoalieSeason: ["playerId", "year"],
+    PlayerSeason: ["playerId", "year"],
+    GoalieSeasonLevel: ["seasonId", "clubId", "levelId", "ageGroupId"],
+    PlayerSeasonLevel: ["seasonId", "clubId", "levelId", "ageGroupId"],
+}
+
+# The level stats that are counts, and can be added up when a season has two teams of the same club in the same level
+SUMMED_LEVEL_COLUMNS = {
+    GoalieSeasonLevel: ["games", "played", "goalsAllowed", "saves"],
+    PlayerSeasonLevel: ["games", "goals", "assists", "points", "penaltyMinutes"],
+}
+
+def rowToValues(PRow: object) -> dict:
+    """
+    Returns the column values of an unsaved row from database/converters.py as a dict for upsertRows. The id is left out.
+    """
+    return {Column.key: getattr(PRow, Column.key) for Column in PRow.__table__.columns if Column.key != "id"}
+
+def buildUpsertStatement(PTable: object, PDialect: str, PUpdateColumns: list[str]) -> object:
+    """
+    Returns the insert statement of PTable that updates PUpdateColumns when the natural key already exists.
+
+    Raises:
+        ValueError: If the dialect has no upsert here.
+    """
+    KeyColumns = NATURAL_KEYS[PTable]
+    if PDialect in ["mysql", "mariadb"]:
+        Statement = mysql.insert(PTable.__table__)
+        return Statement.on_duplicate_key_update({Column: Statement.inserted[Column] for Column in PUpdateColumns})
+    if PDialect in ["sqlite", "postgresql"]:
+        Statement = (sqlite if PDialect == "sqlite" else postgresql).insert(PTable.__table__)
+        return Statement.on_conflict_do_update(index_elements=KeyColumns, set_={Column: Statement.excluded[Column] for Column in PUpdateColumns})
+    raise ValueError(f"No upsert for the {PDialect} dialect")
+
+def upsertRows(PTable: object, PRows: list[dict], Session: object) -> int:
+    """
+    Inserts the rows, or updates the ones whose natural key (NATURAL_KEYS) already exists. UPSERT_BATCH rows per statement. Not committed here.
+
+    Args:
+        PTable (object): The model class, ex. PlayerSeasonLevel.
+        PRows (list[dict]): The column values of each row, without the id. Every row must have the same keys.
+        Session (object): The SQLAlchemy session to write with.
+
+    Returns:
+        int: How many rows were sent.
+    """
+    if not PRows:
+        return 0
+
+    KeyColumns = NATURAL_KEYS[PTable]
+    UpdateColumns = [Column for Column in PRows[0] if Column not in KeyColumns]
+    Statement = buildUpsertStatement(PTable, Session.get_bind().dialect.name, UpdateColumns)
+
+    for Start in range(0, len(PRows), UPSERT_BATCH):
+        Session.execute(Statement, PRows[Start:Start + UPSERT_BATCH])
+    return len(PRows)
+
+def toNumber(PValue) -> float:
+    """
+    Returns the stat as a number for adding up. "" and None are 0.
+    """
+    if PValue in ["", None]:
+        return 0
+    return float(str(PValue).replace(",", "."))
+
+def mergeLevelRows(PTable: object, PRows: list[dict]) -> list[dict]:
+    """
+    Merges level rows that have the same natural key. This happens when a player played for two teams of the same club in the same level,
+    ex. "Pelicans Turkoosi" and "Pelicans Valkoinen" in U14 AAA. The counts are added up, and the save percentage is counted again from the sums.
+    Without this, the second row would overwrite the first one in the upsert.
+
+    Args:
+        PTable (object): GoalieSeasonLevel or PlayerSeasonLevel.
+        PRows (list[dict]): The level rows of one or more seasons.
+
+    Returns:
+        list[dict]: One row per natural key, in the original order.
+    """
+    KeyColumns = NATURAL_KEYS[PTable]
+    Merged = {}
+    for Row in PRows:
+        Key = tuple(Row[Column] for Column in KeyColumns)
+        if Key not in Merged:
+            Merged[Key] = dict(Row)
+            continue
+
+        Existing = Merged[Key]
+        for Column in SUMMED_LEVEL_COLUMNS[PTable]:
+            Existing[Column] = int(toNumber(Existing[Column]) + toNumber(Row[Column]))
+        if PTable is GoalieSeasonLevel:
+            Shots = Existing["saves"] + Existing["goalsAllowed"]
+            Existing["savePercentage"] = round(100 * Existing["saves"] / Shots, 2) if Shots else 0
+
+    return list(Merged.values())
@@ -1,81 +1,55 @@
 
 
 from database.connection import SessionLocal
-from database.models import Player as PlayerRow, GoalieSeason as GoalieSeasonRow, PlayerSeason as PlayerSeasonRow, PlayerSeasonLevel as PlayerSeasonLevelRow, GoalieSeasonLevel as GoalieSeasonLevelRow, Club as ClubRow, Level as LevelRow, AgeGroup as AgeGroupRow
+from database.reader import readPlayerYears
+from database.registry import getDimensionId, registerSeasonLevels
+from database.upsert import upsertRows, mergeLevelRows, rowToValues
+from database.data_versions import bumpDataVersions, scopesForWrite
+from database.models import Player as PlayerRow, GoalieSeason as GoalieSeasonRow, PlayerSeason as PlayerSeasonRow, PlayerSeasonLevel as PlayerSeasonLevelRow, GoalieSeasonLevel as GoalieSeasonLevelRow
 from historical_scraper.models.player import Player as PlayerObject
-from database.converters import playerConverter, goalieSeasonConverter, playerSeasonConverter, playerSeasonLevelConverter, goalieSeasonLevelConverter, createClubRow, createLevelRow, createAgeGroupRow
+from database.converters import playerConverter, goalieSeasonConverter, playerSeasonConverter, playerSeasonLevelConverter, goalieSeasonLevelConverter
 
 def checkIfClubExists(ClubName: str, Session: object) -> int:
     """
-    Checks if a club row with the given ClubName already exists in the "clubs" table.
-    If it exists, return the id.
-    If not, create a new row and return the id.
+    Returns the id of the club row with the given ClubName in the "clubs" table, creating the row if it doesn't exist yet.
+    The lookup goes through the registry (database/registry.py), so it only queries the database for a name it hasn't seen.
 
     Args:
         ClubName (str): The name of the club to check.
-        Session (object): The SQLAlchemy session to use for the query.
+        Session (object): Not used anymore. The new rows are committed by the registry in a session of its own.
 
     Returns:
-        int: The id of the club row if it already exists, or the id of a newly created club row if it doesn't exist yet.
+        int: The id of the club row.
     """
-    try:
-        Row = Session.query(ClubRow).filter(ClubRow.clubName == ClubName).one() # Try finding the row with the given ClubName 
-        return Row.id                                                           # If found, return the id
-    except Exception:
-        Club = createClubRow(ClubName)                                          # If its not found create a new row
-        Session.add(Club)                                                       # Add the new row to the session
-        Session.flush()                                                         # Flush the changes to get thd ID
-        print(f"\nCreated a new club row for {ClubName}\n")                     # Print for improved readability
-        return Club.id                                                          # Return the id
-    
+    return getDimensionId("club", ClubName)
+
 def checkIfLevelExists(LevelName: str, Session: object) -> int:
     """
-    Checks if a level row with the given LevelName already exists in the "levels" table.
-    If it exists, return the id.
-    If not, create a new row and return the id.
+    Returns the id of the level row with the given LevelName in the "levels" table, creating the row if it doesn't exist yet.
+    The lookup goes through the registry (database/registry.py), so it only queries the database for a name it hasn't seen.
 
     Args:
         LevelName (str): The name of the level to check.
-        Session (object): The SQLAlchemy session to use for the query.
+        Session (object): Not used anymore. The new rows are committed by the registry in a session of its own.
 
     Returns:
-        int: The id of the level row if it already exists, or the id of a newly created level row if it doesn't exist yet.
+        int: The id of the level row.
     """
-    try:
-        Row = Session.query(LevelRow).filter(LevelRow.levelName == LevelName).one() # Try finding the row with the given LevelName
-        return Row.id                                                               # If found, return the id
-    except Exception:
-        Level = createLevelRow(LevelName)                                           # If its not found create a new row
-        Session.add(Level)                                                          # Add the new row to the session
-        Session.flush()                                                             # Flush the changes to get thd ID
-        print(f"\nCreated a new level row for {LevelName}\n")                       # Print for improved readability
-        return Level.id                                                             # Return the id
-    
+    return getDimensionId("level", LevelName)
+
 def checkIfAgeGroupExists(AgeGroupName: str, Session: object) -> int:
     """
-    Checks if an age group row with the given AgeGroupName already exists in the "age_groups" table.
-    If it exists, return the id.
-    If not, create a new row and return the id.
+    Returns the id of the age group row with the given AgeGroupName in the "age_groups" table, creating the row if it doesn't exist yet.
+    The lookup goes through the registry (database/registry.py), so it only queries the database for a name it hasn't seen.
 
     Args:
         AgeGroupName (str): The name of the age group to check.
-        Session (object): The SQLAlchemy session to use for the query.
+        Session (object): Not used anymore. The new rows are committed by the registry in a session of its own.
 
     Returns:
-        int: The id of the age group row if it already exists, or the id of a newly created age group row if it doesn't exist yet.
+        int: The id of the age group row.
     """
-
-    try:
-        Row = Session.query(AgeGroupRow).filter(AgeGroupRow.ageGroupName == AgeGroupName).one() # Try finding the row with the given AgeGroupName
-        return Row.id                                                                           # If found, return the id
-    except Exception:
-        AgeGroup = createAgeGroupRow(AgeGroupName)                                              # If its not found create a new row
-        Session.add(AgeGroup)                                                                   # Add the new row to the session
-        Session.flush()                                                                         # Flush the changes to get thd ID
-        print(f"\nCreated a new age group row for {AgeGroupName}\n")                            # Print for improved readability
-        return AgeGroup.id                                                                      # Return the id
-
-
+    return getDimensionId("ageGroup", AgeGroupName)
 
 def writePlayerToDb(PlayerRow: PlayerRow, Session: object) -> int:
         
@@ -120,31 +94,38 @@ def writeSeasonToDb(Season: object, PlayerId: int, Position: str, Session: objec
     Session.flush()
     return SeasonRow.id
 
-def writeSeasonLevelToDb(SeasonLevelObject: object, SeasonId: int, PlayerObject: object, Session: object) -> None:
+def writeSeasonLevelsToDb(SeasonLevelObjects: list, SeasonId: int, PlayerObject: object, Session: object) -> int:
     """
-    Writes a SeasonLevelStat to the database using the given Session.
+    Writes the SeasonLevelStats of one season to the database using the given Session.
     Checks if club, level and ageGroup are already on their respective tables. If not, first creates those rows.
     A SeasonLevelStat is part of a Season and contains the stats for one ("U16 AAA" or "U18 SM" or "U18 Mestis" for example) level in that season.
+    Two teams of the same club in the same level (ex. "Pelicans Turkoosi" and "Pelicans Valkoinen") have the same natural key, so they are
+    added up into one row with mergeLevelRows and written with an upsert, the same way the bulk writer does.
 
     Args:
-        SeasonLevelObject (object): The SeasonLevelStat to write to the database. This is a scraped seasonLevelObject
-        SeasonId (int): The id of the season row in the goalie_seasons or player_seasons table to link the level to.
-        PlayerObject (object): The PlayerObject from which the SeasonLevelStat was created. Needed to determine the correct position.
+        SeasonLevelObjects (list): The SeasonLevelStats to write to the database. These are scraped seasonLevelObjects
+        SeasonId (int): The id of the season row in the goalie_seasons or player_seasons table to link the levels to.
+        PlayerObject (object): The PlayerObject from which the SeasonLevelStats were created. Needed to determine the correct position.
         Session (object): The SQLAlchemy session to use for the query.
+
+    Returns:
+        int: How many level rows were written.
     """
-    clubId = checkIfClubExists(SeasonLevelObject.club, Session)             # Checks if the club exists in the clubs table. If not, creates a new row. Return ID.
-    levelId = checkIfLevelExists(SeasonLevelObject.level, Session)          # Checks if the level exists in the levels table. If not, creates a new row. Return ID.
-    ageGroupId = checkIfAgeGroupExists(SeasonLevelObject.ageGroup, Session) # Checks if the ageGroup exists in the age_groups table. If not, creates a new row. Return ID.
-    
     if PlayerObject.position == "Maalivahti":
-        SeasonLevelStatRow = goalieSeasonLevelConverter(SeasonLevelObject, SeasonId, clubId, levelId, ageGroupId, PlayerObject.id)  # This converts the goalieSeasonLevelObject (from scraping) to a goalieSeasonLevelRow (Base, used in SQL Alchemy) 
+        Table, Converter = GoalieSeasonLevelRow, goalieSeasonLevelConverter     # Converts the goalieSeasonLevelObject (from scraping) to a goalieSeasonLevelRow (Base, used in SQL Alchemy)
     elif PlayerObject.position in ["Kenttäpelaaja", "Puolustaja", "Hyökkääjä"]:
-        SeasonLevelStatRow = playerSeasonLevelConverter(SeasonLevelObject, SeasonId, clubId, levelId, ageGroupId, PlayerObject.id)  # This converts the playerSeasonLevelObject (from scraping) to a playerSeasonLevelRow (Base, used in SQL Alchemy) 
+        Table, Converter = PlayerSeasonLevelRow, playerSeasonLevelConverter     # Converts the playerSeasonLevelObject (from scraping) to a playerSeasonLevelRow (Base, used in SQL Alchemy)
     else:
-        raise ValueError(f"Unsupported position: {PlayerObject.position} in writeSeasonLevelToDb")  # Just in case the position is not supported
+        raise ValueError(f"Unsupported position: {PlayerObject.position} in writeSeasonLevelsToDb")  # Just in case the position is not supported
 
-    Session.add(SeasonLevelStatRow)
-    Session.flush()
+    Values = []
+    for SeasonLevelObject in SeasonLevelObjects:
+        clubId = checkIfClubExists(SeasonLevelObject.club, Session)             # Checks if the club exists in the clubs table. If not, creates a new row. Return ID.
+        levelId = checkIfLevelExists(SeasonLevelObject.level, Session)          # Checks if the level exists in the levels table. If not, creates a new row. Return ID.
+        ageGroupId = checkIfAgeGroupExists(SeasonLevelObject.ageGroup, Session) # Checks if the ageGroup exists in the age_groups table. If not, creates a new row. Return ID.
+        Values.append(rowToValues(Converter(SeasonLevelObject, SeasonId, clubId, levelId, ageGroupId, PlayerObject.id)))
+
+    return upsertRows(Table, mergeLevelRows(Table, Values), Session)
 
 def writeEntirePlayerToDb(PlayerObject: PlayerObject) -> None:
     """
@@ -154,7 +135,7 @@ def writeEntirePlayerToDb(PlayerObject: PlayerObject) -> None:
     2. Convert the PlayerObject to a PlayerRow
     3. Write the PlayerRow to the database
     4. For each Season in the PlayerObject, write the Season to the database
-    5. For each SeasonLevelStat in the Season, write the SeasonLevelStat to the database
+    5. Write the SeasonLevelStats of each Season to the database, the same club twice in one level is added up into one row
     5a. Also create new club, level and ageGroup rows if needed.
 
     Args:
@@ -163,20 +144,104 @@ def writeEntirePlayerToDb(PlayerObject: PlayerObject) -> None:
     Returns:
         None
     """
+    registerSeasonLevels(PlayerObject.seasons)      # New clubs, levels and age groups are committed first, see database/registry.py
     Session = SessionLocal()                        # Create the session to use for all rows
-    PlayerRow = playerConverter(PlayerObject)       # Convert the PlayerObject to a PlayerRow (Base), this can be written to table with SQLAlchemy
-    PlayerId = writePlayerToDb(PlayerRow, Session)  # Write the PlayerRow to the database "players" table, return the ID
-    PlayerObject.id = PlayerId                      # Assign the ID to the PlayerObject
+    writePlayerRows(PlayerObject, Session)
 
     for key, value in vars(PlayerObject).items():   # Print all the attributes of the PlayerObject for debugging
         print(f"{key}: {value}")
 
+    Session.commit()
+    Session.close()
+
+def writePlayerRows(PlayerObject: PlayerObject, Session: object) -> int:
+    """
+    Adds the player row, its season rows and their level rows to the Session and flushes them, and bumps their data versions (database/data_versions.py).
+    Steps 2-5 of writeEntirePlayerToDb. Not committed here.
+
+    Args:
+        PlayerObject (PlayerObject): The player to write. Its .id is set to the id of the new row.
+        Session (object): The SQLAlchemy session to use for the query.
+
+    Returns:
+        int: The id of the new player row.
+    """
+    PlayerRow = playerConverter(PlayerObject)       # Convert the PlayerObject to a PlayerRow (Base), this can be written to table with SQLAlchemy
+    PlayerId = writePlayerToDb(PlayerRow, Session)  # Write the PlayerRow to the database "players" table, return the ID
+    PlayerObject.id = PlayerId                      # Assign the ID to the PlayerObject
+
     for Season in PlayerObject.seasons:
         SeasonId = writeSeasonToDb(Season, PlayerId, PlayerObject.position, Session)    # Write the Season to the database and return the ID
+        writeSeasonLevelsToDb(Season.seasonLevelStats, SeasonId, PlayerObject, Session) # Write the SeasonLevelStats to the database
 
-        for SeasonLevelStat in Season.seasonLevelStats:
-            writeSeasonLevelToDb(SeasonLevelStat, SeasonId, PlayerObject, Session)      # Write the SeasonLevelStat to the database
+    bumpDataVersions(Session, scopesForWrite([PlayerId], [Season.year for Season in PlayerObject.seasons]))  # The cached API responses of the player and the years are out of date on commit
+    return PlayerId
 
+def writePlayerBatchToDb(PlayerObjects: list) -> list:
+    """
+    Writes many players in one transaction. Each player is written inside its own savepoint, so a player that fails is rolled back
+    on its own and the rest of the batch is still committed.
 
-    Session.commit()
-    Session.close()
+    Args:
+        PlayerObjects (list): The scraped player objects. The club, level and ageGroup of the levels must be parsed.
+
+    Returns:
+        list: (PlayerObject, Exception) for each player that couldn't be written.
+    """
+    Failed = []
+    registerSeasonLevels([Season for Player in PlayerObjects for Season in Player.seasons])
+    Session = SessionLocal()
+    try:
+        for Player in PlayerObjects:
+            try:
+                with Session.begin_nested():
+                    writePlayerRows(Player, Session)
+            except Exception as e:
+                Failed.append((Player, e))
+        Session.commit()
+    except Exception:
+        Session.rollback()
+        raise
+    finally:
+        Session.close()
+
+    return Failed
+
+
+def writeSeasonsForExistingPlayer(PlayerId: int, Seasons: list) -> int:
+    """
+    Writes seasons (and their levels) for a player that is already in the "players" table.
+    Seasons whose year is already stored for the player are skipped, so running this twice doesn't write duplicates.
+
+    Args:
+        PlayerId (int): The id of the player row.
+        Seasons (list): GoalieSeason or PlayerSeason objects, with their seasonLevelStats. The club, level and ageGroup of the levels must be parsed.
+
+    Returns:
+        int: How many seasons were written.
+    """
+    registerSeasonLevels(Seasons)
+    Session = SessionLocal()
+    try:
+        ExistingPlayer = Session.get(PlayerRow, PlayerId)                           # writeSeasonLevelsToDb needs the .position and .id of the player
+        StoredYears = readPlayerYears(Session, PlayerId, ExistingPlayer.position)
+
+        Written = 0
+        for Season in Seasons:
+            if int(Season.year) in StoredYears:
+                continue
+            SeasonId = writeSeasonToDb(Season, PlayerId, ExistingPlayer.position, Session)
+            writeSeasonLevelsToDb(Season.seasonLevelStats, SeasonId, ExistingPlayer, Session)
+            Written += 1
+
+        WrittenYears = [Season.year for Season in Seasons if int(Season.year) not in StoredYears]
+        if WrittenYears:
+            bumpDataVersions(Session, scopesForWrite([PlayerId], WrittenYears))
+        Session.commit()
+    except Exception:
+        Session.rollback()
+        raise
+    finally:
+        Session.close()
+
+    return Written
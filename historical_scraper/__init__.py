@@ -1,3 +1,4 @@
 from .scraper import main, oneGoalieTest, onePlayerTest
+from .async_scraper import runAsyncScraper
 from .models import *
 from .helpers import *
\ No newline at end of file
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from playwright.async_api import async_playwright
+
+from historical_scraper.helpers.async_player_scraper import scrapeClubDataAsync, fetchPlayerCareerDataAsync
+from historical_scraper.helpers.parse_pool import parseTeamRosters, shutdownParsePool
+from historical_scraper.helpers.player_scraper import writeSeasonLevelDetails
+from historical_scraper.helpers.waits import printWaitSummary
+from historical_scraper.helpers.rate_limiter import printRateMetrics
+from historical_scraper.helpers.fault_handling import quarantinePlayer, printFaultSummary
+from historical_scraper.config import SCRAPER_CONCURRENCY
+
+from database.reader import getDbContents
+
+async def playerWorker(PWorkerId: int, PQueue: asyncio.Queue, PBrowser: object, PFailedNames: list) -> None:
+    """
+    One worker of the async scraper. Opens its own browser context and page, and scrapes players from the shared queue until it is empty.
+    A player that still fails after the retries is quarantined, so one bad page doesn't stop the other workers.
+
+    Args:
+        PWorkerId (int): The id of the worker. Only used in prints.
+        PQueue (asyncio.Queue): The queue of Player objects to scrape. All players are put in the queue before the workers start.
+        PBrowser (object): The async Browser object from playwright.
+        PFailedNames (list): The sjlNames of the quarantined players are added here.
+
+    Returns:
+        None: The Player objects are edited in place.
+    """
+    Context = await PBrowser.new_context()     # Each worker has its own context, so the pages dont share cookies or storage
+    Page = await Context.new_page()            # USE THIS PAGE EVERYWHERE WITHIN THIS WORKER!
+
+    try:
+        while True:
+            try:
+                PlayerObject = PQueue.get_nowait()  # Take the next player from the queue
+            except asyncio.QueueEmpty:
+                break                               # No more players, this worker is done
+
+            try:
+                await fetchPlayerCareerDataAsync(PlayerObject.sjlLink, PlayerObject, Page)  # This scrapes the players web page and edits the Player object in place
+            except Exception as e:
+                print(f"Worker {PWorkerId} failed to scrape {PlayerObject.sjlName}")
+                quarantinePlayer(PlayerObject.sjlName, PlayerObject.sjlLink, e)
+                PFailedNames.append(PlayerObject.sjlName)
+            finally:
+                PQueue.task_done()
+    finally:
+        await Context.close()
+
+    return None
+
+async def scrapePlayersConcurrently(PPlayersDict: dict, PBrowser: object, PConcurrency: int) -> None:
+    """
+    Scrapes all the players in the PPlayersDict with PConcurrency pages at the same time.
+
+    Args:
+        PPlayersDict (dict): Dict of Player objects. Key is sjlName, value is the Player object. The objects are edited in place, the quarantined players are removed.
+        PBrowser (object): The async Browser object from playwright.
+        PConcurrency (int): How many pages to run at the same time.
+
+    Returns:
+        None
+    """
+    Queue = asyncio.Queue()                     # Work queue shared by all the workers
+    for PlayerObject in PPlayersDict.values():
+        Queue.put_nowait(PlayerObject)
+
+    WorkerCount = max(1, min(PConcurrency, Queue.qsize()))  # No point in starting more workers than there are players
+    StartTime = time.perf_counter()
+
+    FailedNames = []
+    await asyncio.gather(*[playerWorker(WorkerId, Queue, PBrowser, FailedNames) for WorkerId in range(WorkerCount)])
+
+    for NameKey in FailedNames:                 # Half scraped players are not returned, so they aren't written
+        del PPlayersDict[NameKey]
+
+    Elapsed = time.perf_counter() - StartTime
+    if Elapsed > 0:
+        print(f"Scraped {len(PPlayersDict)} players in {Elapsed:.1f}s with {WorkerCount} workers ({len(PPlayersDict) / Elapsed * 3600:.0f} players per hour)")
+
+    return None
+
+async def mainAsync(PTeamIds: list[str] = ["319126555"], PNumberOfSeasons: int = 2, PConcurrency: int = SCRAPER_CONCURRENCY) -> dict:
+    """
+    The asyncio version of historical_scraper.scraper.main.
+    Does the same steps, but the players are scraped by PConcurrency pages at the same time.
+
+    Args:
+        PTeamIds (list[str]): The team IDs of the teams to scrape.
+        PNumberOfSeasons (int): The number of seasons to scrape the team rosters for.
+        PConcurrency (int): How many pages to run at the same time.
+
+    Returns:
+        dict: The PlayersDict. Key is sjlName, value is a Player object. Same as historical_scraper.scraper.main returns.
+    """
+    print(f"Async scraping script is live with {PConcurrency} workers")
+
+    # Init the containers
+    ClubTeamList = []           # List of Team objects. These mainly just contain the html of the players for each season.
+    PlayersDict = {}            # Dict of player objects. These contain all the player objects containing the actual data
+
+    dbDict = getDbContents()    # To avoid dublicates, queries the database and returns all contents of "players", "clubs", "levels" and "age_groups" tables.
+
+    async with async_playwright() as p:
+        Browser = await p.chromium.launch(headless=True)
+
+        # This scrapes the team pages for the html that contain all players for a specific season.
+        await scrapeClubDataAsync(PTeamIds, PNumberOfSeasons, ClubTeamList, Browser)
+
+        # This parses the html from each teams each season into player objects. The player objects get stored in PlayersDict with no duplicates.
+        parseTeamRosters(ClubTeamList, PlayersDict)
+        print("Done parsing the players")
+
+        for NameKey in list(PlayersDict.keys()):        # Players already in the db are not scraped again
+            if NameKey in dbDict["players"]:
+                print(f"{NameKey} is already in the database")
+                del PlayersDict[NameKey]
+
+        await scrapePlayersConcurrently(PlayersDict, Browser, PConcurrency)
+
+        # Cleanup
+        await Browser.close()
+
+    printWaitSummary()  # Shows how long the event driven waits took compared to the old fixed sleeps
+    printRateMetrics()  # The final state of the adaptive rate limiter
+    printFaultSummary() # How many players were quarantined
+    shutdownParsePool()
+
+    # This writes the .level .club and .ageGroup attributes to the PlayerSeasonLevel objects
+    writeSeasonLevelDetails(PlayersDict)
+
+    ClubTeamList.clear()
+
+    return PlayersDict
+
+def runAsyncScraper(PTeamIds: list[str] = ["319126555"], PNumberOfSeasons: int = 2, PConcurrency: int = SCRAPER_CONCURRENCY) -> dict:
+    """
+    Sync entry point for the async scraper, so it can be called like historical_scraper.scraper.main.
+
+    Returns:
+        dict: The PlayersDict. Key is sjlName, value is a Player object.
+    """
+    return asyncio.run(mainAsync(PTeamIds, PNumberOfSeasons, PConcurrency))
@@ -1 +1,87 @@
+import os
+
 CURRENT_YEAR = 2025
+
+SCRAPER_CONCURRENCY = 6     # How many browser pages the async scraper (historical_scraper.async_scraper) runs at the same time
+
+# Fetch backend. "playwright" renders every page in Chromium. "http" calls the backend endpoints the season dropdowns use directly,
+# and only falls back to Playwright for the players it can't handle (ex. retired players).
+FETCH_BACKEND = os.getenv("SCRAPER_FETCH_BACKEND", "playwright")
+
+LEIJONAT_BASE_URL = os.getenv("LEIJONAT_BASE_URL", "https://www.leijonat.fi")    # Point this to a local stand-in server when testing the http backend
+HTTP_TIMEOUT_SECONDS = 10                                                       # Timeout for one request of the http backend
+HTTP_MAX_CONNECTIONS = 20                                                       # Size of the http backends connection pool
+
+# The XHR endpoints the season dropdowns load their content from. They return the html that is put into the page containers.
+# The query parameters of the player/team link are passed on, with the season added as "season".
+# NOTE: The defaults are invented paths, they have not been checked against the real site. Set the real ones with the env variables.
+# A 404 from either one makes the http backend fall back to Playwright, and the Playwright waits (helpers/waits.py) don't depend on them matching.
+PLAYER_SEASON_ENDPOINT = os.getenv("LEIJONAT_PLAYER_SEASON_ENDPOINT", "/modules/mod_playercard/helper/getplayerseasonstats.php")
+TEAM_PLAYERS_ENDPOINT = os.getenv("LEIJONAT_TEAM_PLAYERS_ENDPOINT", "/modules/mod_teamcard/helper/getteamplayers.php")
+
+# Event driven waits (helpers/waits.py). These replace the fixed wait_for_timeout sleeps after changing the season dropdowns.
+WAIT_TIMEOUT_MS = 3000          # Ceiling for one wait, if neither the network response nor a DOM change shows up
+WAIT_AFTER_RESPONSE_MS = 1000   # Once the network response has arrived, how long the containers still have to change
+WAIT_SETTLE_MS = 100            # How long the containers have to be without new mutations to count as rendered
+
+# How the season stats are read from the rendered page. "html" reads the containers with inner_html() and parses them with BeautifulSoup.
+# "evaluate" runs one JavaScript function in the page that returns the parsed dicts directly (helpers/js_extract.py).
+EXTRACTION_MODE = os.getenv("SCRAPER_EXTRACTION_MODE", "html")
+
+# Which html parser the parse functions in utils.py and team_scraper.py use. "lxml" (helpers/lxml_parsers.py) is the fast one,
+# "bs4" is the original BeautifulSoup html.parser (helpers/soup_parsers.py). bs4 is used anyway if lxml isn't installed.
+PARSER_BACKEND = os.getenv("SCRAPER_PARSER", "lxml")
+
+# Raw html archive (helpers/archive.py). Every fetched fragment is stored compressed, so it can be parsed again later without scraping.
+ARCHIVE_ENABLED = os.getenv("SCRAPER_ARCHIVE", "0") == "1"
+ARCHIVE_DIR = os.getenv("SCRAPER_ARCHIVE_DIR", "html_archive")     # Blobs go to ARCHIVE_DIR/blobs, the SQLite index is ARCHIVE_DIR/index.sqlite3
+
+# Persistent job queue (helpers/job_queue.py). One job per (player link, season), so a crashed run can be resumed.
+JOB_QUEUE_PATH = os.getenv("SCRAPER_JOB_QUEUE", "scrape_jobs.sqlite3")
+JOB_MAX_ATTEMPTS = 3        # A failed job is retried on the next runs until it has failed this many times
+JOB_LEASE_SECONDS = 300     # How long a worker holds a claimed player without renewing. A dead worker's player is taken over after this.
+WORKER_POLL_SECONDS = 10    # How often an idle worker checks if a dead worker's lease has run out
+
+# Series stat tables (helpers/series_stats.py). One page lists the stats of every skater and goalie of one series (level) for a season.
+# {SerieId} and {Season} are filled in. The selectors point to the skater and goalie tables on that page.
+SERIES_STATS_URL = os.getenv("LEIJONAT_SERIES_STATS_URL", "https://www.leijonat.fi/index.php/tilastot?serieid={SerieId}&season={Season}")
+SERIES_SKATER_TABLE = os.getenv("LEIJONAT_SERIES_SKATER_TABLE", "table.skater-stats")
+SERIES_GOALIE_TABLE = os.getenv("LEIJONAT_SERIES_GOALIE_TABLE", "table.goalie-stats")
+
+# Adaptive rate limiting (helpers/rate_limiter.py). Every page load, season select and http fetch takes a token from the bucket of its host,
+# and a slot of the hosts concurrency limit. Both are tuned with AIMD: halved when the latency or error rate of a window is too high, raised step by step while the site is healthy.
+RATE_LIMIT_ENABLED = os.getenv("SCRAPER_RATE_LIMIT", "1") == "1"
+RATE_INITIAL_PER_SECOND = float(os.getenv("SCRAPER_RATE_PER_SECOND", "4"))     # Start rate of the token bucket
+RATE_MIN_PER_SECOND = 0.5
+RATE_MAX_PER_SECOND = 20.0
+RATE_INCREASE_PER_SECOND = 0.5      # Additive increase of the rate after a healthy window
+RATE_BURST = 4                      # Size of the token bucket, how many requests can go at once after an idle moment
+CONCURRENCY_MIN = 1
+CONCURRENCY_MAX = 12                # Upper limit for requests in flight to one host
+RATE_WINDOW_REQUESTS = 20           # How many finished requests one AIMD decision is based on
+RATE_TARGET_LATENCY_MS = 2500       # A window with a higher average latency than this is a sign of an overloaded site
+RATE_MAX_ERROR_RATE = 0.1           # A window with more failed requests than this is a sign of an overloaded site
+RATE_METRICS_INTERVAL_SECONDS = 30  # How often the live metrics line is printed. 0 turns it off.
+
+# Fault handling (helpers/fault_handling.py). Failed fetches are retried with a jittered exponential backoff,
+# players that still fail are quarantined (written to QUARANTINE_PATH) and the run goes on.
+RETRY_MAX_ATTEMPTS = 3              # Attempts per fetch, the first one included
+RETRY_BASE_SECONDS = 1.0            # Backoff before the 2nd attempt. Doubles for every attempt after that, with +-50% jitter.
+RETRY_MAX_SECONDS = 30.0
+CIRCUIT_FAILURE_THRESHOLD = 5       # This many timeouts or network errors in a row means the site is down. The run pauses.
+CIRCUIT_PAUSE_SECONDS = 60          # First pause. Doubles every time the first request after a pause fails too.
+CIRCUIT_MAX_PAUSE_SECONDS = 900
+QUARANTINE_PATH = os.getenv("SCRAPER_QUARANTINE", "quarantine.jsonl")
+
+# Streaming pipeline (historical_scraper/pipeline.py). The fetcher, the parsers and the writer are connected with bounded queues,
+# so a slow stage makes the stage before it wait, and only a few players are in memory at a time.
+PIPELINE_QUEUE_SIZE = 8         # How many players can wait between two stages
+PIPELINE_PARSERS = 2            # Parser threads
+PIPELINE_WRITE_BATCH = 20       # The writer commits this many players at once
+PIPELINE_FLUSH_SECONDS = 5      # The writer commits a smaller batch if no new player has arrived in this time
+
+# Parse pool (helpers/parse_pool.py). "off" parses on the thread that drives the browser, like before.
+# "thread" or "process" hands the BeautifulSoup parsing to a pool, so the browser can fetch the next season while the last one is parsed.
+# "process" uses every core, but each worker process has to import the scraper first.
+PARSE_POOL_MODE = os.getenv("SCRAPER_PARSE_POOL", "off")
+PARSE_POOL_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", str(os.cpu_count() or 2)))
@@ -0,0 +1 @@
+# Development only tools: the local stand-in server and the checks that run against it. Not imported by the scrapers.
@@ -0,0 +1,133 @@
+from playwright.sync_api import sync_playwright
+from historical_scraper.models.team import Team
+from historical_scraper.config import PLAYER_SEASON_ENDPOINT, TEAM_PLAYERS_ENDPOINT
+from historical_scraper.helpers.player_scraper import fetchPlayerSeasonHtml
+from historical_scraper.helpers.team_scraper import fetchTeamHtml, parsePlayerRowDicts
+from historical_scraper.helpers.http_fetcher import configureHttpClient, closeHttpClient, fetchPlayerSeasonHttp, fetchTeamHtmlHttp, EndpointNotFoundError
+from historical_scraper.helpers.rate_limiter import throttledGoto
+from historical_scraper.helpers.parser_parity import readFixtures
+from historical_scraper.dev.standin_server import startStandinServer, buildRouteKey
+
+# DEVELOPMENT ONLY. Checks that the http backend (helpers/http_fetcher.py) gives the same dicts as the Playwright scraper.
+# The stand-in server (dev/standin_server.py) serves the fixtures of historical_scraper/fixtures twice: as endpoint fragments for the
+# http backend, and as a player and a team page whose season dropdown loads the same fragments with fetch(), like the real site does.
+# Both backends then read the same seasons, and the parsed results have to be equal. Needs Chromium (playwright install chromium).
+
+# Season: (season-all fixture, level fixture) of the stand-in players. "2023" has no levels, so it is parsed as a season without games.
+STANDIN_PLAYER_SEASONS = {"2025": ("season.html", "levels.html"), "2024": ("dash.html", "dash.html"), "2023": ("season.html", "empty.html")}
+STANDIN_TEAM_SEASONS = {"2025": "roster.html", "2024": "empty.html"}
+
+# Position: (lkq of the stand-in player, fixture kind prefix, total stats container, level stats container)
+STANDIN_PLAYERS = {
+    "Maalivahti": ("1001", "goalie", "pcm-all-stats-container", "pcss-goalie-serie-stats-series-container"),
+    "Puolustaja": ("1002", "skater", "psac-all-skater-stats-container", "pcss-skater-serie-stats-series-container"),
+}
+STANDIN_TEAM_ID = "2001"
+
+# A page with a season dropdown. Changing the season loads the fragment from the endpoint and copies the containers into the page.
+STANDIN_PAGE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"></head><body>
+<select id="{SelectId}"><option value="" selected>-</option>{Options}</select>
+{Containers}
+<script>
+document.getElementById("{SelectId}").addEventListener("change", async (Event) => {{
+    const Params = new URLSearchParams(location.search);
+    Params.set("season", Event.target.value);
+    const Response = await fetch("{Endpoint}?" + Params.toString());
+    const Fragment = document.createElement("div");
+    Fragment.innerHTML = await Response.text();
+    for (const Id of {ContainerIds}) document.getElementById(Id).innerHTML = Fragment.querySelector("#" + Id).innerHTML;
+}});
+</script>
+</body></html>"""
+
+def buildStandinPage(PSelectId: str, PSeasons: list[str], PEndpoint: str, PContainerIds: list[str]) -> str:
+    """
+    Returns the html of a stand-in page. The containers start with a placeholder, so loading an empty season changes them too.
+    """
+    Options = "".join(f'<option value="{Season}">{Season}</option>' for Season in PSeasons)
+    Containers = "\n".join(f'<div id="{Id}"><p>Ladataan...</p></div>' for Id in PContainerIds)
+    ContainerIds = "[" + ", ".join(f'"{Id}"' for Id in PContainerIds) + "]"
+    return STANDIN_PAGE_HTML.format(SelectId=PSelectId, Options=Options, Containers=Containers, Endpoint=PEndpoint, ContainerIds=ContainerIds)
+
+def buildStandinRoutes() -> dict[str, str]:
+    """
+    Returns the routes of the stand-in server: the pages and the endpoint fragments of the STANDIN_PLAYERS and the stand-in team.
+    """
+    Fixtures = {(Kind, FileName): RawHtml for Kind, FileName, RawHtml in readFixtures()}
+    Routes = {}
+
+    for Position, (Lkq, KindPrefix, AllStatsId, LevelStatsId) in STANDIN_PLAYERS.items():
+        Routes[buildRouteKey("/pelaajat", {"lkq": Lkq})] = buildStandinPage("pcss-season-select", list(STANDIN_PLAYER_SEASONS), PLAYER_SEASON_ENDPOINT, [AllStatsId, LevelStatsId])
+        for Season, (AllStatsFile, LevelStatsFile) in STANDIN_PLAYER_SEASONS.items():
+            Routes[buildRouteKey(PLAYER_SEASON_ENDPOINT, {"lkq": Lkq, "season": Season})] = (
+                f'<div id="{AllStatsId}">{Fixtures[(f"{KindPrefix}-season-all", AllStatsFile)]}</div>'
+                f'<div id="{LevelStatsId}">{Fixtures[(f"{KindPrefix}-season-levels", LevelStatsFile)]}</div>')
+
+    Routes[buildRouteKey("/joukkueet", {"teamid": STANDIN_TEAM_ID})] = buildStandinPage("tcss-season-select", list(STANDIN_TEAM_SEASONS), TEAM_PLAYERS_ENDPOINT, ["tcst-team-players-container"])
+    for Season, RosterFile in STANDIN_TEAM_SEASONS.items():
+        Routes[buildRouteKey(TEAM_PLAYERS_ENDPOINT, {"teamid": STANDIN_TEAM_ID, "season": Season})] = f'<div id="tcst-team-players-container">{Fixtures[("team-roster", RosterFile)]}</div>'
+
+    return Routes
+
+def checkHttpParity() -> dict:
+    """
+    Starts the stand-in server, reads every season of the STANDIN_PLAYERS and the stand-in team with both backends and compares the results.
+    Also checks that a 404 from an endpoint raises EndpointNotFoundError, which makes the http backend fall back to Playwright.
+
+    Returns:
+        dict: {"PlayerSeasons": compared player seasons, "TeamSeasons": compared team seasons}
+
+    Raises:
+        AssertionError: If the backends give different results for any season, or the 404 isn't raised as EndpointNotFoundError.
+    """
+    Server, BaseUrl = startStandinServer(buildStandinRoutes())
+    configureHttpClient(BaseUrl)
+    Mismatches = []
+    Summary = {"PlayerSeasons": 0, "TeamSeasons": 0}
+
+    try:
+        with sync_playwright() as p:
+            Browser = p.chromium.launch(headless=True)
+            Page = Browser.new_page()
+
+            for Position, (Lkq, KindPrefix, AllStatsId, LevelStatsId) in STANDIN_PLAYERS.items():
+                PlayerLink = f"{BaseUrl}/pelaajat?lkq={Lkq}"
+                throttledGoto(Page, PlayerLink)
+                for Season in STANDIN_PLAYER_SEASONS:
+                    PlaywrightStats = fetchPlayerSeasonHtml(Page, Season, Position, PlayerLink)
+                    HttpStats = fetchPlayerSeasonHttp(PlayerLink, Season, Position)
+                    Summary["PlayerSeasons"] += 1
+                    if PlaywrightStats != HttpStats:
+                        Mismatches.append(f"{Position} {Season}:\n  playwright: {PlaywrightStats}\n  http:       {HttpStats}")
+
+            TeamLink = f"{BaseUrl}/joukkueet?teamid={STANDIN_TEAM_ID}"
+            PlaywrightTeam = Team("Stand-in", STANDIN_TEAM_ID, TeamLink)
+            HttpTeam = Team("Stand-in", STANDIN_TEAM_ID, TeamLink)
+            throttledGoto(Page, TeamLink)
+            fetchTeamHtml(list(STANDIN_TEAM_SEASONS), Page, PlaywrightTeam)
+            fetchTeamHtmlHttp(list(STANDIN_TEAM_SEASONS), HttpTeam)
+            for Season in STANDIN_TEAM_SEASONS:
+                PlaywrightRows = parsePlayerRowDicts(PlaywrightTeam.seasonRosterHtmls[Season])
+                HttpRows = parsePlayerRowDicts(HttpTeam.seasonRosterHtmls[Season])
+                Summary["TeamSeasons"] += 1
+                if PlaywrightRows != HttpRows:
+                    Mismatches.append(f"Team {Season}:\n  playwright: {PlaywrightRows}\n  http:       {HttpRows}")
+
+            Browser.close()
+
+        try:
+            fetchPlayerSeasonHttp(f"{BaseUrl}/pelaajat?lkq=missing", "2025", "Puolustaja")
+            Mismatches.append("A 404 from the player season endpoint didn't raise EndpointNotFoundError")
+        except EndpointNotFoundError:
+            pass
+    finally:
+        closeHttpClient()
+        Server.shutdown()
+
+    for Mismatch in Mismatches:
+        print(f"Mismatch in {Mismatch}")
+    print(f"Compared {Summary['PlayerSeasons']} player seasons and {Summary['TeamSeasons']} team seasons, {len(Mismatches)} mismatches")
+    if Mismatches:
+        raise AssertionError(f"The http and Playwright backends differ in {len(Mismatches)} checks")
+    return Summary
@@ -0,0 +1,50 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+# DEVELOPMENT ONLY. A small local stand-in for the leijonat.fi pages and backend endpoints. It serves html from a dict,
+# so the http fetch backend can be run against it with configureHttpClient(BaseUrl) instead of the real site. See dev/http_parity.py.
+# Nothing in the scrapers imports this.
+
+def buildRouteKey(PPath: str, PParams: dict) -> str:
+    """
+    Builds the key used in the routes dict. The params are sorted, so the order in the request doesn't matter.
+    Ex. buildRouteKey("/endpoint.php", {"season": "2025", "lkq": "123"}) -> "/endpoint.php?lkq=123&season=2025"
+    """
+    return f"{PPath}?{urlencode(sorted(PParams.items()))}"
+
+def startStandinServer(PRoutes: dict[str, str], PPort: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """
+    Starts the stand-in server in a background thread.
+
+    Args:
+        PRoutes (dict[str, str]): Key is a route key from buildRouteKey, value is the html to return. Unknown routes return 404.
+        PPort (int): The port to listen on. 0 picks a free port.
+
+    Returns:
+        tuple[ThreadingHTTPServer, str]: The server (call .shutdown() when done) and its base url, ex. "http://127.0.0.1:54321"
+    """
+    class StandinHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            Url = urlparse(self.path)
+            Body = PRoutes.get(buildRouteKey(Url.path, dict(parse_qsl(Url.query))))
+
+            if Body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            Encoded = Body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(Encoded)))
+            self.end_headers()
+            self.wfile.write(Encoded)
+
+        def log_message(self, format, *args):
+            pass    # Keep the console clean
+
+    Server = ThreadingHTTPServer(("127.0.0.1", PPort), StandinHandler)
+    threading.Thread(target=Server.serve_forever, daemon=True).start()
+
+    return Server, f"http://127.0.0.1:{Server.server_address[1]}"
@@ -0,0 +1,24 @@
+class ScrapeError(Exception):
+    """
+    Raised when a scraped page doesn't look like we expect, ex. a stats container is missing fields or a player is neither a goalie nor a skater.
+    Only the current player (or job) should be given up on, so the rest of the run can go on.
+    """
+    pass
+
+class ScrapeTimeoutError(ScrapeError):
+    """
+    Raised when the site didn't answer in time. Usually temporary, so the fetch is retried (helpers/fault_handling.py).
+    """
+    pass
+
+class MissingElementError(ScrapeError):
+    """
+    Raised when an element we need is missing from a loaded page or fragment. The page may have been only half rendered, so the fetch is retried.
+    """
+    pass
+
+class UnexpectedLayoutError(ScrapeError):
+    """
+    Raised when the page loaded, but its content doesn't look like we expect. Fetching it again gives the same page, so it is not retried.
+    """
+    pass
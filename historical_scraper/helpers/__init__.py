@@ -1,3 +1,11 @@
 from .team_scraper import *
 from .player_scraper import *
 from .utils import *
+from .async_player_scraper import *
+from .http_fetcher import *
+from .js_extract import *
+from .replay import *
+from .job_queue import *
+from .series_stats import *
+from .gap_planner import *
+from .parser_parity import *
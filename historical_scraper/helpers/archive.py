@@ -0,0 +1,173 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from historical_scraper.config import ARCHIVE_DIR
+
+try:
+    import zstandard    # Optional. Smaller and faster than gzip, but gzip is used if it isn't installed.
+except ImportError:
+    zstandard = None
+
+# Content addressed archive of the raw html fragments the scrapers fetch.
+# Each fragment is stored once as a compressed blob named by the sha256 of its content (ARCHIVE_DIR/blobs/ab/abcd....html.zst or .html.gz),
+# and a SQLite index maps (url, season, kind) to the content hashes, with the time each one was fetched.
+# The replay mode (helpers/replay.py) reads the fragments back and runs the normal parsers on them.
+#
+# Kinds:
+# - "team-roster": #tcst-team-players-container of a team page for one season. Url is the team link.
+# - "player-details": .pcm-basic-col of a player page. Url is the player link, season is "".
+# - "player-position": td.person-position of a player page. Only exists for active players. Season is "".
+# - "player-age": #pcm-player-age of a retired players page. Season is "".
+# - "goalie-season-all", "goalie-season-levels": the total stats and level stats containers of a goalie for one season.
+# - "skater-season-all", "skater-season-levels": the same for skaters.
+
+ArchiveConnection = None        # Shared connection to the index. Opened on first use by getArchiveConnection()
+ArchiveLock = threading.Lock()  # The async scraper and the pipeline use the archive from several threads
+
+def getArchiveConnection() -> sqlite3.Connection:
+    """
+    Returns the connection to the archive index, creating the directory and the table on the first call.
+    """
+    global ArchiveConnection
+    if ArchiveConnection is None:
+        os.makedirs(os.path.join(ARCHIVE_DIR, "blobs"), exist_ok=True)
+        ArchiveConnection = sqlite3.connect(os.path.join(ARCHIVE_DIR, "index.sqlite3"), check_same_thread=False)
+        ArchiveConnection.execute("""
+            CREATE TABLE IF NOT EXISTS fragments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                season TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                contentHash TEXT NOT NULL,
+                fetchedAt REAL NOT NULL,
+                UNIQUE (url, season, kind, contentHash)
+            )""")
+        ArchiveConnection.execute("CREATE INDEX IF NOT EXISTS fragments_kind_season ON fragments (kind, season)")
+        ArchiveConnection.commit()
+    return ArchiveConnection
+
+def getBlobPath(PContentHash: str, PExtension: str) -> str:
+    """
+    Returns the path of a blob. The first two characters of the hash are used as a sub directory, so no directory gets too big.
+    """
+    return os.path.join(ARCHIVE_DIR, "blobs", PContentHash[:2], f"{PContentHash}.html.{PExtension}")
+
+def writeBlob(PContentHash: str, PHtml: str) -> None:
+    """
+    Writes the compressed html to its blob file, unless a blob with the same hash is already stored.
+    """
+    for Extension in ("zst", "gz"):
+        if os.path.exists(getBlobPath(PContentHash, Extension)):
+            return None
+
+    Data = PHtml.encode("utf-8")
+    if zstandard is not None:
+        Path, Compressed = getBlobPath(PContentHash, "zst"), zstandard.ZstdCompressor(level=10).compress(Data)
+    else:
+        Path, Compressed = getBlobPath(PContentHash, "gz"), gzip.compress(Data, compresslevel=6)
+
+    os.makedirs(os.path.dirname(Path), exist_ok=True)
+    TempPath = f"{Path}.tmp{threading.get_ident()}"
+    with open(TempPath, "wb") as File:
+        File.write(Compressed)
+    os.replace(TempPath, Path)      # Atomic, so a crash never leaves a half written blob behind
+
+    return None
+
+def readBlob(PContentHash: str) -> str:
+    """
+    Reads and decompresses the html of a blob.
+
+    Raises:
+        FileNotFoundError: If there is no blob for the hash.
+    """
+    ZstPath = getBlobPath(PContentHash, "zst")
+    if os.path.exists(ZstPath):
+        if zstandard is None:
+            raise RuntimeError(f"{ZstPath} is zstd compressed, but zstandard is not installed")
+        with open(ZstPath, "rb") as File:
+            return zstandard.ZstdDecompressor().decompress(File.read()).decode("utf-8")
+
+    with open(getBlobPath(PContentHash, "gz"), "rb") as File:
+        return gzip.decompress(File.read()).decode("utf-8")
+
+def archiveFragment(PUrl: str, PSeason: str, PKind: str, PHtml: str) -> str:
+    """
+    Stores one fetched html fragment in the archive.
+
+    Args:
+        PUrl (str): The url the fragment was fetched from, ex. the player link.
+        PSeason (str): The season of the fragment, ex. "2025". "" if the fragment doesn't depend on the season.
+        PKind (str): What the fragment is, see the list at the top of this module.
+        PHtml (str): The raw html.
+
+    Returns:
+        str: The content hash of the fragment.
+    """
+    ContentHash = hashlib.sha256(PHtml.encode("utf-8")).hexdigest()
+    writeBlob(ContentHash, PHtml)
+
+    with ArchiveLock:
+        Connection = getArchiveConnection()
+        # If the same content was already archived for this url, season and kind, only the fetch time is updated
+        Connection.execute("""
+            INSERT INTO fragments (url, season, kind, contentHash, fetchedAt) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (url, season, kind, contentHash) DO UPDATE SET fetchedAt = excluded.fetchedAt""",
+            (PUrl, PSeason, PKind, ContentHash, time.time()))
+        Connection.commit()
+
+    return ContentHash
+
+def archiveSeasonContainers(PUrl: str, PSeason: str, PPosition: str, PSeasonAllStatsHtml: str, PLevelStatsHtml: str) -> None:
+    """
+    Archives the total stats and level stats containers of one season of a player.
+
+    Args:
+        PUrl (str): The player link.
+        PSeason (str): The season, ex. "2025".
+        PPosition (str): The position the containers were read for. Decides between the goalie and skater kinds.
+        PSeasonAllStatsHtml (str): The inner html of the total stats container.
+        PLevelStatsHtml (str): The inner html of the level stats container.
+
+    Returns:
+        None
+    """
+    Prefix = "goalie" if PPosition == "Maalivahti" else "skater"
+    archiveFragment(PUrl, PSeason, f"{Prefix}-season-all", PSeasonAllStatsHtml)
+    archiveFragment(PUrl, PSeason, f"{Prefix}-season-levels", PLevelStatsHtml)
+    return None
+
+def getLatestFragment(PUrl: str, PSeason: str, PKind: str) -> str:
+    """
+    Returns the html of the most recently fetched fragment for the url, season and kind, or None if nothing is archived.
+    """
+    with ArchiveLock:
+        Row = getArchiveConnection().execute(
+            "SELECT contentHash FROM fragments WHERE url = ? AND season = ? AND kind = ? ORDER BY fetchedAt DESC LIMIT 1",
+            (PUrl, PSeason, PKind)).fetchone()
+
+    if Row is None:
+        return None
+    return readBlob(Row[0])
+
+def getArchivedSeasons(PUrl: str, PKind: str) -> list[str]:
+    """
+    Returns the seasons archived for the url and kind, newest first. Ex. ["2025", "2024"...]
+    """
+    with ArchiveLock:
+        Rows = getArchiveConnection().execute(
+            "SELECT DISTINCT season FROM fragments WHERE url = ? AND kind = ? ORDER BY season DESC", (PUrl, PKind)).fetchall()
+    return [Row[0] for Row in Rows]
+
+def getArchivedFragments(PKinds: list[str]) -> list[tuple[str, str]]:
+    """
+    Returns (kind, content hash) of every distinct fragment archived for the kinds. Read the html with readBlob.
+    """
+    Placeholders = ", ".join("?" for _ in PKinds)
+    with ArchiveLock:
+        Rows = getArchiveConnection().execute(
+            f"SELECT DISTINCT kind, contentHash FROM fragments WHERE kind IN ({Placeholders}) ORDER BY kind, contentHash", PKinds).fetchall()
+    return [(Row[0], Row[1]) for Row in Rows]
@@ -0,0 +1,272 @@
+import asyncio
+from historical_scraper.models.team import Team
+from historical_scraper.models.player import Player
+from historical_scraper.config import PLAYER_SEASON_ENDPOINT, TEAM_PLAYERS_ENDPOINT, EXTRACTION_MODE, ARCHIVE_ENABLED
+from historical_scraper.helpers.archive import archiveFragment, archiveSeasonContainers
+from historical_scraper.helpers.waits import selectSeasonAndWaitAsync
+from historical_scraper.helpers.js_extract import extractPlayerSeasonStatsAsync
+from historical_scraper.helpers.utils import getSeasons, getSeasonsToScrape, parseSeasonOptions
+from historical_scraper.helpers.player_scraper import (addSeasonToPlayer, addRetiredSeasonToPlayer, parseSeasonContainers, getEmptySeasonStats, hasLevelRows, hasParsedLevels,
+                                                       seasonStatsContainers, levelStatsAttempts, isSeasonAvailable, retiredSeasonCandidates,
+                                                       writePersonalDetails, writePosition, writeRetiredBirthYear, writeRetiredPosition)
+from historical_scraper.helpers.rate_limiter import throttledGotoAsync
+from historical_scraper.helpers.fault_handling import retryCallAsync
+
+# These are the asyncio (playwright.async_api) versions of the functions in team_scraper.py and player_scraper.py.
+# They do the exact same page interactions, so the Player objects they produce are the same as with the sync scraper.
+# The only difference is that they can be awaited, so many pages can be scraped at the same time. See historical_scraper.async_scraper
+# Everything that doesn't touch the page (parsing, which seasons to fetch, the retired player checks) is done by the shared functions of player_scraper.py,
+# so only the page reads are here.
+
+async def fetchTeamHtmlAsync(PSeasons: list[str], PPage: object, PTeamObject: Team) -> None:
+    """
+    Async version of team_scraper.fetchTeamHtml. Fetches the HTML for all the players for the given seasons.
+
+    Args:
+        PSeasons (list[str]): The seasons to fetch.
+        PPage (object): The async page object from playwright.
+        PTeamObject (Team): The team object to store the html in.
+
+    Returns:
+        None: Edits in place the PTeamObject. Updates the self.seasonRosterHtmls dict. Adds each season "year": "html".
+    """
+    for Season in PSeasons: # PSeasons is a lsit of years like ["2025", "2024"...]
+        print("Scraping season: " + Season + " for team: " + PTeamObject.name)
+        await selectSeasonAndWaitAsync(PPage, "select#tcss-season-select", Season, ["#tcst-team-players-container"], TEAM_PLAYERS_ENDPOINT, "team-season", 1000)
+
+        RawHtml = await PPage.locator("#tcst-team-players-container").inner_html() # Get the content of the players container on the team page (PELAAJAT)
+        if ARCHIVE_ENABLED:
+            archiveFragment(PTeamObject.sjlLink, Season, "team-roster", RawHtml)
+        PTeamObject.addSeasonRosterHtml(Season, RawHtml)                            # Add the html to the dict
+
+    return None
+
+async def scrapeTeamDataAsync(PTeamId: str, PPage: object, PClubList: list, PSeasons: list[str]) -> None:
+    """
+    Async version of team_scraper.scrapeTeamData. Scrapes html data for a specific team and appends it to the club list.
+
+    Args:
+        PTeamId (str): The ID of the team to scrape.
+        PPage (object): The async page object from playwright for web navigation.
+        PClubList (list): A list to append the scraped team data to.
+        PSeasons (list[str]): A list of seasons to fetch HTML data for.
+
+    Returns:
+        None: This function modifies the PClubList in place by appending a new Team object with scraped data.
+    """
+    print("Starting to scrape team: " + PTeamId)
+
+    # Go to the teams page
+    Link = f"https://www.leijonat.fi/joukkueet?teamid={PTeamId}"
+    await throttledGotoAsync(PPage, Link)
+    await PPage.wait_for_selector("#tcm-team-official-name", timeout=5000)
+
+    TeamName = await PPage.locator("#tcm-team-official-name").inner_html()    # Scrape the name of team
+    TeamObject = Team(TeamName, PTeamId, Link)                                  # Create the TeamObject and init it with the TeamName, TeamId and the SjlLink
+    await fetchTeamHtmlAsync(PSeasons, PPage, TeamObject)                       # This writes the HTML for each requested season in the seasonRosterHtmls dict
+    PClubList.append(TeamObject)
+
+    return None
+
+async def scrapeClubDataAsync(PTeamIds: list[str], PNumberOfSeasons: int, PClubList: list, PBrowser: object) -> None:
+    """
+    Async version of team_scraper.scrapeClubData. Each team gets its own browser context, and the teams are scraped at the same time.
+
+    Args:
+        PTeamIds (list[str]): The team IDs of the teams to scrape.
+        PNumberOfSeasons (int): The number of seasons to scrape.
+        PClubList (list[object]): A list to hold the team objects that store the data.
+        PBrowser (object): The async Browser object from playwright.
+
+    Returns:
+        None: Edits in place the PClubList.
+    """
+    Seasons = []                                # Local container for the years to scrape
+    getSeasons(PNumberOfSeasons, Seasons)       # Populates the list with year strings ["2025", "2024"...]
+
+    async def scrapeOneTeam(TeamId: str) -> None:
+        Context = await PBrowser.new_context()  # Own context for each team, so the pages dont share any state
+        try:
+            Page = await Context.new_page()
+            await scrapeTeamDataAsync(TeamId, Page, PClubList, Seasons)
+        finally:
+            await Context.close()
+
+    await asyncio.gather(*[scrapeOneTeam(TeamId) for TeamId in PTeamIds])
+    print("Done scraping the teams player htmls.")
+
+    return None
+
+async def fetchPlayerCareerDataAsync(PPlayerLink: str, PPlayerObject: Player, PPage: object) -> None:
+    """
+    Async version of player_scraper.fetchPlayerCareerData. Fetches the player CAREER data and stores it in the provided Player object.
+
+    Args:
+        PPlayerLink (str): The link to the player's page.
+        PPlayerObject (Player): The player object to store the data in.
+        PPage (object): The async Page object to use.
+
+    Returns:
+        None: Edits the PPlayerObject in place.
+    """
+    print(f"\nScraping player: {PPlayerObject.sjlName}")
+
+    if not await retryCallAsync(discoverPlayerAsync, PPlayerLink, PPlayerObject, PPage, PDescription=PPlayerObject.sjlName):
+        # This is a player that is no more active, so sjl displays the information differently.
+        print(f"Failed to scrape {PPlayerObject.sjlName}. He hasn't played in the current year.\nResortin to using fetchRetiredPlayerCareerDataAsync")
+        await fetchRetiredPlayerCareerDataAsync(PPlayerLink, PPlayerObject, PPage)
+        return None
+
+    await scrapeSeasonsForPlayerAsync(PPlayerObject, PPage)                         # Scrape the player's seasons. Outcome Player.seasons <- SeasonObject.seasonLeveStats <- SeasonLevelObject
+
+    return None
+
+async def discoverPlayerAsync(PPlayerLink: str, PPlayerObject: Player, PPage: object) -> bool:
+    """
+    Async version of player_scraper.discoverPlayer. Goes to the player page and writes the birth year and position to the player object.
+
+    Returns:
+        bool: True for an active player. False if the position is missing, which means the player hasn't played in the current year.
+    """
+    await throttledGotoAsync(PPage, PPlayerLink)
+    await PPage.wait_for_selector(".pcm-basic-col", timeout=5000)                   # Wait for it to load
+    writePersonalDetails(PPlayerObject, PPlayerLink, await PPage.locator(".pcm-basic-col").inner_html())
+
+    try:
+        await PPage.wait_for_selector("td.person-position", timeout=5000)
+        PositionHtml = await PPage.locator("td.person-position").inner_html()
+    except Exception:
+        return False                                                                # Retired players don't have the position on the page
+
+    writePosition(PPlayerObject, PPlayerLink, PositionHtml)
+    return True
+
+async def fetchPlayerSeasonHtmlAsync(PPage: object, PSeason: str, PPosition: str, PPlayerLink: str = None) -> dict:
+    """
+    Async version of player_scraper.fetchPlayerSeasonHtml. Fetches and parses the player's ONE SEASON statistics from the webpage.
+
+    Args:
+        PPage (object): The async page object representing the player's webpage.
+        PSeason (str): The season for which the stats are to be fetched.
+        PPosition (str): The position of the player, either "Maalivahti" (goalie) or "Kenttäpelaaja" (skater), "Hyökkääjä" or "Puolustaja".
+        PPlayerLink (str): The link of the player. The raw html is archived under it when ARCHIVE_ENABLED. Defaults to the url of the page.
+
+    Returns:
+        dict: The same dict as fetchPlayerSeasonHtml returns.
+    """
+    StatsContainers = seasonStatsContainers(PPosition)
+    await selectSeasonAndWaitAsync(PPage, "select#pcss-season-select", PSeason, StatsContainers, PLAYER_SEASON_ENDPOINT, "player-season", 500)
+
+    if EXTRACTION_MODE == "evaluate" and not ARCHIVE_ENABLED:
+        ParsedStats = await extractPlayerSeasonStatsAsync(PPage, PPosition)        # One page.evaluate call returns the parsed dicts, no html round-trip
+        for _ in range(levelStatsAttempts(PPosition) - 1):
+            if hasParsedLevels(ParsedStats, PPosition):
+                break
+            await PPage.wait_for_timeout(100)                                       # The levels may not have been rendered yet, read again
+            ParsedStats = await extractPlayerSeasonStatsAsync(PPage, PPosition)
+        return ParsedStats
+
+    SeasonAllStatsHtml = await PPage.locator(StatsContainers[0]).inner_html()       # Total stats THIS SEASON
+    LevelStatsHtml = await PPage.locator(StatsContainers[1]).inner_html()           # Stats per league THIS SEASON, see player_scraper.readLevelStatsHtml
+    for _ in range(levelStatsAttempts(PPosition) - 1):
+        if hasLevelRows(LevelStatsHtml, PPosition):
+            break
+        await PPage.wait_for_timeout(100)
+        LevelStatsHtml = await PPage.locator(StatsContainers[1]).inner_html()
+
+    if ARCHIVE_ENABLED:
+        archiveSeasonContainers(PPlayerLink or PPage.url, PSeason, PPosition, SeasonAllStatsHtml, LevelStatsHtml)
+
+    return parseSeasonContainers(SeasonAllStatsHtml, LevelStatsHtml, PPosition)
+
+async def fetchSeasonWithRetriesAsync(PPlayerObject: Player, PPage: object, PSeason: str) -> dict:
+    """
+    Async version of player_scraper.fetchSeasonWithRetries. fetchPlayerSeasonHtmlAsync with retries, the page is loaded again before each retry.
+    """
+    return await retryCallAsync(fetchPlayerSeasonHtmlAsync, PPage, PSeason, PPlayerObject.position, PPlayerObject.sjlLink,
+                                PDescription=f"season {PSeason} of {PPlayerObject.sjlName}", PBeforeRetry=lambda: throttledGotoAsync(PPage, PPlayerObject.sjlLink))
+
+async def readAvailableSeasonsAsync(PPage: object) -> list[str]:
+    """
+    Async version of player_scraper.readAvailableSeasons. Reads the seasons the player has data for from the season dropdown.
+
+    Returns:
+        list[str]: The seasons in the dropdown, newest first. None if the dropdown can't be read.
+    """
+    try:
+        SelectHtml = await PPage.locator("select#pcss-season-select").inner_html(timeout=5000)
+    except Exception as e:
+        print(f"Could not read the season dropdown: {e}")
+        return None
+
+    return parseSeasonOptions(SelectHtml) or None
+
+async def fetchSeasonsForPlayerAsync(PPlayerObject: Player, PPage: object, PSeasons: list[str]) -> list[tuple[str, dict]]:
+    """
+    Async version of player_scraper.fetchSeasonsForPlayer, without the parse pool. The seasons missing from the season dropdown get zero stats without a fetch.
+
+    Returns:
+        list[tuple[str, dict]]: (Season, StatsDict) in the order of PSeasons.
+    """
+    AvailableSeasons = await readAvailableSeasonsAsync(PPage)           # The seasons the player has data for. None if the dropdown couldn't be read.
+
+    Seasons = []
+    for Season in PSeasons:
+        if isSeasonAvailable(Season, AvailableSeasons):
+            Seasons.append((Season, await fetchSeasonWithRetriesAsync(PPlayerObject, PPage, Season)))
+        else:
+            Seasons.append((Season, getEmptySeasonStats(PPlayerObject.position)))   # No team that season, so the page would only show zeros
+
+    return Seasons
+
+async def scrapeSeasonsForPlayerAsync(PPlayerObject: Player, PPage: object) -> None:
+    """
+    Async version of player_scraper.scrapeSeasonsForPlayer. Scrapes the player's stats for all seasons from getSeasonsToScrape and stores them in the player object.
+    """
+    for Season, StatsDict in await fetchSeasonsForPlayerAsync(PPlayerObject, PPage, getSeasonsToScrape(PPlayerObject.birthYear)):
+        addSeasonToPlayer(PPlayerObject, Season, StatsDict)             # Build the season and level objects and add them to the player object
+
+    return None
+
+async def fetchRetiredPlayerCareerDataAsync(PPlayerLink: str, PPlayerObject: Player, PPage: object) -> None:
+    """
+    Async version of player_scraper.fetchRetiredPlayerCareerData. Like the sync version, only the combined season stats are stored for retired players.
+    """
+    LastSeasonPlayed = await discoverRetiredPlayerAsync(PPlayerLink, PPlayerObject, PPage)    # Writes the position and birth year to the player object
+
+    # Get the range of seasons to scrape. Last year played - (assumed) U13 season.
+    SeasonsToScrape = getSeasonsToScrape(PPlayerObject.birthYear, LastSeasonPlayed)
+    for Season, StatsDict in await fetchSeasonsForPlayerAsync(PPlayerObject, PPage, SeasonsToScrape):
+        addRetiredSeasonToPlayer(PPlayerObject, Season, StatsDict)
+
+    return None
+
+async def discoverRetiredPlayerAsync(PPlayerLink: str, PPlayerObject: Player, PPage: object) -> str:
+    """
+    Async version of player_scraper.discoverRetiredPlayer. Finds the last season a retired player played, and writes the position and (guessed) birth year to the player object.
+
+    Returns:
+        str: The last season the player played, ex. "2023". None if no season has any data.
+    """
+    for Season in retiredSeasonCandidates(await readAvailableSeasonsAsync(PPage)):
+        await selectSeasonAndWaitAsync(PPage, "select#pcss-season-select", Season, ["#pcss-player-season-teams"], PLAYER_SEASON_ENDPOINT, "retired-season", 800)
+        SeasonTeamsHtml = await PPage.locator("#pcss-player-season-teams").inner_html()
+
+        # Since this seasons html contain some data, this is the last season they played.
+        if len(SeasonTeamsHtml) > 0:
+            print(f"{Season} is the latest {PPlayerObject.sjlName} has played in")
+            await checkRetiredPositionAsync(PPlayerObject, PPage)
+            writeRetiredBirthYear(PPlayerObject, PPlayerLink, await PPage.locator("#pcm-player-age").inner_html())
+            return Season
+
+    return None
+
+async def checkRetiredPositionAsync(PPlayerObject: Player, PPage: object) -> None:
+    """
+    Async version of player_scraper.checkRetiredPoistion. Checks if the retired player is a goalie or a skater.
+    """
+    GoalieVisible = await PPage.locator("#psac-all-goalie-stats-container").is_visible()
+    SkaterVisible = await PPage.locator("#psac-all-skater-stats-container").is_visible()
+    writeRetiredPosition(PPlayerObject, GoalieVisible, SkaterVisible)  # Raises if the page shows both or neither
+
+    return None
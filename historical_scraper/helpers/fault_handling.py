@@ -0,0 +1,194 @@
+import time
+import json
+import random
+import asyncio
+import threading
+import httpx
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Error as AsyncPlaywrightError, TimeoutError as AsyncPlaywrightTimeoutError
+from historical_scraper.errors import ScrapeError, ScrapeTimeoutError, MissingElementError, UnexpectedLayoutError
+from historical_scraper.config import RETRY_MAX_ATTEMPTS, RETRY_BASE_SECONDS, RETRY_MAX_SECONDS, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_PAUSE_SECONDS, CIRCUIT_MAX_PAUSE_SECONDS, QUARANTINE_PATH
+
+# Fault handling for the scrapers. A failing fetch is classified, and only the kinds that can go away on their own are retried,
+# with a jittered exponential backoff. Timeouts and network errors also feed a circuit breaker: after CIRCUIT_FAILURE_THRESHOLD of them
+# in a row the site is treated as down, and every fetch waits until the pause is over. A player that still fails is quarantined,
+# so the rest of the run goes on and the quarantined players can be looked at (or scraped again) later.
+
+RETRYABLE_KINDS = ["timeout", "network", "missing-element"]     # "layout" and "other" would fail the same way again
+SITE_DOWN_KINDS = ["timeout", "network"]                        # Only these count towards the circuit breaker
+
+CircuitLock = threading.Lock()
+CircuitState = {"Failures": 0, "OpenUntil": 0.0, "PauseSeconds": CIRCUIT_PAUSE_SECONDS, "Opened": 0}
+QuarantinedPlayers = []     # The players quarantined in this process, see quarantinePlayer()
+
+def classifyError(PError: BaseException) -> str:
+    """
+    Classifies a fetch error.
+
+    Args:
+        PError (BaseException): The raised error.
+
+    Returns:
+        str: "timeout", "network", "missing-element", "layout" or "other".
+    """
+    if isinstance(PError, (PlaywrightTimeoutError, AsyncPlaywrightTimeoutError, ScrapeTimeoutError, httpx.TimeoutException)):
+        return "timeout"
+    if isinstance(PError, MissingElementError):
+        return "missing-element"
+    if isinstance(PError, (UnexpectedLayoutError, ScrapeError)):
+        return "layout"
+    if isinstance(PError, httpx.HTTPStatusError):
+        StatusCode = PError.response.status_code
+        return "network" if StatusCode >= 500 or StatusCode == 429 else "other"   # 5xx and "too many requests" are the site's problem, other 4xx are ours
+    if isinstance(PError, httpx.TransportError):
+        return "network"
+    if isinstance(PError, (PlaywrightError, AsyncPlaywrightError)) and "net::" in str(PError):
+        return "network"            # ex. net::ERR_CONNECTION_RESET from page.goto
+    return "other"
+
+def getBackoffSeconds(PAttempt: int) -> float:
+    """
+    Returns how long to wait before the next attempt. PAttempt is the number of the failed attempt, starting from 1.
+    """
+    Backoff = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (PAttempt - 1))
+    return Backoff * random.uniform(0.5, 1.5)       # Jitter, so parallel workers don't all retry at the same moment
+
+def getCircuitWait() -> float:
+    """
+    Returns how many seconds the circuit is still open. 0 if fetches can go.
+    """
+    with CircuitLock:
+        return max(0.0, CircuitState["OpenUntil"] - time.monotonic())
+
+def recordSuccess() -> None:
+    """
+    Closes the circuit after a successful fetch.
+    """
+    with CircuitLock:
+        CircuitState["Failures"] = 0
+        CircuitState["PauseSeconds"] = CIRCUIT_PAUSE_SECONDS
+    return None
+
+def recordFailure(PKind: str) -> None:
+    """
+    Counts a failed fetch towards the circuit breaker. Opens the circuit when the site looks down.
+
+    Args:
+        PKind (str): The kind from classifyError. Only SITE_DOWN_KINDS are counted.
+
+    Returns:
+        None
+    """
+    if PKind not in SITE_DOWN_KINDS:
+        return None
+
+    with CircuitLock:
+        CircuitState["Failures"] += 1
+        if CircuitState["Failures"] < CIRCUIT_FAILURE_THRESHOLD or CircuitState["OpenUntil"] > time.monotonic():
+            return None
+        Pause = CircuitState["PauseSeconds"]
+        CircuitState["OpenUntil"] = time.monotonic() + Pause
+        CircuitState["PauseSeconds"] = min(CIRCUIT_MAX_PAUSE_SECONDS, Pause * 2)   # If the first fetch after the pause fails too, pause longer
+        CircuitState["Failures"] = CIRCUIT_FAILURE_THRESHOLD - 1                    # One more failure after the pause opens it again
+        CircuitState["Opened"] += 1
+
+    print(f"{CIRCUIT_FAILURE_THRESHOLD} timeouts or network errors in a row, the site looks down. Pausing for {Pause:.0f}s")
+    return None
+
+def retryCall(PFunction, *PArgs, PDescription: str = "", PBeforeRetry=None, **PKwargs):
+    """
+    Calls PFunction(*PArgs, **PKwargs), retrying the retryable errors with a jittered backoff. Waits first if the circuit is open.
+
+    Args:
+        PFunction (callable): The fetch to run.
+        PDescription (str): What is fetched, only used in prints. Ex. "season 2024 of DOE John"
+        PBeforeRetry (callable): Called with no arguments before each retry, ex. to reload the page.
+
+    Returns:
+        The return value of PFunction.
+
+    Raises:
+        The last error, if it is not retryable or all RETRY_MAX_ATTEMPTS failed.
+    """
+    Attempt = 1
+    while True:
+        CircuitWait = getCircuitWait()
+        if CircuitWait > 0:
+            time.sleep(CircuitWait)
+
+        try:
+            if Attempt > 1 and PBeforeRetry is not None:
+                PBeforeRetry()
+            Result = PFunction(*PArgs, **PKwargs)
+        except Exception as e:
+            Kind = classifyError(e)
+            recordFailure(Kind)
+            if Kind not in RETRYABLE_KINDS or Attempt >= RETRY_MAX_ATTEMPTS:
+                raise
+            Backoff = getBackoffSeconds(Attempt)
+            print(f"Attempt {Attempt} of {PDescription} failed ({Kind}): {e}. Retrying in {Backoff:.1f}s")
+            time.sleep(Backoff)
+            Attempt += 1
+            continue
+
+        recordSuccess()
+        return Result
+
+async def retryCallAsync(PFunction, *PArgs, PDescription: str = "", PBeforeRetry=None, **PKwargs):
+    """
+    Async version of retryCall. PFunction and PBeforeRetry are coroutine functions.
+    """
+    Attempt = 1
+    while True:
+        CircuitWait = getCircuitWait()
+        if CircuitWait > 0:
+            await asyncio.sleep(CircuitWait)
+
+        try:
+            if Attempt > 1 and PBeforeRetry is not None:
+                await PBeforeRetry()
+            Result = await PFunction(*PArgs, **PKwargs)
+        except Exception as e:
+            Kind = classifyError(e)
+            recordFailure(Kind)
+            if Kind not in RETRYABLE_KINDS or Attempt >= RETRY_MAX_ATTEMPTS:
+                raise
+            Backoff = getBackoffSeconds(Attempt)
+            print(f"Attempt {Attempt} of {PDescription} failed ({Kind}): {e}. Retrying in {Backoff:.1f}s")
+            await asyncio.sleep(Backoff)
+            Attempt += 1
+            continue
+
+        recordSuccess()
+        return Result
+
+def quarantinePlayer(PName: str, PLink: str, PError: BaseException, PSeason: str = "") -> None:
+    """
+    Records a player (or one season of a player) that couldn't be scraped. The record is appended to QUARANTINE_PATH as one json line.
+
+    Args:
+        PName (str): The sjlName of the player.
+        PLink (str): The sjl link of the player.
+        PError (BaseException): The error the last attempt raised.
+        PSeason (str): The season, if only one season failed. "" for the whole player.
+
+    Returns:
+        None
+    """
+    Record = {"time": time.time(), "name": PName, "link": PLink, "season": PSeason, "kind": classifyError(PError), "error": str(PError)}
+    QuarantinedPlayers.append(Record)
+    with CircuitLock:               # Threads share the file
+        with open(QUARANTINE_PATH, "a", encoding="utf-8") as File:
+            File.write(json.dumps(Record, ensure_ascii=False) + "\n")
+    print(f"Quarantined {PName} {PSeason} ({Record['kind']}): {PError}")
+    return None
+
+def printFaultSummary() -> None:
+    """
+    Prints how many players were quarantined in this run and how many times the circuit breaker paused it.
+    """
+    if QuarantinedPlayers:
+        print(f"{len(QuarantinedPlayers)} quarantined in this run, see {QUARANTINE_PATH}")
+    if CircuitState["Opened"]:
+        print(f"The run was paused {CircuitState['Opened']} times because the site looked down")
+    return None
@@ -0,0 +1,82 @@
+from historical_scraper.models.player import Player
+from historical_scraper.helpers.utils import getSeasonsToScrape
+from historical_scraper.helpers.job_queue import enqueueMissingSeasons
+
+from database.connection import SessionLocal
+from database.models import Player as PlayerRow
+from database.reader import readStoredSeasonYears
+
+# Gap aware backfill. Compares the seasons each player in the database should have with the seasons that are stored,
+# and queues only the missing (player, season) pairs to the job queue. Stored seasons are never scraped again.
+# The database doesn't know if a player has retired, so every season of the age range is expected here. When the queued player is run,
+# its season dropdown decides: the seasons after the last one in it are dropped, see queued_scraper.settleUnavailableSeasons.
+
+def getExpectedSeasons(PBirthYear: int, PStoredYears: set[int]) -> list[str]:
+    """
+    Returns the seasons a player in the database should have, in the same format getSeasonsToScrape returns.
+    Retirement is not guessed from the stored years, an active player who missed a season or two would lose all the later ones.
+    The seasons the player didn't play are left out when the player page is read.
+
+    Args:
+        PBirthYear (int): The birth year of the player.
+        PStoredYears (set[int]): The years that are already stored for the player. Not used to cut the range.
+
+    Returns:
+        list[str]: The expected seasons, ex. ["2025", "2024"...]
+    """
+    return getSeasonsToScrape(PBirthYear)
+
+def planMissingSeasons(PPlayerLinks: list[str] = None) -> list[tuple]:
+    """
+    Finds the missing seasons of the players in the database. Three queries in total: the players and the stored years of both season tables.
+
+    Args:
+        PPlayerLinks (list[str]): Only plan these players. Defaults to every player in the database.
+
+    Returns:
+        list[tuple]: (PlayerRow, MissingSeasons) for each player that is missing seasons. MissingSeasons is a list of season strings.
+    """
+    Session = SessionLocal()
+    try:
+        Query = Session.query(PlayerRow)
+        if PPlayerLinks is not None:
+            Query = Query.filter(PlayerRow.sjlLink.in_(PPlayerLinks))
+        PlayerRows = Query.all()
+        StoredYears = readStoredSeasonYears(Session)
+        Session.expunge_all()       # The rows are used after the session is closed
+    finally:
+        Session.close()
+
+    Plan = []
+    for Row in PlayerRows:
+        if Row.birthYear is None:
+            continue
+        Stored = StoredYears.get(Row.id, set())
+        MissingSeasons = [Season for Season in getExpectedSeasons(Row.birthYear, Stored) if int(Season) not in Stored]
+        if MissingSeasons:
+            Plan.append((Row, MissingSeasons))
+
+    return Plan
+
+def enqueueSeasonGaps(PPlayerLinks: list[str] = None) -> dict:
+    """
+    Plans the missing seasons with planMissingSeasons and adds them to the job queue. The players are queued as already discovered,
+    so runJobQueue only scrapes the missing seasons and writes them with writeSeasonsForExistingPlayer.
+
+    Args:
+        PPlayerLinks (list[str]): Only plan these players. Defaults to every player in the database.
+
+    Returns:
+        dict: {"players": number of players topped up, "seasons": number of season jobs queued}
+    """
+    Plan = planMissingSeasons(PPlayerLinks)
+    SeasonCount = 0
+    for Row, MissingSeasons in Plan:
+        PlayerObject = Player(Row.sjlName, Row.epName, Row.sjlLink)
+        PlayerObject.birthYear = Row.birthYear
+        PlayerObject.position = Row.position
+        enqueueMissingSeasons(Row.id, PlayerObject, MissingSeasons)
+        SeasonCount += len(MissingSeasons)
+
+    print(f"Queued {SeasonCount} missing seasons for {len(Plan)} players")
+    return {"players": len(Plan), "seasons": SeasonCount}
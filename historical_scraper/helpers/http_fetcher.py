@@ -0,0 +1,274 @@
+import httpx
+from bs4 import BeautifulSoup
+from urllib.parse import urlparse, parse_qsl
+from historical_scraper.models.team import Team
+from historical_scraper.models.player import Player
+from historical_scraper.errors import ScrapeError, MissingElementError, UnexpectedLayoutError
+from historical_scraper.config import CURRENT_YEAR, ARCHIVE_ENABLED, LEIJONAT_BASE_URL, HTTP_TIMEOUT_SECONDS, HTTP_MAX_CONNECTIONS, PLAYER_SEASON_ENDPOINT, TEAM_PLAYERS_ENDPOINT
+from historical_scraper.helpers.utils import getSeasons, getSeasonsToScrape, parsePosition, parsePersonalDetails
+from historical_scraper.helpers.player_scraper import addSeasonToPlayer, parseSeasonContainers
+from historical_scraper.helpers.archive import archiveFragment, archiveSeasonContainers
+from historical_scraper.helpers.rate_limiter import throttled
+from historical_scraper.helpers.fault_handling import retryCall
+
+# HTTP fetch backend. Instead of rendering the pages in Chromium, this calls the same backend endpoints the season dropdowns call,
+# and hands the returned html to the same parse functions the Playwright scraper uses.
+# All requests share one pooled httpx.Client, so the connections are reused between players.
+
+HttpClient = None   # The shared client. Created on first use by getHttpClient()
+
+class MissingContainerError(MissingElementError):
+    """Raised when a fetched fragment doesn't contain the container we need. The caller should fall back to Playwright."""
+    pass
+
+class EndpointNotFoundError(UnexpectedLayoutError):
+    """Raised when a backend endpoint returns 404. The endpoint paths in config.py are not checked against the site, so the whole run should fall back to Playwright. Not retried."""
+    pass
+
+def configureHttpClient(PBaseUrl: str = LEIJONAT_BASE_URL) -> httpx.Client:
+    """
+    (Re)creates the shared httpx client. Call this with the url of a local stand-in server to test the backend without the real site.
+
+    Args:
+        PBaseUrl (str): The base url all endpoint paths are relative to.
+
+    Returns:
+        httpx.Client: The new shared client.
+    """
+    global HttpClient
+    closeHttpClient()
+    Limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+    HttpClient = httpx.Client(base_url=PBaseUrl, timeout=HTTP_TIMEOUT_SECONDS, limits=Limits, follow_redirects=True)
+    return HttpClient
+
+def getHttpClient() -> httpx.Client:
+    """
+    Returns the shared httpx client, creating it on the first call.
+    """
+    if HttpClient is None:
+        return configureHttpClient()
+    return HttpClient
+
+def closeHttpClient() -> None:
+    """
+    Closes the shared httpx client and its pooled connections.
+    """
+    global HttpClient
+    if HttpClient is not None:
+        HttpClient.close()
+        HttpClient = None
+    return None
+
+def getLinkParams(PLink: str) -> dict:
+    """
+    Returns the query parameters of a player or team link as a dict. Ex. "...?lkq=123" -> {"lkq": "123"}
+    """
+    return dict(parse_qsl(urlparse(PLink).query))
+
+def fetchFragment(PEndpoint: str, PParams: dict) -> str:
+    """
+    Fetches one html fragment from a backend endpoint. Timeouts and 5xx responses are retried, see helpers/fault_handling.py.
+
+    Args:
+        PEndpoint (str): The path of the endpoint, relative to the base url.
+        PParams (dict): The query parameters.
+
+    Returns:
+        str: The html of the response.
+
+    Raises:
+        EndpointNotFoundError: If the endpoint returns 404.
+        httpx.HTTPError: If the request fails or the response is not 2xx.
+    """
+    return retryCall(requestFragment, PEndpoint, PParams, PDescription=f"{PEndpoint} {PParams}")
+
+def requestFragment(PEndpoint: str, PParams: dict) -> str:
+    """
+    One request of fetchFragment, without the retries.
+    """
+    with throttled(LEIJONAT_BASE_URL):      # Same host as the pages, so the http backend shares the rate limit with Playwright
+        Response = getHttpClient().get(PEndpoint, params=PParams)
+        if Response.status_code == 404:
+            raise EndpointNotFoundError(f"{PEndpoint} returned 404, check LEIJONAT_PLAYER_SEASON_ENDPOINT and LEIJONAT_TEAM_PLAYERS_ENDPOINT")
+        Response.raise_for_status()
+    return Response.text
+
+def extractContainerHtml(PSoup: BeautifulSoup, PSelector: str) -> str:
+    """
+    Returns the inner html of the element matching PSelector. This is the same string locator(PSelector).inner_html() returns on the rendered page.
+
+    Raises:
+        MissingContainerError: If the fragment doesn't contain the element.
+    """
+    Element = PSoup.select_one(PSelector)
+    if Element is None:
+        raise MissingContainerError(f"No {PSelector} in the fetched fragment")
+    return Element.decode_contents()
+
+def parsePlayerSeasonFragment(PFragmentHtml: str, PPosition: str, PPlayerLink: str, PSeason: str) -> dict:
+    """
+    Parses the stats of one season from a player season fragment.
+
+    Args:
+        PFragmentHtml (str): The html returned by the player season endpoint.
+        PPosition (str): The position of the player, either "Maalivahti" (goalie) or "Kenttäpelaaja" (skater), "Hyökkääjä" or "Puolustaja".
+        PPlayerLink (str): The player link. The containers are archived under it when ARCHIVE_ENABLED.
+        PSeason (str): The season of the fragment.
+
+    Returns:
+        dict: The same dict as player_scraper.fetchPlayerSeasonHtml returns.
+    """
+    Soup = BeautifulSoup(PFragmentHtml, "html.parser")
+
+    if PPosition == "Maalivahti":
+        SeasonAllStatsHtml = extractContainerHtml(Soup, "#pcm-all-stats-container")                  # Total stats for Goalie THIS SEASON
+        LevelStatsHtml = extractContainerHtml(Soup, "#pcss-goalie-serie-stats-series-container")     # Goalie stats per league THIS SEASON
+    else: # Position is "Kenttäpelaaja" aka player or "Hyökkääjä" or "Puolustaja"
+        SeasonAllStatsHtml = extractContainerHtml(Soup, "#psac-all-skater-stats-container")          # Total stats for Player THIS SEASON
+        LevelStatsHtml = extractContainerHtml(Soup, "#pcss-skater-serie-stats-series-container")     # Player stats per league THIS SEASON
+
+    if ARCHIVE_ENABLED:
+        archiveSeasonContainers(PPlayerLink, PSeason, PPosition, SeasonAllStatsHtml, LevelStatsHtml)
+
+    return parseSeasonContainers(SeasonAllStatsHtml, LevelStatsHtml, PPosition)
+
+def fetchPlayerSeasonHttp(PPlayerLink: str, PSeason: str, PPosition: str) -> dict:
+    """
+    HTTP version of player_scraper.fetchPlayerSeasonHtml. Fetches and parses the player's ONE SEASON statistics.
+
+    Args:
+        PPlayerLink (str): The link to the player's page.
+        PSeason (str): The season for which the stats are to be fetched.
+        PPosition (str): The position of the player.
+
+    Returns:
+        dict: The same dict as player_scraper.fetchPlayerSeasonHtml returns.
+    """
+    Params = getLinkParams(PPlayerLink)
+    Params["season"] = PSeason
+    FragmentHtml = fetchFragment(PLAYER_SEASON_ENDPOINT, Params)
+    return parsePlayerSeasonFragment(FragmentHtml, PPosition, PPlayerLink, PSeason)
+
+def fetchPlayerCareerDataHttp(PPlayerLink: str, PPlayerObject: Player) -> None:
+    """
+    HTTP version of player_scraper.fetchPlayerCareerData. Fetches the personal details, position and all the seasons for a player.
+    Retired players don't have the position on the current season, so they raise MissingContainerError and have to be scraped with Playwright.
+
+    Args:
+        PPlayerLink (str): The link to the player's page.
+        PPlayerObject (Player): The player object to store the data in. Only edited once everything is fetched.
+
+    Returns:
+        None
+
+    Raises:
+        MissingContainerError: If a needed container is missing from a fragment.
+        httpx.HTTPError: If a request fails.
+    """
+    print(f"\nScraping player over http: {PPlayerObject.sjlName}")
+
+    Params = getLinkParams(PPlayerLink)
+    Params["season"] = str(CURRENT_YEAR)
+    Soup = BeautifulSoup(fetchFragment(PLAYER_SEASON_ENDPOINT, Params), "html.parser")
+
+    PersonalDetailsHtml = extractContainerHtml(Soup, ".pcm-basic-col")     # Personal details are only scraped once per player
+    PositionHtml = extractContainerHtml(Soup, "td.person-position")         # Missing for retired players
+    if ARCHIVE_ENABLED:
+        archiveFragment(PPlayerLink, "", "player-details", PersonalDetailsHtml)
+        archiveFragment(PPlayerLink, "", "player-position", PositionHtml)
+
+    BirthYear = parsePersonalDetails(PersonalDetailsHtml)["DateOfBirth"]
+    Position = parsePosition(PositionHtml)
+
+    # Fetch all the seasons before touching the player object, so a failed request doesn't leave it half filled for the Playwright fallback
+    SeasonStats = []
+    for Season in getSeasonsToScrape(BirthYear):
+        SeasonStats.append((Season, fetchPlayerSeasonHttp(PPlayerLink, Season, Position)))
+
+    PPlayerObject.birthYear = BirthYear
+    PPlayerObject.position = Position
+    for Season, StatsDict in SeasonStats:
+        addSeasonToPlayer(PPlayerObject, Season, StatsDict)
+
+    return None
+
+def fetchTeamHtmlHttp(PSeasons: list[str], PTeamObject: Team) -> None:
+    """
+    HTTP version of team_scraper.fetchTeamHtml. Fetches the HTML for all the players of the team for the given seasons.
+
+    Args:
+        PSeasons (list[str]): The seasons to fetch.
+        PTeamObject (Team): The team object to store the html in.
+
+    Returns:
+        None: Edits in place the PTeamObject. Updates the self.seasonRosterHtmls dict. Adds each season "year": "html".
+    """
+    for Season in PSeasons:
+        print("Scraping season over http: " + Season + " for team: " + PTeamObject.name)
+        FragmentHtml = fetchFragment(TEAM_PLAYERS_ENDPOINT, {"teamid": PTeamObject.teamId, "season": Season})
+        Soup = BeautifulSoup(FragmentHtml, "html.parser")
+        RawHtml = extractContainerHtml(Soup, "#tcst-team-players-container")
+        if ARCHIVE_ENABLED:
+            archiveFragment(PTeamObject.sjlLink, Season, "team-roster", RawHtml)
+        PTeamObject.addSeasonRosterHtml(Season, RawHtml)
+
+    return None
+
+def scrapeClubDataHttp(PTeamIds: list[str], PNumberOfSeasons: int, PClubList: list) -> None:
+    """
+    HTTP version of team_scraper.scrapeClubData. Fetches the roster html of each team for the given number of seasons.
+
+    Args:
+        PTeamIds (list[str]): The team IDs of the teams to scrape.
+        PNumberOfSeasons (int): The number of seasons to scrape.
+        PClubList (list[object]): A list to hold the team objects that store the data.
+
+    Returns:
+        None: Edits in place the PClubList.
+    """
+    Seasons = []
+    getSeasons(PNumberOfSeasons, Seasons)   # Populates the list with year strings ["2025", "2024"...]
+
+    for TeamId in PTeamIds:
+        Link = f"https://www.leijonat.fi/joukkueet?teamid={TeamId}"
+        FirstFragment = BeautifulSoup(fetchFragment(TEAM_PLAYERS_ENDPOINT, {"teamid": TeamId, "season": Seasons[0]}), "html.parser")
+        NameElement = FirstFragment.select_one("#tcm-team-official-name")
+        TeamName = NameElement.text.strip() if NameElement else TeamId    # The name is only used in prints, so the id will do if the fragment doesn't have it
+
+        TeamObject = Team(TeamName, TeamId, Link)
+        fetchTeamHtmlHttp(Seasons, TeamObject)
+        PClubList.append(TeamObject)
+
+    print("Done fetching the teams player htmls over http.")
+
+    return None
+
+def scrapePlayersHttp(PPlayersDict: dict) -> list[str]:
+    """
+    Scrapes all the players in PPlayersDict over http.
+
+    Args:
+        PPlayersDict (dict): Dict of Player objects. Key is sjlName, value is the Player object. The objects are edited in place.
+
+    Returns:
+        list[str]: The sjlNames of the players that couldn't be scraped over http, for any reason. These should be scraped with Playwright.
+        After an EndpointNotFoundError this is every player that was left, the endpoint isn't called again.
+    """
+    FallbackNames = []
+    NameKeys = list(PPlayersDict.keys())
+    for Index, NameKey in enumerate(NameKeys):
+        PlayerObject = PPlayersDict[NameKey]
+        try:
+            fetchPlayerCareerDataHttp(PlayerObject.sjlLink, PlayerObject)
+        except EndpointNotFoundError as e:
+            print(f"{e}. Falling back to Playwright for the remaining {len(NameKeys) - Index} players.")
+            FallbackNames.extend(NameKeys[Index:])
+            break
+        except (ScrapeError, httpx.HTTPError) as e:             # Missing containers, "SeasonAllStats wrong" and the other parse errors, failed requests
+            print(f"Http fetch failed for {NameKey}: {e}. Falling back to Playwright.")
+            FallbackNames.append(NameKey)
+        except Exception as e:                                  # One broken player must not stop the run
+            print(f"Unexpected error in the http fetch of {NameKey}: {type(e).__name__}: {e}. Falling back to Playwright.")
+            FallbackNames.append(NameKey)
+
+    return FallbackNames
@@ -0,0 +1,511 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from historical_scraper.models.player import Player
+from historical_scraper.models.season import GoalieSeason, PlayerSeason
+from historical_scraper.config import JOB_QUEUE_PATH, JOB_MAX_ATTEMPTS, JOB_LEASE_SECONDS
+from historical_scraper.helpers.player_scraper import addSeasonToPlayer
+
+# Persistent job queue of the historical scraper. The state of a run is kept in a SQLite file instead of only in the PlayersDict,
+# so a run that crashes (or is stopped) can be started again and it continues where it stopped.
+#
+# Tables:
+# - "players": one row per player link. The player is first "discovered" (birth year, position and the seasons to scrape are read from the page),
+#   which creates the season jobs. Once all its jobs are done, the player is written to the database and its state is set to "written".
+#   Players that are already in the database have their playerId set. Only their missing seasons are queued (helpers/gap_planner.py).
+# - "jobs": one row per (player link, season). The result is the dict fetchPlayerSeasonHtml returns, stored as json.
+# - "update_jobs": one row per season row of the current year, for the update scraper workers (update_scraper/worker.py).
+# - "worker_stats": one row per worker process, with how much it has done. Used to see the throughput of each worker.
+#
+# States: "pending" -> "in-flight" -> "done" ("written" for players) or "failed".
+# Failed rows are set back to pending by resumeJobs() until they have failed JOB_MAX_ATTEMPTS times.
+#
+# Worker mode: several processes (on one host, or on several hosts sharing the file) take players from the same queue.
+# A claimed player or update job is leased to the worker for JOB_LEASE_SECONDS. The worker renews the lease as it goes,
+# and if it dies, the lease runs out and the next claim takes the row over.
+
+JobConnection = None            # Shared connection to the queue. Opened on first use by getJobConnection()
+JobLock = threading.Lock()      # Serializes the use of the shared connection
+
+def getJobConnection() -> sqlite3.Connection:
+    """
+    Returns the connection to the job queue, creating the tables on the first call.
+    """
+    global JobConnection
+    if JobConnection is None:
+        JobConnection = sqlite3.connect(JOB_QUEUE_PATH, timeout=30, check_same_thread=False)    # Other worker processes may hold the write lock for a moment
+        JobConnection.execute("PRAGMA journal_mode=WAL")                                         # Readers don't block the writer
+        JobConnection.execute("""
+            CREATE TABLE IF NOT EXISTS players (
+                link TEXT PRIMARY KEY,
+                sjlName TEXT NOT NULL,
+                epName TEXT,
+                birthYear INTEGER,
+                position TEXT,
+                retired INTEGER NOT NULL DEFAULT 0,
+                discovered INTEGER NOT NULL DEFAULT 0,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                leaseOwner TEXT,
+                leaseExpiresAt REAL,
+                playerId INTEGER,
+                updatedAt REAL NOT NULL
+            )""")
+        JobConnection.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                link TEXT NOT NULL,
+                season TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                result TEXT,
+                updatedAt REAL NOT NULL,
+                PRIMARY KEY (link, season)
+            )""")
+        JobConnection.execute("""
+            CREATE TABLE IF NOT EXISTS update_jobs (
+                position TEXT NOT NULL,
+                seasonId INTEGER NOT NULL,
+                link TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                leaseOwner TEXT,
+                leaseExpiresAt REAL,
+                updatedAt REAL NOT NULL,
+                PRIMARY KEY (position, seasonId)
+            )""")
+        JobConnection.execute("""
+            CREATE TABLE IF NOT EXISTS worker_stats (
+                workerId TEXT PRIMARY KEY,
+                mode TEXT NOT NULL,
+                startedAt REAL NOT NULL,
+                lastSeenAt REAL NOT NULL,
+                itemsDone INTEGER NOT NULL DEFAULT 0,
+                jobsDone INTEGER NOT NULL DEFAULT 0,
+                jobsFailed INTEGER NOT NULL DEFAULT 0
+            )""")
+        # Queue files made by older versions don't have all the columns on players
+        PlayerColumns = [Row[1] for Row in JobConnection.execute("PRAGMA table_info(players)").fetchall()]
+        for Column, Type in [("leaseOwner", "TEXT"), ("leaseExpiresAt", "REAL"), ("playerId", "INTEGER")]:
+            if Column not in PlayerColumns:
+                JobConnection.execute(f"ALTER TABLE players ADD COLUMN {Column} {Type}")
+        JobConnection.execute("CREATE INDEX IF NOT EXISTS players_state ON players (state)")
+        JobConnection.execute("CREATE INDEX IF NOT EXISTS update_jobs_state ON update_jobs (state)")
+        JobConnection.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state)")
+        JobConnection.commit()
+    return JobConnection
+
+def enqueuePlayers(PPlayersDict: dict) -> int:
+    """
+    Adds the players to the queue. Players that are already in the queue (from an earlier run) are left as they are.
+
+    Args:
+        PPlayersDict (dict): Dict of Player objects. Key is sjlName, value is the Player object.
+
+    Returns:
+        int: How many new players were added.
+    """
+    Now = time.time()
+    with JobLock:
+        Connection = getJobConnection()
+        Before = Connection.total_changes
+        Connection.executemany(
+            "INSERT OR IGNORE INTO players (link, sjlName, epName, updatedAt) VALUES (?, ?, ?, ?)",
+            [(PlayerObject.sjlLink, PlayerObject.sjlName, PlayerObject.epName, Now) for PlayerObject in PPlayersDict.values()])
+        Connection.commit()
+        return Connection.total_changes - Before
+
+def getWorkerId() -> str:
+    """
+    Returns the id of this worker process, ex. "scraper-host-1-12345". Unique over all the hosts sharing the queue.
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def resumeJobs(PReleaseAllLeases: bool = False) -> None:
+    """
+    Prepares the queue for a new run. The failed rows that haven't used up their JOB_MAX_ATTEMPTS are set back to pending.
+    Rows left in-flight by a dead worker are taken over by claimNextPlayer once their lease runs out.
+
+    Args:
+        PReleaseAllLeases (bool): Set all in-flight rows back to pending right away. Only use this when no other worker is running,
+                                  ex. when the single process mainQueued is restarted after a crash.
+
+    Returns:
+        None
+    """
+    Now = time.time()
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute("BEGIN IMMEDIATE")
+        if PReleaseAllLeases:
+            Connection.execute("UPDATE jobs SET state = 'pending', updatedAt = ? WHERE state = 'in-flight'", (Now,))
+            Connection.execute("UPDATE players SET state = 'pending', leaseOwner = NULL, updatedAt = ? WHERE state = 'in-flight'", (Now,))
+        Connection.execute("UPDATE jobs SET state = 'pending', updatedAt = ? WHERE state = 'failed' AND attempts < ?", (Now, JOB_MAX_ATTEMPTS))
+        # A failed player is retried, unless one of its seasons has failed for good
+        Connection.execute("""
+            UPDATE players SET state = 'pending', updatedAt = ?
+            WHERE state = 'failed' AND attempts < ?
+            AND NOT EXISTS (SELECT 1 FROM jobs WHERE jobs.link = players.link AND jobs.state = 'failed')""",
+            (Now, JOB_MAX_ATTEMPTS))
+        Connection.execute("UPDATE update_jobs SET state = 'pending', updatedAt = ? WHERE state = 'failed' AND attempts < ?", (Now, JOB_MAX_ATTEMPTS))
+        Connection.commit()
+    return None
+
+def claimLeasedRow(PTable: str, PWorkerId: str) -> int:
+    """
+    Leases the next pending row of PTable to the worker. A row whose lease has run out (its worker died) is taken over too.
+    BEGIN IMMEDIATE takes the write lock before the select, so two workers can never claim the same row.
+
+    Args:
+        PTable (str): "players" or "update_jobs".
+        PWorkerId (str): The id of the claiming worker.
+
+    Returns:
+        int: The rowid of the claimed row, or None if there is nothing to claim.
+    """
+    Now = time.time()
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute("BEGIN IMMEDIATE")
+        Row = Connection.execute(
+            f"SELECT rowid FROM {PTable} WHERE state = 'pending' OR (state = 'in-flight' AND leaseExpiresAt < ?) ORDER BY rowid LIMIT 1",
+            (Now,)).fetchone()
+        if Row is None:
+            Connection.commit()
+            return None
+        Connection.execute(
+            f"UPDATE {PTable} SET state = 'in-flight', leaseOwner = ?, leaseExpiresAt = ?, updatedAt = ? WHERE rowid = ?",
+            (PWorkerId, Now + JOB_LEASE_SECONDS, Now, Row[0]))
+        if PTable == "players":     # The season jobs a dead worker left in-flight are run again
+            Connection.execute(
+                "UPDATE jobs SET state = 'pending', updatedAt = ? WHERE state = 'in-flight' AND link = (SELECT link FROM players WHERE rowid = ?)",
+                (Now, Row[0]))
+        Connection.commit()
+    return Row[0]
+
+def renewLease(PTable: str, PKey: tuple, PWorkerId: str) -> bool:
+    """
+    Extends the lease of a row the worker holds. Call this between the jobs of a long player.
+
+    Args:
+        PTable (str): "players" or "update_jobs".
+        PKey (tuple): ("link", value) for players, ("rowid", value) for any table.
+        PWorkerId (str): The id of the worker holding the lease.
+
+    Returns:
+        bool: False if the lease had already been taken over by another worker. The worker should drop the row then.
+    """
+    with JobLock:
+        Connection = getJobConnection()
+        Cursor = Connection.execute(
+            f"UPDATE {PTable} SET leaseExpiresAt = ? WHERE {PKey[0]} = ? AND leaseOwner = ? AND state = 'in-flight'",
+            (time.time() + JOB_LEASE_SECONDS, PKey[1], PWorkerId))
+        Connection.commit()
+    return Cursor.rowcount == 1
+
+def rowToPlayer(PRow: tuple) -> Player:
+    """
+    Builds a Player object from a (link, sjlName, epName, birthYear, position) row of the players table.
+    """
+    PlayerObject = Player(PRow[1], PRow[2], PRow[0])
+    PlayerObject.birthYear = PRow[3]
+    PlayerObject.position = PRow[4]
+    return PlayerObject
+
+def claimNextPlayer(PWorkerId: str = None) -> tuple:
+    """
+    Takes the next pending player from the queue, marks it in-flight and leases it to the worker.
+
+    Args:
+        PWorkerId (str): The id of the claiming worker. Defaults to getWorkerId().
+
+    Returns:
+        tuple: (Player, Retired, Discovered). The Player object has the birth year and position if the player is already discovered.
+        None if there are no pending players left.
+    """
+    RowId = claimLeasedRow("players", PWorkerId or getWorkerId())
+    if RowId is None:
+        return None
+
+    with JobLock:
+        Row = getJobConnection().execute(
+            "SELECT link, sjlName, epName, birthYear, position, retired, discovered FROM players WHERE rowid = ?", (RowId,)).fetchone()
+
+    return rowToPlayer(Row), bool(Row[5]), bool(Row[6])
+
+def addSeasonJobs(PPlayerObject: Player, PSeasons: list[str], PRetired: bool) -> None:
+    """
+    Stores the discovered details of the player and creates one pending job for each season to scrape.
+
+    Args:
+        PPlayerObject (Player): The discovered player. The birth year and position are stored.
+        PSeasons (list[str]): The seasons to scrape, ex. ["2025", "2024"...]
+        PRetired (bool): True if the player was discovered with discoverRetiredPlayer. Retired players get no levels.
+
+    Returns:
+        None
+    """
+    Now = time.time()
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute(
+            "UPDATE players SET birthYear = ?, position = ?, retired = ?, discovered = 1, updatedAt = ? WHERE link = ?",
+            (PPlayerObject.birthYear, PPlayerObject.position, int(PRetired), Now, PPlayerObject.sjlLink))
+        Connection.executemany(
+            "INSERT OR IGNORE INTO jobs (link, season, updatedAt) VALUES (?, ?, ?)",
+            [(PPlayerObject.sjlLink, Season, Now) for Season in PSeasons])
+        Connection.commit()
+    return None
+
+def enqueueMissingSeasons(PPlayerId: int, PPlayerObject: Player, PSeasons: list[str]) -> None:
+    """
+    Queues the missing seasons of a player that is already in the database. The player is stored as discovered, so the page isn't read again.
+    A player that was written by an earlier run is set back to pending. The seasons that were done before are run again, as they weren't stored.
+
+    Args:
+        PPlayerId (int): The id of the player row in the database.
+        PPlayerObject (Player): The player, with the birth year and position from the database.
+        PSeasons (list[str]): The missing seasons, ex. ["2025", "2021"]
+
+    Returns:
+        None
+    """
+    Now = time.time()
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute("BEGIN IMMEDIATE")
+        Connection.execute("""
+            INSERT INTO players (link, sjlName, epName, birthYear, position, discovered, playerId, updatedAt) VALUES (?, ?, ?, ?, ?, 1, ?, ?)
+            ON CONFLICT (link) DO UPDATE SET birthYear = excluded.birthYear, position = excluded.position, discovered = 1, playerId = excluded.playerId,
+            state = CASE WHEN state = 'in-flight' THEN state ELSE 'pending' END, attempts = 0, updatedAt = excluded.updatedAt""",
+            (PPlayerObject.sjlLink, PPlayerObject.sjlName, PPlayerObject.epName, PPlayerObject.birthYear, PPlayerObject.position, PPlayerId, Now))
+        Connection.executemany("""
+            INSERT INTO jobs (link, season, updatedAt) VALUES (?, ?, ?)
+            ON CONFLICT (link, season) DO UPDATE SET state = 'pending', attempts = 0, updatedAt = excluded.updatedAt WHERE state != 'in-flight'""",
+            [(PPlayerObject.sjlLink, Season, Now) for Season in PSeasons])
+        Connection.commit()
+    return None
+
+def dropSeasonJobs(PPlayerLink: str, PSeasons: list[str]) -> None:
+    """
+    Removes the pending jobs of the seasons, ex. the seasons after a player retired. A dropped season is not written at all.
+    """
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.executemany("DELETE FROM jobs WHERE link = ? AND season = ? AND state = 'pending'", [(PPlayerLink, Season) for Season in PSeasons])
+        Connection.commit()
+    return None
+
+def getPendingSeasons(PPlayerLink: str) -> list[str]:
+    """
+    Returns the seasons of the player that still have a pending job, newest first.
+    """
+    with JobLock:
+        Rows = getJobConnection().execute(
+            "SELECT season FROM jobs WHERE link = ? AND state = 'pending' ORDER BY season DESC", (PPlayerLink,)).fetchall()
+    return [Row[0] for Row in Rows]
+
+def setJobState(PPlayerLink: str, PSeason: str, PState: str, PResult: dict = None, PError: str = None) -> None:
+    """
+    Moves one season job to a new state. A "done" job stores the stats dict as json, a "failed" job stores the error and uses up one attempt.
+    """
+    Attempts = 1 if PState == "failed" else 0
+    Result = json.dumps(PResult) if PResult is not None else None
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute(
+            "UPDATE jobs SET state = ?, result = COALESCE(?, result), error = ?, attempts = attempts + ?, updatedAt = ? WHERE link = ? AND season = ?",
+            (PState, Result, PError, Attempts, time.time(), PPlayerLink, PSeason))
+        Connection.commit()
+    return None
+
+def setPlayerState(PPlayerLink: str, PState: str, PError: str = None) -> None:
+    """
+    Moves a player to a new state. Failing a player uses up one of its attempts.
+    """
+    Attempts = 1 if PState == "failed" else 0
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute(
+            "UPDATE players SET state = ?, error = ?, attempts = attempts + ?, updatedAt = ? WHERE link = ?",
+            (PState, PError, Attempts, time.time(), PPlayerLink))
+        Connection.commit()
+    return None
+
+def isPlayerComplete(PPlayerLink: str) -> bool:
+    """
+    Returns True if all the season jobs of the player are done. A player without season jobs (no seasons in the range,
+    or all of them already stored) is complete, so it is written instead of being failed and retried forever.
+    """
+    with JobLock:
+        Row = getJobConnection().execute(
+            "SELECT COUNT(*), SUM(state = 'done') FROM jobs WHERE link = ?", (PPlayerLink,)).fetchone()
+    return Row[0] == (Row[1] or 0)      # SUM is NULL when there are no jobs
+
+def buildPlayerFromJobs(PPlayerLink: str) -> Player:
+    """
+    Rebuilds the Player object with all its seasons from the stored results of its done jobs.
+    Like fetchRetiredPlayerCareerData, no levels are added for retired players.
+
+    Args:
+        PPlayerLink (str): The link of the player.
+
+    Returns:
+        Player: The player object, ready for writeSeasonLevelDetails and writeEntirePlayerToDb. The .id is set for players already in the database.
+    """
+    with JobLock:
+        Connection = getJobConnection()
+        Row = Connection.execute("SELECT link, sjlName, epName, birthYear, position, retired, playerId FROM players WHERE link = ?", (PPlayerLink,)).fetchone()
+        JobRows = Connection.execute(
+            "SELECT season, result FROM jobs WHERE link = ? AND state = 'done' ORDER BY season DESC", (PPlayerLink,)).fetchall()
+
+    PlayerObject = rowToPlayer(Row)
+    PlayerObject.id = Row[6]            # The id of the player row for players already in the database, None for new players
+    for Season, Result in JobRows:
+        StatsDict = json.loads(Result)
+        if not Row[5]:
+            addSeasonToPlayer(PlayerObject, Season, StatsDict)
+        elif PlayerObject.position == "Maalivahti":
+            PlayerObject.addSeason(GoalieSeason(Season, StatsDict["SeasonAllGoalieStas"]))
+        else:
+            PlayerObject.addSeason(PlayerSeason(Season, StatsDict["SeasonAllPlayerStas"]))
+
+    return PlayerObject
+
+def getQueueSummary() -> dict:
+    """
+    Returns how many players and jobs are in each state. Ex. {"players": {"written": 10, "pending": 3}, "jobs": {"done": 90, "failed": 1}}
+    """
+    with JobLock:
+        Connection = getJobConnection()
+        Players = dict(Connection.execute("SELECT state, COUNT(*) FROM players GROUP BY state").fetchall())
+        Jobs = dict(Connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+    return {"players": Players, "jobs": Jobs}
+
+def enqueueUpdateJobs(PSeasons: list[tuple], PRestart: bool = True) -> int:
+    """
+    Fills the update_jobs table for the update scraper workers.
+
+    Args:
+        PSeasons (list[tuple]): (position, seasonId, player link) for each season row of the current year.
+        PRestart (bool): Start a new update pass, the jobs of the last pass are removed. False continues an interrupted pass.
+
+    Returns:
+        int: How many jobs were added.
+    """
+    Now = time.time()
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute("BEGIN IMMEDIATE")
+        if PRestart:
+            Connection.execute("DELETE FROM update_jobs")
+        Before = Connection.total_changes
+        Connection.executemany(
+            "INSERT OR IGNORE INTO update_jobs (position, seasonId, link, updatedAt) VALUES (?, ?, ?, ?)",
+            [(Position, SeasonId, Link, Now) for Position, SeasonId, Link in PSeasons])
+        Added = Connection.total_changes - Before
+        Connection.commit()
+    return Added
+
+def claimNextUpdateJob(PWorkerId: str = None) -> tuple:
+    """
+    Takes the next pending update job and leases it to the worker.
+
+    Returns:
+        tuple: (rowid, position, seasonId, player link), or None if there are no pending update jobs left.
+    """
+    RowId = claimLeasedRow("update_jobs", PWorkerId or getWorkerId())
+    if RowId is None:
+        return None
+
+    with JobLock:
+        Row = getJobConnection().execute("SELECT position, seasonId, link FROM update_jobs WHERE rowid = ?", (RowId,)).fetchone()
+
+    return (RowId,) + tuple(Row)
+
+def setUpdateJobState(PRowId: int, PState: str, PError: str = None) -> None:
+    """
+    Moves an update job to a new state. Failing a job uses up one of its attempts.
+    """
+    Attempts = 1 if PState == "failed" else 0
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute(
+            "UPDATE update_jobs SET state = ?, error = ?, attempts = attempts + ?, updatedAt = ? WHERE rowid = ?",
+            (PState, PError, Attempts, time.time(), PRowId))
+        Connection.commit()
+    return None
+
+def hasUnfinishedUpdateJobs() -> bool:
+    """
+    Returns True if the update pass in the queue still has pending or in-flight jobs. Call resumeJobs first, so the failed jobs that are retried count.
+    """
+    with JobLock:
+        Row = getJobConnection().execute("SELECT COUNT(*) FROM update_jobs WHERE state IN ('pending', 'in-flight')").fetchone()
+    return Row[0] > 0
+
+def hasLiveLeases(PTable: str) -> bool:
+    """
+    Returns True if some other worker still holds a lease on PTable. A worker with nothing to claim waits for these, as they are reclaimed if their worker dies.
+    """
+    with JobLock:
+        Row = getJobConnection().execute(
+            f"SELECT COUNT(*) FROM {PTable} WHERE state = 'in-flight' AND leaseExpiresAt >= ?", (time.time(),)).fetchone()
+    return Row[0] > 0
+
+def recordWorkerProgress(PWorkerId: str, PMode: str, PItemsDone: int = 0, PJobsDone: int = 0, PJobsFailed: int = 0) -> None:
+    """
+    Adds to the counters of the worker in the worker_stats table. Creates the row on the first call.
+
+    Args:
+        PWorkerId (str): The id of the worker.
+        PMode (str): "historical" or "update".
+        PItemsDone (int): Players written (historical) or seasons updated (update).
+        PJobsDone (int): Season jobs done.
+        PJobsFailed (int): Jobs that failed.
+
+    Returns:
+        None
+    """
+    Now = time.time()
+    with JobLock:
+        Connection = getJobConnection()
+        Connection.execute("""
+            INSERT INTO worker_stats (workerId, mode, startedAt, lastSeenAt, itemsDone, jobsDone, jobsFailed) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (workerId) DO UPDATE SET lastSeenAt = excluded.lastSeenAt, itemsDone = itemsDone + excluded.itemsDone,
+            jobsDone = jobsDone + excluded.jobsDone, jobsFailed = jobsFailed + excluded.jobsFailed""",
+            (PWorkerId, PMode, Now, Now, PItemsDone, PJobsDone, PJobsFailed))
+        Connection.commit()
+    return None
+
+def getWorkerStats() -> list[dict]:
+    """
+    Returns the counters and the throughput of each worker that has used the queue, busiest first.
+    ItemsPerHour and JobsPerHour are counted over the time between the first and the last progress of the worker.
+    """
+    with JobLock:
+        Rows = getJobConnection().execute(
+            "SELECT workerId, mode, startedAt, lastSeenAt, itemsDone, jobsDone, jobsFailed FROM worker_stats ORDER BY jobsDone DESC").fetchall()
+
+    Stats = []
+    for WorkerId, Mode, StartedAt, LastSeenAt, ItemsDone, JobsDone, JobsFailed in Rows:
+        Hours = max(LastSeenAt - StartedAt, 1) / 3600
+        Stats.append({"WorkerId": WorkerId, "Mode": Mode, "ItemsDone": ItemsDone, "JobsDone": JobsDone, "JobsFailed": JobsFailed,
+                      "ItemsPerHour": round(ItemsDone / Hours, 1), "JobsPerHour": round(JobsDone / Hours, 1), "LastSeenAt": LastSeenAt})
+    return Stats
+
+def printWorkerStats() -> None:
+    """
+    Prints the throughput of each worker, and the total of all of them.
+    """
+    Stats = getWorkerStats()
+    for Worker in Stats:
+        print(f"{Worker['WorkerId']} ({Worker['Mode']}): {Worker['ItemsDone']} items, {Worker['JobsDone']} jobs, {Worker['JobsFailed']} failed, "
+              f"{Worker['ItemsPerHour']} items/h, {Worker['JobsPerHour']} jobs/h")
+    print(f"All {len(Stats)} workers: {sum(Worker['JobsPerHour'] for Worker in Stats):.1f} jobs/h")
+    return None
@@ -0,0 +1,131 @@
+from historical_scraper.errors import MissingElementError
+from historical_scraper.helpers.utils import parseSeasonAllGoalieStas, parseGoalieStats, parseSeasonAllPlayerStas, parsePlayerStats
+
+# In-browser extraction of the season stats. One page.evaluate call reads the total stats and the level rows
+# and returns the same dicts the parsers in utils.py build, so no html is sent over the Playwright bridge.
+# The ids and classes are the same ones the parsers use, and textContent.trim() gives the same strings as .text.strip().
+
+# Key in the returned dict: id of the div in the total stats container. Same as parseSeasonAllGoalieStas / parseSeasonAllPlayerStas.
+GOALIE_SEASON_FIELDS = {"Games": "pcas-goalie-games", "Played": "pcas-goalie-played-games", "GoalsAllowed": "pcas-goalie-goals-against", "TimeOnIce": "pcas-goalie-toi", "Gaa": "pcas-goalie-gaa"}
+PLAYER_SEASON_FIELDS = {"Games": "pcas-skater-games", "Goals": "pcas-skater-goals", "Assists": "pcas-skater-assists", "Points": "pcas-skater-points", "PenaltyMinutes": "pcas-skater-penalty-minutes", "PpGoals": "pcas-skater-goals-pp", "ShGoals": "pcas-skater-goals-sh", "SoGoals": "pcas-skater-goals-ws"}
+
+# The keys of the pcss-level-stat-col cells in order. Same as parseGoalieStats / parsePlayerStats.
+GOALIE_LEVEL_STAT_KEYS = ["Games", "Played", "GoalsAllowed", "Saves", "Save%"]
+PLAYER_LEVEL_STAT_KEYS = ["Games", "Goals", "Assists", "Points", "PenaltyMinutes"]
+
+# The containers for each position: (total stats container, level stats container)
+GOALIE_CONTAINERS = ["#pcm-all-stats-container", "#pcss-goalie-serie-stats-series-container"]
+PLAYER_CONTAINERS = ["#psac-all-skater-stats-container", "#pcss-skater-serie-stats-series-container"]
+
+# Returns {"SeasonAll": {...} or null if a field is missing, "Levels": [{...}, ...]}
+EXTRACT_SEASON_STATS_JS = """([AllStatsSelector, LevelStatsSelector, SeasonFields, LevelStatKeys]) => {
+    const cleanText = (Element) => Element ? Element.textContent.trim() : null;
+
+    const AllStatsContainer = document.querySelector(AllStatsSelector);
+    let SeasonAll = {};
+    for (const [Key, Id] of Object.entries(SeasonFields)) {
+        const Element = AllStatsContainer ? AllStatsContainer.querySelector("div#" + Id) : null;
+        if (!Element) { SeasonAll = null; break; }
+        SeasonAll[Key] = cleanText(Element);
+    }
+
+    const Levels = [];
+    const LevelStatsContainer = document.querySelector(LevelStatsSelector);
+    const Rows = LevelStatsContainer ? LevelStatsContainer.querySelectorAll("div.pcss-level-title-row") : [];
+    for (const Row of Rows) {
+        const Cells = Row.querySelectorAll("div.pcss-level-stat-col");
+        const Level = {
+            TeamName: cleanText(Row.querySelector("div.pcss-level-team-name-col")),
+            LevelName: cleanText(Row.querySelector("div.pcss-level-name-col")),
+        };
+        LevelStatKeys.forEach((Key, Index) => { Level[Key] = cleanText(Cells[Index]); });
+        Levels.push(Level);
+    }
+
+    return {SeasonAll: SeasonAll, Levels: Levels};
+}"""
+
+def getExtractionArgs(PPosition: str) -> list:
+    """
+    Returns the argument list for EXTRACT_SEASON_STATS_JS for the given position.
+    """
+    if PPosition == "Maalivahti":
+        return [GOALIE_CONTAINERS[0], GOALIE_CONTAINERS[1], GOALIE_SEASON_FIELDS, GOALIE_LEVEL_STAT_KEYS]
+    return [PLAYER_CONTAINERS[0], PLAYER_CONTAINERS[1], PLAYER_SEASON_FIELDS, PLAYER_LEVEL_STAT_KEYS]
+
+def buildParsedStats(PExtracted: dict, PPosition: str) -> dict:
+    """
+    Turns the result of EXTRACT_SEASON_STATS_JS into the dict fetchPlayerSeasonHtml returns.
+
+    Args:
+        PExtracted (dict): The value returned by page.evaluate.
+        PPosition (str): The position of the player.
+
+    Returns:
+        dict: For goalies "SeasonAllGoalieStas" and "GoalieLevelStats", for skaters "SeasonAllPlayerStas" and "PlayerLevelStats".
+
+    Raises:
+        MissingElementError: If the total stats container is missing a field. The html path would crash in the parser on the same page.
+    """
+    if PExtracted["SeasonAll"] is None:
+        raise MissingElementError("SeasonAllStats wrong, the total stats container is missing fields")
+
+    if PPosition == "Maalivahti":
+        return {"SeasonAllGoalieStas": PExtracted["SeasonAll"], "GoalieLevelStats": PExtracted["Levels"]}
+
+    SeasonAllStats = PExtracted["SeasonAll"]
+    if PExtracted["Levels"] == []:  # If the player stats are empty, set the player stats to "0". Same as fetchPlayerSeasonHtml does.
+        SeasonAllStats = {"Games": "0", "Goals": "0", "Assists": "0", "Points": "0", "PenaltyMinutes": "0", "PpGoals": "0", "ShGoals": "0", "SoGoals": "0"}
+
+    return {"SeasonAllPlayerStas": SeasonAllStats, "PlayerLevelStats": PExtracted["Levels"]}
+
+def extractPlayerSeasonStats(PPage: object, PPosition: str) -> dict:
+    """
+    Reads the stats of the currently selected season straight from the page with one page.evaluate call.
+    The season must already be selected and rendered, see waits.selectSeasonAndWait.
+
+    Args:
+        PPage (object): The Page object from playwright, loaded with the player page.
+        PPosition (str): The position of the player.
+
+    Returns:
+        dict: The same dict as fetchPlayerSeasonHtml returns.
+    """
+    return buildParsedStats(PPage.evaluate(EXTRACT_SEASON_STATS_JS, getExtractionArgs(PPosition)), PPosition)
+
+async def extractPlayerSeasonStatsAsync(PPage: object, PPosition: str) -> dict:
+    """
+    Async version of extractPlayerSeasonStats, for the async scraper.
+    """
+    return buildParsedStats(await PPage.evaluate(EXTRACT_SEASON_STATS_JS, getExtractionArgs(PPosition)), PPosition)
+
+def checkExtractionParity(PPage: object, PPosition: str) -> bool:
+    """
+    Reads the currently selected season both ways, with page.evaluate and with inner_html() + the BeautifulSoup parsers, and compares the results.
+    Used to make sure the evaluate mode gives the same data before switching EXTRACTION_MODE.
+
+    Args:
+        PPage (object): The Page object from playwright, loaded with the player page and a season selected.
+        PPosition (str): The position of the player.
+
+    Returns:
+        bool: True if both ways gave the same dicts. The differences are printed otherwise.
+    """
+    Extracted = PPage.evaluate(EXTRACT_SEASON_STATS_JS, getExtractionArgs(PPosition))
+
+    if PPosition == "Maalivahti":
+        SeasonAll = parseSeasonAllGoalieStas(PPage.locator(GOALIE_CONTAINERS[0]).inner_html())
+        Levels = parseGoalieStats(PPage.locator(GOALIE_CONTAINERS[1]).inner_html())
+    else:
+        SeasonAll = parseSeasonAllPlayerStas(PPage.locator(PLAYER_CONTAINERS[0]).inner_html())
+        Levels = parsePlayerStats(PPage.locator(PLAYER_CONTAINERS[1]).inner_html())
+
+    Matches = True
+    if Extracted["SeasonAll"] != SeasonAll:
+        print(f"Season stats differ. evaluate: {Extracted['SeasonAll']} html: {SeasonAll}")
+        Matches = False
+    if Extracted["Levels"] != Levels:
+        print(f"Level stats differ. evaluate: {Extracted['Levels']} html: {Levels}")
+        Matches = False
+
+    return Matches
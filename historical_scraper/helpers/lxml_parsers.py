@@ -0,0 +1,145 @@
+from lxml import html as LxmlHtml
+
+# The lxml parsers. Same functions and same return values as the BeautifulSoup parsers in helpers/soup_parsers.py, but the html is parsed
+# by libxml2 and the elements are found with XPath, which is about 10x faster. utils.py and team_scraper.py use these when lxml is installed.
+# A missing element raises AttributeError like the BeautifulSoup versions do (None.text_content()), so the callers see the same errors.
+# parser_parity.checkParserParity runs both over the html archive and reports any differences.
+
+def parseFragment(PRawHtml: str) -> object:
+    """
+    Parses an html fragment (an inner_html of a container) into one wrapper div, so fragments with several top level elements or only text work too.
+    """
+    return LxmlHtml.fragment_fromstring(PRawHtml, create_parent="div")
+
+def findAll(PElement: object, PTag: str, PId: str = None, PClass: str = None) -> list:
+    """
+    Returns the PTag descendants of PElement in document order, optionally with the given id or with PClass in their class list.
+    Same matching as BeautifulSoup find_all(PTag, id=PId, class_=PClass).
+    """
+    Condition = ""
+    if PId is not None:
+        Condition = f"[@id='{PId}']"
+    elif PClass is not None:
+        Condition = f"[contains(concat(' ', normalize-space(@class), ' '), ' {PClass} ')]"
+    return PElement.xpath(f".//{PTag}{Condition}")
+
+def findFirst(PElement: object, PTag: str, PId: str = None, PClass: str = None) -> object:
+    """
+    Returns the first match of findAll, or None. Same as BeautifulSoup find().
+    """
+    Elements = findAll(PElement, PTag, PId, PClass)
+    return Elements[0] if Elements else None
+
+def parsePosition(PRawHtml: str) -> str:
+    """
+    lxml version of utils.parsePosition.
+    """
+    PositionText = parseFragment(PRawHtml).text_content()   # Get the text for position
+    return PositionText.split(" ")[1]                       # Return the split position
+
+def parseSeasonOptions(PRawHtml: str) -> list[str]:
+    """
+    lxml version of utils.parseSeasonOptions.
+    """
+    Seasons = []
+    for Option in findAll(parseFragment(PRawHtml), "option"):
+        Value = (Option.get("value") or Option.text_content()).strip()      # Fall back to the text if the option has no value
+        if Value.isdigit() and len(Value) == 4:
+            Seasons.append(Value)
+    return sorted(set(Seasons), reverse=True)
+
+def parsePersonalDetails(PRawHtml: str) -> dict:
+    """
+    lxml version of utils.parsePersonalDetails.
+    """
+    Root = parseFragment(PRawHtml)
+    DateOfBirth = findFirst(Root, "div", PId="pcm-player-dob").text_content().strip()
+    return {"DateOfBirth": DateOfBirth}
+
+def parseSeasonAllGoalieStas(PRawHtml: str) -> dict:
+    """
+    lxml version of utils.parseSeasonAllGoalieStas.
+    """
+    Root = parseFragment(PRawHtml)
+    Games = findFirst(Root, "div", PId="pcas-goalie-games").text_content().strip()
+    Played = findFirst(Root, "div", PId="pcas-goalie-played-games").text_content().strip()
+    GoalsAllowed = findFirst(Root, "div", PId="pcas-goalie-goals-against").text_content().strip()
+    TimeOnIce = findFirst(Root, "div", PId="pcas-goalie-toi").text_content().strip()
+    Gaa = findFirst(Root, "div", PId="pcas-goalie-gaa").text_content().strip()
+
+    return {"Games": Games, "Played": Played, "GoalsAllowed": GoalsAllowed, "TimeOnIce": TimeOnIce, "Gaa": Gaa}
+
+def parseSeasonAllPlayerStas(PRawHtml: str) -> dict:
+    """
+    lxml version of utils.parseSeasonAllPlayerStas.
+    """
+    Root = parseFragment(PRawHtml)
+    Games = findFirst(Root, "div", PId="pcas-skater-games").text_content().strip()
+    Goals = findFirst(Root, "div", PId="pcas-skater-goals").text_content().strip()
+    Assists = findFirst(Root, "div", PId="pcas-skater-assists").text_content().strip()
+    Points = findFirst(Root, "div", PId="pcas-skater-points").text_content().strip()
+    PenaltyMinutes = findFirst(Root, "div", PId="pcas-skater-penalty-minutes").text_content().strip()
+    PpGoals = findFirst(Root, "div", PId="pcas-skater-goals-pp").text_content().strip()
+    ShGoals = findFirst(Root, "div", PId="pcas-skater-goals-sh").text_content().strip()
+    SoGoals = findFirst(Root, "div", PId="pcas-skater-goals-ws").text_content().strip()
+
+    return {"Games": Games, "Goals": Goals, "Assists": Assists, "Points": Points, "PenaltyMinutes": PenaltyMinutes, "PpGoals": PpGoals, "ShGoals": ShGoals, "SoGoals": SoGoals}
+
+def parseLevelRows(PRawHtml: str, PStatKeys: list[str]) -> list[dict]:
+    """
+    Parses the pcss-level-title-rows of a level stats container. The pcss-level-stat-col cells are stored under PStatKeys in order.
+    """
+    AllLevelsInSeason = []
+    for Row in findAll(parseFragment(PRawHtml), "div", PClass="pcss-level-title-row"):
+        Cells = findAll(Row, "div", PClass="pcss-level-stat-col")
+        LevelDict = {
+            "TeamName": findFirst(Row, "div", PClass="pcss-level-team-name-col").text_content().strip(),
+            "LevelName": findFirst(Row, "div", PClass="pcss-level-name-col").text_content().strip(),
+        }
+        for Index, Key in enumerate(PStatKeys):
+            LevelDict[Key] = Cells[Index].text_content().strip()    # IndexError on a short row, like Cells[i] in the BeautifulSoup versions
+        AllLevelsInSeason.append(LevelDict)
+
+    return AllLevelsInSeason
+
+def parseGoalieStats(PRawHtml: str) -> list[dict]:
+    """
+    lxml version of utils.parseGoalieStats.
+    """
+    return parseLevelRows(PRawHtml, ["Games", "Played", "GoalsAllowed", "Saves", "Save%"])
+
+def parsePlayerStats(PRawHtml: str) -> list[dict]:
+    """
+    lxml version of utils.parsePlayerStats.
+    """
+    return parseLevelRows(PRawHtml, ["Games", "Goals", "Assists", "Points", "PenaltyMinutes"])
+
+def parsePlayerRowDicts(PRawHtml: str, PParseStaff: bool = False) -> list[dict]:
+    """
+    lxml version of team_scraper.parsePlayerRowDicts.
+    """
+    PlayerRows = []
+    for Row in findAll(parseFragment(PRawHtml), "div", PClass="tcst-row"):
+        RoleDiv = findFirst(Row, "div", PClass="col-xs-4")
+        if RoleDiv is not None:      # Not just "if RoleDiv", an lxml element without children is falsy but a BeautifulSoup tag isn't
+            if RoleDiv.text_content().strip() == "Toimihenkilö" and PParseStaff == False:
+                continue    # Skip staff members
+        else:
+            print("No role div")
+
+        NameDiv = findFirst(Row, "div", PClass="col-xs-6")
+        if NameDiv is None:
+            print("No name div")
+            continue
+
+        PlayerLink = findFirst(NameDiv, "a")
+        if PlayerLink is None:
+            print("No player link")
+            continue
+
+        SjlName = PlayerLink.text_content().strip()
+        NameParts = SjlName.split(" ")
+        EpName = f"{NameParts[1]} {NameParts[0].capitalize()}"
+        PlayerRows.append({"SjlName": SjlName, "EpName": EpName, "SjlLink": f"https://www.leijonat.fi/{PlayerLink.attrib['href']}"})
+
+    return PlayerRows
@@ -0,0 +1,85 @@
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from historical_scraper.helpers.team_scraper import parsePlayerRowDicts, addPlayerRowsToDict
+from historical_scraper.config import PARSE_POOL_MODE, PARSE_POOL_WORKERS
+
+# Parse offload. The parse functions only take html strings and return plain dicts and lists, so they can be run in a thread pool
+# or in other processes. submitParse returns a Future either way. With PARSE_POOL_MODE "off" the function is run right away
+# and the Future is already done, so the callers don't need two code paths.
+
+ParsePool = None    # The shared executor. Created on first use by getParsePool()
+
+def isParsePoolEnabled() -> bool:
+    """
+    True if the parsing is handed to a pool.
+    """
+    return PARSE_POOL_MODE in ["thread", "process"]
+
+def getParsePool() -> object:
+    """
+    Returns the shared executor, creating it on the first call. None when PARSE_POOL_MODE is "off".
+    The process pool uses "spawn", so the workers don't inherit the Playwright driver threads of the parent.
+    """
+    global ParsePool
+    if ParsePool is None and PARSE_POOL_MODE == "thread":
+        ParsePool = ThreadPoolExecutor(max_workers=PARSE_POOL_WORKERS, thread_name_prefix="parser")
+    elif ParsePool is None and PARSE_POOL_MODE == "process":
+        ParsePool = ProcessPoolExecutor(max_workers=PARSE_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return ParsePool
+
+def shutdownParsePool() -> None:
+    """
+    Waits for the running parses and closes the shared executor.
+    """
+    global ParsePool
+    if ParsePool is not None:
+        ParsePool.shutdown(wait=True)
+        ParsePool = None
+    return None
+
+def submitParse(PFunction, *PArgs) -> Future:
+    """
+    Runs PFunction(*PArgs) in the parse pool.
+
+    Args:
+        PFunction (callable): A module level parse function. With the process pool, its arguments and return value must be picklable.
+
+    Returns:
+        Future: .result() returns what PFunction returned, or raises what it raised.
+    """
+    Pool = getParsePool()
+    if Pool is not None:
+        return Pool.submit(PFunction, *PArgs)
+    return runNow(PFunction, *PArgs)         # No pool, run it here
+
+def runNow(PFunction, *PArgs) -> Future:
+    """
+    Runs PFunction(*PArgs) right here and returns the result as an already done Future. For the work that can't leave this thread, ex. anything using the Page.
+    """
+    Done = Future()
+    try:
+        Done.set_result(PFunction(*PArgs))
+    except Exception as e:
+        Done.set_exception(e)
+    return Done
+
+def parseTeamRosters(PClubTeamList: list, PPlayersDict: dict) -> None:
+    """
+    Parses the players of every team and season roster in PClubTeamList into PPlayersDict. The rosters are parsed in the pool at the same time,
+    and the results are added in the same order as the one by one loop over parsePlayerRowsFromHtml, so the same duplicates are skipped.
+
+    Args:
+        PClubTeamList (list): The Team objects with their seasonRosterHtmls.
+        PPlayersDict (dict): Dict of Player objects. Key is sjlName. Edited in place.
+
+    Returns:
+        None
+    """
+    Futures = []
+    for Team in PClubTeamList:
+        for SeasonKey, HtmlValue in Team.seasonRosterHtmls.items():     # Key is the season year (ex. "2025"), value is the html (containing all the players for that season)
+            Futures.append(submitParse(parsePlayerRowDicts, HtmlValue))
+
+    for Parsed in Futures:
+        addPlayerRowsToDict(Parsed.result(), PPlayersDict)
+    return None
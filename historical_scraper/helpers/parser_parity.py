@@ -0,0 +1,133 @@
+import io
+import os
+import time
+from contextlib import redirect_stdout
+from historical_scraper.helpers import soup_parsers
+from historical_scraper.helpers.utils import lxml_parsers
+from historical_scraper.helpers.archive import getArchivedFragments, readBlob
+
+# Parity check of the two parser backends. Every fragment in the html archive (helpers/archive.py) is parsed with both
+# the BeautifulSoup parsers and the lxml parsers, and the results have to be equal. A fragment one backend can't parse
+# has to fail the same way with the other. Run this after changing either backend, or after the site changed its html.
+# The html archive is not in git, so checkFixtureParity does the same over the small committed set in historical_scraper/fixtures,
+# one folder per archive kind, with the empty and "-" cases included. That one runs anywhere, the scraper doesn't have to have run first.
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+# Archive kind: the parse function used for it. "player-age" is only int()'d, so it isn't here.
+PARITY_FUNCTIONS = {
+    "team-roster": "parsePlayerRowDicts",
+    "player-details": "parsePersonalDetails",
+    "player-position": "parsePosition",
+    "goalie-season-all": "parseSeasonAllGoalieStas",
+    "goalie-season-levels": "parseGoalieStats",
+    "skater-season-all": "parseSeasonAllPlayerStas",
+    "skater-season-levels": "parsePlayerStats",
+}
+
+def runParser(PBackend: object, PFunctionName: str, PRawHtml: str) -> tuple[object, float]:
+    """
+    Runs one parse function of a backend module.
+
+    Returns:
+        tuple: (The parsed result, or the name of the error it raised; how many seconds the parse took)
+    """
+    Start = time.perf_counter()
+    try:
+        with redirect_stdout(io.StringIO()):    # The roster parser prints about odd rows, once per backend is enough noise
+            Result = getattr(PBackend, PFunctionName)(PRawHtml)
+    except Exception as e:
+        Result = f"raised {type(e).__name__}"
+    return Result, time.perf_counter() - Start
+
+def readFixtures(PKinds: list[str] = None) -> list[tuple[str, str, str]]:
+    """
+    Reads the committed html fixtures of the kinds.
+
+    Args:
+        PKinds (list[str]): The archive kinds to read, ex. ["team-roster"]. Defaults to all the kinds in PARITY_FUNCTIONS.
+
+    Returns:
+        list[tuple[str, str, str]]: (kind, file name, html) of every fixture, sorted by kind and name.
+    """
+    Fixtures = []
+    for Kind in sorted(PKinds or PARITY_FUNCTIONS.keys()):
+        KindDir = os.path.join(FIXTURES_DIR, Kind)
+        for FileName in sorted(os.listdir(KindDir)) if os.path.isdir(KindDir) else []:
+            with open(os.path.join(KindDir, FileName), encoding="utf-8") as File:
+                Fixtures.append((Kind, FileName, File.read()))
+    return Fixtures
+
+def compareFragment(PKind: str, PRawHtml: str, PSummary: dict, PName: str, PPrintLimit: int) -> None:
+    """
+    Parses one fragment with both backends and adds the result to PSummary. A mismatch is stored as (kind, PName).
+    """
+    SoupResult, SoupSeconds = runParser(soup_parsers, PARITY_FUNCTIONS[PKind], PRawHtml)
+    LxmlResult, LxmlSeconds = runParser(lxml_parsers, PARITY_FUNCTIONS[PKind], PRawHtml)
+
+    PSummary["fragments"] += 1
+    PSummary["bs4Seconds"] += SoupSeconds
+    PSummary["lxmlSeconds"] += LxmlSeconds
+
+    if SoupResult != LxmlResult:
+        PSummary["mismatches"].append((PKind, PName))
+        if len(PSummary["mismatches"]) <= PPrintLimit:
+            print(f"Mismatch in {PKind} {PName}:\n  bs4:  {str(SoupResult)[:300]}\n  lxml: {str(LxmlResult)[:300]}")
+    return None
+
+def printParitySummary(PSummary: dict) -> None:
+    Speedup = PSummary["bs4Seconds"] / PSummary["lxmlSeconds"] if PSummary["lxmlSeconds"] else 0.0
+    print(f"Checked {PSummary['fragments']} fragments, {len(PSummary['mismatches'])} mismatches. "
+          f"bs4 {PSummary['bs4Seconds']:.2f}s, lxml {PSummary['lxmlSeconds']:.2f}s ({Speedup:.1f}x faster)")
+    return None
+
+def checkParserParity(PKinds: list[str] = None, PPrintLimit: int = 10) -> dict:
+    """
+    Parses every archived fragment of the kinds with both backends and compares the results.
+
+    Args:
+        PKinds (list[str]): The archive kinds to check. Defaults to all the kinds in PARITY_FUNCTIONS.
+        PPrintLimit (int): How many of the differences are printed in full.
+
+    Returns:
+        dict: {"fragments": checked fragments, "mismatches": [(kind, content hash)...], "bs4Seconds": .., "lxmlSeconds": ..}
+    """
+    if lxml_parsers is None:
+        print("lxml is not installed, nothing to compare against")
+        return {"fragments": 0, "mismatches": [], "bs4Seconds": 0.0, "lxmlSeconds": 0.0}
+
+    Summary = {"fragments": 0, "mismatches": [], "bs4Seconds": 0.0, "lxmlSeconds": 0.0}
+    for Kind, ContentHash in getArchivedFragments(PKinds or list(PARITY_FUNCTIONS.keys())):
+        compareFragment(Kind, readBlob(ContentHash), Summary, ContentHash, PPrintLimit)
+
+    printParitySummary(Summary)
+    return Summary
+
+def checkFixtureParity(PKinds: list[str] = None) -> dict:
+    """
+    Parses every committed fixture (readFixtures) with both backends and compares the results.
+
+    Args:
+        PKinds (list[str]): The archive kinds to check. Defaults to all the kinds in PARITY_FUNCTIONS.
+
+    Returns:
+        dict: The same summary as checkParserParity, the mismatches are (kind, file name).
+
+    Raises:
+        AssertionError: If lxml is not installed, there are no fixtures, or the backends parse any fixture differently.
+    """
+    if lxml_parsers is None:
+        raise AssertionError("lxml is not installed, nothing to compare against")
+
+    Fixtures = readFixtures(PKinds)
+    if not Fixtures:
+        raise AssertionError(f"No fixtures in {FIXTURES_DIR}")
+
+    Summary = {"fragments": 0, "mismatches": [], "bs4Seconds": 0.0, "lxmlSeconds": 0.0}
+    for Kind, FileName, RawHtml in Fixtures:
+        compareFragment(Kind, RawHtml, Summary, FileName, len(Fixtures))
+
+    printParitySummary(Summary)
+    if Summary["mismatches"]:
+        raise AssertionError(f"The parser backends differ on {Summary['mismatches']}")
+    return Summary
@@ -1,10 +1,24 @@
 from bs4 import BeautifulSoup
-import sys
 from historical_scraper.models.player import Player
+from historical_scraper.errors import MissingElementError, UnexpectedLayoutError
 from historical_scraper.models.season import GoalieSeason, PlayerSeason, GoalieSeasonLevel, PlayerSeasonLevel
-from historical_scraper.config import CURRENT_YEAR
-from historical_scraper.helpers.utils import getSeasonsToScrape, parsePosition, parsePersonalDetails, parseAgeGroupLevelAndClub, parseSeasonAllGoalieStas, parseGoalieStats, parseSeasonAllPlayerStas, parsePlayerStats
-
+from historical_scraper.config import CURRENT_YEAR, PLAYER_SEASON_ENDPOINT, EXTRACTION_MODE, ARCHIVE_ENABLED
+from historical_scraper.helpers.archive import archiveFragment, archiveSeasonContainers
+from historical_scraper.helpers.waits import selectSeasonAndWait
+from historical_scraper.helpers.js_extract import extractPlayerSeasonStats
+from historical_scraper.helpers.utils import getSeasonsToScrape, parseSeasonOptions, parsePosition, parsePersonalDetails, parseAgeGroupLevelAndClub, parseSeasonAllGoalieStas, parseGoalieStats, parseSeasonAllPlayerStas, parsePlayerStats
+from historical_scraper.helpers.rate_limiter import throttledGoto
+from historical_scraper.helpers.fault_handling import retryCall
+from historical_scraper.helpers.parse_pool import isParsePoolEnabled, submitParse, runNow
+
+# The total stats of a season without any games. The page shows these for the seasons the player had no team.
+EMPTY_GOALIE_SEASON = {"Games": "0", "Played": "0", "GoalsAllowed": "0", "TimeOnIce": "0", "Gaa": "0"}
+EMPTY_PLAYER_SEASON = {"Games": "0", "Goals": "0", "Assists": "0", "Points": "0", "PenaltyMinutes": "0", "PpGoals": "0", "ShGoals": "0", "SoGoals": "0"}
+
+# The level stats container is sometimes filled in a moment after the total stats. It is read again every 100ms while it has no levels,
+# this many times per position, before the season is taken as a season without levels.
+LEVEL_STATS_ATTEMPTS = {"Maalivahti": 30}
+LEVEL_STATS_DEFAULT_ATTEMPTS = 15
 
 def fetchPlayerCareerData(PPlayerLink: str, PPlayerObject: Player, PPage: object) -> dict:
     """
@@ -24,8 +38,31 @@ def fetchPlayerCareerData(PPlayerLink: str, PPlayerObject: Player, PPage: object
     """
     print(f"\nScraping player: {PPlayerObject.sjlName}")
 
+    if not retryCall(discoverPlayer, PPlayerLink, PPlayerObject, PPage, PDescription=PPlayerObject.sjlName):  # Goes to the player page and writes the birth year and position to the object
+        # This is a player that is no more active, so sjl displays the information differently.
+        print(f"Failed to scrape {PPlayerObject.sjlName}. He hasn't played in the current year.\nResortin to using fetchRetiredPlayerCareerData")
+        fetchRetiredPlayerCareerData(PPlayerLink, PPlayerObject, PPage)     # This function does its best to handle the case, and still record all available data.
+        return None                                                         # Terminate the regular scraping. 
+
+    scrapeSeasonsForPlayer(PPlayerObject, PPage)                            # Scrape the player's seasons. Outcome Player.seasons <- SeasonObject.seasonLeveStats <- SeasonLevelObject
+
+
+    return None
+
+def discoverPlayer(PPlayerLink: str, PPlayerObject: Player, PPage: object) -> bool:
+    """
+    Goes to the player page and writes the birth year and position to the player object.
+
+    Args:
+        PPlayerLink (str): The link to the player's page.
+        PPlayerObject (Player): The player object to write the details to.
+        PPage (object): The Page object to use. Left on the player page.
+
+    Returns:
+        bool: True for an active player. False if the position is missing, which means the player hasn't played in the current year. Use discoverRetiredPlayer for those.
+    """
     # Open a browser and go to the desired player page
-    PPage.goto(PPlayerLink)
+    throttledGoto(PPage, PPlayerLink)
 
     # Wait for one second to load dynamic content
     PPage.wait_for_timeout(00)
@@ -33,27 +70,112 @@ def fetchPlayerCareerData(PPlayerLink: str, PPlayerObject: Player, PPage: object
     # Get the Html containing the personal details
     PPage.wait_for_selector(".pcm-basic-col", timeout=5000)                 # Wait for it to load
     PersonalDetailsHtml = PPage.locator(".pcm-basic-col").inner_html()      # Personal details are only scraped once per player
-    PersonalDetails = parsePersonalDetails(PersonalDetailsHtml)             # Parse the personal details into a dict
-    PPlayerObject.birthYear = PersonalDetails["DateOfBirth"]                # Add the date of birth to the player object. Potentially add more personal details later
+    writePersonalDetails(PPlayerObject, PPlayerLink, PersonalDetailsHtml)   # Parse the personal details and add the date of birth to the player object
 
     # Get the Html containing the player's position
     try:
         PPage.wait_for_selector("td.person-position", timeout=5000)         # Wait for it to load
         PositionHtml = PPage.locator("td.person-position").inner_html()     # Scrape the position info for player
-        Position = parsePosition(PositionHtml)                              # Parse the position into a string
-        PPlayerObject.position = Position                                   # Add the position to the player object for player
     except:
-        # This is a player that is no more active, so sjl displays the information differently.
-        print(f"Failed to scrape {PPlayerObject.sjlName}. He hasn't played in the current year.\nResortin to using fetchRetiredPlayerCareerData")
-        fetchRetiredPlayerCareerData(PPlayerLink, PPlayerObject, PPage)     # This function does its best to handle the case, and still record all available data.
-        return None                                                         # Terminate the regular scraping. 
+        return False                                                        # Retired players don't have the position on the page
+    
+    writePosition(PPlayerObject, PPlayerLink, PositionHtml)                 # Parse the position into a string and add it to the player object
 
-    scrapeSeasonsForPlayer(PPlayerObject, PPage)                            # Scrape the player's seasons. Outcome Player.seasons <- SeasonObject.seasonLeveStats <- SeasonLevelObject
+    return True
 
+# The parts of the player page scraping that don't touch the page. These are shared by the sync scraper here and the async scraper
+# (helpers/async_player_scraper.py), so the only difference between the two is whether the page is awaited.
 
-    return None
+def writePersonalDetails(PPlayerObject: Player, PPlayerLink: str, PPersonalDetailsHtml: str) -> None:
+    """
+    Parses the personal details container of the player page and writes the birth year to the player object. Archives the html when ARCHIVE_ENABLED.
+    """
+    if ARCHIVE_ENABLED:
+        archiveFragment(PPlayerLink, "", "player-details", PPersonalDetailsHtml)
+    PersonalDetails = parsePersonalDetails(PPersonalDetailsHtml)            # Parse the personal details into a dict
+    PPlayerObject.birthYear = PersonalDetails["DateOfBirth"]                # Potentially add more personal details later
+
+def writePosition(PPlayerObject: Player, PPlayerLink: str, PPositionHtml: str) -> None:
+    """
+    Parses the position cell of the player page and writes the position to the player object. Archives the html when ARCHIVE_ENABLED.
+    """
+    if ARCHIVE_ENABLED:
+        archiveFragment(PPlayerLink, "", "player-position", PPositionHtml)
+    PPlayerObject.position = parsePosition(PPositionHtml)
+
+def seasonStatsContainers(PPosition: str) -> list[str]:
+    """
+    Returns the selectors of the total stats container and the level stats container of the position on the player page.
+    """
+    if PPosition == "Maalivahti":
+        return ["#pcm-all-stats-container", "#pcss-goalie-serie-stats-series-container"]
+    return ["#psac-all-skater-stats-container", "#pcss-skater-serie-stats-series-container"]
+
+def levelStatsAttempts(PPosition: str) -> int:
+    """
+    Returns how many times the level stats of the position are read, 100ms apart, before the season is taken as a season without levels.
+    """
+    return LEVEL_STATS_ATTEMPTS.get(PPosition, LEVEL_STATS_DEFAULT_ATTEMPTS)
 
-def fetchPlayerSeasonHtml(PPage: object, PSeason: str, PPosition: str) -> dict:
+def hasParsedLevels(PParsedStats: dict, PPosition: str) -> bool:
+    """
+    Returns True if the parsed stats of a season, in the format fetchPlayerSeasonHtml returns, have at least one level.
+    """
+    LevelKey = "GoalieLevelStats" if PPosition == "Maalivahti" else "PlayerLevelStats"
+    return PParsedStats[LevelKey] != []
+
+def isSeasonAvailable(PSeason: str, PAvailableSeasons: list[str]) -> bool:
+    """
+    Returns False if the season is missing from the season dropdown (readAvailableSeasons), so it gets getEmptySeasonStats without a fetch.
+    True for every season if the dropdown couldn't be read.
+    """
+    return PAvailableSeasons is None or PSeason in PAvailableSeasons
+
+def retiredSeasonCandidates(PAvailableSeasons: list[str]) -> list[str]:
+    """
+    Returns the seasons to look for the last season of a retired player in, newest first. The seasons of the dropdown, or the last 10 seasons without it.
+    """
+    return PAvailableSeasons or getSeasonsToScrape("2000")                 # "2000" because its far enough birthdate to give the full 10 years.
+
+def writeRetiredBirthYear(PPlayerObject: Player, PPlayerLink: str, PPlayerAgeHtml: str) -> None:
+    """
+    Writes the (guessed) birth year of a retired player to the player object from the age on the page: current year - age. Archives the html when ARCHIVE_ENABLED.
+    """
+    if ARCHIVE_ENABLED:
+        archiveFragment(PPlayerLink, "", "player-age", PPlayerAgeHtml)
+    PPlayerObject.birthYear = CURRENT_YEAR - int(PPlayerAgeHtml)
+
+def writeRetiredPosition(PPlayerObject: Player, PGoalieVisible: bool, PSkaterVisible: bool) -> None:
+    """
+    Writes the position of a retired player to the player object from which of the total stats containers is visible.
+
+    Raises:
+        UnexpectedLayoutError: If both are visible.
+        MissingElementError: If neither is visible.
+    """
+    if PGoalieVisible and PSkaterVisible:
+        raise UnexpectedLayoutError(f"{PPlayerObject.sjlName} is a goalie and skater")
+
+    if not PGoalieVisible and not PSkaterVisible:
+        raise MissingElementError(f"{PPlayerObject.sjlName} is not a goalie or skater")
+
+    if PGoalieVisible:
+        print(f"{PPlayerObject.sjlName} is a goalie")
+        PPlayerObject.position = "Maalivahti"
+    else:
+        print(f"{PPlayerObject.sjlName} is a skater")
+        PPlayerObject.position = "Kenttäpelaaja"                 # The retired page doesn't tell forwards and defenders apart
+
+def addRetiredSeasonToPlayer(PPlayerObject: Player, PSeason: str, PStatsDict: dict) -> None:
+    """
+    Adds one season of a retired player to the player object. Like addSeasonToPlayer, but only the combined season stats are stored for retired players.
+    """
+    if PPlayerObject.position == "Maalivahti":
+        PPlayerObject.addSeason(GoalieSeason(PSeason, PStatsDict["SeasonAllGoalieStas"]))
+    else: # If position is "Kenttäpelaaja", "Hyökkääjä", "Puolustaja"
+        PPlayerObject.addSeason(PlayerSeason(PSeason, PStatsDict["SeasonAllPlayerStas"]))
+
+def fetchPlayerSeasonHtml(PPage: object, PSeason: str, PPosition: str, PPlayerLink: str = None) -> dict:
     """
     Fetches and parses the player's ONE SEASON statistics from the webpage.
 
@@ -61,6 +183,7 @@ def fetchPlayerSeasonHtml(PPage: object, PSeason: str, PPosition: str) -> dict:
         PPage (object): The page object representing the player's webpage.
         PSeason (str): The season for which the stats are to be fetched.
         PPosition (str): The position of the player, either "Maalivahti" (goalie) or "Kenttäpelaaja" (skater), "Hyökkääjä" or "Puolustaja".
+        PPlayerLink (str): The link of the player. The raw html is archived under it when ARCHIVE_ENABLED. Defaults to the url of the page.
 
     Returns:
         dict: A dictionary containing the parsed season statistics. For goalies, it includes "SeasonAllGoalieStas" (dict) and "GoalieLevelStats" (list of dicts). For skaters, it includes "SeasonAllPlayerStas" (dict) and "PlayerLevelStats" (list of dicts).
@@ -68,62 +191,174 @@ def fetchPlayerSeasonHtml(PPage: object, PSeason: str, PPosition: str) -> dict:
 
     # print(f"\n\nFetching stats for season {PSeason}\n")
 
-    # Select season and wait for a second for the content to laod
-    PPage.locator("select#pcss-season-select").select_option(PSeason)
-    PPage.wait_for_timeout(500)
-    
+    if EXTRACTION_MODE == "evaluate" and not ARCHIVE_ENABLED:
+        selectPlayerSeason(PPage, PSeason, PPosition)
+        ParsedStats = extractPlayerSeasonStats(PPage, PPosition)   # One page.evaluate call returns the parsed dicts, no html round-trip. The archive needs the html, so not used with it.
+        for _ in range(levelStatsAttempts(PPosition) - 1):
+            if hasParsedLevels(ParsedStats, PPosition):
+                break
+            PPage.wait_for_timeout(100)                            # The levels may not have been rendered yet, read again
+            ParsedStats = extractPlayerSeasonStats(PPage, PPosition)
+        return ParsedStats
+
+    SeasonAllStatsHtml, LevelStatsHtml = fetchPlayerSeasonContainers(PPage, PSeason, PPosition, PPlayerLink)
+    return parseSeasonContainers(SeasonAllStatsHtml, LevelStatsHtml, PPosition)
+
+def selectPlayerSeason(PPage: object, PSeason: str, PPosition: str) -> list[str]:
+    """
+    Selects the season on the player page and waits until the stats containers have been rendered for it.
+
+    Returns:
+        list[str]: The selectors of the total stats container and the level stats container of the position.
+    """
+    StatsContainers = seasonStatsContainers(PPosition)
+    selectSeasonAndWait(PPage, "select#pcss-season-select", PSeason, StatsContainers, PLAYER_SEASON_ENDPOINT, "player-season", 500)
+    return StatsContainers
+
+def fetchPlayerSeasonContainers(PPage: object, PSeason: str, PPosition: str, PPlayerLink: str = None) -> tuple[str, str]:
+    """
+    Selects the season and returns the raw html of its stats containers, without parsing them. Takes the same arguments as fetchPlayerSeasonHtml.
+
+    Returns:
+        tuple[str, str]: The inner html of the total stats container and of the level stats container. Parse them with parseSeasonContainers.
+    """
+    StatsContainers = selectPlayerSeason(PPage, PSeason, PPosition)
+
+    SeasonAllStatsHtml = PPage.locator(StatsContainers[0]).inner_html()     # Total stats THIS SEASON
+    LevelStatsHtml = readLevelStatsHtml(PPage, StatsContainers[1], PPosition)   # Stats per league THIS SEASON
+
+    if ARCHIVE_ENABLED:     # Keep the raw html, so it can be parsed again later without scraping (see helpers/archive.py)
+        archiveSeasonContainers(PPlayerLink or PPage.url, PSeason, PPosition, SeasonAllStatsHtml, LevelStatsHtml)
+
+    return SeasonAllStatsHtml, LevelStatsHtml
+
+def hasLevelRows(PLevelStatsHtml: str, PPosition: str) -> bool:
+    """
+    Returns True if the level stats container html has at least one level of the position.
+    """
     if PPosition == "Maalivahti":
-        SeasonAllStatsHtml = PPage.locator("#pcm-all-stats-container").inner_html()                 # Total stats for Goalie THIS SEASON
-        SeasonAllStats = parseSeasonAllGoalieStas(SeasonAllStatsHtml)                               # Parse the total stats into a dict
+        return parseGoalieStats(PLevelStatsHtml) != []
+    return parsePlayerStats(PLevelStatsHtml) != []
+
+def readLevelStatsHtml(PPage: object, PSelector: str, PPosition: str) -> str:
+    """
+    Reads the inner html of the level stats container. While it has no levels, it is read again every 100ms, LEVEL_STATS_ATTEMPTS times at most.
+    Without this, a container that hasn't been filled yet would be parsed as a season without levels and written as zero stats.
+
+    Args:
+        PPage (object): The Page object, with the season selected.
+        PSelector (str): The selector of the level stats container of the position.
+        PPosition (str): The position of the player.
+
+    Returns:
+        str: The inner html of the container. Still without levels if the player really had none that season.
+    """
+    LevelStatsHtml = PPage.locator(PSelector).inner_html()
+    for _ in range(levelStatsAttempts(PPosition) - 1):
+        if hasLevelRows(LevelStatsHtml, PPosition):
+            break
+        PPage.wait_for_timeout(100)
+        LevelStatsHtml = PPage.locator(PSelector).inner_html()
+    return LevelStatsHtml
+
+def fetchSeasonWithRetries(PPlayerObject: Player, PPage: object, PSeason: str) -> dict:
+    """
+    fetchPlayerSeasonHtml with the retries of helpers/fault_handling.py. The player page is loaded again before each retry,
+    so a half rendered page doesn't stay around.
+
+    Args:
+        PPlayerObject (Player): The player, with the position set.
+        PPage (object): The Page object to use. Must be loaded with the player page.
+        PSeason (str): The season to fetch.
+
+    Returns:
+        dict: The same dict as fetchPlayerSeasonHtml returns.
+    """
+    return retryCall(fetchPlayerSeasonHtml, PPage, PSeason, PPlayerObject.position, PPlayerObject.sjlLink,
+                     PDescription=f"season {PSeason} of {PPlayerObject.sjlName}", PBeforeRetry=lambda: throttledGoto(PPage, PPlayerObject.sjlLink))
+
+def parseSeasonContainers(PSeasonAllStatsHtml: str, PLevelStatsHtml: str, PPosition: str) -> dict:
+    """
+    Parses the html of the total stats container and the level stats container of ONE SEASON.
+    Used for the html read from the page, the http backend and the archive replay.
+
+    Args:
+        PSeasonAllStatsHtml (str): The inner html of the total stats container.
+        PLevelStatsHtml (str): The inner html of the level stats container.
+        PPosition (str): The position of the player, either "Maalivahti" (goalie) or "Kenttäpelaaja" (skater), "Hyökkääjä" or "Puolustaja".
+
+    Returns:
+        dict: The same dict as fetchPlayerSeasonHtml returns.
+    """
+    if PPosition == "Maalivahti":
+        SeasonAllStats = parseSeasonAllGoalieStas(PSeasonAllStatsHtml)                              # Parse the total stats into a dict
         
         if len(SeasonAllStats) == 0:                                                                # Try and make sure we dont miss any stats
-            print("SOS SeasonAllStats wrong")                                                       # Hopefully exit with some information
-            print(SeasonAllStatsHtml)
-            print(SeasonAllStats)
-            sys.exit(1)
-
-        GoalieLevelStats = []
-        Attempts = 0
-        while GoalieLevelStats == [] and Attempts < 30:
-            GoalieStatsHtml = PPage.locator("#pcss-goalie-serie-stats-series-container").inner_html()   # Goalie stats per league THIS SEASON
-            GoalieLevelStats = parseGoalieStats(GoalieStatsHtml)                                        # Parse the goalie stats into a dict
-            PPage.wait_for_timeout(100)                                                                 # Wait for 100ms
-            Attempts += 1                                                                               # After 15 attempts, give up.
+            print("SOS SeasonAllStats wrong")                                                       # Give up on this page with some information
+            print(PSeasonAllStatsHtml)
+            raise MissingElementError(f"SeasonAllStats wrong: {SeasonAllStats}")
+
+        GoalieLevelStats = parseGoalieStats(PLevelStatsHtml)                                        # Parse the goalie stats into a dict
 
         # If the goalie stats are empty, set the goalie stats to "0"
         if GoalieLevelStats == {}:
-            SeasonAllStats = {"Games": "0", "Played": "0", "GoalsAllowed": "0", "TimeOnIce": "0", "Gaa": "0"}
+            SeasonAllStats = dict(EMPTY_GOALIE_SEASON)
 
         # Store the total stats and goalie stats in a dict
         ParsedStats = {"SeasonAllGoalieStas": SeasonAllStats, "GoalieLevelStats": GoalieLevelStats}   
 
     else: # Position is "Kenttäpelaaja" aka player or "Hyökkääjä" or "Puolustaja"
-        SeasonAllStatsHtml = PPage.locator("#psac-all-skater-stats-container").inner_html()         # Total stats for Player THIS SEASON
-        SeasonAllStats = parseSeasonAllPlayerStas(SeasonAllStatsHtml)                               # Parse the total stats into a dict
+        SeasonAllStats = parseSeasonAllPlayerStas(PSeasonAllStatsHtml)                              # Parse the total stats into a dict
 
         if len(SeasonAllStats) == 0:                                                                # Try and make sure we dont miss any stats
-            print("SOS SeasonAllStats wrong")                                                       # Hopefully exit with some information
-            print(SeasonAllStatsHtml)
-            print(SeasonAllStats)
-            sys.exit(1)
-
-        PlayerLevelStats = []
-        Attempts = 0
-        while PlayerLevelStats == [] and Attempts < 15:
-            PlayerStatsHtml = PPage.locator("#pcss-skater-serie-stats-series-container").inner_html()   # Player stats per league THIS SEASON
-            PlayerLevelStats = parsePlayerStats(PlayerStatsHtml)                                        # Parse the player stats into a dict
-            PPage.wait_for_timeout(100)                                                                 # Wait for 100ms
-            Attempts += 1                                                                               # After 15 attempts, give up.
+            print("SOS SeasonAllStats wrong")                                                       # Give up on this page with some information
+            print(PSeasonAllStatsHtml)
+            raise MissingElementError(f"SeasonAllStats wrong: {SeasonAllStats}")
+
+        PlayerLevelStats = parsePlayerStats(PLevelStatsHtml)                                        # Parse the player stats into a dict
 
         # If the player stats are empty, set the player stats to "0"
         if PlayerLevelStats == []:
-            SeasonAllStats = {"Games": "0", "Goals": "0", "Assists": "0", "Points": "0", "PenaltyMinutes": "0", "PpGoals": "0", "ShGoals": "0", "SoGoals": "0"}
+            SeasonAllStats = dict(EMPTY_PLAYER_SEASON)
 
         # Store the total stats and player stats in a dict
         ParsedStats = {"SeasonAllPlayerStas": SeasonAllStats, "PlayerLevelStats": PlayerLevelStats}
         
     return ParsedStats
 
+def getEmptySeasonStats(PPosition: str) -> dict:
+    """
+    Returns the parsed stats of a season the player has no data for, in the format fetchPlayerSeasonHtml returns.
+    Used for the seasons missing from the season dropdown, so they don't need a page interaction.
+
+    Args:
+        PPosition (str): The position of the player, either "Maalivahti" (goalie) or "Kenttäpelaaja" (skater), "Hyökkääjä" or "Puolustaja".
+
+    Returns:
+        dict: The same zero stats parseSeasonContainers returns for a season without levels.
+    """
+    if PPosition == "Maalivahti":
+        return {"SeasonAllGoalieStas": dict(EMPTY_GOALIE_SEASON), "GoalieLevelStats": []}
+    return {"SeasonAllPlayerStas": dict(EMPTY_PLAYER_SEASON), "PlayerLevelStats": []}
+
+def readAvailableSeasons(PPage: object) -> list[str]:
+    """
+    Reads the seasons the player has data for from the season dropdown. This is one read of the page, no season is selected.
+
+    Args:
+        PPage (object): The Page object to use. Must be loaded with the player page.
+
+    Returns:
+        list[str]: The seasons in the dropdown, newest first ["2025", "2023"...]. None if the dropdown can't be read, then every season has to be fetched.
+    """
+    try:
+        SelectHtml = PPage.locator("select#pcss-season-select").inner_html(timeout=5000)
+    except Exception as e:
+        print(f"Could not read the season dropdown: {e}")
+        return None
+
+    return parseSeasonOptions(SelectHtml) or None
+
 def scrapeSeasonsForPlayer(PPlayerObject: Player, PPage: object):
     """
     Scrapes the player's stats for all seasons in the list obtained from getSeasonsToScrape and stores them in the player object.
@@ -142,23 +377,79 @@ def scrapeSeasonsForPlayer(PPlayerObject: Player, PPage: object):
     SeasonsToScrape = getSeasonsToScrape(PPlayerObject.birthYear)       
 
     # Get the Html containing the player's season stats
-    for Season in SeasonsToScrape:
-        StatsDict = fetchPlayerSeasonHtml(PPage, Season, PPlayerObject.position)  # Fetch the player's season stats. It is stored in dict.
-        
-        if PPlayerObject.position == "Maalivahti":
-            SeasonObject = GoalieSeason(Season, StatsDict["SeasonAllGoalieStas"])   # Here we create a object to represent the whole season
-            PPlayerObject.addSeason(SeasonObject)                                   # Add the season object to the player object.seasons
-            for Level in StatsDict["GoalieLevelStats"]:                             # Iterate over all the levels in the season
-                SeasonLevelObject = GoalieSeasonLevel(Level)                        # Create a object to represent the games they played on one season at this level
-                SeasonObject.addLevelStat(SeasonLevelObject)                        # Add the level object to the season object.seasonLevelStats
+    for Season, StatsDict in fetchSeasonsForPlayer(PPlayerObject, PPage, SeasonsToScrape):
+        addSeasonToPlayer(PPlayerObject, Season, StatsDict)                       # Build the season and level objects and add them to the player object
+
+def fetchSeasonsForPlayer(PPlayerObject: Player, PPage: object, PSeasons: list[str]) -> list[tuple[str, dict]]:
+    """
+    Fetches and parses the given seasons of the player. The seasons missing from the season dropdown get zero stats without a fetch.
+    When the parse pool is on (helpers/parse_pool.py), the containers of a season are parsed in the pool while the browser fetches the next season.
+
+    Args:
+        PPlayerObject (Player): The player, with the position set.
+        PPage (object): The Page object to use. Must be loaded with the player page.
+        PSeasons (list[str]): The seasons to fetch, ex. ["2025", "2024"]
+
+    Returns:
+        list[tuple[str, dict]]: (Season, StatsDict) in the order of PSeasons. StatsDict is the dict fetchPlayerSeasonHtml returns.
+    """
+    AvailableSeasons = readAvailableSeasons(PPage)                      # The seasons the player has data for. None if the dropdown couldn't be read.
+    ParseInPool = isParsePoolEnabled() and (EXTRACTION_MODE == "html" or ARCHIVE_ENABLED)
+
+    PendingSeasons = []
+    for Season in PSeasons:
+        if not isSeasonAvailable(Season, AvailableSeasons):
+            PendingSeasons.append((Season, None))                       # No team that season, so the page would only show zeros
+        elif ParseInPool:
+            SeasonAllStatsHtml, LevelStatsHtml = retryCall(fetchPlayerSeasonContainers, PPage, Season, PPlayerObject.position, PPlayerObject.sjlLink,
+                                                           PDescription=f"season {Season} of {PPlayerObject.sjlName}", PBeforeRetry=lambda: throttledGoto(PPage, PPlayerObject.sjlLink))
+            PendingSeasons.append((Season, submitParse(parseSeasonContainers, SeasonAllStatsHtml, LevelStatsHtml, PPlayerObject.position)))
+        else:
+            PendingSeasons.append((Season, runNow(fetchSeasonWithRetries, PPlayerObject, PPage, Season)))   # Parsed here, or in the browser with EXTRACTION_MODE "evaluate"
+
+    Seasons = []
+    for Season, Parsed in PendingSeasons:
+        if Parsed is None:
+            StatsDict = getEmptySeasonStats(PPlayerObject.position)
+        else:
+            try:
+                StatsDict = Parsed.result()
+            except MissingElementError:
+                if not ParseInPool:
+                    raise                                               # fetchSeasonWithRetries already retried it
+                StatsDict = fetchSeasonWithRetries(PPlayerObject, PPage, Season)    # The containers were half rendered, fetch the season again
+        Seasons.append((Season, StatsDict))
+
+    return Seasons
+
+def addSeasonToPlayer(PPlayerObject: Player, PSeason: str, PStatsDict: dict) -> None:
+    """
+    Creates the Season object (and its SeasonLevel objects) from one season's parsed stats and adds it to the player object.
+    This is shared by the sync scraper, the async scraper and any other path that produces the dict returned by fetchPlayerSeasonHtml.
 
+    Args:
+        PPlayerObject (Player): The player object to add the season to. Its position decides between goalie and skater objects.
+        PSeason (str): The season year, ex. "2025".
+        PStatsDict (dict): The parsed stats for the season, in the format returned by fetchPlayerSeasonHtml.
 
-        else: # If position is "Kenttäpelaaja" "Puolustaja" or "Hyökkääjä"
-            SeasonObject = PlayerSeason(Season, StatsDict["SeasonAllPlayerStas"])   # Create a object to represent the whole season
-            PPlayerObject.addSeason(SeasonObject)                                   # Add the season object to the player object.seasons
-            for Level in StatsDict["PlayerLevelStats"]:                             # Iterate over all the levels in the season
-                SeasonLevelObject = PlayerSeasonLevel(Level)                        # Create a object to represent the games they played on one season at this level
-                SeasonObject.addLevelStat(SeasonLevelObject)                        # Add the level object to the season object.seasonLevelStats
+    Returns:
+        None
+    """
+    if PPlayerObject.position == "Maalivahti":
+        SeasonObject = GoalieSeason(PSeason, PStatsDict["SeasonAllGoalieStas"])  # Here we create a object to represent the whole season
+        PPlayerObject.addSeason(SeasonObject)                                   # Add the season object to the player object.seasons
+        for Level in PStatsDict["GoalieLevelStats"]:                            # Iterate over all the levels in the season
+            SeasonLevelObject = GoalieSeasonLevel(Level)                        # Create a object to represent the games they played on one season at this level
+            SeasonObject.addLevelStat(SeasonLevelObject)                        # Add the level object to the season object.seasonLevelStats
+
+    else: # If position is "Kenttäpelaaja" "Puolustaja" or "Hyökkääjä"
+        SeasonObject = PlayerSeason(PSeason, PStatsDict["SeasonAllPlayerStas"])  # Create a object to represent the whole season
+        PPlayerObject.addSeason(SeasonObject)                                   # Add the season object to the player object.seasons
+        for Level in PStatsDict["PlayerLevelStats"]:                            # Iterate over all the levels in the season
+            SeasonLevelObject = PlayerSeasonLevel(Level)                        # Create a object to represent the games they played on one season at this level
+            SeasonObject.addLevelStat(SeasonLevelObject)                        # Add the level object to the season object.seasonLevelStats
+
+    return None
 
 def writeSeasonLevelDetails(PPlayersDict: dict) -> None:
     """
@@ -198,14 +489,40 @@ def fetchRetiredPlayerCareerData(PPlayerLink: str, PPlayerObject: Player, PPage:
         dict: The dictionary with the player data, containing the player's personal details, position and season stats.
     """
 
-    # This gets the last 10 seasons as strings  ["2025", "2024", "2023"...]
-    SeasonsToScrape = getSeasonsToScrape("2000") # "2000" because its far enough birthdate to give the full 10 years.
+    LastSeasonPlayed = discoverRetiredPlayer(PPlayerLink, PPlayerObject, PPage)    # Writes the position and birth year to the player object
+
+    # Get the range of seasons to scrape. Last year played - (assumed) U13 season.
+    SeasonsToScrape = getSeasonsToScrape(PPlayerObject.birthYear, LastSeasonPlayed)
+
+    # Get the Html containing the player's season stats
+    for Season, StatsDict in fetchSeasonsForPlayer(PPlayerObject, PPage, SeasonsToScrape):
+        print(f"{Season} season stats: {StatsDict}")                       # DEBUG PRINT
+        addRetiredSeasonToPlayer(PPlayerObject, Season, StatsDict)          # Only the combined season stats are stored for retired players
+
+
+    return None
+
+def discoverRetiredPlayer(PPlayerLink: str, PPlayerObject: Player, PPage: object) -> str:
+    """
+    Finds the last season a retired player played, and writes the position and (guessed) birth year to the player object.
+    The newest season in the season dropdown is the last season played, so only that season is selected.
+    If the dropdown can't be read, the last 10 seasons are tried one by one.
+
+    Args:
+        PPlayerLink (str): The link to the player's page.
+        PPlayerObject (Player): The player object to write the details to.
+        PPage (object): The Page object to use. Must be loaded with the player page.
+
+    Returns:
+        str: The last season the player played, ex. "2023". None if no season has any data.
+    """
+    # The seasons the player has data for, newest first. Without the dropdown, this gets the last 10 seasons as strings  ["2025", "2024", "2023"...]
+    SeasonsToScrape = retiredSeasonCandidates(readAvailableSeasons(PPage))
     LastSeasonPlayed = None
 
     # Try to find the last the seasons the player has still played
     for Season in SeasonsToScrape:
-        PPage.locator("select#pcss-season-select").select_option(Season)
-        PPage.wait_for_timeout(800)
+        selectSeasonAndWait(PPage, "select#pcss-season-select", Season, ["#pcss-player-season-teams"], PLAYER_SEASON_ENDPOINT, "retired-season", 800)
         SeasonTeamsHtml = PPage.locator("#pcss-player-season-teams").inner_html()
         
         # Since this seasons html contain some data, this is the last season they played.
@@ -217,36 +534,11 @@ def fetchRetiredPlayerCareerData(PPlayerLink: str, PPlayerObject: Player, PPage:
             checkRetiredPoistion(PPlayerObject, PPage)
 
             # Get the birth year for the player (Guess current year - Age )
-            PlayerAge = int(PPage.locator("#pcm-player-age").inner_html())
-            PlayerBirthYear = CURRENT_YEAR - PlayerAge
-            PPlayerObject.birthYear = PlayerBirthYear
+            PlayerAgeHtml = PPage.locator("#pcm-player-age").inner_html()
+            writeRetiredBirthYear(PPlayerObject, PPlayerLink, PlayerAgeHtml)
             break
     
-    # Get the range of seasons to scrape. Last year played - (assumed) U13 season.
-    SeasonsToScrape = getSeasonsToScrape(PPlayerObject.birthYear, LastSeasonPlayed)
-
-    # Get the Html containing the player's season stats
-    for Season in SeasonsToScrape:
-        StatsDict = fetchPlayerSeasonHtml(PPage, Season, PPlayerObject.position)  # Fetch the player's season stats. It is stored in dict.
-        
-        if PPlayerObject.position == "Maalivahti":
-            print(f"{Season} SeasonAllGoalieStas: {StatsDict["SeasonAllGoalieStas"]}")
-            SeasonObject = GoalieSeason(Season, StatsDict["SeasonAllGoalieStas"])
-            for Level in StatsDict["GoalieLevelStats"]:   # DEBUG PRINT
-                print(f"{Level}")
-            # PlayerDataDict[Season] = StatsDict
-            PPlayerObject.addSeason(SeasonObject)
-
-        else: # If position is "Kenttäpelaaja", "Hyökkääjä", "Puolustaja"
-            print(f"{Season} SeasonAllPlayerStas: {StatsDict["SeasonAllPlayerStas"]}")
-            for Level in StatsDict["PlayerLevelStats"]:   # DEBUG PRINT
-                print(f"{Level}")
-            # PlayerDataDict[Season] = StatsDict
-            SeasonObject = PlayerSeason(Season, StatsDict["SeasonAllPlayerStas"])
-            PPlayerObject.addSeason(SeasonObject)
-
-
-    return None
+    return LastSeasonPlayed
 
 def checkRetiredPoistion(PPlayerObject: Player, PPage: object) -> None:
     """
@@ -259,26 +551,8 @@ def checkRetiredPoistion(PPlayerObject: Player, PPage: object) -> None:
     Returns:
         None
     """
-    GoalieDiv = PPage.locator("#psac-all-goalie-stats-container")
-    PlayerDiv = PPage.locator("#psac-all-skater-stats-container")
-
-    # Player is a goalie
-    if GoalieDiv.is_visible():
-        print(f"{PPlayerObject.sjlName} is a goalie")
-        PPlayerObject.position = "Maalivahti"            
-
-    # Player is a skater
-    if PlayerDiv.is_visible():
-        print(f"{PPlayerObject.sjlName} is a skater")
-        PPlayerObject.position in ["Kenttäpelaaja", "Hyökkääjä", "Puolustaja"]
-
-    # Player is not a goalie or skater
-    if not GoalieDiv.is_visible() and not PlayerDiv.is_visible():
-        print(f"{PPlayerObject.sjlName} is not a goalie or skater")
-        sys.exit(1)
-
-    if GoalieDiv.is_visible() and PlayerDiv.is_visible():
-        print(f"{PPlayerObject.sjlName} is a goalie and skater")
-        sys.exit(1)
+    GoalieVisible = PPage.locator("#psac-all-goalie-stats-container").is_visible()
+    SkaterVisible = PPage.locator("#psac-all-skater-stats-container").is_visible()
+    writeRetiredPosition(PPlayerObject, GoalieVisible, SkaterVisible)      # Raises if the page shows both or neither
 
     return None
\ No newline at end of file
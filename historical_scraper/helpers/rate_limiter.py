@@ -0,0 +1,268 @@
+import time
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from urllib.parse import urlparse
+from historical_scraper.config import (RATE_LIMIT_ENABLED, RATE_INITIAL_PER_SECOND, RATE_MIN_PER_SECOND, RATE_MAX_PER_SECOND, RATE_INCREASE_PER_SECOND, RATE_BURST,
+                                       CONCURRENCY_MIN, CONCURRENCY_MAX, RATE_WINDOW_REQUESTS, RATE_TARGET_LATENCY_MS, RATE_MAX_ERROR_RATE, RATE_METRICS_INTERVAL_SECONDS)
+
+# Shared politeness and throughput controller for everything that loads data from the site.
+# Each host has a token bucket (requests per second) and a concurrency limit (requests in flight). Both are tuned with AIMD:
+# after every RATE_WINDOW_REQUESTS finished requests the window is checked, and if the average latency or the error rate is too high
+# both limits are halved, otherwise they are raised by one step. A failed request halves them right away, at most once per window.
+# The state is per process and guarded by a threading.Lock, so the sync scraper, threads and the asyncio scraper all share it.
+# The worker processes (historical_scraper/worker.py) each have their own controller, so start them with a lower SCRAPER_RATE_PER_SECOND.
+
+class HostController:
+    """
+    The token bucket and the AIMD state of one host. Only used through acquireSlot / releaseSlot, which hold ControllerLock.
+    """
+    def __init__(self, Host):
+        self.host = Host
+        self.rate = RATE_INITIAL_PER_SECOND         # Tokens added per second
+        self.tokens = float(RATE_BURST)
+        self.lastRefill = time.monotonic()
+        self.concurrency = max(CONCURRENCY_MIN, min(CONCURRENCY_MAX, int(RATE_INITIAL_PER_SECOND)))
+        self.inFlight = 0
+
+        self.windowCount = 0            # Finished requests in the current window
+        self.windowErrors = 0
+        self.windowLatencyMs = 0.0
+        self.decreasedInWindow = False  # A failure only halves the limits once per window
+
+        self.requests = 0               # Totals for the metrics
+        self.errors = 0
+        self.totalLatencyMs = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.recentStarts = []          # Start times of the last requests, for the observed request rate
+
+    def refill(self, PNow: float) -> None:
+        self.tokens = min(float(RATE_BURST), self.tokens + (PNow - self.lastRefill) * self.rate)
+        self.lastRefill = PNow
+
+    def decrease(self) -> None:
+        self.rate = max(RATE_MIN_PER_SECOND, self.rate / 2)
+        self.concurrency = max(CONCURRENCY_MIN, self.concurrency // 2)
+        self.decreases += 1
+
+    def increase(self) -> None:
+        self.rate = min(RATE_MAX_PER_SECOND, self.rate + RATE_INCREASE_PER_SECOND)
+        self.concurrency = min(CONCURRENCY_MAX, self.concurrency + 1)
+        self.increases += 1
+
+class RequestSlot:
+    """
+    Handed out by throttled / throttledAsync. Set .failed = True if the request didn't fail with an exception but still went wrong, ex. a wait timed out.
+    """
+    def __init__(self, Controller, StartTime):
+        self.controller = Controller
+        self.startTime = StartTime
+        self.failed = False
+
+Controllers = {}                    # Key is the host, value is its HostController
+ControllerLock = threading.Lock()
+LastMetricsPrint = time.monotonic()
+
+def getHost(PUrl: str) -> str:
+    """
+    Returns the host of a url, ex. "www.leijonat.fi". Relative urls (the http backend's endpoints) return "".
+    """
+    return urlparse(PUrl or "").netloc
+
+def getController(PHost: str) -> HostController:
+    """
+    Returns the controller of the host, creating it on the first call. Must be called with ControllerLock held.
+    """
+    if PHost not in Controllers:
+        Controllers[PHost] = HostController(PHost)
+    return Controllers[PHost]
+
+def tryAcquireSlot(PHost: str) -> tuple:
+    """
+    Takes a token and a concurrency slot of the host if both are free.
+
+    Args:
+        PHost (str): The host the request goes to.
+
+    Returns:
+        tuple: (RequestSlot, 0) if the request can go, (None, SecondsToWait) if not.
+    """
+    with ControllerLock:
+        Controller = getController(PHost)
+        Now = time.monotonic()
+        Controller.refill(Now)
+
+        if Controller.inFlight >= Controller.concurrency:
+            return None, 0.05                                       # Wait for a request to finish
+        if Controller.tokens < 1:
+            return None, (1 - Controller.tokens) / Controller.rate  # Wait for the next token
+
+        Controller.tokens -= 1
+        Controller.inFlight += 1
+        Controller.recentStarts.append(Now)
+        if len(Controller.recentStarts) > 200:
+            del Controller.recentStarts[:100]
+        return RequestSlot(Controller, Now), 0
+
+def releaseSlot(PSlot: RequestSlot) -> None:
+    """
+    Records a finished request and makes the AIMD decision when the window is full.
+
+    Args:
+        PSlot (RequestSlot): The slot from tryAcquireSlot.
+
+    Returns:
+        None
+    """
+    LatencyMs = (time.monotonic() - PSlot.startTime) * 1000
+    with ControllerLock:
+        Controller = PSlot.controller
+        Controller.inFlight -= 1
+        Controller.requests += 1
+        Controller.totalLatencyMs += LatencyMs
+        Controller.windowCount += 1
+        Controller.windowLatencyMs += LatencyMs
+
+        if PSlot.failed:
+            Controller.errors += 1
+            Controller.windowErrors += 1
+            if not Controller.decreasedInWindow:            # Back off right away, the site is struggling
+                Controller.decrease()
+                Controller.decreasedInWindow = True
+
+        if Controller.windowCount >= RATE_WINDOW_REQUESTS:
+            AvgLatencyMs = Controller.windowLatencyMs / Controller.windowCount
+            ErrorRate = Controller.windowErrors / Controller.windowCount
+            if AvgLatencyMs > RATE_TARGET_LATENCY_MS or ErrorRate > RATE_MAX_ERROR_RATE:
+                if not Controller.decreasedInWindow:
+                    Controller.decrease()
+            else:
+                Controller.increase()
+            Controller.windowCount = 0
+            Controller.windowErrors = 0
+            Controller.windowLatencyMs = 0.0
+            Controller.decreasedInWindow = False
+
+    printLiveMetrics()
+    return None
+
+@contextmanager
+def throttled(PUrl: str):
+    """
+    Waits until a request to the host of PUrl is allowed, and records how it went. An exception inside the block counts as a failed request.
+
+        with throttled(PlayerLink):
+            Page.goto(PlayerLink)
+
+    Args:
+        PUrl (str): The url of the request. Only the host is used.
+
+    Yields:
+        RequestSlot: The slot of the request, or None if RATE_LIMIT_ENABLED is off.
+    """
+    if not RATE_LIMIT_ENABLED:
+        yield None
+        return
+
+    Host = getHost(PUrl)
+    while True:
+        Slot, WaitSeconds = tryAcquireSlot(Host)
+        if Slot is not None:
+            break
+        time.sleep(WaitSeconds)
+
+    try:
+        yield Slot
+    except BaseException:
+        Slot.failed = True
+        raise
+    finally:
+        releaseSlot(Slot)
+
+@asynccontextmanager
+async def throttledAsync(PUrl: str):
+    """
+    Async version of throttled, for the async scraper. Waits with asyncio.sleep, so the other coroutines keep running.
+    """
+    if not RATE_LIMIT_ENABLED:
+        yield None
+        return
+
+    Host = getHost(PUrl)
+    while True:
+        Slot, WaitSeconds = tryAcquireSlot(Host)
+        if Slot is not None:
+            break
+        await asyncio.sleep(WaitSeconds)
+
+    try:
+        yield Slot
+    except BaseException:
+        Slot.failed = True
+        raise
+    finally:
+        releaseSlot(Slot)
+
+def throttledGoto(PPage: object, PUrl: str) -> None:
+    """
+    PPage.goto(PUrl) through the rate limiter.
+    """
+    with throttled(PUrl):
+        PPage.goto(PUrl)
+    return None
+
+async def throttledGotoAsync(PPage: object, PUrl: str) -> None:
+    """
+    Async version of throttledGoto.
+    """
+    async with throttledAsync(PUrl):
+        await PPage.goto(PUrl)
+    return None
+
+def getRateMetrics() -> dict:
+    """
+    Returns the live state of the controller of each host.
+
+    Returns:
+        dict: Key is the host, value is a dict with "Concurrency", "InFlight", "RateLimit" (tokens per second), "RequestRate" (requests
+        started per second in the last 10 seconds), "Requests", "Errors", "AvgLatencyMs", "Increases" and "Decreases".
+    """
+    Metrics = {}
+    Now = time.monotonic()
+    with ControllerLock:
+        for Host, Controller in Controllers.items():
+            RecentCount = len([Start for Start in Controller.recentStarts if Now - Start <= 10])
+            Metrics[Host or "http-backend"] = {
+                "Concurrency": Controller.concurrency,
+                "InFlight": Controller.inFlight,
+                "RateLimit": round(Controller.rate, 2),
+                "RequestRate": round(RecentCount / 10, 2),
+                "Requests": Controller.requests,
+                "Errors": Controller.errors,
+                "AvgLatencyMs": round(Controller.totalLatencyMs / Controller.requests, 1) if Controller.requests else 0.0,
+                "Increases": Controller.increases,
+                "Decreases": Controller.decreases,
+            }
+    return Metrics
+
+def printRateMetrics() -> None:
+    """
+    Prints the metrics from getRateMetrics(), one line per host.
+    """
+    for Host, Metrics in getRateMetrics().items():
+        print(f"Rate {Host}: concurrency {Metrics['Concurrency']} ({Metrics['InFlight']} in flight), limit {Metrics['RateLimit']}/s, "
+              f"now {Metrics['RequestRate']}/s, {Metrics['Requests']} requests, {Metrics['Errors']} errors, avg {Metrics['AvgLatencyMs']}ms, "
+              f"{Metrics['Increases']} ups / {Metrics['Decreases']} backoffs")
+    return None
+
+def printLiveMetrics() -> None:
+    """
+    Prints the metrics every RATE_METRICS_INTERVAL_SECONDS while the scraper runs.
+    """
+    global LastMetricsPrint
+    if RATE_METRICS_INTERVAL_SECONDS <= 0 or time.monotonic() - LastMetricsPrint < RATE_METRICS_INTERVAL_SECONDS:
+        return None
+    LastMetricsPrint = time.monotonic()
+    printRateMetrics()
+    return None
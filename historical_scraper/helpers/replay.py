@@ -0,0 +1,136 @@
+from historical_scraper.models.team import Team
+from historical_scraper.models.player import Player
+from historical_scraper.models.season import GoalieSeason, PlayerSeason
+from historical_scraper.config import CURRENT_YEAR
+from historical_scraper.helpers.archive import getLatestFragment, getArchivedSeasons
+from historical_scraper.helpers.utils import getSeasons, getSeasonsToScrape, parsePosition, parsePersonalDetails
+from historical_scraper.helpers.player_scraper import addSeasonToPlayer, parseSeasonContainers
+
+# Offline replay. Rebuilds the same Team and Player objects the scrapers build, but reads the html from the archive (helpers/archive.py)
+# instead of the website. Used to re-run changed parsers over old fetches without scraping the site again.
+
+def replayClubData(PTeamIds: list[str], PNumberOfSeasons: int, PClubList: list) -> None:
+    """
+    Archive version of team_scraper.scrapeClubData. Builds the team objects from the archived "team-roster" fragments.
+
+    Args:
+        PTeamIds (list[str]): The team IDs of the teams to replay.
+        PNumberOfSeasons (int): The number of seasons to replay.
+        PClubList (list[object]): A list to hold the team objects.
+
+    Returns:
+        None: Edits in place the PClubList. Seasons that are not in the archive are skipped.
+    """
+    Seasons = []
+    getSeasons(PNumberOfSeasons, Seasons)   # Populates the list with year strings ["2025", "2024"...]
+
+    for TeamId in PTeamIds:
+        Link = f"https://www.leijonat.fi/joukkueet?teamid={TeamId}"
+        TeamObject = Team(TeamId, TeamId, Link)     # The team name isn't archived. It is only used in prints, so the id will do.
+
+        for Season in Seasons:
+            RawHtml = getLatestFragment(Link, Season, "team-roster")
+            if RawHtml is None:
+                print(f"No archived roster for team {TeamId} season {Season}")
+                continue
+            TeamObject.addSeasonRosterHtml(Season, RawHtml)
+
+        PClubList.append(TeamObject)
+
+    return None
+
+def replaySeasonStats(PPlayerLink: str, PSeason: str, PPosition: str) -> dict:
+    """
+    Archive version of player_scraper.fetchPlayerSeasonHtml. Parses the archived containers of one season.
+
+    Args:
+        PPlayerLink (str): The player link the containers were archived under.
+        PSeason (str): The season, ex. "2025".
+        PPosition (str): The position of the player.
+
+    Returns:
+        dict: The same dict as fetchPlayerSeasonHtml returns, or None if the season is not in the archive.
+    """
+    Prefix = "goalie" if PPosition == "Maalivahti" else "skater"
+    SeasonAllStatsHtml = getLatestFragment(PPlayerLink, PSeason, f"{Prefix}-season-all")
+    LevelStatsHtml = getLatestFragment(PPlayerLink, PSeason, f"{Prefix}-season-levels")
+
+    if SeasonAllStatsHtml is None or LevelStatsHtml is None:
+        return None
+
+    return parseSeasonContainers(SeasonAllStatsHtml, LevelStatsHtml, PPosition)
+
+def replayRetiredPlayerCareerData(PPlayerObject: Player) -> bool:
+    """
+    Archive version of player_scraper.fetchRetiredPlayerCareerData.
+    The position is taken from which kind of season containers were archived, and the birth year from the archived age.
+    Like the scraper, no levels are added for retired players.
+
+    Args:
+        PPlayerObject (Player): The player object to fill.
+
+    Returns:
+        bool: True if the player could be replayed, False if the archive is missing the needed fragments.
+    """
+    PlayerAgeHtml = getLatestFragment(PPlayerObject.sjlLink, "", "player-age")
+    if PlayerAgeHtml is None:
+        return False
+
+    GoalieSeasons = getArchivedSeasons(PPlayerObject.sjlLink, "goalie-season-all")
+    SkaterSeasons = getArchivedSeasons(PPlayerObject.sjlLink, "skater-season-all")
+    if GoalieSeasons and SkaterSeasons:         # The scraper stops on players that are both, so the archive shouldn't have these
+        print(f"{PPlayerObject.sjlName} has both goalie and skater seasons archived")
+        return False
+
+    PPlayerObject.position = "Maalivahti" if GoalieSeasons else "Kenttäpelaaja"
+    PPlayerObject.birthYear = CURRENT_YEAR - int(PlayerAgeHtml)
+
+    for Season in (GoalieSeasons or SkaterSeasons):
+        StatsDict = replaySeasonStats(PPlayerObject.sjlLink, Season, PPlayerObject.position)
+        if StatsDict is None:                   # Only part of the season was archived. Skipped, zero stats would overwrite a season that has data
+            print(f"Season {Season} of {PPlayerObject.sjlName} is not fully in the archive, skipping it")
+            continue
+        if PPlayerObject.position == "Maalivahti":
+            PPlayerObject.addSeason(GoalieSeason(Season, StatsDict["SeasonAllGoalieStas"]))
+        else:
+            PPlayerObject.addSeason(PlayerSeason(Season, StatsDict["SeasonAllPlayerStas"]))
+
+    return True
+
+def replayPlayerCareerData(PPlayerObject: Player) -> bool:
+    """
+    Archive version of player_scraper.fetchPlayerCareerData. Fills the player object from the archived fragments of the player.
+
+    Args:
+        PPlayerObject (Player): The player object to fill. Only edited once all the needed fragments are found for an active player.
+
+    Returns:
+        bool: True if the player could be replayed, False if the archive is missing the needed fragments.
+    """
+    print(f"\nReplaying player: {PPlayerObject.sjlName}")
+
+    PersonalDetailsHtml = getLatestFragment(PPlayerObject.sjlLink, "", "player-details")
+    if PersonalDetailsHtml is None:
+        return False
+
+    PositionHtml = getLatestFragment(PPlayerObject.sjlLink, "", "player-position")
+    if PositionHtml is None:                    # Only active players have the position archived
+        return replayRetiredPlayerCareerData(PPlayerObject)
+
+    BirthYear = parsePersonalDetails(PersonalDetailsHtml)["DateOfBirth"]
+    Position = parsePosition(PositionHtml)
+
+    SeasonStats = []
+    for Season in getSeasonsToScrape(BirthYear):
+        StatsDict = replaySeasonStats(PPlayerObject.sjlLink, Season, Position)
+        if StatsDict is None:
+            print(f"Season {Season} of {PPlayerObject.sjlName} is not in the archive")
+            return False
+        SeasonStats.append((Season, StatsDict))
+
+    PPlayerObject.birthYear = BirthYear
+    PPlayerObject.position = Position
+    for Season, StatsDict in SeasonStats:
+        addSeasonToPlayer(PPlayerObject, Season, StatsDict)
+
+    return True
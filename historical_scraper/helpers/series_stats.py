@@ -0,0 +1,190 @@
+from bs4 import BeautifulSoup
+from urllib.parse import urlparse, parse_qsl
+from historical_scraper.models.player import Player
+from historical_scraper.models.season import GoalieSeason, PlayerSeason, GoalieSeasonLevel, PlayerSeasonLevel
+from historical_scraper.config import SERIES_STATS_URL, SERIES_SKATER_TABLE, SERIES_GOALIE_TABLE, ARCHIVE_ENABLED
+from historical_scraper.helpers.archive import archiveFragment
+from historical_scraper.helpers.utils import parseAgeGroupLevelAndClub
+from historical_scraper.helpers.rate_limiter import throttledGoto
+
+# Series stat tables. One page of a series (ex. "U16 AAA") lists every skater and goalie of the series for a season,
+# so one page load gives the level rows of hundreds of players, instead of one player page and up to 10 season selects per player.
+# The columns are found by their header text, so a reordered table still parses.
+
+# Header text (upper case) -> key in the level dicts. The same keys parsePlayerStats / parseGoalieStats use.
+SKATER_HEADER_KEYS = {"PELAAJA": "Name", "NIMI": "Name", "JOUKKUE": "TeamName", "SEURA": "TeamName",
+                      "O": "Games", "OTT": "Games", "M": "Goals", "S": "Assists", "P": "Points", "J": "PenaltyMinutes", "RM": "PenaltyMinutes",
+                      "YVM": "PpGoals", "YV": "PpGoals", "AVM": "ShGoals", "AV": "ShGoals", "VLM": "SoGoals", "VL": "SoGoals"}
+GOALIE_HEADER_KEYS = {"PELAAJA": "Name", "NIMI": "Name", "JOUKKUE": "TeamName", "SEURA": "TeamName",
+                      "O": "Games", "OTT": "Games", "PO": "Played", "PM": "GoalsAllowed", "T": "Saves", "TORJ": "Saves",
+                      "T%": "Save%", "TORJ%": "Save%", "AIKA": "TimeOnIce", "PELIAIKA": "TimeOnIce"}
+
+SKATER_LEVEL_KEYS = ["Games", "Goals", "Assists", "Points", "PenaltyMinutes"]
+SKATER_SEASON_KEYS = ["Games", "Goals", "Assists", "Points", "PenaltyMinutes", "PpGoals", "ShGoals", "SoGoals"]
+GOALIE_LEVEL_KEYS = ["Games", "Played", "GoalsAllowed", "Saves", "Save%"]
+
+def getLinkKey(PLink: str) -> str:
+    """
+    Returns the key players are matched with. The query string of the player link (ex. "lkq=123"), so relative and absolute links of the same player match.
+    """
+    Query = parse_qsl(urlparse(PLink).query)
+    if not Query:
+        return PLink
+    return "&".join(f"{Key}={Value}" for Key, Value in sorted(Query))
+
+def parseSeriesStatTable(PRawHtml: str, PHeaderKeys: dict) -> list[dict]:
+    """
+    Parses a series stat table into one dict per player row.
+
+    Args:
+        PRawHtml (str): The html of the table.
+        PHeaderKeys (dict): SKATER_HEADER_KEYS or GOALIE_HEADER_KEYS.
+
+    Returns:
+        list[dict]: The keys of the found columns, plus "SjlName" and "SjlLink" from the link in the name cell. All values are STRINGS!
+        Rows without a player link (ex. team totals) are skipped.
+    """
+    Soup = BeautifulSoup(PRawHtml, "html.parser")
+    HeaderCells = Soup.select("thead th") or Soup.select("tr th")
+    Columns = [PHeaderKeys.get(Cell.text.strip().upper()) for Cell in HeaderCells]     # None for the columns we don't use
+
+    Rows = []
+    for Row in Soup.select("tbody tr") or Soup.select("tr")[1:]:
+        Cells = Row.find_all("td")
+        RowDict = {}
+        for Key, Cell in zip(Columns, Cells):
+            if Key is None:
+                continue
+            RowDict[Key] = Cell.text.strip()
+            Link = Cell.find("a")
+            if Key == "Name" and Link is not None:
+                RowDict["SjlName"] = Link.text.strip()
+                RowDict["SjlLink"] = Link["href"] if Link["href"].startswith("http") else f"https://www.leijonat.fi/{Link['href'].lstrip('/')}"
+
+        if "SjlLink" in RowDict:
+            Rows.append(RowDict)
+
+    return Rows
+
+def fetchSeriesStatTables(PPage: object, PSerieId: str, PSeason: str) -> tuple[str, str]:
+    """
+    Loads the stats page of one series for one season and returns the html of the skater and goalie tables.
+
+    Args:
+        PPage (object): The Page object from playwright.
+        PSerieId (str): The id of the series.
+        PSeason (str): The season, ex. "2025".
+
+    Returns:
+        tuple[str, str]: The outer html of the skater table and the goalie table. "" if the page doesn't have the table.
+    """
+    Url = SERIES_STATS_URL.format(SerieId=PSerieId, Season=PSeason)
+    throttledGoto(PPage, Url)
+    PPage.wait_for_selector(f"{SERIES_SKATER_TABLE}, {SERIES_GOALIE_TABLE}", timeout=5000)
+
+    Tables = []
+    for Selector, Kind in [(SERIES_SKATER_TABLE, "series-skaters"), (SERIES_GOALIE_TABLE, "series-goalies")]:
+        Locator = PPage.locator(Selector)
+        TableHtml = Locator.first.evaluate("Element => Element.outerHTML") if Locator.count() > 0 else ""
+        if ARCHIVE_ENABLED:
+            archiveFragment(Url, PSeason, Kind, TableHtml)
+        Tables.append(TableHtml)
+
+    return Tables[0], Tables[1]
+
+def buildLevelDict(PRow: dict, PLevelName: str, PGoalie: bool) -> dict:
+    """
+    Turns one parsed table row into the level dict GoalieSeasonLevel / PlayerSeasonLevel take. Missing columns are "0".
+    """
+    LevelDict = {"TeamName": PRow.get("TeamName", ""), "LevelName": PLevelName}
+    for Key in (GOALIE_LEVEL_KEYS if PGoalie else SKATER_LEVEL_KEYS):
+        LevelDict[Key] = PRow.get(Key) or "0"
+    return LevelDict
+
+def parseMinutes(PTimeOnIce: str) -> float:
+    """
+    Parses a "mm:ss" time on ice into minutes. "" or None is 0.
+    """
+    if not PTimeOnIce:
+        return 0
+    Minutes, Seconds = PTimeOnIce.split(":")
+    return int(Minutes) + int(Seconds) / 60
+
+def sumSeasonTotals(PRows: list[dict], PGoalie: bool) -> dict:
+    """
+    Sums the table rows of one player for one season into the season totals dict GoalieSeason / PlayerSeason take.
+    The series pages have no separate season totals, so the total is the sum of the levels that were scraped.
+
+    Args:
+        PRows (list[dict]): The parsed table rows of the player in the season, one per series.
+        PGoalie (bool): True for goalie rows.
+
+    Returns:
+        dict: The season totals. All values are STRINGS, like the player page parsers return.
+    """
+    def total(PKey: str) -> int:
+        return sum(int(Row.get(PKey) or 0) for Row in PRows)
+
+    if not PGoalie:
+        return {Key: str(total(Key)) for Key in SKATER_SEASON_KEYS}
+
+    Minutes = sum(parseMinutes(Row.get("TimeOnIce")) for Row in PRows)
+    GoalsAllowed = total("GoalsAllowed")
+    Gaa = f"{GoalsAllowed * 60 / Minutes:.2f}" if Minutes > 0 else "0"
+    TimeOnIce = f"{int(Minutes)}:{round((Minutes - int(Minutes)) * 60):02d}"
+    return {"Games": str(total("Games")), "Played": str(total("Played")), "GoalsAllowed": str(GoalsAllowed), "TimeOnIce": TimeOnIce, "Gaa": Gaa}
+
+def scrapeSeriesStats(PSeries: list[tuple[str, str]], PSeasons: list[str], PPage: object) -> dict:
+    """
+    Scrapes the stat tables of the given series and seasons and groups the rows by player and season.
+
+    Args:
+        PSeries (list[tuple[str, str]]): (SerieId, LevelName) of each series, ex. [("123", "U16 AAA")]. The level name is what the player page shows for the level.
+        PSeasons (list[str]): The seasons to scrape, ex. ["2025", "2024"]
+        PPage (object): The Page object from playwright.
+
+    Returns:
+        dict: Key is (link key, season). Value is {"SjlName", "SjlLink", "Goalie": bool, "Rows": [parsed rows], "Levels": [level dicts]}.
+    """
+    Stats = {}
+    for Season in PSeasons:
+        for SerieId, LevelName in PSeries:
+            print(f"Scraping series {LevelName} ({SerieId}) season {Season}")
+            SkaterHtml, GoalieHtml = fetchSeriesStatTables(PPage, SerieId, Season)
+
+            for TableHtml, HeaderKeys, Goalie in [(SkaterHtml, SKATER_HEADER_KEYS, False), (GoalieHtml, GOALIE_HEADER_KEYS, True)]:
+                for Row in parseSeriesStatTable(TableHtml, HeaderKeys):
+                    Entry = Stats.setdefault((getLinkKey(Row["SjlLink"]), Season), {"SjlName": Row["SjlName"], "SjlLink": Row["SjlLink"], "Goalie": Goalie, "Rows": [], "Levels": []})
+                    if Entry["Goalie"] != Goalie:       # A skater that also played as a goalie. The player pages only show one position, so the position of the first row wins.
+                        continue
+                    Entry["Rows"].append(Row)
+                    Entry["Levels"].append(buildLevelDict(Row, LevelName, Goalie))
+
+    return Stats
+
+def buildSeasonObject(PEntry: dict, PSeason: str) -> object:
+    """
+    Builds the GoalieSeason / PlayerSeason object, with its level objects, from one entry of scrapeSeriesStats.
+    The club, level and age group of the levels are parsed like writeSeasonLevelDetails does.
+    """
+    if PEntry["Goalie"]:
+        SeasonObject = GoalieSeason(PSeason, sumSeasonTotals(PEntry["Rows"], True))
+        LevelClass = GoalieSeasonLevel
+    else:
+        SeasonObject = PlayerSeason(PSeason, sumSeasonTotals(PEntry["Rows"], False))
+        LevelClass = PlayerSeasonLevel
+
+    for LevelDict in PEntry["Levels"]:
+        LevelObject = LevelClass(LevelDict)
+        parseAgeGroupLevelAndClub(LevelObject)
+        SeasonObject.addLevelStat(LevelObject)
+
+    return SeasonObject
+
+def entryToPlayer(PEntry: dict) -> Player:
+    """
+    Builds a Player object with only the names and link from a series entry, the same way parsePlayerRowsFromHtml does. Used for the unmatched players.
+    """
+    NameParts = PEntry["SjlName"].split(" ")
+    EpName = f"{NameParts[1]} {NameParts[0].capitalize()}" if len(NameParts) > 1 else PEntry["SjlName"]
+    return Player(PEntry["SjlName"], EpName, PEntry["SjlLink"])
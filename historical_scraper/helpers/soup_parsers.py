@@ -0,0 +1,164 @@
+from bs4 import BeautifulSoup
+
+# The BeautifulSoup ("html.parser") parsers. These are the originals the lxml parsers (helpers/lxml_parsers.py) are checked against,
+# and the fallback when lxml isn't installed or SCRAPER_PARSER is "bs4". The public parse functions in utils.py and team_scraper.py pick the backend.
+
+def parsePosition(PRawHtml: str) -> str:
+    """
+    BeautifulSoup version of utils.parsePosition.
+    """
+    Soup = BeautifulSoup(PRawHtml, "html.parser")   # Parse the raw HTML
+    PositionText = Soup.get_text()                  # Get the text for position
+    Position = PositionText.split(" ")[1]           # Get the split position
+    return Position                                 # Return the position
+
+def parseSeasonOptions(PRawHtml: str) -> list[str]:
+    """
+    BeautifulSoup version of utils.parseSeasonOptions.
+    """
+    Soup = BeautifulSoup(PRawHtml, "html.parser")                           # Parse the raw HTML
+    Seasons = []
+    for Option in Soup.find_all("option"):
+        Value = (Option.get("value") or Option.get_text()).strip()          # Fall back to the text if the option has no value
+        if Value.isdigit() and len(Value) == 4:
+            Seasons.append(Value)
+    return sorted(set(Seasons), reverse=True)
+
+def parsePersonalDetails(PRawHtml: str) -> dict:
+    """
+    BeautifulSoup version of utils.parsePersonalDetails.
+    """
+    Soup = BeautifulSoup(PRawHtml, "html.parser")                           # Parse the raw HTML
+    DateOfBirth = Soup.find("div", id="pcm-player-dob").text.strip()        # Get the date of birth
+    PersonalDetailsDict = {"DateOfBirth": DateOfBirth}                      # Create a dictionary with the date of birth (and possible future details)
+    return PersonalDetailsDict                                              # Return the dictionary
+
+def parseSeasonAllGoalieStas(PRawHtml: str) -> dict:
+    """
+    BeautifulSoup version of utils.parseSeasonAllGoalieStas.
+    """
+    Soup = BeautifulSoup(PRawHtml, "html.parser")                                   # Parse the raw HTML. Values below are clean strings
+    Games = Soup.find("div", id="pcas-goalie-games").text.strip()                   # How many game the goalie was in the roster for
+    Played = Soup.find("div", id="pcas-goalie-played-games").text.strip()           # How many games the goalie played
+    GoalsAllowed = Soup.find("div", id="pcas-goalie-goals-against").text.strip()    # How many goals the goalie allowed
+    TimeOnIce = Soup.find("div", id="pcas-goalie-toi").text.strip()                 # How much time on ice the goalie had
+    Gaa = Soup.find("div", id="pcas-goalie-gaa").text.strip()                       # What has the goalies GAA
+
+    SeasonAllGoalieStasDict = {"Games": Games, "Played": Played, "GoalsAllowed": GoalsAllowed, "TimeOnIce": TimeOnIce, "Gaa": Gaa}
+    return SeasonAllGoalieStasDict
+
+def parseSeasonAllPlayerStas(PRawHtml: str) -> dict:
+    """
+    BeautifulSoup version of utils.parseSeasonAllPlayerStas.
+    """
+
+    Soup = BeautifulSoup(PRawHtml, "html.parser")                                       # Parse the raw HTML. Values below are clean strings
+    Games = Soup.find("div", id="pcas-skater-games").text.strip()                       # How many games the player played
+    Goals = Soup.find("div", id="pcas-skater-goals").text.strip()                       # How many goals the player scored
+    Assists = Soup.find("div", id="pcas-skater-assists").text.strip()                   # How many assists they had
+    Points = Soup.find("div", id="pcas-skater-points").text.strip()                     # How many points they had
+    PenaltyMinutes = Soup.find("div", id="pcas-skater-penalty-minutes").text.strip()    # How many penalty minutes they had
+    PpGoals = Soup.find("div", id="pcas-skater-goals-pp").text.strip()                  # How many power play goals
+    ShGoals = Soup.find("div", id="pcas-skater-goals-sh").text.strip()                  # How many short handed goals
+    SoGoals = Soup.find("div", id="pcas-skater-goals-ws").text.strip()                  # How many shootout goals
+    
+    SeasonAllPlayerStasDict = {"Games": Games, "Goals": Goals, "Assists": Assists, "Points": Points, "PenaltyMinutes": PenaltyMinutes, "PpGoals": PpGoals, "ShGoals": ShGoals, "SoGoals": SoGoals}
+    return SeasonAllPlayerStasDict
+
+def parseGoalieStats(PRawHtml: str) -> dict:
+    """
+    BeautifulSoup version of utils.parseGoalieStats.
+    """
+
+    Soup = BeautifulSoup(PRawHtml, "html.parser")   # Parse the raw HTML
+    Rows = Soup.find_all("div", class_="pcss-level-title-row")
+    
+    AllLevelsInSeason = []    # This holds all the dicts for inividual teams on a season
+
+    for Row in Rows:
+        LevelDict = {}        # Create a dictionary for each level
+        Cells = Row.find_all("div", class_="pcss-level-stat-col")
+        TeamName = Row.find("div", class_="pcss-level-team-name-col").text.strip()
+        LevelName = Row.find("div", class_="pcss-level-name-col").text.strip()
+
+        # print(f"Team: {TeamName} | Level: {LevelName} | Games: {Cells[0].text.strip()} | Played: {Cells[1].text.strip()} | GoalsAllowed: {Cells[2].text.strip()} | Saves: {Cells[3].text.strip()} | Save%: {Cells[4].text.strip()}")
+        # print("")
+
+        LevelDict["TeamName"] = TeamName                    # Add the team name
+        LevelDict["LevelName"] = LevelName                  # Add the level name
+        LevelDict["Games"] = Cells[0].text.strip()          # Add the number of games in the roster
+        LevelDict["Played"] = Cells[1].text.strip()         # Add the number of played
+        LevelDict["GoalsAllowed"] = Cells[2].text.strip()   # Add the number of goals allowed
+        LevelDict["Saves"] = Cells[3].text.strip()          # Add the number of saves
+        LevelDict["Save%"] = Cells[4].text.strip()          # Add the save percentage
+
+        AllLevelsInSeason.append(LevelDict)
+
+    return AllLevelsInSeason
+
+def parsePlayerStats(PRawHtml: str) -> list[dict]:
+    """
+    BeautifulSoup version of utils.parsePlayerStats.
+    """
+    Soup = BeautifulSoup(PRawHtml, "html.parser")   # Parse the raw HTML
+    Rows = Soup.find_all("div", class_="pcss-level-title-row")
+    
+    AllLevelsInSeason = []    # This holds all the dicts for inividual teams on a season
+
+    for Row in Rows:
+        LevelDict = {}
+        Cells = Row.find_all("div", class_="pcss-level-stat-col")
+        TeamName = Row.find("div", class_="pcss-level-team-name-col").text.strip()
+        LevelName = Row.find("div", class_="pcss-level-name-col").text.strip()
+        
+        # print(f"Team: {TeamName} | Level: {LevelName} | Games: {Cells[0].text.strip()} | Goals: {Cells[1].text.strip()} | Assists: {Cells[2].text.strip()} | Points: {Cells[3].text.strip()} | PenaltyMinutes: {Cells[4].text.strip()}")
+        # print("")
+        
+        LevelDict["TeamName"] = TeamName                    # Add the team name
+        LevelDict["LevelName"] = LevelName                  # Add the level name
+        LevelDict["Games"] = Cells[0].text.strip()          # Add the number of games in the roster
+        LevelDict["Goals"] = Cells[1].text.strip()          # Add the number of goals
+        LevelDict["Assists"] = Cells[2].text.strip()        # Add the number of assists
+        LevelDict["Points"] = Cells[3].text.strip()         # Add the number of points
+        LevelDict["PenaltyMinutes"] = Cells[4].text.strip() # Add the number of penalty minutes
+
+        AllLevelsInSeason.append(LevelDict)
+
+    return AllLevelsInSeason
+
+def parsePlayerRowDicts(PRawHtml: str, PParseStaff: bool = False) -> list[dict]:
+    """
+    BeautifulSoup version of team_scraper.parsePlayerRowDicts.
+    """
+
+    # Make a list of all the player rows
+    Soup = BeautifulSoup(PRawHtml, "html.parser")
+    Rows = Soup.find_all("div", class_="tcst-row")
+    PlayerRows = []
+
+    for Row in Rows:        # Loop through the player rows, meaning handle each players html at time
+        RoleDiv = Row.find("div", class_="col-xs-4")    # Find the role div
+        if RoleDiv:
+            Role = RoleDiv.text.strip()                  # Get the role
+            if Role == "Toimihenkilö" and PParseStaff == False:
+                continue    # Skip staff members
+        else:
+            print("No role div") # Role div not found SOS? :D
+
+
+        NameDiv = Row.find("div", class_="col-xs-6")    # Find the div containing both the name and player-page link
+        if not NameDiv:
+            print("No name div")
+            continue
+
+        PlayerLink = NameDiv.find("a")                # Find the link to the players page
+        if not PlayerLink:
+            print("No player link")
+            continue
+
+        SjlName = PlayerLink.text.strip()       # Get the name in SJL format
+        NameParts = SjlName.split(" ")        # Split the name into first name and last name
+        EpName = f"{NameParts[1]} {NameParts[0].capitalize()}"  # Get the name in EP format
+        PlayerRows.append({"SjlName": SjlName, "EpName": EpName, "SjlLink": f"https://www.leijonat.fi/{PlayerLink['href']}"})
+
+    return PlayerRows
@@ -1,7 +1,10 @@
-from bs4 import BeautifulSoup
 from historical_scraper.models.team import Team
 from historical_scraper.models.player import Player
-from historical_scraper.helpers.utils import getSeasons
+from historical_scraper.helpers.utils import getSeasons, getParserBackend
+from historical_scraper.helpers.waits import selectSeasonAndWait
+from historical_scraper.helpers.archive import archiveFragment
+from historical_scraper.helpers.rate_limiter import throttledGoto
+from historical_scraper.config import TEAM_PLAYERS_ENDPOINT, ARCHIVE_ENABLED
 
 def fetchTeamHtml(PSeasons: list[str], PPage: object, PTeamObject: Team) -> None:
     """
@@ -17,21 +20,23 @@ def fetchTeamHtml(PSeasons: list[str], PPage: object, PTeamObject: Team) -> None
     """
     for Season in PSeasons: # PSeasons is a lsit of years like ["2025", "2024"...]
         print("Scraping season: " + Season + " for team: " + PTeamObject.name)
-        PPage.locator("select#tcss-season-select").select_option(Season)    # This sets the season selector to current season to load dynamic html for season.
-        # Wait a bit to load dynamic content. Should this be adjusted?
-        PPage.wait_for_timeout(1000)  
+        # This sets the season selector to the season to load dynamic html for season, and waits until the players container has been rendered.
+        selectSeasonAndWait(PPage, "select#tcss-season-select", Season, ["#tcst-team-players-container"], TEAM_PLAYERS_ENDPOINT, "team-season", 1000)
 
         # Get the content of the players container on the team page (PELAAJAT)
         RawHtml = PPage.locator("#tcst-team-players-container").inner_html()
+        if ARCHIVE_ENABLED:     # Keep the raw html, so it can be parsed again later without scraping
+            archiveFragment(PTeamObject.sjlLink, Season, "team-roster", RawHtml)
 
         # We use the Team objects method to store the season: html key-value pair to the dict.
         PTeamObject.addSeasonRosterHtml(Season, RawHtml)    # Add the html to the dict
 
     return None
 
-def parsePlayerRowsFromHtml(PRawHtml: str, PPlayersDict: dict, PParseStaff: bool = False) -> list[dict]:
+def parsePlayerRowDicts(PRawHtml: str, PParseStaff: bool = False) -> list[dict]:
     """
     Parses the player (and staff) rows from the raw HTML of a teams one seasons player container.
+    Only returns plain dicts, so it can be run in another process (helpers/parse_pool.py).
 
     Args:
         PRawHtml (str): The raw HTML of the players container. This HTML contains all players for a season.
@@ -42,48 +47,46 @@ def parsePlayerRowsFromHtml(PRawHtml: str, PPlayersDict: dict, PParseStaff: bool
         \n      {
         \n      PlayerDict["SjlName"] = SjlName
         \n      PlayerDict["EpName"] = EpName
-        \n      PlayerDict["SjlLink"] = f"https://www.leijonat.fi/index.php/index.php/{NameLink["href"]}"
+        \n      PlayerDict["SjlLink"] = f"https://www.leijonat.fi/{NameLink["href"]}"
         \n      }
     """
+    return getParserBackend().parsePlayerRowDicts(PRawHtml, PParseStaff)
 
-    # Make a list of all the player rows
-    Soup = BeautifulSoup(PRawHtml, "html.parser")
-    Rows = Soup.find_all("div", class_="tcst-row")
-
-    for Row in Rows:        # Loop through the player rows, meaning handle each players html at time
-        RoleDiv = Row.find("div", class_="col-xs-4")    # Find the role div
-        if RoleDiv:
-            Role = RoleDiv.text.strip()                  # Get the role
-            if Role == "Toimihenkilö" and PParseStaff == False:
-                continue    # Skip staff members
-        else:
-            print("No role div") # Role div not found SOS? :D
-
-
-        NameDiv = Row.find("div", class_="col-xs-6")    # Find the div containing both the name and player-page link
-
-        if NameDiv:
-            PlayerLink = NameDiv.find("a")                # Find the link to the players page
-            if PlayerLink:
-                SjlName = PlayerLink.text.strip()       # Get the name in SJL format
-                NameParts = SjlName.split(" ")        # Split the name into first name and last name
-                EpName = f"{NameParts[1]} {NameParts[0].capitalize()}"  # Get the name in EP format
+def addPlayerRowsToDict(PPlayerRows: list[dict], PPlayersDict: dict) -> None:
+    """
+    Creates a Player object for each row dict from parsePlayerRowDicts and adds it to PPlayersDict. Players already in the dict are skipped.
 
-                # Create a player object, and save the names and link to the player object
-                PlayerObject = Player(SjlName, EpName, f"https://www.leijonat.fi/{PlayerLink['href']}")     # Create a player object
+    Args:
+        PPlayerRows (list[dict]): The rows from parsePlayerRowDicts.
+        PPlayersDict (dict): Dict of Player objects. Key is sjlName. Edited in place.
 
-            else:
-                print("No player link")
-        else:
-            print("No name div")
-        
+    Returns:
+        None
+    """
+    for PlayerRow in PPlayerRows:
+        SjlName = PlayerRow["SjlName"]
         if SjlName not in PPlayersDict: # Check if the player (object) is already in the dict. This is to avoid duplicates in data fetching.
-            PPlayersDict[SjlName] = PlayerObject # This edits the dict in place. Each player is a Player object.
+            PPlayersDict[SjlName] = Player(SjlName, PlayerRow["EpName"], PlayerRow["SjlLink"]) # This edits the dict in place. Each player is a Player object.
         else:
             print(f"Player {SjlName} already in dict")
 
     return None
 
+def parsePlayerRowsFromHtml(PRawHtml: str, PPlayersDict: dict, PParseStaff: bool = False) -> None:
+    """
+    Parses the player rows from the raw HTML of a teams one seasons player container, and adds them to PPlayersDict as Player objects.
+
+    Args:
+        PRawHtml (str): The raw HTML of the players container. This HTML contains all players for a season.
+        PPlayersDict (dict): Dict of Player objects. Key is sjlName. Edited in place.
+        PParseStaff (bool): Whether to parse staff members.
+
+    Returns:
+        None
+    """
+    addPlayerRowsToDict(parsePlayerRowDicts(PRawHtml, PParseStaff), PPlayersDict)
+    return None
+
 def scrapeTeamData(PTeamId: int, PPage: object, PClubList: list, PSeasons: list[str]) -> None:
     """
     Scrapes html data for a specific team and appends it to the club list. This is then later parsed for the data.
@@ -102,7 +105,7 @@ def scrapeTeamData(PTeamId: int, PPage: object, PClubList: list, PSeasons: list[
 
     # Go to the teams page
     Link = f"https://www.leijonat.fi/joukkueet?teamid={PTeamId}"
-    PPage.goto(Link)
+    throttledGoto(PPage, Link)
     PPage.wait_for_timeout(000)  
     PPage.wait_for_selector("#tcm-team-official-name", timeout=5000)
 
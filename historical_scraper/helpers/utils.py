@@ -1,8 +1,28 @@
-from historical_scraper.config import CURRENT_YEAR
-from bs4 import BeautifulSoup
+from historical_scraper.config import CURRENT_YEAR, PARSER_BACKEND
+from historical_scraper.helpers import soup_parsers
 from historical_scraper.models import Player, GoalieSeason, PlayerSeason, GoalieSeasonLevel, PlayerSeasonLevel
 import sys
 
+try:
+    from historical_scraper.helpers import lxml_parsers    # Optional. About 10x faster than BeautifulSoup, which is used if lxml isn't installed.
+except ImportError:
+    lxml_parsers = None
+
+def getParserBackend(PBackend: str = None) -> object:
+    """
+    Returns the module the parse functions below hand the html to: helpers/lxml_parsers.py or helpers/soup_parsers.py.
+    Both have the same functions and return the same dicts.
+
+    Args:
+        PBackend (str): "lxml" or "bs4". Defaults to PARSER_BACKEND (env SCRAPER_PARSER).
+
+    Returns:
+        module: lxml_parsers, or soup_parsers if "bs4" was asked for or lxml isn't installed.
+    """
+    if (PBackend or PARSER_BACKEND) == "bs4" or lxml_parsers is None:
+        return soup_parsers
+    return lxml_parsers
+
 def getSeasons(PAmmount: int, PSeasons: list[str]) -> None:
     """
     Appends the specified number of seasons to the provided list, starting from the current year (set in the config_file).
@@ -106,10 +126,19 @@ def parsePosition(PRawHtml: str) -> str:
     Returns:
         str: The position of the player as a string.
     """
-    Soup = BeautifulSoup(PRawHtml, "html.parser")   # Parse the raw HTML
-    PositionText = Soup.get_text()                  # Get the text for position
-    Position = PositionText.split(" ")[1]           # Get the split position
-    return Position                                 # Return the position
+    return getParserBackend().parsePosition(PRawHtml)
+
+def parseSeasonOptions(PRawHtml: str) -> list[str]:
+    """
+    Parses the seasons listed in the season dropdown (select#pcss-season-select) of the player page.
+
+    Args:
+        PRawHtml (str): The inner HTML of the select element.
+
+    Returns:
+        list[str]: The seasons as year strings, newest first ["2025", "2023"...]. Options that are not years are skipped.
+    """
+    return getParserBackend().parseSeasonOptions(PRawHtml)
 
 def parsePersonalDetails(PRawHtml: str) -> dict:
     """
@@ -121,10 +150,7 @@ def parsePersonalDetails(PRawHtml: str) -> dict:
     Returns:
         dict: A dictionary containing the personal details of the player, currently only containing the date of birth.
     """
-    Soup = BeautifulSoup(PRawHtml, "html.parser")                           # Parse the raw HTML
-    DateOfBirth = Soup.find("div", id="pcm-player-dob").text.strip()        # Get the date of birth
-    PersonalDetailsDict = {"DateOfBirth": DateOfBirth}                      # Create a dictionary with the date of birth (and possible future details)
-    return PersonalDetailsDict                                              # Return the dictionary  
+    return getParserBackend().parsePersonalDetails(PRawHtml)
 
 def parseSeasonAllGoalieStas(PRawHtml: str) -> dict:
     """
@@ -143,15 +169,7 @@ def parseSeasonAllGoalieStas(PRawHtml: str) -> dict:
             "Gaa": Gaa (number of goals against average)
         }
     """
-    Soup = BeautifulSoup(PRawHtml, "html.parser")                                   # Parse the raw HTML. Values below are clean strings
-    Games = Soup.find("div", id="pcas-goalie-games").text.strip()                   # How many game the goalie was in the roster for
-    Played = Soup.find("div", id="pcas-goalie-played-games").text.strip()           # How many games the goalie played
-    GoalsAllowed = Soup.find("div", id="pcas-goalie-goals-against").text.strip()    # How many goals the goalie allowed
-    TimeOnIce = Soup.find("div", id="pcas-goalie-toi").text.strip()                 # How much time on ice the goalie had
-    Gaa = Soup.find("div", id="pcas-goalie-gaa").text.strip()                       # What has the goalies GAA
-
-    SeasonAllGoalieStasDict = {"Games": Games, "Played": Played, "GoalsAllowed": GoalsAllowed, "TimeOnIce": TimeOnIce, "Gaa": Gaa}
-    return SeasonAllGoalieStasDict
+    return getParserBackend().parseSeasonAllGoalieStas(PRawHtml)
 
 def parseSeasonAllPlayerStas(PRawHtml: str) -> dict:
     """
@@ -173,19 +191,7 @@ def parseSeasonAllPlayerStas(PRawHtml: str) -> dict:
             "SoGoals": SoGoals (number of shootout goals)
         }
     """
-
-    Soup = BeautifulSoup(PRawHtml, "html.parser")                                       # Parse the raw HTML. Values below are clean strings
-    Games = Soup.find("div", id="pcas-skater-games").text.strip()                       # How many games the player played
-    Goals = Soup.find("div", id="pcas-skater-goals").text.strip()                       # How many goals the player scored
-    Assists = Soup.find("div", id="pcas-skater-assists").text.strip()                   # How many assists they had
-    Points = Soup.find("div", id="pcas-skater-points").text.strip()                     # How many points they had
-    PenaltyMinutes = Soup.find("div", id="pcas-skater-penalty-minutes").text.strip()    # How many penalty minutes they had
-    PpGoals = Soup.find("div", id="pcas-skater-goals-pp").text.strip()                  # How many power play goals
-    ShGoals = Soup.find("div", id="pcas-skater-goals-sh").text.strip()                  # How many short handed goals
-    SoGoals = Soup.find("div", id="pcas-skater-goals-ws").text.strip()                  # How many shootout goals
-    
-    SeasonAllPlayerStasDict = {"Games": Games, "Goals": Goals, "Assists": Assists, "Points": Points, "PenaltyMinutes": PenaltyMinutes, "PpGoals": PpGoals, "ShGoals": ShGoals, "SoGoals": SoGoals}
-    return SeasonAllPlayerStasDict
+    return getParserBackend().parseSeasonAllPlayerStas(PRawHtml)
 
 def parseGoalieStats(PRawHtml: str) -> dict:
     """
@@ -205,34 +211,7 @@ def parseGoalieStats(PRawHtml: str) -> dict:
             - "Saves": The number of saves made.
             - "Save%": The save percentage.
     """
-
-    Soup = BeautifulSoup(PRawHtml, "html.parser")   # Parse the raw HTML
-    Rows = Soup.find_all("div", class_="pcss-level-title-row")
-    
-    AllLevelsInSeason = []    # This holds all the dicts for inividual teams on a season
-
-    for Row in Rows:
-        LevelDict = {}        # Create a dictionary for each level
-        Cells = Row.find_all("div", class_="pcss-level-stat-col")
-        TeamName = Row.find("div", class_="pcss-level-team-name-col").text.strip()
-        LevelName = Row.find("div", class_="pcss-level-name-col").text.strip()
-
-        # print(f"Team: {TeamName} | Level: {LevelName} | Games: {Cells[0].text.strip()} | Played: {Cells[1].text.strip()} | GoalsAllowed: {Cells[2].text.strip()} | Saves: {Cells[3].text.strip()} | Save%: {Cells[4].text.strip()}")
-        # print("")
-
-        LevelDict["TeamName"] = TeamName                    # Add the team name
-        LevelDict["LevelName"] = LevelName                  # Add the level name
-        LevelDict["Games"] = Cells[0].text.strip()          # Add the number of games in the roster
-        LevelDict["Played"] = Cells[1].text.strip()         # Add the number of played
-        LevelDict["GoalsAllowed"] = Cells[2].text.strip()   # Add the number of goals allowed
-        LevelDict["Saves"] = Cells[3].text.strip()          # Add the number of saves
-        LevelDict["Save%"] = Cells[4].text.strip()          # Add the save percentage
-
-        AllLevelsInSeason.append(LevelDict)
-
-    return AllLevelsInSeason
-
-
+    return getParserBackend().parseGoalieStats(PRawHtml)
 
 def parsePlayerStats(PRawHtml: str) -> list[dict]:
     """
@@ -247,29 +226,5 @@ def parsePlayerStats(PRawHtml: str) -> list[dict]:
 
         }
     """
-    Soup = BeautifulSoup(PRawHtml, "html.parser")   # Parse the raw HTML
-    Rows = Soup.find_all("div", class_="pcss-level-title-row")
-    
-    AllLevelsInSeason = []    # This holds all the dicts for inividual teams on a season
-
-    for Row in Rows:
-        LevelDict = {}
-        Cells = Row.find_all("div", class_="pcss-level-stat-col")
-        TeamName = Row.find("div", class_="pcss-level-team-name-col").text.strip()
-        LevelName = Row.find("div", class_="pcss-level-name-col").text.strip()
-        
-        # print(f"Team: {TeamName} | Level: {LevelName} | Games: {Cells[0].text.strip()} | Goals: {Cells[1].text.strip()} | Assists: {Cells[2].text.strip()} | Points: {Cells[3].text.strip()} | PenaltyMinutes: {Cells[4].text.strip()}")
-        # print("")
-        
-        LevelDict["TeamName"] = TeamName                    # Add the team name
-        LevelDict["LevelName"] = LevelName                  # Add the level name
-        LevelDict["Games"] = Cells[0].text.strip()          # Add the number of games in the roster
-        LevelDict["Goals"] = Cells[1].text.strip()          # Add the number of goals
-        LevelDict["Assists"] = Cells[2].text.strip()        # Add the number of assists
-        LevelDict["Points"] = Cells[3].text.strip()         # Add the number of points
-        LevelDict["PenaltyMinutes"] = Cells[4].text.strip() # Add the number of penalty minutes
-
-        AllLevelsInSeason.append(LevelDict)
-
-    return AllLevelsInSeason
+    return getParserBackend().parsePlayerStats(PRawHtml)
 
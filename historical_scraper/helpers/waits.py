@@ -0,0 +1,197 @@
+import time
+from historical_scraper.config import WAIT_TIMEOUT_MS, WAIT_AFTER_RESPONSE_MS, WAIT_SETTLE_MS
+from historical_scraper.helpers.rate_limiter import throttled, throttledAsync
+
+# Event driven waits for the season dropdowns.
+# Instead of sleeping a fixed time after select_option, two things are raced: a MutationObserver on each stats container, and the backend
+# response for the new season. The wait returns as soon as every container has changed and settled. If the response shows up first,
+# the containers only get WAIT_AFTER_RESPONSE_MS more, so a response that never matches PResponsePattern doesn't slow anything down,
+# and a page that got its data but never re-renders doesn't wait the whole WAIT_TIMEOUT_MS. WAIT_TIMEOUT_MS is the ceiling for one wait.
+# Every wait is recorded in WaitTimings, so getWaitSummary() can show how long the waits really took compared to the old sleeps.
+
+WAIT_POLL_MS = 25   # How often the containers are checked while waiting
+
+# Installs a MutationObserver on each container. Each container has its own changed flag and last mutation time, so one container
+# that has been re-rendered doesn't hide another that still shows the previous season. The state is stored on window for the settle check below.
+ARM_OBSERVERS_JS = """(Selectors) => {
+    if (window.__hsWaitState) window.__hsWaitState.observers.forEach(Observer => Observer.disconnect());
+    const State = {containers: {}, observers: []};
+    for (const Selector of Selectors) {
+        const Element = document.querySelector(Selector);
+        if (!Element) continue;
+        const Container = {changed: false, lastMutation: performance.now()};
+        const Observer = new MutationObserver(() => { Container.changed = true; Container.lastMutation = performance.now(); });
+        Observer.observe(Element, {childList: true, subtree: true, characterData: true});
+        State.containers[Selector] = Container;
+        State.observers.push(Observer);
+    }
+    window.__hsWaitState = State;
+}"""
+
+# True once every container has changed (if required) and none of them has had a mutation for SettleMs.
+CONTAINERS_SETTLED_JS = """([SettleMs, RequireChange]) => {
+    const State = window.__hsWaitState;
+    if (!State) return true;
+    const Now = performance.now();
+    return Object.values(State.containers).every(Container => (!RequireChange || Container.changed) && Now - Container.lastMutation >= SettleMs);
+}"""
+
+WaitTimings = {}    # Key is the wait name, ex. "player-season". Value is a dict of counters, see recordWait()
+
+def recordWait(PWaitName: str, PElapsedMs: float, PBaselineMs: int, PTimedOut: bool) -> None:
+    """
+    Records one finished wait.
+
+    Args:
+        PWaitName (str): The name of the wait, ex. "team-season".
+        PElapsedMs (float): How long the wait took.
+        PBaselineMs (int): How long the fixed sleep this wait replaces was. Used to calculate the saved time.
+        PTimedOut (bool): True if the wait hit the ceiling.
+
+    Returns:
+        None
+    """
+    Timing = WaitTimings.setdefault(PWaitName, {"Count": 0, "TotalMs": 0.0, "MaxMs": 0.0, "Timeouts": 0, "BaselineMs": PBaselineMs})
+    Timing["Count"] += 1
+    Timing["TotalMs"] += PElapsedMs
+    Timing["MaxMs"] = max(Timing["MaxMs"], PElapsedMs)
+    if PTimedOut:
+        Timing["Timeouts"] += 1
+    return None
+
+def getWaitSummary() -> dict:
+    """
+    Returns a summary of all the recorded waits.
+
+    Returns:
+        dict: Key is the wait name, value is a dict with "Count", "AvgMs", "MaxMs", "Timeouts", "BaselineMs" and "SavedMs".
+        "SavedMs" is how much less time the waits took in total than the old fixed sleeps would have.
+    """
+    Summary = {}
+    for WaitName, Timing in WaitTimings.items():
+        Summary[WaitName] = {
+            "Count": Timing["Count"],
+            "AvgMs": round(Timing["TotalMs"] / Timing["Count"], 1),
+            "MaxMs": round(Timing["MaxMs"], 1),
+            "Timeouts": Timing["Timeouts"],
+            "BaselineMs": Timing["BaselineMs"],
+            "SavedMs": round(Timing["Count"] * Timing["BaselineMs"] - Timing["TotalMs"], 1),
+        }
+    return Summary
+
+def printWaitSummary() -> None:
+    """
+    Prints the summary from getWaitSummary(), one line per wait name.
+    """
+    for WaitName, Summary in getWaitSummary().items():
+        print(f"Wait {WaitName}: {Summary['Count']} waits, avg {Summary['AvgMs']}ms (was {Summary['BaselineMs']}ms), max {Summary['MaxMs']}ms, {Summary['Timeouts']} timeouts, saved {Summary['SavedMs'] / 1000:.1f}s")
+    return None
+
+def getWaitDeadline(PStartTime: float, PResponseTimes: list[float]) -> float:
+    """
+    Returns the perf_counter time the wait gives up at: WAIT_TIMEOUT_MS after the start, or WAIT_AFTER_RESPONSE_MS after the response if that is sooner.
+
+    Args:
+        PStartTime (float): The perf_counter time the wait started.
+        PResponseTimes (list[float]): The perf_counter times of the matching responses so far.
+
+    Returns:
+        float: The deadline as a perf_counter time.
+    """
+    Deadline = PStartTime + WAIT_TIMEOUT_MS / 1000
+    if PResponseTimes:
+        Deadline = min(Deadline, PResponseTimes[0] + WAIT_AFTER_RESPONSE_MS / 1000)     # The data is here, now the containers just have to be rendered
+    return Deadline
+
+def selectSeasonAndWait(PPage: object, PSelectSelector: str, PSeason: str, PContainerSelectors: list[str], PResponsePattern: str, PWaitName: str, PBaselineMs: int) -> float:
+    """
+    Selects PSeason in the dropdown and waits until the containers have been rendered for it.
+
+    1. Arm a MutationObserver on each container, and listen for responses whose url contains PResponsePattern
+    2. Select the season
+    3. Check the containers every WAIT_POLL_MS. Done as soon as all of them have changed and settled.
+       A matching response cuts the remaining wait to WAIT_AFTER_RESPONSE_MS, so whichever of the two comes first ends the wait.
+    The whole wait holds a slot of the rate limiter (helpers/rate_limiter.py), and a wait that hits the ceiling counts as a failed request there.
+    If the season is already selected, nothing is requested, so we only wait for the containers to settle.
+    A wait that hits the ceiling is not an error, the caller reads the containers as they are, same as after the old sleeps.
+
+    Args:
+        PPage (object): The Page object from playwright.
+        PSelectSelector (str): The selector of the season dropdown, ex. "select#pcss-season-select".
+        PSeason (str): The season to select, ex. "2025".
+        PContainerSelectors (list[str]): The selectors of the containers that are re-rendered for the new season.
+        PResponsePattern (str): A part of the url of the backend response the dropdown triggers.
+        PWaitName (str): The name the wait is recorded with.
+        PBaselineMs (int): The fixed sleep this wait replaces.
+
+    Returns:
+        float: How long the wait took in ms.
+    """
+    ResponseTimes = []
+    def onResponse(Response: object) -> None:
+        if PResponsePattern in Response.url:
+            ResponseTimes.append(time.perf_counter())
+
+    with throttled(PPage.url) as Slot:     # The select loads the season from the site, so it goes through the rate limiter
+        StartTime = time.perf_counter()
+        Dropdown = PPage.locator(PSelectSelector)
+        RequireChange = Dropdown.input_value() != PSeason      # If the season is already selected, the containers won't change
+        PPage.evaluate(ARM_OBSERVERS_JS, PContainerSelectors)
+
+        PPage.on("response", onResponse)
+        try:
+            if RequireChange:
+                Dropdown.select_option(PSeason)     # A failing select is a real error, it is raised
+
+            TimedOut = False
+            while not PPage.evaluate(CONTAINERS_SETTLED_JS, [WAIT_SETTLE_MS, RequireChange]):
+                if time.perf_counter() >= getWaitDeadline(StartTime, ResponseTimes):
+                    TimedOut = True
+                    break
+                PPage.wait_for_timeout(WAIT_POLL_MS)    # Also lets playwright deliver the response events to onResponse
+        finally:
+            PPage.remove_listener("response", onResponse)
+        if Slot is not None:
+            Slot.failed = TimedOut                  # A wait that hit the ceiling means the site is slow
+
+    ElapsedMs = (time.perf_counter() - StartTime) * 1000
+    recordWait(PWaitName, ElapsedMs, PBaselineMs, TimedOut)
+    return ElapsedMs
+
+async def selectSeasonAndWaitAsync(PPage: object, PSelectSelector: str, PSeason: str, PContainerSelectors: list[str], PResponsePattern: str, PWaitName: str, PBaselineMs: int) -> float:
+    """
+    Async version of selectSeasonAndWait, for the async scraper. Takes the same arguments.
+
+    Returns:
+        float: How long the wait took in ms.
+    """
+    ResponseTimes = []
+    def onResponse(Response: object) -> None:
+        if PResponsePattern in Response.url:
+            ResponseTimes.append(time.perf_counter())
+
+    async with throttledAsync(PPage.url) as Slot:
+        StartTime = time.perf_counter()
+        Dropdown = PPage.locator(PSelectSelector)
+        RequireChange = (await Dropdown.input_value()) != PSeason
+        await PPage.evaluate(ARM_OBSERVERS_JS, PContainerSelectors)
+
+        PPage.on("response", onResponse)
+        try:
+            if RequireChange:
+                await Dropdown.select_option(PSeason)
+
+            TimedOut = False
+            while not await PPage.evaluate(CONTAINERS_SETTLED_JS, [WAIT_SETTLE_MS, RequireChange]):
+                if time.perf_counter() >= getWaitDeadline(StartTime, ResponseTimes):
+                    TimedOut = True
+                    break
+                await PPage.wait_for_timeout(WAIT_POLL_MS)
+        finally:
+            PPage.remove_listener("response", onResponse)
+        if Slot is not None:
+            Slot.failed = TimedOut
+
+    ElapsedMs = (time.perf_counter() - StartTime) * 1000
+    recordWait(PWaitName, ElapsedMs, PBaselineMs, TimedOut)
+    return ElapsedMs
@@ -0,0 +1,215 @@
+import queue
+import threading
+from playwright.sync_api import sync_playwright
+
+from historical_scraper.helpers.team_scraper import scrapeClubData
+from historical_scraper.helpers.parse_pool import parseTeamRosters, submitParse, shutdownParsePool
+from historical_scraper.helpers.player_scraper import discoverPlayer, discoverRetiredPlayer, readAvailableSeasons, fetchPlayerSeasonContainers, parseSeasonContainers, getEmptySeasonStats, addSeasonToPlayer, addRetiredSeasonToPlayer, writeSeasonLevelDetails
+from historical_scraper.helpers.utils import getSeasonsToScrape
+from historical_scraper.helpers.waits import printWaitSummary
+from historical_scraper.helpers.rate_limiter import throttledGoto, printRateMetrics
+from historical_scraper.helpers.fault_handling import retryCall, quarantinePlayer, printFaultSummary
+from historical_scraper.models.player import Player
+from historical_scraper.config import PIPELINE_QUEUE_SIZE, PIPELINE_PARSERS, PIPELINE_WRITE_BATCH, PIPELINE_FLUSH_SECONDS
+
+from database.reader import getDbContents
+from database.bulk_writer import writePlayersInBulk
+
+# Streaming version of historical_scraper.scraper.main. Instead of keeping every player in PlayersDict until the browser closes,
+# the players flow through three stages connected by bounded queues:
+#   1. The fetcher (the main thread, it owns the browser) reads the raw html containers of a player's seasons.
+#   2. PIPELINE_PARSERS parser threads build the Player, Season and SeasonLevel objects from the html.
+#   3. The writer thread commits the players to the database in batches of PIPELINE_WRITE_BATCH.
+# A full queue blocks the stage before it, so memory stays flat, and the players show up in the database while the run goes on.
+
+def fetchRawPlayer(PPlayerObject: Player, PPage: object) -> dict:
+    """
+    Stage 1. Reads the birth year and position of the player and the raw html of its seasons. Nothing is parsed here, so the browser can move on quickly.
+
+    Args:
+        PPlayerObject (Player): The player to fetch. The birth year and position are written to it.
+        PPage (object): The Page object to use.
+
+    Returns:
+        dict: {"Player": Player, "Retired": bool, "Seasons": [(Season, SeasonAllStatsHtml, LevelStatsHtml)]}. The htmls are None for seasons without data.
+    """
+    Retired = not retryCall(discoverPlayer, PPlayerObject.sjlLink, PPlayerObject, PPage, PDescription=PPlayerObject.sjlName)
+    LastSeasonPlayed = None
+    if Retired:
+        LastSeasonPlayed = discoverRetiredPlayer(PPlayerObject.sjlLink, PPlayerObject, PPage)
+
+    AvailableSeasons = readAvailableSeasons(PPage)
+    RawSeasons = []
+    for Season in getSeasonsToScrape(PPlayerObject.birthYear, LastSeasonPlayed):
+        if AvailableSeasons is not None and Season not in AvailableSeasons:
+            RawSeasons.append((Season, None, None))         # No data that season, the parser fills in zeros
+            continue
+        SeasonAllStatsHtml, LevelStatsHtml = retryCall(fetchPlayerSeasonContainers, PPage, Season, PPlayerObject.position, PPlayerObject.sjlLink,
+                                                       PDescription=f"season {Season} of {PPlayerObject.sjlName}", PBeforeRetry=lambda: throttledGoto(PPage, PPlayerObject.sjlLink))
+        RawSeasons.append((Season, SeasonAllStatsHtml, LevelStatsHtml))
+
+    return {"Player": PPlayerObject, "Retired": Retired, "Seasons": RawSeasons}
+
+def buildPlayerFromRaw(PRawPlayer: dict) -> Player:
+    """
+    Stage 2. Parses the raw seasons from fetchRawPlayer into the season objects of the player, the same way fetchPlayerCareerData builds them.
+    Retired players only get the season totals, like in fetchRetiredPlayerCareerData.
+
+    Args:
+        PRawPlayer (dict): The dict from fetchRawPlayer.
+
+    Returns:
+        Player: The player with its seasons, and the club, level and age group of the levels parsed.
+    """
+    PlayerObject = PRawPlayer["Player"]
+    ParsedSeasons = []          # All the seasons of the player are parsed in the parse pool at the same time
+    for Season, SeasonAllStatsHtml, LevelStatsHtml in PRawPlayer["Seasons"]:
+        if SeasonAllStatsHtml is not None:
+            ParsedSeasons.append((Season, submitParse(parseSeasonContainers, SeasonAllStatsHtml, LevelStatsHtml, PlayerObject.position)))
+        else:
+            ParsedSeasons.append((Season, None))
+
+    for Season, Parsed in ParsedSeasons:
+        StatsDict = getEmptySeasonStats(PlayerObject.position) if Parsed is None else Parsed.result()
+
+        if not PRawPlayer["Retired"]:
+            addSeasonToPlayer(PlayerObject, Season, StatsDict)
+        else:
+            addRetiredSeasonToPlayer(PlayerObject, Season, StatsDict)
+
+    writeSeasonLevelDetails({PlayerObject.sjlName: PlayerObject})     # This writes the .level .club and .ageGroup attributes to the PlayerSeasonLevel objects
+    return PlayerObject
+
+def countStat(PStats: dict, PKey: str, PAmount: int = 1) -> None:
+    """
+    Adds PAmount to one counter of the shared stats dict. The stages run in different threads, so the dict has its own lock.
+    """
+    with PStats["Lock"]:
+        PStats[PKey] += PAmount
+    return None
+
+def parserStage(PParseQueue: queue.Queue, PWriteQueue: queue.Queue, PStats: dict) -> None:
+    """
+    One parser thread. Takes raw players from PParseQueue until it gets None, and puts the built players to PWriteQueue.
+    """
+    while True:
+        RawPlayer = PParseQueue.get()
+        if RawPlayer is None:
+            break
+        try:
+            PWriteQueue.put(buildPlayerFromRaw(RawPlayer))     # Blocks while the writer is behind
+            countStat(PStats, "Parsed")
+        except Exception as e:
+            quarantinePlayer(RawPlayer["Player"].sjlName, RawPlayer["Player"].sjlLink, e)
+            countStat(PStats, "Failed")
+    return None
+
+def flushWriteBatch(PBatch: list, PStats: dict) -> None:
+    """
+    Commits the players of the batch with writePlayersInBulk and empties the batch. The players that fail are quarantined.
+    """
+    if not PBatch:
+        return None
+    try:
+        Failed = writePlayersInBulk(PBatch, len(PBatch))   # One commit for the whole batch, player by player only if it fails
+    except Exception as e:          # The commit itself failed, nothing of the batch was written
+        Failed = [(PlayerObject, e) for PlayerObject in PBatch]
+
+    for PlayerObject, Error in Failed:
+        quarantinePlayer(PlayerObject.sjlName, PlayerObject.sjlLink, Error)
+    countStat(PStats, "Written", len(PBatch) - len(Failed))
+    countStat(PStats, "Failed", len(Failed))
+    print(f"Wrote {len(PBatch) - len(Failed)} players to the database ({PStats['Written']} so far)")
+    PBatch.clear()
+    return None
+
+def writerStage(PWriteQueue: queue.Queue, PStats: dict) -> None:
+    """
+    The writer thread. Collects players from PWriteQueue into batches of PIPELINE_WRITE_BATCH, and commits a smaller batch
+    if nothing has arrived in PIPELINE_FLUSH_SECONDS. Stops at None.
+    """
+    Batch = []
+    while True:
+        try:
+            PlayerObject = PWriteQueue.get(timeout=PIPELINE_FLUSH_SECONDS)
+        except queue.Empty:
+            flushWriteBatch(Batch, PStats)      # The fetcher is slow right now, so write what we have
+            continue
+
+        if PlayerObject is None:
+            break
+        Batch.append(PlayerObject)
+        if len(Batch) >= PIPELINE_WRITE_BATCH:
+            flushWriteBatch(Batch, PStats)
+
+    flushWriteBatch(Batch, PStats)
+    return None
+
+def mainPipeline(PTeamIds: list[str] = ["319126555"], PNumberOfSeasons: int = 2, PParserCount: int = PIPELINE_PARSERS) -> dict:
+    """
+    Streaming version of historical_scraper.scraper.main. The players are written to the database by the pipeline itself,
+    so nothing is returned for the caller to write.
+
+    Args:
+        PTeamIds (list[str]): The team IDs of the teams to scrape.
+        PNumberOfSeasons (int): The number of seasons to scrape the team rosters for.
+        PParserCount (int): How many parser threads to run.
+
+    Returns:
+        dict: How many players were fetched, parsed, written and failed.
+    """
+    print("Pipeline scraping script is live")
+
+    ClubTeamList = []           # List of Team objects. These mainly just contain the html of the players for each season.
+    PlayersDict = {}            # The players to scrape. Each player is taken out of the dict when it is fetched, so the dict doesn't keep the finished players in memory.
+    Stats = {"Fetched": 0, "Parsed": 0, "Written": 0, "Failed": 0, "Lock": threading.Lock()}
+
+    dbDict = getDbContents()    # Players already in the db are not scraped again
+
+    ParseQueue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    WriteQueue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    Parsers = [threading.Thread(target=parserStage, args=(ParseQueue, WriteQueue, Stats), daemon=True) for _ in range(PParserCount)]
+    Writer = threading.Thread(target=writerStage, args=(WriteQueue, Stats), daemon=True)
+    for Thread in Parsers + [Writer]:
+        Thread.start()
+
+    with sync_playwright() as p:
+        Browser = p.chromium.launch(headless=True)
+        Page = Browser.new_page()
+
+        try:
+            scrapeClubData(PTeamIds, PNumberOfSeasons, ClubTeamList, Page)
+            parseTeamRosters(ClubTeamList, PlayersDict)
+            ClubTeamList.clear()
+            print("Done parsing the players")
+
+            for NameKey in list(PlayersDict.keys()):
+                PlayerObject = PlayersDict.pop(NameKey)
+                if NameKey in dbDict["players"]:
+                    print(f"{NameKey} is already in the database")
+                    continue
+                try:
+                    RawPlayer = fetchRawPlayer(PlayerObject, Page)
+                except Exception as e:
+                    quarantinePlayer(NameKey, PlayerObject.sjlLink, e)
+                    countStat(Stats, "Failed")
+                    continue
+                countStat(Stats, "Fetched")
+                ParseQueue.put(RawPlayer)                           # Blocks while the parsers are behind
+        finally:
+            for _ in Parsers:                                       # One stop signal per parser, even if the fetcher crashed
+                ParseQueue.put(None)
+            for Thread in Parsers:
+                Thread.join()
+            WriteQueue.put(None)
+            Writer.join()
+            Browser.close()
+            shutdownParsePool()
+
+    printWaitSummary()
+    printRateMetrics()
+    printFaultSummary()
+
+    Summary = {Key: Value for Key, Value in Stats.items() if Key != "Lock"}
+    print(f"Pipeline done: {Summary}")
+    return Summary
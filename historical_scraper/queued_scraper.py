@@ -0,0 +1,273 @@
+from playwright.sync_api import sync_playwright
+
+from historical_scraper.helpers.team_scraper import scrapeClubData
+from historical_scraper.helpers.parse_pool import parseTeamRosters, shutdownParsePool
+from historical_scraper.helpers.player_scraper import discoverPlayer, discoverRetiredPlayer, readAvailableSeasons, getEmptySeasonStats, fetchSeasonWithRetries, writeSeasonLevelDetails
+from historical_scraper.helpers.job_queue import enqueuePlayers, resumeJobs, claimNextPlayer, addSeasonJobs, dropSeasonJobs, getPendingSeasons, setJobState, setPlayerState, isPlayerComplete, buildPlayerFromJobs, getQueueSummary, getWorkerId, renewLease, recordWorkerProgress
+from historical_scraper.helpers.utils import getSeasonsToScrape
+from historical_scraper.helpers.gap_planner import enqueueSeasonGaps
+from historical_scraper.helpers.waits import printWaitSummary
+from historical_scraper.helpers.rate_limiter import throttledGoto, printRateMetrics
+from historical_scraper.helpers.fault_handling import retryCall, printFaultSummary
+
+from database.connection import SessionLocal
+from database.reader import getDbContents, readOnePlayerByName
+from database.writer import writeEntirePlayerToDb, writeSeasonsForExistingPlayer
+
+def discoverQueuedPlayer(PPlayerObject: object, PPage: object) -> None:
+    """
+    Reads the birth year, position and the seasons to scrape of a queued player from its page, and creates the season jobs.
+    The seasons missing from the season dropdown have no data, so their jobs are done right away with zero stats.
+
+    Args:
+        PPlayerObject (Player): The claimed player. Edited in place.
+        PPage (object): The Page object to use. Left on the player page.
+
+    Returns:
+        None
+    """
+    LastSeasonPlayed = None
+    Retired = not retryCall(discoverPlayer, PPlayerObject.sjlLink, PPlayerObject, PPage, PDescription=PPlayerObject.sjlName)     # False for players that haven't played in the current year
+    if Retired:
+        LastSeasonPlayed = discoverRetiredPlayer(PPlayerObject.sjlLink, PPlayerObject, PPage)
+
+    SeasonsToScrape = getSeasonsToScrape(PPlayerObject.birthYear, LastSeasonPlayed)
+    addSeasonJobs(PPlayerObject, SeasonsToScrape, Retired)
+
+    AvailableSeasons = readAvailableSeasons(PPage)
+    if AvailableSeasons is not None:
+        for Season in SeasonsToScrape:
+            if Season not in AvailableSeasons:
+                setJobState(PPlayerObject.sjlLink, Season, "done", PResult=getEmptySeasonStats(PPlayerObject.position))
+    return None
+
+def settleUnavailableSeasons(PPlayerObject: object, PPage: object) -> None:
+    """
+    Checks the pending seasons of a player discovered in an earlier run, or queued by the gap planner, against the season dropdown.
+    The seasons after the newest one in the dropdown were not played (the player retired or had a break that hasn't ended), so their jobs are dropped.
+    The older seasons missing from the dropdown are done with zero stats, like in discoverQueuedPlayer.
+
+    Args:
+        PPlayerObject (Player): The claimed player.
+        PPage (object): The Page object to use. Must be loaded with the player page.
+
+    Returns:
+        None
+    """
+    AvailableSeasons = readAvailableSeasons(PPage)
+    if AvailableSeasons is None:                # Can't tell, every pending season is fetched
+        return None
+
+    LastSeasonPlayed = max(int(Season) for Season in AvailableSeasons)
+    Unavailable = [Season for Season in getPendingSeasons(PPlayerObject.sjlLink) if Season not in AvailableSeasons]
+    dropSeasonJobs(PPlayerObject.sjlLink, [Season for Season in Unavailable if int(Season) > LastSeasonPlayed])
+    for Season in Unavailable:
+        if int(Season) < LastSeasonPlayed:
+            setJobState(PPlayerObject.sjlLink, Season, "done", PResult=getEmptySeasonStats(PPlayerObject.position))
+    return None
+
+def writeQueuedPlayer(PPlayerLink: str) -> None:
+    """
+    Builds the finished player from its jobs and writes it to the database with writeEntirePlayerToDb.
+    If the player is already in the database (the last run crashed after writing it), it is only marked written.
+    Players queued by the gap planner already have a row, so only their missing seasons are written with writeSeasonsForExistingPlayer.
+    """
+    PlayerObject = buildPlayerFromJobs(PPlayerLink)
+
+    if PlayerObject.id is not None:
+        writeSeasonLevelDetails({PlayerObject.sjlName: PlayerObject})
+        writeSeasonsForExistingPlayer(PlayerObject.id, PlayerObject.seasons)    # Skips the years that are already stored
+        setPlayerState(PPlayerLink, "written")
+        return None
+
+    Session = SessionLocal()
+    try:
+        AlreadyWritten = readOnePlayerByName(Session, PlayerObject.sjlName) is not None
+    finally:
+        Session.close()
+
+    if AlreadyWritten:
+        print(f"{PlayerObject.sjlName} is already in the database")
+    else:
+        writeSeasonLevelDetails({PlayerObject.sjlName: PlayerObject})   # This writes the .level .club and .ageGroup attributes to the PlayerSeasonLevel objects
+        writeEntirePlayerToDb(PlayerObject)                             # Commits the player and all its seasons
+
+    setPlayerState(PPlayerLink, "written")
+    return None
+
+def scrapeQueuedPlayer(PPlayerObject: object, PDiscovered: bool, PPage: object, PWorkerId: str) -> None:
+    """
+    Runs the pending jobs of one claimed player. A failing season job is marked failed and the other seasons go on.
+    Once all the jobs of the player are done, the player is written to the database.
+
+    Args:
+        PPlayerObject (Player): The claimed player.
+        PDiscovered (bool): True if the season jobs were already created in an earlier run.
+        PPage (object): The Page object to use.
+        PWorkerId (str): The id of the worker holding the lease on the player.
+
+    Returns:
+        None
+    """
+    print(f"\nScraping queued player: {PPlayerObject.sjlName}")
+
+    try:
+        if PDiscovered:
+            retryCall(throttledGoto, PPage, PPlayerObject.sjlLink, PDescription=PPlayerObject.sjlName)
+            settleUnavailableSeasons(PPlayerObject, PPage)
+        else:
+            discoverQueuedPlayer(PPlayerObject, PPage)
+    except Exception as e:
+        print(f"Failed to discover {PPlayerObject.sjlName}: {e}")
+        setPlayerState(PPlayerObject.sjlLink, "failed", str(e))
+        recordWorkerProgress(PWorkerId, "historical", PJobsFailed=1)
+        return None
+
+    for Season in getPendingSeasons(PPlayerObject.sjlLink):
+        setJobState(PPlayerObject.sjlLink, Season, "in-flight")
+        try:
+            StatsDict = fetchSeasonWithRetries(PPlayerObject, PPage, Season)
+        except Exception as e:
+            print(f"Season {Season} of {PPlayerObject.sjlName} failed: {e}")
+            setJobState(PPlayerObject.sjlLink, Season, "failed", PError=str(e))
+            recordWorkerProgress(PWorkerId, "historical", PJobsFailed=1)
+            continue
+        setJobState(PPlayerObject.sjlLink, Season, "done", PResult=StatsDict)
+        recordWorkerProgress(PWorkerId, "historical", PJobsDone=1)
+
+        if not renewLease("players", ("link", PPlayerObject.sjlLink), PWorkerId):   # The lease ran out and another worker took the player over
+            print(f"Lost the lease on {PPlayerObject.sjlName}, leaving it to the other worker")
+            return None
+
+    if not isPlayerComplete(PPlayerObject.sjlLink):
+        setPlayerState(PPlayerObject.sjlLink, "failed", "Some seasons failed")
+        return None
+
+    try:
+        writeQueuedPlayer(PPlayerObject.sjlLink)
+        recordWorkerProgress(PWorkerId, "historical", PItemsDone=1)
+    except Exception as e:
+        print(f"Failed to write {PPlayerObject.sjlName} to the database: {e}")
+        setPlayerState(PPlayerObject.sjlLink, "failed", str(e))
+
+    return None
+
+def runJobQueue(PPage: object, PWorkerId: str = None) -> None:
+    """
+    Scrapes the queued players one by one until there are no pending players left.
+
+    Args:
+        PPage (object): The Page object to use.
+        PWorkerId (str): The id the players are leased with. Defaults to getWorkerId().
+
+    Returns:
+        None
+    """
+    WorkerId = PWorkerId or getWorkerId()
+    while True:
+        Claimed = claimNextPlayer(WorkerId)
+        if Claimed is None:
+            break
+        PlayerObject, Retired, Discovered = Claimed
+        scrapeQueuedPlayer(PlayerObject, Discovered, PPage, WorkerId)
+    return None
+
+def fillPlayerQueue(PTeamIds: list[str], PNumberOfSeasons: int, PPage: object, PDbDict: dict) -> None:
+    """
+    Scrapes the team rosters and adds the players that are not in the database yet to the job queue.
+
+    Args:
+        PTeamIds (list[str]): The team IDs of the teams to scrape.
+        PNumberOfSeasons (int): The number of seasons to scrape the team rosters for.
+        PPage (object): The Page object to use.
+        PDbDict (dict): The result of getDbContents. Players already in the db are not queued.
+
+    Returns:
+        None
+    """
+    ClubTeamList = []           # List of Team objects. These mainly just contain the html of the players for each season.
+    PlayersDict = {}            # Dict of player objects. Only used to fill the queue.
+
+    scrapeClubData(PTeamIds, PNumberOfSeasons, ClubTeamList, PPage)
+
+    parseTeamRosters(ClubTeamList, PlayersDict)
+    print("Done parsing the players")
+
+    for NameKey in list(PlayersDict.keys()):
+        if NameKey in PDbDict["players"]:
+            del PlayersDict[NameKey]
+
+    print(f"Added {enqueuePlayers(PlayersDict)} new players to the queue")
+    ClubTeamList.clear()
+
+    return None
+
+def mainQueued(PTeamIds: list[str] = ["319126555"], PNumberOfSeasons: int = 2) -> dict:
+    """
+    Resumable version of historical_scraper.scraper.main. The players go through the job queue (helpers/job_queue.py),
+    and each player is written to the database as soon as all its seasons are scraped. Running this again after a crash continues from where it stopped.
+
+    Args:
+        PTeamIds (list[str]): The team IDs of the teams to scrape.
+        PNumberOfSeasons (int): The number of seasons to scrape the team rosters for.
+
+    Returns:
+        dict: How many players and jobs ended up in each state, see job_queue.getQueueSummary.
+    """
+    print("Queued scraping script is live")
+
+    resumeJobs(PReleaseAllLeases=True)  # Jobs left in-flight by a crashed run are set back to pending. No other workers run with this one.
+    dbDict = getDbContents()    # Players already in the db are not queued
+
+    with sync_playwright() as p:
+        Browser = p.chromium.launch(headless=True)
+        Page = Browser.new_page()
+
+        fillPlayerQueue(PTeamIds, PNumberOfSeasons, Page, dbDict)
+        runJobQueue(Page)
+
+        Browser.close()
+
+    printWaitSummary()
+    printRateMetrics()  # The final state of the adaptive rate limiter
+    printFaultSummary()
+    shutdownParsePool()
+
+    Summary = getQueueSummary()
+    print(f"Queue after the run: {Summary}")
+
+    return Summary
+
+def mainBackfill(PPlayerLinks: list[str] = None) -> dict:
+    """
+    Tops up the players already in the database. Only the seasons missing from player_seasons and goalie_seasons are scraped
+    (helpers/gap_planner.py), the stored seasons are never fetched again. Runs through the same job queue as mainQueued, so it is resumable too.
+
+    Args:
+        PPlayerLinks (list[str]): Only top up these players. Defaults to every player in the database.
+
+    Returns:
+        dict: How many players and jobs ended up in each state, see job_queue.getQueueSummary.
+    """
+    print("Backfill script is live")
+
+    resumeJobs(PReleaseAllLeases=True)
+    enqueueSeasonGaps(PPlayerLinks)
+
+    with sync_playwright() as p:
+        Browser = p.chromium.launch(headless=True)
+        Page = Browser.new_page()
+
+        runJobQueue(Page)
+
+        Browser.close()
+
+    printWaitSummary()
+    printRateMetrics()  # The final state of the adaptive rate limiter
+    printFaultSummary()
+    shutdownParsePool()
+
+    Summary = getQueueSummary()
+    print(f"Queue after the run: {Summary}")
+
+    return Summary
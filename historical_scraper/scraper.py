@@ -1,10 +1,16 @@
 from playwright.sync_api import sync_playwright
 
 from historical_scraper.helpers.team_scraper import scrapeClubData, parsePlayerRowsFromHtml
+from historical_scraper.helpers.parse_pool import parseTeamRosters, shutdownParsePool
 from historical_scraper.helpers.player_scraper import fetchPlayerCareerData, writeSeasonLevelDetails
+from historical_scraper.helpers.waits import printWaitSummary
+from historical_scraper.helpers.rate_limiter import printRateMetrics
+from historical_scraper.helpers.fault_handling import quarantinePlayer, printFaultSummary
+from historical_scraper.helpers.http_fetcher import scrapeClubDataHttp, scrapePlayersHttp, closeHttpClient, EndpointNotFoundError
+from historical_scraper.helpers.replay import replayClubData, replayPlayerCareerData
 from historical_scraper.models.team import Team
 from historical_scraper.models.player import Player
-from historical_scraper.config import CURRENT_YEAR
+from historical_scraper.config import CURRENT_YEAR, FETCH_BACKEND
 
 from database.reader import getDbContents
 
@@ -95,8 +101,14 @@ def onePlayerTest():
     # return OnePlayer
     return PlayersDict
 
-def main():
+def main(PReplay: bool = False, PBackend: str = FETCH_BACKEND):
     print("Scraping script is live")
+
+    if PReplay:                     # Parse the archived html instead of scraping, see historical_scraper.helpers.replay
+        return mainReplay()
+
+    if PBackend == "http":          # The http backend skips the browser, see historical_scraper.helpers.http_fetcher
+        return mainHttp()
     
     # Init the containers
     ClubTeamList = []           # List of Team objects. These mainly just contain the html of the players for each season. Used just until we manage to parse the html into objects.
@@ -115,9 +127,7 @@ def main():
         scrapeClubData(["319126555"], 2, ClubTeamList, Page)                ### !!Eventually the club IDs should be more dynamic!! ###
 
         # This parses the html from each teams each season into player objects. The player objects get stored in PlayersDict with no duplicates.
-        for Team in ClubTeamList:
-            for SeasonKey, HtmlValue in Team.seasonRosterHtmls.items():     # Key is the season year (ex. "2025"), value is the html (containing all the players for that season)
-                parsePlayerRowsFromHtml(HtmlValue, PlayersDict)             # Parses the players from html to player objects. These objects only contain the sjl_name, ep_name, and sjl_link at this point.
+        parseTeamRosters(ClubTeamList, PlayersDict)                         # These objects only contain the sjl_name, ep_name, and sjl_link at this point. Parsed in the parse pool if it is on.
         print("Done parsing the players")
 
         NameKeysToDelete = []                                               # List to collect the dict key-value pairs to delete
@@ -126,7 +136,11 @@ def main():
                 print(f"{NameKey} is already in the database")              
                 NameKeysToDelete.append(NameKey)                            # Add the key-value pair to the list of players to delete. These are already in the table, and we dont want to write duplicates.
                 continue                                                    # Move to next player
-            fetchPlayerCareerData(ValueObject.sjlLink, ValueObject, Page)   # This scrapes the players web page and edits the value Player object in place
+            try:
+                fetchPlayerCareerData(ValueObject.sjlLink, ValueObject, Page)   # This scrapes the players web page and edits the value Player object in place
+            except Exception as e:
+                quarantinePlayer(NameKey, ValueObject.sjlLink, e)           # The retries didn't help. Leave the player out, so a half scraped player isn't written.
+                NameKeysToDelete.append(NameKey)
 
         for NameKey in NameKeysToDelete:                                    # Delete the found duplicate players from the PlayersDict
             del PlayersDict[NameKey]                                        # This dict is later used to conver PlayerObjects to PlayerRows
@@ -134,12 +148,118 @@ def main():
         # Cleanup
         Browser.close()
 
+    printWaitSummary()  # Shows how long the event driven waits took compared to the old fixed sleeps
+    printRateMetrics()  # The final state of the adaptive rate limiter
+    printFaultSummary() # How many players were quarantined
+    shutdownParsePool()
+
     # This writes the .level .club and .ageGroup attributes to the PlayerSeasonLevel objects
     writeSeasonLevelDetails(PlayersDict)
     
     ClubTeamList.clear()
     
 
+    return PlayersDict
+
+def mainHttp():
+    """
+    The same as main, but the team rosters and players are fetched over http with the shared httpx client.
+    The browser is only started if some players (ex. retired players) need the Playwright fallback,
+    or for the whole run if the team endpoint returns 404. A player that fails on Playwright too is quarantined, like in main.
+    """
+    print("Http scraping script is live")
+
+    # Init the containers
+    ClubTeamList = []           # List of Team objects. These mainly just contain the html of the players for each season.
+    PlayersDict = {}            # Dict of player objects. These contain all the player objects containing the actual data
+
+    dbDict = getDbContents()    # To avoid dublicates, queries the database and returns all contents of "players", "clubs", "levels" and "age_groups" tables.
+
+    try:
+        scrapeClubDataHttp(["319126555"], 2, ClubTeamList)                 ### !!Eventually the club IDs should be more dynamic!! ###
+    except EndpointNotFoundError as e:                                      # The configured endpoint doesn't exist on the site
+        print(f"{e}. Falling back to Playwright for the whole run.")
+        closeHttpClient()
+        return main(PBackend="playwright")
+
+    parseTeamRosters(ClubTeamList, PlayersDict)                             # Parses the players from html to player objects.
+    print("Done parsing the players")
+
+    for NameKey in list(PlayersDict.keys()):                                # Players already in the db are not scraped again
+        if NameKey in dbDict["players"]:
+            print(f"{NameKey} is already in the database")
+            del PlayersDict[NameKey]
+
+    FallbackNames = scrapePlayersHttp(PlayersDict)                          # Returns the names of the players that need the Playwright fallback
+    closeHttpClient()
+
+    if FallbackNames:
+        try:
+            with sync_playwright() as p:
+                Browser = p.chromium.launch(headless=True)
+                Page = Browser.new_page()
+                while FallbackNames:
+                    NameKey = FallbackNames.pop(0)
+                    PlayersDict[NameKey].seasons = []                       # Drop anything a failed http attempt left behind
+                    try:
+                        fetchPlayerCareerData(PlayersDict[NameKey].sjlLink, PlayersDict[NameKey], Page)
+                    except Exception as e:
+                        quarantinePlayer(NameKey, PlayersDict[NameKey].sjlLink, e)  # Failed both ways. Leave the player out, so a half scraped player isn't written.
+                        del PlayersDict[NameKey]
+                Browser.close()
+        except Exception as e:                                              # The browser itself failed, ex. Chromium isn't installed. Keep the players fetched over http.
+            print(f"The Playwright fallback failed: {e}")
+            for NameKey in FallbackNames:
+                quarantinePlayer(NameKey, PlayersDict[NameKey].sjlLink, e)
+                del PlayersDict[NameKey]
+
+    # This writes the .level .club and .ageGroup attributes to the PlayerSeasonLevel objects. One player at a time, so a level name
+    # that can't be parsed only quarantines that player.
+    for NameKey in list(PlayersDict.keys()):
+        try:
+            writeSeasonLevelDetails({NameKey: PlayersDict[NameKey]})
+        except Exception as e:
+            quarantinePlayer(NameKey, PlayersDict[NameKey].sjlLink, e)
+            del PlayersDict[NameKey]
+
+    printRateMetrics()  # The final state of the adaptive rate limiter
+    printFaultSummary() # Printed even when nothing was quarantined
+
+    ClubTeamList.clear()
+
+    return PlayersDict
+
+def mainReplay():
+    """
+    The same as main, but everything is read from the html archive (helpers/archive.py) instead of the website. No browser or network is needed.
+    Players that are not fully in the archive are left out of the returned dict.
+    """
+    print("Replay script is live")
+
+    # Init the containers
+    ClubTeamList = []           # List of Team objects. These mainly just contain the html of the players for each season.
+    PlayersDict = {}            # Dict of player objects. These contain all the player objects containing the actual data
+
+    dbDict = getDbContents()    # To avoid dublicates, queries the database and returns all contents of "players", "clubs", "levels" and "age_groups" tables.
+
+    replayClubData(["319126555"], 2, ClubTeamList)                         ### !!Eventually the club IDs should be more dynamic!! ###
+
+    parseTeamRosters(ClubTeamList, PlayersDict)                             # Parses the players from html to player objects.
+    print("Done parsing the players")
+
+    for NameKey in list(PlayersDict.keys()):
+        if NameKey in dbDict["players"]:                                    # Players already in the db are not replayed
+            print(f"{NameKey} is already in the database")
+            del PlayersDict[NameKey]
+        elif not replayPlayerCareerData(PlayersDict[NameKey]):              # Edits the Player object in place. False if the archive doesn't have the player.
+            print(f"{NameKey} is not in the archive, skipping")
+            del PlayersDict[NameKey]
+
+    # This writes the .level .club and .ageGroup attributes to the PlayerSeasonLevel objects
+    writeSeasonLevelDetails(PlayersDict)
+
+    ClubTeamList.clear()
+
     return PlayersDict
 
 if __name__ == "__main__":
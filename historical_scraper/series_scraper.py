@@ -0,0 +1,80 @@
+from playwright.sync_api import sync_playwright
+
+from historical_scraper.helpers.series_stats import scrapeSeriesStats, buildSeasonObject, entryToPlayer, getLinkKey
+from historical_scraper.helpers.job_queue import enqueuePlayers
+from historical_scraper.helpers.utils import getSeasons
+from historical_scraper.queued_scraper import runJobQueue
+
+from database.connection import SessionLocal
+from database.reader import readAllPlayers
+from database.writer import writeSeasonsForExistingPlayer
+
+def ingestSeriesStats(PStats: dict) -> dict:
+    """
+    Writes the seasons from the series stat tables for the players that are already in the database.
+    The rows are matched to the players by sjlLink.
+
+    Args:
+        PStats (dict): The result of series_stats.scrapeSeriesStats.
+
+    Returns:
+        dict: The unmatched players. Key is sjlName, value is a Player object with the names and link, ready for job_queue.enqueuePlayers.
+    """
+    Session = SessionLocal()
+    try:
+        PlayersByLink = {getLinkKey(Row.sjlLink): (Row.id, Row.position) for Row in readAllPlayers(Session)}
+    finally:
+        Session.close()
+
+    SeasonsByPlayer = {}        # Player id -> list of season objects
+    UnmatchedPlayers = {}
+    for (LinkKey, Season), Entry in PStats.items():
+        if LinkKey not in PlayersByLink:
+            UnmatchedPlayers.setdefault(Entry["SjlName"], entryToPlayer(Entry))
+            continue
+
+        PlayerId, Position = PlayersByLink[LinkKey]
+        if (Position == "Maalivahti") != Entry["Goalie"]:       # The table doesn't match the position stored for the player
+            print(f"{Entry['SjlName']} is in the {'goalie' if Entry['Goalie'] else 'skater'} table, but stored as {Position}. Skipping {Season}.")
+            continue
+        SeasonsByPlayer.setdefault(PlayerId, []).append(buildSeasonObject(Entry, Season))
+
+    Written = 0
+    for PlayerId, Seasons in SeasonsByPlayer.items():
+        Written += writeSeasonsForExistingPlayer(PlayerId, Seasons)     # Skips the years already stored for the player
+
+    print(f"Wrote {Written} seasons for {len(SeasonsByPlayer)} players from the series tables. {len(UnmatchedPlayers)} players were not in the database.")
+    return UnmatchedPlayers
+
+def mainSeries(PSeries: list[tuple[str, str]], PNumberOfSeasons: int = 2, PScrapeUnmatched: bool = True) -> dict:
+    """
+    Bulk ingestion from the series stat tables. One page load per series and season, instead of one player page per player.
+    Players that are not in the database yet go to the job queue and are scraped from their own pages, see queued_scraper.
+
+    Args:
+        PSeries (list[tuple[str, str]]): (SerieId, LevelName) of each series to read, ex. [("123", "U16 AAA")].
+        PNumberOfSeasons (int): How many seasons back from the current to read.
+        PScrapeUnmatched (bool): Scrape the unmatched players right away. If False they are only queued.
+
+    Returns:
+        dict: The unmatched players, key is sjlName.
+    """
+    print("Series scraping script is live")
+
+    Seasons = []
+    getSeasons(PNumberOfSeasons, Seasons)   # Populates the list with year strings ["2025", "2024"...]
+
+    with sync_playwright() as p:
+        Browser = p.chromium.launch(headless=True)
+        Page = Browser.new_page()
+
+        Stats = scrapeSeriesStats(PSeries, Seasons, Page)
+        UnmatchedPlayers = ingestSeriesStats(Stats)
+
+        print(f"Added {enqueuePlayers(UnmatchedPlayers)} unmatched players to the job queue")
+        if PScrapeUnmatched:
+            runJobQueue(Page)       # Falls back to the player pages for the players the tables couldn't be matched to
+
+        Browser.close()
+
+    return UnmatchedPlayers
@@ -0,0 +1,102 @@
+import sys
+import time
+import multiprocessing
+from playwright.sync_api import sync_playwright
+
+from historical_scraper.queued_scraper import runJobQueue, fillPlayerQueue
+from historical_scraper.helpers.job_queue import resumeJobs, hasLiveLeases, getWorkerId, getQueueSummary, printWorkerStats
+from historical_scraper.config import SCRAPER_CONCURRENCY, WORKER_POLL_SECONDS
+
+from database.reader import getDbContents
+
+# Worker mode of the historical scraper. Each worker is its own process with its own browser, and leases players from the shared job queue
+# (helpers/job_queue.py), so the workers can run on one host or on several hosts that share the queue file.
+# Start the workers on one host with startWorkerProcesses, or one per terminal/host with: python -m historical_scraper.worker historical
+
+def runHistoricalWorker(PWorkerId: str = None) -> None:
+    """
+    One historical scraper worker. Scrapes queued players until the queue is empty and no other worker holds a lease.
+    While other workers are still busy it keeps polling, so it can take over the players of a worker that dies.
+
+    Args:
+        PWorkerId (str): The id of the worker. Defaults to getWorkerId().
+
+    Returns:
+        None
+    """
+    WorkerId = PWorkerId or getWorkerId()
+    print(f"Historical worker {WorkerId} is live")
+
+    with sync_playwright() as p:
+        Browser = p.chromium.launch(headless=True)
+        Page = Browser.new_page()   # USE THIS PAGE EVERYWHERE WITHIN THIS WORKER!
+
+        while True:
+            runJobQueue(Page, WorkerId)                 # Returns when there is nothing left to claim
+            if not hasLiveLeases("players"):
+                break
+            time.sleep(WORKER_POLL_SECONDS)             # Other workers are still busy. If one of them dies, its players are claimed on the next round.
+
+        Browser.close()
+
+    print(f"Historical worker {WorkerId} is done")
+    return None
+
+def startWorkerProcesses(PTarget: object, PWorkerCount: int) -> None:
+    """
+    Starts PWorkerCount worker processes running PTarget, and waits for all of them to finish.
+
+    Args:
+        PTarget (object): The worker function, ex. runHistoricalWorker. Called without arguments in each process.
+        PWorkerCount (int): How many processes to start.
+
+    Returns:
+        None
+    """
+    Processes = [multiprocessing.Process(target=PTarget) for _ in range(PWorkerCount)]
+    for Process in Processes:
+        Process.start()
+    for Process in Processes:
+        Process.join()
+
+    printWorkerStats()
+    return None
+
+def runHistoricalWorkers(PTeamIds: list[str] = ["319126555"], PNumberOfSeasons: int = 2, PWorkerCount: int = SCRAPER_CONCURRENCY) -> dict:
+    """
+    Fills the player queue from the team rosters and scrapes it with PWorkerCount worker processes on this host.
+    Workers started on other hosts with the same SCRAPER_JOB_QUEUE file help with the same queue.
+
+    Args:
+        PTeamIds (list[str]): The team IDs of the teams to scrape.
+        PNumberOfSeasons (int): The number of seasons to scrape the team rosters for.
+        PWorkerCount (int): How many worker processes to start.
+
+    Returns:
+        dict: How many players and jobs ended up in each state, see job_queue.getQueueSummary.
+    """
+    resumeJobs()                # Failed jobs are retried. In-flight rows are left to their leases, other hosts may be working on them.
+    dbDict = getDbContents()
+
+    with sync_playwright() as p:
+        Browser = p.chromium.launch(headless=True)
+        fillPlayerQueue(PTeamIds, PNumberOfSeasons, Browser.new_page(), dbDict)
+        Browser.close()
+
+    startWorkerProcesses(runHistoricalWorker, PWorkerCount)
+
+    Summary = getQueueSummary()
+    print(f"Queue after the run: {Summary}")
+    return Summary
+
+if __name__ == "__main__":
+    # python -m historical_scraper.worker [historical|update] [number of processes]
+    # Only runs workers, the queue must be filled first with runHistoricalWorkers or update_scraper.worker.fillUpdateQueue.
+    Mode = sys.argv[1] if len(sys.argv) > 1 else "historical"
+    WorkerCount = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    if Mode == "update":
+        from update_scraper.worker import runUpdateWorker
+        startWorkerProcesses(runUpdateWorker, WorkerCount)
+    else:
+        startWorkerProcesses(runHistoricalWorker, WorkerCount)
@@ -1,12 +1,24 @@
 from database.connection import createEmptyTables
 from database.converters import playerConverter
 from database.writer import writeEntirePlayerToDb
+from database.bulk_writer import writePlayersInBulk
 from database.reader import getDbContents
+from database.migrations import upgradeDatabase
+from database.query_plans import checkQueryPlans
+from database.query_counter import checkReaderQueryCounts
 
-from historical_scraper import oneGoalieTest, onePlayerTest, main as scraperMain
+from historical_scraper import oneGoalieTest, onePlayerTest, main as scraperMain, runAsyncScraper
+from historical_scraper.queued_scraper import mainQueued, mainBackfill
+from historical_scraper.worker import runHistoricalWorkers
+from historical_scraper.series_scraper import mainSeries
+from historical_scraper.pipeline import mainPipeline
+
+from historical_scraper.helpers.parser_parity import checkParserParity, checkFixtureParity
+from historical_scraper.dev.http_parity import checkHttpParity
 
 
 from update_scraper.update_scraped_data import updateLatestData
+from update_scraper.worker import runUpdateWorkers
 
 
 ### THESE ARE FOR UNDER CONSTRUCTION TESTING ###
@@ -15,6 +27,9 @@ from update_scraper.update_scraped_data import updateLatestData
 
 # dbDict = getDbContents()        # Queries the database and returns all contents of "players", "clubs", "levels" and "age_groups" tables.
 # createEmptyTables()             # Only do this if you want a fresh empty database
+# upgradeDatabase()               # Applies the schema migrations in database/migrations the database doesn't have yet
+# checkQueryPlans()               # Runs EXPLAIN on the reader queries and prints the ones that scan a whole table
+# checkReaderQueryCounts()        # Fails if a season level reader runs more queries when there are more rows (N+1)
 
 # Goalie = oneGoalieTest()      # Test function that returns only 1 Goalie
 # Player = onePlayerTest()      # Test function that returns only 1 Player
@@ -24,10 +39,23 @@ from update_scraper.update_scraped_data import updateLatestData
 
 
 # Players = scraperMain()
+# Players = runAsyncScraper(PConcurrency=6)   # Same as scraperMain, but scrapes 6 players at the same time
+# mainPipeline()                              # Same as scraperMain, but writes the players to the database in batches while it scrapes
+# mainQueued()                                # Resumable scraper. Writes each player to the database as soon as it is done, run again after a crash to continue
+# mainBackfill()                              # Scrapes only the seasons missing from the database for the players already in it
+# runHistoricalWorkers(PWorkerCount=4)       # Same as mainQueued, but with 4 worker processes. More hosts can join with: python -m historical_scraper.worker historical 4
+# mainSeries([("123", "U16 AAA")])           # Reads whole series stat tables. Only the players not in the database are scraped from their own pages
+# Players = scraperMain(PReplay=True)         # Same as scraperMain, but parses the html archived with SCRAPER_ARCHIVE=1 instead of scraping
+# checkParserParity()                        # Parses the whole html archive with both the lxml and the BeautifulSoup parsers and compares the results
+# checkFixtureParity()                       # Same over the fixtures committed in historical_scraper/fixtures. Raises if the parsers differ
+# checkHttpParity()                          # Serves the fixtures from a local stand-in server and checks that the http backend reads the same stats as Playwright
 # for Player, PlayerObject in Players.items():
 #     writeEntirePlayerToDb(PlayerObject)   # Writes the goalie (or any player) to the database
+# writePlayersInBulk(list(Players.values()))  # Same as the loop above, but writes 500 players per commit with a few multi-row inserts
 
 
 
 # THIS IS FOR THE UPDATE SCRAPER
+# runUpdateWorkers(PWorkerCount=4)   # Same as updateLatestData, but 4 worker processes lease the seasons from the job queue
+# updateLatestData(PReplay=True)    # Updates the current season from the html archive, no browser needed
 updateLatestData()
\ No newline at end of file
@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# The database modules read DATABASE_URL when they are imported, so the tests point it to a SQLite file before any test imports them.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.sqlite3')}"
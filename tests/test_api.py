@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+from database.connection import createEmptyTables
+from database.pagination import encodeCursor
+from api.api_main import app
+
+# The query validation of the season level endpoints. A bad query has to be refused before anything is read or cached.
+
+@pytest.fixture(autouse=True)
+def emptyDatabase():
+    createEmptyTables()
+    yield
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+def test_non_numeric_year_is_refused_before_the_cache_key(client):
+    for Url in ["/season-levels?year=abc", "/season-levels/export?year=abc"]:
+        Response = client.get(Url)
+        assert Response.status_code == 422
+        assert "year" in str(Response.json()["detail"])
+
+def test_numeric_year_filters(client):
+    Response = client.get("/season-levels?year=2024")
+    assert Response.status_code == 200
+    assert Response.json()["goalies"] == [] and Response.json()["players"] == []
+
+@pytest.mark.parametrize("Positions", [
+    {"players": ["points", 12]},                    # Too short
+    {"players": ["points", 12, 3405, 1]},           # Too long
+    {"players": ["points", "12", 3405]},            # The value is not of the type of the column
+    {"players": ["points", 12, "3405"]},            # Neither is the id
+    {"players": ["points", True, 3405]},
+    {"players": ["savePercentage", 91.5, 3405]},    # Not a sort of the table
+    {"teams": ["id", 12, 12]},                      # Not a table of the endpoint
+    {"players": "points"},
+])
+def test_tampered_cursor_is_a_400(client, Positions):
+    Response = client.get(f"/season-levels?sort=points&after={encodeCursor(Positions)}")
+    assert Response.status_code == 400
+    assert Response.json()["detail"] == "Invalid cursor"
+
+def test_valid_cursors_are_accepted(client):
+    assert client.get(f"/season-levels?sort=-points&after={encodeCursor({'players': ['-points', 12, 3405]})}").status_code == 200
+    assert client.get(f"/season-levels?sort=savePercentage&position=Maalivahti&after={encodeCursor({'goalies': ['savePercentage', 91, 7]})}").status_code == 200
+    assert client.get(f"/players/?sort=sjlName&after={encodeCursor({'players': ['sjlName', 'JOKUNEN Jaska', 7]})}").status_code == 200
+    assert client.get(f"/players/?sort=sjlName&after={encodeCursor({'players': ['sjlName', 7, 7]})}").status_code == 400
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select
+from database.connection import createEmptyTables, SessionLocal
+from database.registry import RegistryState
+from database.writer import writeEntirePlayerToDb
+from database.models import PlayerSeasonLevel as PlayerSeasonLevelRow, GoalieSeasonLevel as GoalieSeasonLevelRow
+from historical_scraper.models.player import Player
+from historical_scraper.models.season import GoalieSeason, PlayerSeason, GoalieSeasonLevel, PlayerSeasonLevel
+
+# Two teams of one club in the same level, ex. "Pelicans Turkoosi" and "Pelicans Valkoinen" in U14 AAA, are both parsed to the club "Pelicans",
+# so they have the same natural key in the level tables. writeEntirePlayerToDb has to add them up into one row instead of failing on the unique constraint.
+
+@pytest.fixture(autouse=True)
+def emptyDatabase():
+    createEmptyTables()
+    RegistryState["Loaded"] = False     # The ids of the registry are from the dropped tables
+    yield
+
+def addSameClubLevels(PSeason: object, PLevelClass: object, PLevelDicts: list[dict]) -> None:
+    for LevelDict in PLevelDicts:
+        Level = PLevelClass(LevelDict)
+        Level.club, Level.level, Level.ageGroup = "Pelicans", "AAA", "U14"     # What parseAgeGroupLevelAndClub gives for both teams
+        PSeason.seasonLevelStats.append(Level)
+
+def readLevelRows(PTable: object) -> list:
+    Session = SessionLocal()
+    try:
+        return Session.scalars(select(PTable)).all()
+    finally:
+        Session.close()
+
+def test_skater_with_two_teams_of_one_club_in_one_level():
+    PlayerObject = Player("VIRTANEN Aleksi", "Aleksi Virtanen", "https://www.leijonat.fi/index.php/pelaajakortti?lkq=1")
+    PlayerObject.birthYear, PlayerObject.position = "2011", "Puolustaja"
+    Season = PlayerSeason("2025", {"Games": "24", "Goals": "12", "Assists": "17", "Points": "29", "PenaltyMinutes": "14", "PpGoals": "3", "ShGoals": "1", "SoGoals": "0"})
+    addSameClubLevels(Season, PlayerSeasonLevel, [
+        {"TeamName": "Pelicans Turkoosi", "LevelName": "U14 AAA", "Games": "14", "Goals": "8", "Assists": "10", "Points": "18", "PenaltyMinutes": "8"},
+        {"TeamName": "Pelicans Valkoinen", "LevelName": "U14 AAA", "Games": "10", "Goals": "4", "Assists": "7", "Points": "11", "PenaltyMinutes": "6"},
+    ])
+    PlayerObject.addSeason(Season)
+
+    writeEntirePlayerToDb(PlayerObject)
+
+    Rows = readLevelRows(PlayerSeasonLevelRow)
+    assert len(Rows) == 1
+    assert (Rows[0].games, Rows[0].goals, Rows[0].assists, Rows[0].points, Rows[0].penaltyMinutes) == (24, 12, 17, 29, 14)
+
+def test_goalie_with_two_teams_of_one_club_in_one_level():
+    PlayerObject = Player("KORHONEN Eetu", "Eetu Korhonen", "https://www.leijonat.fi/index.php/pelaajakortti?lkq=2")
+    PlayerObject.birthYear, PlayerObject.position = "2011", "Maalivahti"
+    Season = GoalieSeason("2025", {"Games": "24", "Played": "18", "GoalsAllowed": "41", "TimeOnIce": "1012:35", "Gaa": "2.43"})
+    addSameClubLevels(Season, GoalieSeasonLevel, [
+        {"TeamName": "Pelicans Turkoosi", "LevelName": "U14 AAA", "Games": "14", "Played": "11", "GoalsAllowed": "25", "Saves": "268", "Save%": "91.47"},
+        {"TeamName": "Pelicans Valkoinen", "LevelName": "U14 AAA", "Games": "10", "Played": "7", "GoalsAllowed": "16", "Saves": "141", "Save%": "89.81"},
+    ])
+    PlayerObject.addSeason(Season)
+
+    writeEntirePlayerToDb(PlayerObject)
+
+    Rows = readLevelRows(GoalieSeasonLevelRow)
+    assert len(Rows) == 1
+    assert (Rows[0].games, Rows[0].played, Rows[0].goalsAllowed, Rows[0].saves) == (24, 18, 41, 409)
+    assert float(Rows[0].savePercentage) == pytest.approx(100 * 409 / 450, abs=0.01)
@@ -1,2 +1,3 @@
 from .config import *
-from .update_scraped_data import *
\ No newline at end of file
+from .update_scraped_data import *
+from .worker import *
\ No newline at end of file
@@ -0,0 +1,104 @@
+import time
+from playwright.sync_api import sync_playwright
+
+from database.reader import getSeasonObjectsByYear, getAllPlayerObjects, getAllGoalieObjects
+from database.connection import SessionLocal
+
+from historical_scraper.helpers.job_queue import enqueueUpdateJobs, claimNextUpdateJob, setUpdateJobState, hasLiveLeases, hasUnfinishedUpdateJobs, getWorkerId, recordWorkerProgress, resumeJobs
+from historical_scraper.worker import startWorkerProcesses
+from historical_scraper.config import SCRAPER_CONCURRENCY, WORKER_POLL_SECONDS
+
+from .config import CURRENT_YEAR
+from .helpers import goaliesToDict, playersToDict
+from .update_scraped_data import updateOneSeason
+
+# Worker mode of the update scraper. The season rows of the current year go to the update_jobs table of the shared job queue,
+# and each worker process leases them one by one, scrapes the latest data and commits the rows of that season.
+
+def fillUpdateQueue(PRestart: bool = False) -> int:
+    """
+    Adds a job for every goalie and player season row of the current year to the job queue.
+
+    Args:
+        PRestart (bool): Start a new update pass, the jobs of the last pass are removed. False (default) only adds the seasons missing from the queue.
+
+    Returns:
+        int: How many jobs were added.
+    """
+    Session = SessionLocal()
+    try:
+        GoaliesDict = goaliesToDict(getAllGoalieObjects(Session))       # Key is the player id, value the player row. Needed for the links.
+        PlayersDict = playersToDict(getAllPlayerObjects(Session))
+        thisYearsSeasons = getSeasonObjectsByYear(Session, CURRENT_YEAR)
+    finally:
+        Session.close()
+
+    Jobs = [("Maalivahti", Season.id, GoaliesDict[Season.playerId].sjlLink) for Season in thisYearsSeasons["goalies"]]
+    Jobs += [("Kenttäpelaaja", Season.id, PlayersDict[Season.playerId].sjlLink) for Season in thisYearsSeasons["players"]]
+
+    Added = enqueueUpdateJobs(Jobs, PRestart)
+    print(f"Added {Added} update jobs to the queue")
+    return Added
+
+def runUpdateWorker(PWorkerId: str = None) -> None:
+    """
+    One update scraper worker. Updates the leased seasons until the queue is empty and no other worker holds a lease.
+    Each season is committed on its own, so a failing season doesn't roll back the others.
+
+    Args:
+        PWorkerId (str): The id of the worker. Defaults to getWorkerId().
+
+    Returns:
+        None
+    """
+    WorkerId = PWorkerId or getWorkerId()
+    print(f"Update worker {WorkerId} is live")
+
+    with sync_playwright() as p:
+        Browser = p.chromium.launch(headless=True)
+        Page = Browser.new_page()
+
+        while True:
+            Claimed = claimNextUpdateJob(WorkerId)
+            if Claimed is None:
+                if not hasLiveLeases("update_jobs"):
+                    break
+                time.sleep(WORKER_POLL_SECONDS)         # Wait in case another worker dies and its season is reclaimed
+                continue
+
+            RowId, Position, SeasonId, PlayerLink = Claimed
+            Session = SessionLocal()
+            try:
+                updateOneSeason(Page, Session, SeasonId, Position, PlayerLink)
+                Session.commit()
+                setUpdateJobState(RowId, "done")
+                recordWorkerProgress(WorkerId, "update", PItemsDone=1, PJobsDone=1)
+            except Exception as e:
+                Session.rollback()
+                print(f"Update of season {SeasonId} ({PlayerLink}) failed: {e}")
+                setUpdateJobState(RowId, "failed", str(e))
+                recordWorkerProgress(WorkerId, "update", PJobsFailed=1)
+            finally:
+                Session.close()
+
+        Browser.close()
+
+    print(f"Update worker {WorkerId} is done")
+    return None
+
+def runUpdateWorkers(PWorkerCount: int = SCRAPER_CONCURRENCY, PRestart: bool = False) -> None:
+    """
+    Runs the update pass in the queue with PWorkerCount worker processes on this host. A new pass is started only if the queue
+    has no unfinished jobs, so a second host or a restart after a crash joins the running pass instead of throwing its leased jobs away.
+
+    Args:
+        PWorkerCount (int): How many worker processes to start.
+        PRestart (bool): Start a new pass even if the last one isn't finished. Only when no other worker is running.
+    """
+    resumeJobs()
+    if PRestart or not hasUnfinishedUpdateJobs():
+        fillUpdateQueue(PRestart=True)
+    else:
+        print("Continuing the update pass already in the queue")
+    startWorkerProcesses(runUpdateWorker, PWorkerCount)
+    return None